@@ -0,0 +1,631 @@
+"""
+Building search indexes over `OSM <https://www.openstreetmap.org/>`_ data extracts.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from pyhelpers.store import load_pickle, save_pickle
+
+from .reader import get_layer_geometries, get_tag_values
+from .utils import geodetic_to_cartesian
+
+
+def normalise_names(names):
+    """
+    Normalise names for searching.
+
+    The names are case-folded, stripped of diacritics and punctuation, and have their
+    whitespace collapsed, all in a vectorized way.
+
+    :param names: (a name or) names of features
+    :type names: str or pandas.Series
+    :return: normalised name(s)
+    :rtype: str or pandas.Series
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.indexer import normalise_names
+
+        >>> names = pd.Series(["St. Peter's  Church", 'Café Rouge'])
+
+        >>> print(normalise_names(names).tolist())
+        ['st peters church', 'cafe rouge']
+    """
+
+    if isinstance(names, str):
+        name = re.sub(r'[\u0300-\u036f]', '', unicodedata.normalize('NFKD', names))
+        name = re.sub(r'[^\w\s]', '', name.casefold())
+        return re.sub(r'\s+', ' ', name).strip()
+
+    names_ = names.astype(object).where(names.notnull(), '').astype(str)
+
+    names_ = names_.str.normalize('NFKD').str.replace(r'[\u0300-\u036f]', '', regex=True)
+    names_ = names_.str.casefold().str.replace(r"[^\w\s]", '', regex=True)
+    names_ = names_.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+    return names_
+
+
+def make_trigram_codes(names, max_length=64):
+    """
+    Make codes of the (character) trigrams of normalised names.
+
+    Each name is padded with two leading spaces and one trailing space; and
+    each trigram is encoded as an integer made of the code points of its characters.
+    Only the distinct trigrams of each name are returned.
+
+    :param names: normalised names
+    :type names: numpy.ndarray or pandas.Series
+    :param max_length: maximum number of characters of a name used for making trigrams,
+        defaults to ``64``
+    :type max_length: int
+    :return: trigram codes (sorted for each name) and the index of the name
+        each of them derives from
+    :rtype: tuple
+
+    **Example**::
+
+        >>> import numpy as np
+        >>> from pydriosm.indexer import make_trigram_codes
+
+        >>> codes, name_idx = make_trigram_codes(np.array(['oak']))
+
+        >>> print(len(codes), name_idx)
+        4 [0 0 0 0]
+    """
+
+    names_ = np.asarray(names, dtype=str)
+    n = len(names_)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Code points of the padded names, of shape (number of names, max length + 3)
+    padded = np.char.add(np.char.add('  ', names_), ' ')
+    width = min(int(np.char.str_len(padded).max()), max_length + 3)
+    code_points = np.zeros((n, width), dtype=np.int64)
+    padded_cp = padded.astype(f'<U{width}').view(np.uint32).reshape(n, -1)
+    code_points[:, :padded_cp.shape[1]] = padded_cp
+
+    trigrams = (code_points[:, :-2] << 42) | (code_points[:, 1:-1] << 21) | \
+        code_points[:, 2:]
+    trigrams[code_points[:, 2:] == 0] = -1
+
+    # Keep the distinct trigrams of each name only
+    trigrams.sort(axis=1)
+    valid = trigrams != -1
+    valid[:, 1:] &= trigrams[:, 1:] != trigrams[:, :-1]
+
+    name_idx = np.broadcast_to(np.arange(n)[:, None], trigrams.shape)[valid]
+
+    return trigrams[valid], name_idx
+
+
+class NameSearchIndex:
+    """
+    A class representation of a search index over names (and addresses) of features,
+    supporting prefix queries and fuzzy (trigram-similarity) queries.
+
+    The index consists of an array of normalised names sorted in byte order (for prefix
+    queries by binary search) and an inverted index of trigrams in compressed sparse row
+    form (for fuzzy queries), all held in NumPy arrays.
+
+    :param norm_names: normalised names (UTF-8 encoded) sorted in byte order
+    :type norm_names: numpy.ndarray
+    :param text_data: UTF-8 encoded original texts of the entries, concatenated
+    :type text_data: numpy.ndarray
+    :param text_offsets: offsets of the texts in ``text_data``
+    :type text_offsets: numpy.ndarray
+    :param layer_codes: index (into ``layer_names``) of the layer of each entry
+    :type layer_codes: numpy.ndarray
+    :param layer_names: names of the layers
+    :type layer_names: numpy.ndarray
+    :param feature_ids: OSM ID of the feature of each entry
+    :type feature_ids: numpy.ndarray
+    :param is_address: whether each entry is an address (rather than a name)
+    :type is_address: numpy.ndarray
+    :param trigram_keys: sorted codes of all trigrams
+    :type trigram_keys: numpy.ndarray
+    :param trigram_offsets: offsets of the postings of each trigram in ``postings``
+    :type trigram_offsets: numpy.ndarray
+    :param postings: entries containing each trigram
+    :type postings: numpy.ndarray
+    :param trigram_counts: number of (distinct) trigrams of each entry
+    :type trigram_counts: numpy.ndarray
+
+    See the example for the function
+    :py:func:`build_name_search_index()<pydriosm.indexer.build_name_search_index>`.
+    """
+
+    def __init__(self, norm_names, text_data, text_offsets, layer_codes, layer_names,
+                 feature_ids, is_address, trigram_keys, trigram_offsets, postings,
+                 trigram_counts):
+        """
+        Constructor method.
+        """
+
+        self.NormNames = norm_names
+        self.TextData = text_data
+        self.TextOffsets = text_offsets
+        self.LayerCodes = layer_codes
+        self.LayerNames = layer_names
+        self.FeatureIDs = feature_ids
+        self.IsAddress = is_address
+        self.TrigramKeys = trigram_keys
+        self.TrigramOffsets = trigram_offsets
+        self.Postings = postings
+        self.TrigramCounts = trigram_counts
+
+    def __len__(self):
+        return len(self.NormNames)
+
+    def get_entries(self, entry_idx):
+        """
+        Get the text, layer name and feature ID of entries of the index.
+
+        :param entry_idx: indices of the entries
+        :type entry_idx: numpy.ndarray or list
+        :return: a list of tuples of text, layer name and feature ID
+        :rtype: list
+        """
+
+        text_data = self.TextData.tobytes() if isinstance(self.TextData, np.ndarray) \
+            else self.TextData
+
+        entries = [
+            (text_data[self.TextOffsets[i]:self.TextOffsets[i + 1]].decode('utf-8'),
+             str(self.LayerNames[self.LayerCodes[i]]), int(self.FeatureIDs[i]))
+            for i in entry_idx]
+
+        return entries
+
+    def prefix_search(self, prefix, limit=10):
+        """
+        Search for the entries whose (normalised) names start with a prefix.
+
+        :param prefix: prefix of names, e.g. ``'oakh'``
+        :type prefix: str
+        :param limit: maximum number of entries returned, defaults to ``10``
+        :type limit: int
+        :return: a list of tuples of text, layer name and feature ID
+            of the matched entries, in alphabetical order
+        :rtype: list
+        """
+
+        prefix_ = normalise_names(prefix).encode('utf-8')
+
+        lower = np.searchsorted(self.NormNames, prefix_, side='left')
+        upper = np.searchsorted(self.NormNames, prefix_ + b'\xff', side='left')
+
+        return self.get_entries(range(lower, min(upper, lower + limit)))
+
+    def fuzzy_search(self, query, limit=10, min_score=0.5):
+        """
+        Search for the entries whose names are similar to a query.
+
+        The similarity is the containment of the set of trigrams of the (normalised)
+        query in that of the name, i.e. the share of the trigrams of the query found in
+        the name, so that a (misspelt) word matches the longer names containing it,
+        e.g. ``'okham'`` matches ``'Oakham Castle'``; entries of the same similarity
+        are ranked by the `Jaccard index <https://en.wikipedia.org/wiki/Jaccard_index>`_
+        of the two sets, i.e. the closer names first.
+
+        :param query: a (possibly misspelt) name, e.g. ``'okham'``
+        :type query: str
+        :param limit: maximum number of entries returned, defaults to ``10``
+        :type limit: int
+        :param min_score: minimum similarity of the entries returned, defaults to ``0.5``
+        :type min_score: float
+        :return: a list of tuples of text, layer name, feature ID and similarity
+            of the matched entries, in descending order of the similarity
+        :rtype: list
+        """
+
+        query_codes = make_trigram_codes([normalise_names(query)])[0]
+        if len(self.TrigramKeys) == 0:
+            return []
+
+        pos = np.minimum(np.searchsorted(self.TrigramKeys, query_codes),
+                         len(self.TrigramKeys) - 1)
+        pos = pos[self.TrigramKeys[pos] == query_codes]
+        if len(pos) == 0:
+            return []
+
+        offsets = self.TrigramOffsets
+        hits = np.concatenate([self.Postings[offsets[p]:offsets[p + 1]] for p in pos])
+        candidates, shared = np.unique(hits, return_counts=True)
+
+        scores = shared / len(query_codes)
+        jaccard = shared / (len(query_codes) + self.TrigramCounts[candidates] - shared)
+
+        selected = np.flatnonzero(scores >= min_score)
+        selected = selected[np.lexsort((-jaccard[selected], -scores[selected]))[:limit]]
+
+        entries = [x + (float(s),) for x, s in zip(
+            self.get_entries(candidates[selected]), scores[selected])]
+
+        return entries
+
+    def save(self, path_to_npz):
+        """
+        Save the index as an uncompressed .npz file.
+
+        :param path_to_npz: absolute path to the .npz file
+        :type path_to_npz: str
+        """
+
+        np.savez(path_to_npz, norm_names=self.NormNames, text_data=self.TextData,
+                 text_offsets=self.TextOffsets, layer_codes=self.LayerCodes,
+                 layer_names=self.LayerNames, feature_ids=self.FeatureIDs,
+                 is_address=self.IsAddress, trigram_keys=self.TrigramKeys,
+                 trigram_offsets=self.TrigramOffsets, postings=self.Postings,
+                 trigram_counts=self.TrigramCounts)
+
+    @classmethod
+    def load(cls, path_to_npz):
+        """
+        Load an index saved by
+        :py:meth:`NameSearchIndex.save()<pydriosm.indexer.NameSearchIndex.save>`.
+
+        :param path_to_npz: absolute path to the .npz file
+        :type path_to_npz: str
+        :return: the search index
+        :rtype: NameSearchIndex
+        """
+
+        with np.load(path_to_npz, allow_pickle=False) as index_data:
+            search_index = cls(**{k: index_data[k] for k in index_data.files})
+
+        search_index.TextData = search_index.TextData.tobytes()
+
+        return search_index
+
+
+def build_name_search_index(osm_data, layer_names=None, include_addresses=True,
+                            max_length=64, chunk_size=100000):
+    """
+    Build a search index over the names (and addresses) of features
+    of parsed OSM data.
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``) or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`
+    :type osm_data: dict
+    :param layer_names: names of the layers to be indexed, e.g.
+        ``['points', 'multipolygons']`` or ``['pois', 'places']``;
+        if ``None`` (default), all layers of ``osm_data``
+    :type layer_names: list or None
+    :param include_addresses: whether to index also the addresses composed of the
+        ``addr:*`` tags (in ``'other_tags'``), defaults to ``True``
+    :type include_addresses: bool
+    :param max_length: maximum number of characters of a name used for indexing,
+        defaults to ``64``
+    :type max_length: int
+    :param chunk_size: number of entries whose trigrams are made at a time,
+        defaults to ``100000``
+    :type chunk_size: int
+    :return: the search index
+    :rtype: NameSearchIndex
+
+    **Example**::
+
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.indexer import build_name_search_index, NameSearchIndex
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> sr_name = 'Rutland'
+
+        >>> rutland_pbf = geofabrik_reader.read_osm_pbf(
+        ...     sr_name, data_dir="tests", parse_raw_feat=True,
+        ...     download_confirmation_required=False)
+
+        >>> rutland_name_index = build_name_search_index(
+        ...     rutland_pbf, layer_names=['points', 'multipolygons'])
+
+        >>> rutland_name_index.save("tests\\\\rutland-name-index.npz")
+
+        >>> rutland_name_index = NameSearchIndex.load("tests\\\\rutland-name-index.npz")
+
+        >>> oakham = rutland_name_index.prefix_search('oakh', limit=3)
+        >>> oakham_ = rutland_name_index.fuzzy_search('okham', limit=3)
+    """
+
+    layer_names_ = list(osm_data.keys()) if layer_names is None else layer_names
+
+    entries = []
+    for layer_name in layer_names_:
+        layer_data = osm_data[layer_name]
+        if layer_data is None or layer_data.empty:
+            continue
+
+        id_col = 'osm_id' if 'osm_id' in layer_data.columns and 'id' not in \
+            layer_data.columns else 'id'
+        feature_ids = pd.to_numeric(layer_data[id_col], errors='coerce')
+
+        names = get_tag_values(layer_data, 'name')
+        entries.append(pd.DataFrame({'text': names, 'layer': layer_name,
+                                     'feature_id': feature_ids, 'is_address': False}))
+
+        if include_addresses:
+            addr = [get_tag_values(layer_data, f'addr:{k}').fillna('')
+                    for k in ('housenumber', 'street', 'postcode', 'city')]
+            addresses = addr[0] + ' ' + addr[1] + ', ' + addr[2] + ' ' + addr[3]
+            addresses = addresses.str.replace(r'^[\s,]+|[\s,]+$', '', regex=True)
+            addresses = addresses.str.replace(r'\s+,', ',', regex=True)
+            addresses = addresses.where((addr[0] != '') | (addr[1] != ''), None)
+            entries.append(pd.DataFrame({'text': addresses, 'layer': layer_name,
+                                         'feature_id': feature_ids, 'is_address': True}))
+
+    if not entries:  # None of the layers has data
+        entries = [pd.DataFrame({'text': pd.Series(dtype=object), 'layer': '',
+                                 'feature_id': pd.Series(dtype=float),
+                                 'is_address': False})]
+
+    entries = pd.concat(entries, ignore_index=True)
+    entries = entries[entries.text.notnull() & entries.feature_id.notnull()]
+
+    entries['norm_name'] = normalise_names(entries.text).str.slice(0, max_length)
+    entries = entries[entries.norm_name != '']
+
+    # Sort the entries in the byte order of the UTF-8 encoded normalised names
+    norm_names = entries.norm_name.str.encode('utf-8').to_numpy(dtype=bytes)
+    order = np.argsort(norm_names, kind='stable')
+    entries, norm_names = entries.iloc[order], norm_names[order]
+
+    texts = entries.text.astype(str).str.encode('utf-8')
+    text_offsets = np.r_[0, np.cumsum(texts.str.len().to_numpy())].astype(np.int64)
+    text_data = np.frombuffer(b''.join(texts), dtype=np.uint8)
+
+    layer_names_, layer_codes = np.unique(entries.layer.to_numpy(dtype=str),
+                                          return_inverse=True)
+
+    # Make the inverted index of trigrams
+    trigram_codes, entry_idx = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=int)]
+    norm_names_ = entries.norm_name.to_numpy(dtype=str)
+    for i in range(0, len(norm_names_), chunk_size):
+        codes, idx = make_trigram_codes(norm_names_[i:i + chunk_size], max_length)
+        trigram_codes.append(codes)
+        entry_idx.append(idx + i)
+
+    trigram_codes, entry_idx = np.concatenate(trigram_codes), np.concatenate(entry_idx)
+
+    order = np.argsort(trigram_codes, kind='stable')
+    trigram_keys, trigram_counts_ = np.unique(trigram_codes[order], return_counts=True)
+
+    search_index = NameSearchIndex(
+        norm_names=norm_names, text_data=text_data, text_offsets=text_offsets,
+        layer_codes=layer_codes.astype(np.int16), layer_names=layer_names_,
+        feature_ids=entries.feature_id.to_numpy(dtype=np.int64),
+        is_address=entries.is_address.to_numpy(dtype=bool),
+        trigram_keys=trigram_keys,
+        trigram_offsets=np.r_[0, np.cumsum(trigram_counts_)].astype(np.int64),
+        postings=entry_idx[order].astype(np.int32),
+        trigram_counts=np.bincount(entry_idx, minlength=len(entries)).astype(np.int32))
+
+    return search_index
+
+
+class ReverseGeocoder:
+    """
+    A class representation of a reverse geocoder, which finds the nearest addressed
+    features to given locations by a KD-tree over the (spherical) Cartesian coordinates
+    of the features.
+
+    :param coordinates: longitudes and latitudes of the features, of shape (n, 2)
+    :type coordinates: numpy.ndarray
+    :param address_data: ``'layer'``, ``'id'``, ``'name'``, ``'housenumber'``,
+        ``'street'``, ``'postcode'`` and ``'city'`` of the features
+    :type address_data: pandas.DataFrame
+    :param tree: a KD-tree over the Cartesian coordinates of the features;
+        if ``None`` (default), it is built from ``coordinates``
+    :type tree: scipy.spatial.cKDTree or None
+
+    See the example for the function
+    :py:func:`build_reverse_geocoder()<pydriosm.indexer.build_reverse_geocoder>`.
+    """
+
+    def __init__(self, coordinates, address_data, tree=None):
+        """
+        Constructor method.
+        """
+
+        from scipy.spatial import cKDTree
+
+        self.Coordinates = coordinates
+        self.AddressData = address_data.reset_index(drop=True)
+        self.Radius = 6371008.8
+
+        if tree is None:
+            xyz = geodetic_to_cartesian(coordinates[:, 0], coordinates[:, 1], self.Radius)
+            tree = cKDTree(xyz, balanced_tree=False, compact_nodes=True)
+        self.Tree = tree
+
+    def __len__(self):
+        return len(self.AddressData)
+
+    def query(self, lon, lat, k=1, max_distance=None, workers=-1):
+        """
+        Find the nearest addressed features to locations, in batch.
+
+        :param lon: longitudes of the locations
+        :type lon: numpy.ndarray or list or float
+        :param lat: latitudes of the locations
+        :type lat: numpy.ndarray or list or float
+        :param k: number of the nearest features for each location, defaults to ``1``
+        :type k: int
+        :param max_distance: maximum (great-circle) distance in metres between a location
+            and its nearest features; if ``None`` (default), unlimited
+        :type max_distance: float or None
+        :param workers: number of processes for querying the KD-tree,
+            defaults to ``-1`` (i.e. all available processors)
+        :type workers: int
+        :return: the nearest features (with the index ``'query'`` of the locations and
+            their ``'distance'`` in metres), ``k`` rows per location in ascending order of
+            the distance; locations with no features within ``max_distance`` are omitted
+        :rtype: pandas.DataFrame
+        """
+
+        lon, lat = np.atleast_1d(np.asarray(lon, dtype=float)), \
+            np.atleast_1d(np.asarray(lat, dtype=float))
+
+        xyz = geodetic_to_cartesian(lon, lat, self.Radius)
+
+        if max_distance is None:
+            upper_bound = np.inf
+        else:  # Convert the great-circle distance to the chord distance
+            upper_bound = 2 * self.Radius * np.sin(
+                min(max_distance / (2 * self.Radius), np.pi / 2))
+
+        chords, feat_idx = self.Tree.query(xyz, k=[k] if k == 1 else k,
+                                           distance_upper_bound=upper_bound,
+                                           workers=workers)
+
+        query_idx = np.repeat(np.arange(len(xyz)), chords.shape[1])
+        chords, feat_idx = chords.ravel(), feat_idx.ravel()
+
+        found = feat_idx < len(self.AddressData)
+        query_idx, chords, feat_idx = query_idx[found], chords[found], feat_idx[found]
+
+        nearest_features = self.AddressData.iloc[feat_idx].reset_index(drop=True)
+        nearest_features.insert(0, 'query', query_idx)
+        nearest_features['distance'] = \
+            2 * self.Radius * np.arcsin(np.minimum(chords / (2 * self.Radius), 1))
+
+        return nearest_features
+
+    def save(self, path_to_pickle, verbose=False):
+        """
+        Save the reverse geocoder (including its KD-tree) as a pickle file.
+
+        :param path_to_pickle: absolute path to the pickle file
+        :type path_to_pickle: str
+        :param verbose: whether to print relevant information in console as the function
+            runs, defaults to ``False``
+        :type verbose: bool or int
+        """
+
+        save_pickle((self.Coordinates, self.AddressData, self.Tree), path_to_pickle,
+                    verbose=verbose)
+
+    @classmethod
+    def load(cls, path_to_pickle, verbose=False):
+        """
+        Load a reverse geocoder saved by
+        :py:meth:`ReverseGeocoder.save()<pydriosm.indexer.ReverseGeocoder.save>`.
+
+        :param path_to_pickle: absolute path to the pickle file
+        :type path_to_pickle: str
+        :param verbose: whether to print relevant information in console as the function
+            runs, defaults to ``False``
+        :type verbose: bool or int
+        :return: the reverse geocoder
+        :rtype: ReverseGeocoder
+        """
+
+        coordinates, address_data, tree = load_pickle(path_to_pickle, verbose=verbose)
+
+        return cls(coordinates, address_data, tree=tree)
+
+
+def build_reverse_geocoder(osm_data, layer_names=None, include_named=False):
+    """
+    Build a reverse geocoder over the addressed features of parsed OSM data.
+
+    A feature is addressed if it has the tag ``addr:housenumber`` or ``addr:street``
+    (in ``'other_tags'``); and its location is the centroid of its geometry, e.g. of
+    a building in the layer ``'multipolygons'``.
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``) or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`
+    :type osm_data: dict
+    :param layer_names: names of the layers from which the features are taken, e.g.
+        ``['points', 'multipolygons']`` or ``['buildings']``;
+        if ``None`` (default), all layers of ``osm_data``
+    :type layer_names: list or None
+    :param include_named: whether to take also the features that have only a name but
+        no address (e.g. those of shapefiles, which carry no ``addr:*`` tags),
+        defaults to ``False``
+    :type include_named: bool
+    :return: the reverse geocoder
+    :rtype: ReverseGeocoder
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.indexer import build_reverse_geocoder, ReverseGeocoder
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> sr_name = 'Rutland'
+
+        >>> rutland_pbf = geofabrik_reader.read_osm_pbf(
+        ...     sr_name, data_dir="tests", parse_raw_feat=True,
+        ...     download_confirmation_required=False)
+
+        >>> rutland_geocoder = build_reverse_geocoder(
+        ...     rutland_pbf, layer_names=['points', 'multipolygons'])
+
+        >>> path_to_geocoder = os.path.join("tests", "rutland-geocoder.pickle")
+        >>> rutland_geocoder.save(path_to_geocoder)
+
+        >>> rutland_geocoder = ReverseGeocoder.load(path_to_geocoder)
+
+        >>> nearest = rutland_geocoder.query([-0.7279, -0.5134], [52.6705, 52.6556])
+        >>> print(nearest.columns.tolist()[:4])
+        ['query', 'layer', 'id', 'name']
+    """
+
+    import shapely
+
+    layer_names_ = list(osm_data.keys()) if layer_names is None else layer_names
+
+    coordinates, address_data = [], []
+    for layer_name in layer_names_:
+        layer_data = osm_data[layer_name]
+        if layer_data is None or layer_data.empty:
+            continue
+
+        id_col = 'osm_id' if 'osm_id' in layer_data.columns and 'id' not in \
+            layer_data.columns else 'id'
+
+        addresses = pd.DataFrame({
+            'layer': layer_name,
+            'id': pd.to_numeric(layer_data[id_col], errors='coerce').values,
+            'name': get_tag_values(layer_data, 'name').values})
+        for k in ('housenumber', 'street', 'postcode', 'city'):
+            addresses[k] = get_tag_values(layer_data, f'addr:{k}').values
+
+        addressed = addresses.housenumber.notnull() | addresses.street.notnull()
+        if include_named:
+            addressed |= addresses.name.notnull()
+
+        geoms = get_layer_geometries(layer_data, geo_typ=layer_name)[addressed.values]
+        centroids = shapely.centroid(geoms)
+
+        xy = np.full((len(centroids), 2), np.nan)
+        located = ~shapely.is_missing(centroids) & ~shapely.is_empty(centroids)
+        xy[located] = shapely.get_coordinates(centroids[located])
+
+        coordinates.append(xy[located])
+        address_data.append(addresses[addressed.values][located])
+
+    if sum(len(x) for x in address_data) == 0:  # Including when all layers are empty
+        raise ValueError("No addressed feature is found in the layer data.")
+
+    coordinates = np.concatenate(coordinates)
+    address_data = pd.concat(address_data, ignore_index=True)
+
+    reverse_geocoder = ReverseGeocoder(coordinates, address_data)
+
+    return reverse_geocoder
@@ -6,6 +6,7 @@ with `PostgreSQL <https://www.postgresql.org/>`_.
 from pyhelpers.sql import PostgreSQL
 from pyhelpers.text import remove_punctuation
 
+from .pipeline import PickleSink, PostgresSink, run_pipeline
 from .reader import *
 from .utils import convert_dtype_dict
 
@@ -128,6 +129,55 @@ def validate_table_name(table_name, sub_space=''):
     return table_name_
 
 
+def prepare_layer_data(osm_layer_data):
+    """
+    Prepare one layer of OSM data for importing into a PostgreSQL database.
+
+    Geometric objects are converted into their WKT; and the column of a layer of
+    raw features (i.e. GeoJSON strings) is to be imported as ``JSON``.
+
+    :param osm_layer_data: one layer of OSM data
+    :type osm_layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :return: the prepared data, and the types of its columns (if any is specified)
+    :rtype: tuple[pandas.DataFrame, dict or None]
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from shapely.geometry import Point
+        >>> from pydriosm.ios import prepare_layer_data
+
+        >>> points = pd.DataFrame({'id': [488432],
+        ...                        'coordinates': [Point(-0.5134241, 52.6555853)]})
+
+        >>> points_, col_type = prepare_layer_data(points)
+        >>> print(points_.coordinates[0], col_type)
+        POINT (-0.5134241 52.6555853) None
+    """
+
+    import geopandas as gpd
+    import sqlalchemy.types
+
+    lyr_dat = osm_layer_data.copy()
+
+    if lyr_dat.shape[1] == 1:
+        col_type = {lyr_dat.columns[0]: sqlalchemy.types.JSON}
+    else:
+        col_type = None
+        if 'coordinates' in lyr_dat.columns:
+            if not isinstance(lyr_dat.coordinates.iloc[0], list):
+                lyr_dat.coordinates = lyr_dat.coordinates.map(lambda x: x.wkt)
+
+    if isinstance(lyr_dat, gpd.GeoDataFrame):
+        lyr_dat = pd.DataFrame(lyr_dat)
+        data_types = lyr_dat.dtypes
+        if 'geometry' in [x.name for x in data_types]:
+            geom_col_name = data_types[data_types == 'geometry'].index[0]
+            lyr_dat[geom_col_name] = lyr_dat[geom_col_name].map(lambda x: x.wkt)
+
+    return lyr_dat, col_type
+
+
 class PostgresOSM:
     """
     A class representation of a tool for I/O and storage of OSM data extracts
@@ -595,25 +645,7 @@ class PostgresOSM:
                                         verbose=verbose, **kwargs)
 
         else:
-            import geopandas as gpd
-            import sqlalchemy.types
-
-            lyr_dat = osm_layer_data.copy()
-
-            if lyr_dat.shape[1] == 1:
-                col_type = {lyr_dat.columns[0]: sqlalchemy.types.JSON}
-            else:
-                col_type = None
-                if 'coordinates' in lyr_dat.columns:
-                    if not isinstance(lyr_dat.coordinates[0], list):
-                        lyr_dat.coordinates = lyr_dat.coordinates.map(lambda x: x.wkt)
-
-            if isinstance(lyr_dat, gpd.GeoDataFrame):
-                lyr_dat = pd.DataFrame(lyr_dat)
-                data_types = lyr_dat.dtypes
-                if 'geometry' in [x.name for x in data_types]:
-                    geom_col_name = data_types[data_types == 'geometry'].index[0]
-                    lyr_dat[geom_col_name] = lyr_dat[geom_col_name].map(lambda x: x.wkt)
+            lyr_dat, col_type = prepare_layer_data(osm_layer_data)
 
             self.PostgreSQL.import_data(lyr_dat, table_name=table_name_,
                                         schema_name=schema_name_, if_exists=if_exists,
@@ -849,12 +881,137 @@ class PostgresOSM:
                 del osm_layer
                 gc.collect()
 
+    def apply_osm_pbf_diff(self, osm_pbf_diff, table_name, table_named_as_subregion=False,
+                           schema_named_as_layer=False, id_column='id', chunk_size=None,
+                           confirmation_required=True, verbose=False, **kwargs):
+        """
+        Apply the differences between two versions of OSM data to the tables
+        of the older version, incrementally.
+
+        For each layer, the rows of the modified and deleted features are deleted from
+        the table, and then the created and modified features are appended to it.
+        The changes of all the layers are applied in one transaction, which is
+        rolled back (and the error is raised) if any of them fails.
+
+        :param osm_pbf_diff: change sets of the layers, i.e. the output of
+            :py:func:`diff_osm_pbf()<pydriosm.reader.diff_osm_pbf>`
+        :type osm_pbf_diff: dict
+        :param table_name: name of a table
+        :type table_name: str
+        :param table_named_as_subregion: whether to use subregion name to be a table name,
+            defaults to ``False``
+        :type table_named_as_subregion: bool
+        :param schema_named_as_layer: whether a schema is named as a layer name,
+            defaults to ``False``
+        :type schema_named_as_layer: bool
+        :param id_column: name of the column of feature IDs, defaults to ``'id'``
+        :type id_column: str
+        :param chunk_size: the number of rows in each batch to be written at a time,
+            defaults to ``None``
+        :type chunk_size: int, None
+        :param confirmation_required: whether to prompt a message
+            for confirmation to proceed, defaults to ``True``
+        :type confirmation_required: bool
+        :param verbose: whether to print relevant information in console
+            as the function runs, defaults to ``False``
+        :type verbose: bool
+        :param kwargs: optional parameters of `pandas.DataFrame.to_sql()`_
+
+        .. _`pandas.DataFrame.to_sql()`:
+            https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_sql.html
+
+        **Example**::
+
+            >>> import os
+            >>> from pydriosm.ios import PostgresOSM
+            >>> from pydriosm.reader import diff_osm_pbf
+
+            >>> osmdb_test = PostgresOSM(database_name='osmdb_test')
+            Password (postgres@localhost:5432): ***
+            Connecting postgres:***@localhost:5432/osmdb_test ... Successfully.
+
+            >>> old_pbf = os.path.join("tests", "rutland-201231.osm.pbf")
+            >>> new_pbf = os.path.join("tests", "rutland-latest.osm.pbf")
+
+            >>> rutland_changes = diff_osm_pbf(old_pbf, new_pbf)
+
+            >>> osmdb_test.apply_osm_pbf_diff(rutland_changes, table_name='Rutland',
+            ...                               verbose=True)
+            Confirmed to apply the changes to the table "Rutland"
+                at postgres:***@localhost:5432/osmdb_test
+            ? [No]|Yes: yes
+            Applying the changes to "Rutland" ...
+                points ... done: <number> created, <number> modified, <number> deleted.
+                ...
+        """
+
+        import sqlalchemy
+
+        table_name_ = self.get_table_name_for_subregion(table_name,
+                                                        table_named_as_subregion)
+
+        cfm_msg = "Confirmed to apply the changes to the table \"{}\"\n\tat {}\n?".format(
+            table_name_, self.PostgreSQL.address)
+        if confirmed(cfm_msg, confirmation_required=confirmation_required):
+
+            if verbose:
+                print("Applying the changes to \"{}\" ... ".format(table_name_))
+
+            try:
+                with self.PostgreSQL.engine.begin() as conn:  # (One transaction)
+                    for layer_name, changes in osm_pbf_diff.items():
+                        print("\t{}".format(layer_name), end=" ... ") if verbose else ""
+
+                        schema_name_ = get_default_layer_name(layer_name) \
+                            if schema_named_as_layer else layer_name
+
+                        created, modified = changes['created'], changes['modified']
+
+                        outdated_ids = np.concatenate(
+                            [changes['deleted'],
+                             hash_osm_layer(modified, id_column)[0]]).tolist()
+
+                        if outdated_ids and self.PostgreSQL.table_exists(
+                                table_name_, schema_name_):
+                            if id_column in modified.columns or modified.shape[1] != 1:
+                                id_col = '"{}"'.format(id_column)
+                            else:  # Raw data of a layer, with features stored as JSON
+                                id_col = '("{}"->>\'id\')::bigint'.format(
+                                    modified.columns[0])
+
+                            sql_query = 'DELETE FROM "{}"."{}" WHERE {} = ANY(:ids);'
+                            conn.execute(
+                                sqlalchemy.text(sql_query.format(
+                                    schema_name_, table_name_, id_col)),
+                                {'ids': outdated_ids})
+
+                        updated_data = pd.concat([created, modified])
+                        if not updated_data.empty:
+                            lyr_dat, col_type = prepare_layer_data(updated_data)
+                            conn.execute(sqlalchemy.text(
+                                'CREATE SCHEMA IF NOT EXISTS "{}";'.format(schema_name_)))
+                            lyr_dat.to_sql(
+                                table_name_, conn, schema=schema_name_,
+                                if_exists='append', index=False, chunksize=chunk_size,
+                                dtype=col_type, method=self.PostgreSQL.psql_insert_copy,
+                                **kwargs)
+
+                        if verbose:
+                            print("done: {} created, {} modified, {} deleted.".format(
+                                len(created), len(modified), len(changes['deleted'])))
+
+            except Exception as e:
+                print("failed. {}".format(e))
+                raise
+
     def import_subregion_osm_pbf(self, subregion_names, data_dir=None,
                                  update_osm_pbf=False, if_exists='replace',
                                  chunk_size_limit=50, parse_raw_feat=False,
                                  transform_geom=False, transform_other_tags=False,
                                  pickle_pbf_file=False, rm_osm_pbf=False,
-                                 confirmation_required=True, verbose=False, **kwargs):
+                                 confirmation_required=True, verbose=False,
+                                 max_workers=None, read_queue_size=4, write_queue_size=8,
+                                 **kwargs):
         """
         Import data of geographic region(s) that do not have (sub-)subregions into
         a database.
@@ -896,6 +1053,16 @@ class PostgresOSM:
         :param verbose: whether to print relevant information in console
             as the function runs, defaults to ``False``
         :type verbose: bool or int
+        :param max_workers: (when the file is larger than ``chunk_size_limit``)
+            number of the processes parsing chunks of the data, defaults to ``None``;
+            see also :py:func:`run_pipeline()<pydriosm.pipeline.run_pipeline>`
+        :type max_workers: int or None
+        :param read_queue_size: (when the file is larger than ``chunk_size_limit``)
+            maximum number of chunks read but not yet being parsed, defaults to ``4``
+        :type read_queue_size: int
+        :param write_queue_size: (when the file is larger than ``chunk_size_limit``)
+            maximum number of chunks being parsed or not yet imported, defaults to ``8``
+        :type write_queue_size: int
         :param kwargs: optional parameters of ``.import_osm_pbf_layer()``
 
         **Examples**::
@@ -1057,95 +1224,26 @@ class PostgresOSM:
                             gc.collect()
 
                     else:
-                        import ogr
-
                         if verbose:
                             print(
                                 "Parsing and importing the data of \"{}\" feature-wisely "
                                 "into {} ... ".format(
                                     subregion_name, self.PostgreSQL.address))
 
-                        # Reference: https://gdal.org/python/osgeo.ogr.Feature-class.html
-                        raw_osm_pbf = ogr.Open(path_to_osm_pbf)
-                        layer_count = raw_osm_pbf.GetLayerCount()
-
-                        layer_names, all_layer_data, layer_data = [], [], None
-
-                        for i in range(layer_count):
-                            layer = raw_osm_pbf.GetLayerByIndex(i)  # Hold the i-th layer
-                            layer_name = layer.GetName()
-
-                            if pickle_pbf_file:
-                                layer_names.append(layer_name)
-
-                            if verbose:
-                                print("                       {}".format(layer_name),
-                                      end=" ... ")
-                            try:
-                                features = [feature for _, feature in enumerate(layer)]
-                                feats_no = len(features)
-                                chunks_no = math.ceil(file_size_in_mb / chunk_size_limit)
-                                feats = split_list(lst=features, num_of_sub=chunks_no)
-
-                                del features
-                                gc.collect()
-
-                                if self.subregion_table_exists(
-                                        subregion_name, layer_name) \
-                                        and if_exists == 'replace':
-                                    self.drop_subregion_table(subregion_name, layer_name,
-                                                              confirmation_required=False)
-
-                                all_lyr_dat = []
-                                # Loop through all available features
-                                for feat in feats:
-                                    if parse_raw_feat:
-                                        lyr_dat = pd.DataFrame(
-                                            f.ExportToJson(as_object=True) for f in feat)
-                                        lyr_dat = parse_osm_pbf_layer(
-                                            pbf_layer_data=lyr_dat, geo_typ=layer_name,
-                                            transform_geom=transform_geom,
-                                            transform_other_tags=transform_other_tags)
-
-                                    else:
-                                        lyr_dat = pd.DataFrame(
-                                            f.ExportToJson() for f in feat)
-                                        lyr_dat.columns = ['{}_data'.format(layer_name)]
-
-                                    if_exists_ = if_exists if if_exists == 'fail' \
-                                        else 'append'
-                                    self.import_osm_layer(
-                                        osm_layer_data=lyr_dat, table_name=subregion_name,
-                                        schema_name=layer_name, if_exists=if_exists_,
-                                        confirmation_required=False)
-
-                                    if pickle_pbf_file:
-                                        all_lyr_dat.append(lyr_dat)
-
-                                    del lyr_dat
-                                    gc.collect()
-
-                                if pickle_pbf_file:
-                                    all_layer_data.append(
-                                        pd.concat(all_lyr_dat, ignore_index=True,
-                                                  sort=False))
-
-                                if verbose:
-                                    print("done: {} features.".format(feats_no))
-
-                            except Exception as e:
-                                print("failed. {}".format(e))
-
-                        raw_osm_pbf.Release()
-
-                        del raw_osm_pbf
-                        gc.collect()
-
+                        # Read, parse and import the data concurrently, chunk by chunk
+                        sinks = [PostgresSink(self, subregion_name, if_exists=if_exists,
+                                              **kwargs)]
                         if pickle_pbf_file:
-                            save_pickle(
-                                dict(zip(layer_names, all_layer_data)),
+                            sinks.append(PickleSink(
                                 path_to_osm_pbf.replace(osm_file_format, "-pbf.pickle"),
-                                verbose=verbose)
+                                verbose=verbose))
+
+                        run_pipeline(
+                            path_to_osm_pbf, sinks, parse_raw_feat=parse_raw_feat,
+                            transform_geom=transform_geom,
+                            transform_other_tags=transform_other_tags,
+                            max_workers=max_workers, read_queue_size=read_queue_size,
+                            write_queue_size=write_queue_size, verbose=verbose)
 
                     if rm_osm_pbf:
                         remove_subregion_osm_file(path_to_osm_pbf, verbose=verbose)
@@ -1162,7 +1260,7 @@ class PostgresOSM:
                        table_named_as_subregion=False, schema_named_as_layer=False,
                        chunk_size=None, method='spooled_tempfile', max_size_spooled=1,
                        decode_geojson=False, decode_wkt=False, decode_other_tags=False,
-                       parse_geojson=False, sort_by='id', **kwargs):
+                       parse_geojson=False, sort_by='id', tag_schema=None, **kwargs):
         """
         Fetch OSM data (of one or multiple layers) of a geographic region.
 
@@ -1203,6 +1301,11 @@ class PostgresOSM:
         :param sort_by: column name(s) by which the data (fetched from PostgreSQL)
             is sorted, defaults to ``None``
         :type sort_by: str or list
+        :param tag_schema: schema of tags to be extracted into typed columns
+            (see :py:func:`extract_typed_tags()<pydriosm.reader.extract_typed_tags>`),
+            e.g. ``get_default_tag_schema()``; if ``None`` (default), none is extracted;
+            tags stored as dictionaries require ``decode_other_tags=True``
+        :type tag_schema: dict or None
         :return: PBF (.osm.pbf) data
         :rtype: dict
 
@@ -1388,6 +1491,9 @@ class PostgresOSM:
                         lyr_dat.sort_values(sort_by, inplace=True)
                         lyr_dat.index = range(len(lyr_dat))
 
+                if tag_schema and lyr_dat.shape[1] > 1:
+                    lyr_dat = extract_typed_tags(lyr_dat, tag_schema)
+
                 layer_data.append(lyr_dat)
 
             else:
@@ -0,0 +1,321 @@
+"""
+Building road networks from `OSM <https://www.openstreetmap.org/>`_ data extracts.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .reader import get_layer_geometries, get_tag_values
+from .utils import haversine_distance
+
+
+def parse_maxspeed(maxspeed):
+    """
+    Parse values of the tag ``maxspeed`` into speeds in km/h.
+
+    :param maxspeed: values of the tag ``maxspeed``, e.g. ``'30 mph'``, ``'50'``
+    :type maxspeed: pandas.Series
+    :return: speeds in km/h (``NaN`` where a value is missing, zero or cannot be parsed,
+        e.g. ``'none'`` or ``'signals'``)
+    :rtype: numpy.ndarray
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.network import parse_maxspeed
+
+        >>> print(parse_maxspeed(pd.Series(['30 mph', '50', 'signals', None])))
+        [48.28032 50.            nan       nan]
+    """
+
+    maxspeed_ = maxspeed.astype(object).where(maxspeed.notnull(), '').astype(str)
+
+    speed_unit = maxspeed_.str.extract(r'^\s*(\d+(?:\.\d+)?)\s*(mph|knots)?', expand=True)
+
+    speed = np.array(pd.to_numeric(speed_unit[0], errors='coerce'), dtype=np.float64)
+    speed[(speed_unit[1] == 'mph').to_numpy()] *= 1.609344
+    speed[(speed_unit[1] == 'knots').to_numpy()] *= 1.852
+    speed[speed <= 0] = np.nan  # e.g. '0' for unknown speed limits in shapefiles
+
+    return speed
+
+
+def parse_oneway(oneway, highway=None, junction=None):
+    """
+    Parse values of the tag ``oneway`` into directions of travel.
+
+    :param oneway: values of the tag ``oneway`` (e.g. ``'yes'``, ``'-1'``) or,
+        for shapefile data, of the column ``'oneway'`` (i.e. ``'F'``, ``'T'`` or ``'B'``)
+    :type oneway: pandas.Series
+    :param highway: values of the tag ``highway``, used to tell implied one-way roads
+        (i.e. motorways), defaults to ``None``
+    :type highway: pandas.Series or None
+    :param junction: values of the tag ``junction``, used to tell implied one-way roads
+        (i.e. roundabouts), defaults to ``None``
+    :type junction: pandas.Series or None
+    :return: ``1`` for travelling along the digitised direction only, ``-1`` for
+        travelling against it only, and ``0`` for both directions
+    :rtype: numpy.ndarray
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.network import parse_oneway
+
+        >>> print(parse_oneway(pd.Series(['yes', '-1', None, 'T', 'B'])))
+        [ 1 -1  0 -1  0]
+    """
+
+    oneway_ = oneway.astype(object).where(oneway.notnull(), '').astype(str).str.lower()
+
+    direction = np.zeros(len(oneway_), dtype=np.int8)
+
+    if highway is not None or junction is not None:
+        implied = np.zeros(len(oneway_), dtype=bool)
+        if highway is not None:
+            implied |= highway.isin(['motorway', 'motorway_link']).to_numpy()
+        if junction is not None:
+            implied |= (junction == 'roundabout').to_numpy()
+        # Unless two-way explicitly (i.e. 'no', or 'B' in the shapefiles)
+        direction[implied & ~oneway_.isin(['no', 'b']).to_numpy()] = 1
+
+    # 'F' and 'T' are used in the shapefiles: travelling from and to the first vertex
+    direction[oneway_.isin(['yes', 'true', '1', 'f']).to_numpy()] = 1
+    direction[oneway_.isin(['-1', 'reverse', 't']).to_numpy()] = -1
+
+    return direction
+
+
+class RoadGraph:
+    """
+    A class representation of a road network stored as compressed sparse row (CSR)
+    adjacency arrays.
+
+    The outgoing edges of the node ``i`` are those from ``Offsets[i]`` to
+    ``Offsets[i + 1]`` (exclusive) of the edge arrays ``Targets``, ``Lengths``,
+    ``HighwayCodes``, ``MaxSpeeds`` and ``WayIDs``.
+
+    :param node_coordinates: coordinates of the nodes, of shape (number of nodes, 2)
+    :type node_coordinates: numpy.ndarray
+    :param offsets: offsets of the outgoing edges of each node
+    :type offsets: numpy.ndarray
+    :param targets: target node of each edge
+    :type targets: numpy.ndarray
+    :param lengths: length (in metres, or in the unit of a projected CRS) of each edge
+    :type lengths: numpy.ndarray
+    :param highway_codes: index (into ``highway_classes``) of the class of each edge
+    :type highway_codes: numpy.ndarray
+    :param highway_classes: names of the road classes, e.g. ``'primary'``
+    :type highway_classes: numpy.ndarray
+    :param maxspeeds: speed limit (in km/h) of each edge
+    :type maxspeeds: numpy.ndarray
+    :param way_ids: OSM ID of the way that each edge derives from
+    :type way_ids: numpy.ndarray
+
+    See the example for the function
+    :py:func:`build_road_graph()<pydriosm.network.build_road_graph>`.
+    """
+
+    def __init__(self, node_coordinates, offsets, targets, lengths, highway_codes,
+                 highway_classes, maxspeeds, way_ids):
+        """
+        Constructor method.
+        """
+
+        self.NodeCoordinates = node_coordinates
+        self.Offsets = offsets
+        self.Targets = targets
+        self.Lengths = lengths
+        self.HighwayCodes = highway_codes
+        self.HighwayClasses = highway_classes
+        self.MaxSpeeds = maxspeeds
+        self.WayIDs = way_ids
+
+    @property
+    def number_of_nodes(self):
+        """
+        Number of the nodes of the graph.
+        """
+        return len(self.NodeCoordinates)
+
+    @property
+    def number_of_edges(self):
+        """
+        Number of the (directed) edges of the graph.
+        """
+        return len(self.Targets)
+
+    def neighbours(self, node):
+        """
+        Get the nodes that can be reached from a node by traversing one edge.
+
+        :param node: index of a node
+        :type node: int
+        :return: indices of the neighbouring nodes
+        :rtype: numpy.ndarray
+        """
+
+        return self.Targets[self.Offsets[node]:self.Offsets[node + 1]]
+
+    def save(self, path_to_npz):
+        """
+        Save the graph as an uncompressed .npz file.
+
+        :param path_to_npz: absolute path to the .npz file
+        :type path_to_npz: str
+        """
+
+        np.savez(path_to_npz, node_coordinates=self.NodeCoordinates, offsets=self.Offsets,
+                 targets=self.Targets, lengths=self.Lengths,
+                 highway_codes=self.HighwayCodes, highway_classes=self.HighwayClasses,
+                 maxspeeds=self.MaxSpeeds, way_ids=self.WayIDs)
+
+    @classmethod
+    def load(cls, path_to_npz):
+        """
+        Load a graph saved by
+        :py:meth:`RoadGraph.save()<pydriosm.network.RoadGraph.save>`.
+
+        :param path_to_npz: absolute path to the .npz file
+        :type path_to_npz: str
+        :return: the road graph
+        :rtype: RoadGraph
+        """
+
+        with np.load(path_to_npz, allow_pickle=False) as graph_data:
+            road_graph = cls(**{k: graph_data[k] for k in graph_data.files})
+
+        return road_graph
+
+
+def build_road_graph(road_data, geo_typ=None, geodesic=True, precision=7):
+    """
+    Build a road graph from the ``'lines'`` layer of PBF data
+    or the ``'roads'`` layer of shapefile data.
+
+    The ways are split at every vertex that is shared by more than one way
+    (as well as at their end points), and each resulting section becomes an edge
+    (two edges, one in each direction, unless it is one-way).
+    All the steps are vectorized over the coordinate arrays of the whole layer.
+
+    :param road_data: parsed data of the ``'lines'`` layer of PBF data
+        (only the features with a ``highway`` tag are used)
+        or of the ``'roads'`` layer of shapefile data
+    :type road_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param geo_typ: name of the PBF layer, e.g. ``'lines'``, defaults to ``None``
+    :type geo_typ: str or None
+    :param geodesic: whether the coordinates are longitudes and latitudes,
+        so that the lengths of edges are computed as great-circle distances (in metres);
+        if ``False``, Euclidean distances in the unit of the coordinates,
+        defaults to ``True``
+    :type geodesic: bool
+    :param precision: number of decimal places to which the coordinates are rounded
+        when identifying the shared vertices, defaults to ``7`` (i.e. the precision of
+        OSM coordinates)
+    :type precision: int
+    :return: the road graph
+    :rtype: RoadGraph
+
+    **Example**::
+
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.network import build_road_graph, RoadGraph
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> sr_name = 'Rutland'
+
+        >>> rutland_shp = geofabrik_reader.read_shp_zip(
+        ...     sr_name, layer_names='roads', data_dir="tests",
+        ...     download_confirmation_required=False)
+
+        >>> rutland_road_graph = build_road_graph(rutland_shp['roads'])
+
+        >>> rutland_road_graph.save("tests\\\\rutland-road-graph.npz")
+
+        >>> rutland_road_graph_ = RoadGraph.load("tests\\\\rutland-road-graph.npz")
+        >>> rutland_road_graph_.number_of_edges == rutland_road_graph.number_of_edges
+        True
+    """
+
+    import shapely
+
+    if 'fclass' in road_data.columns:  # Shapefile data
+        highway = road_data['fclass'].astype(object)
+        way_ids = road_data['osm_id']
+        junction = None
+    else:
+        highway = get_tag_values(road_data, 'highway')
+        way_ids = road_data['id']
+        junction = get_tag_values(road_data, 'junction')
+
+    is_road = highway.notnull().to_numpy()
+    road_data_ = road_data[is_road]
+    highway = highway[is_road]
+
+    way_ids = way_ids[is_road].to_numpy(dtype=np.int64)
+    oneway = parse_oneway(get_tag_values(road_data_, 'oneway'), highway=highway,
+                          junction=None if junction is None else junction[is_road])
+    maxspeed = parse_maxspeed(get_tag_values(road_data_, 'maxspeed'))
+    highway_classes, highway_codes = np.unique(highway.to_numpy(dtype=str),
+                                               return_inverse=True)
+
+    # Explode the (multi-)linestrings into parts, each of which is a sequence of vertices
+    geoms = get_layer_geometries(road_data_, geo_typ=geo_typ)
+    parts, part_way = shapely.get_parts(geoms, return_index=True)
+    coords, vertex_part = shapely.get_coordinates(parts, return_index=True)
+
+    # Identify the vertices shared by different ways (or visited twice by one way)
+    vertex_keys = np.round(coords * 10 ** precision).astype(np.int64)
+    unique_keys, vertex_ids = np.unique(vertex_keys, axis=0, return_inverse=True)
+    vertex_ids = vertex_ids.ravel()
+
+    is_first = np.r_[True, vertex_part[1:] != vertex_part[:-1]]
+    is_last = np.r_[vertex_part[1:] != vertex_part[:-1], True]
+    is_node = (np.bincount(vertex_ids)[vertex_ids] > 1) | is_first | is_last
+
+    # Cumulative length of each part at each of its vertices
+    if geodesic:
+        seg_lengths = haversine_distance(coords[:-1, 0], coords[:-1, 1],
+                                         coords[1:, 0], coords[1:, 1])
+    else:
+        seg_lengths = np.hypot(*(coords[1:] - coords[:-1]).T)
+    seg_lengths[is_first[1:]] = 0.0
+    cum_lengths = np.r_[0.0, np.cumsum(seg_lengths)]
+
+    # Each pair of consecutive nodes on the same part makes an edge
+    node_pos = np.flatnonzero(is_node)
+    pos_a, pos_b = node_pos[:-1], node_pos[1:]
+    same_part = vertex_part[pos_a] == vertex_part[pos_b]
+    pos_a, pos_b = pos_a[same_part], pos_b[same_part]
+
+    node_vertex_ids = np.unique(vertex_ids[node_pos])
+    vertex_to_node = np.full(len(unique_keys), -1, dtype=np.int64)
+    vertex_to_node[node_vertex_ids] = np.arange(len(node_vertex_ids))
+
+    source, target = vertex_to_node[vertex_ids[pos_a]], vertex_to_node[vertex_ids[pos_b]]
+    edge_way = part_way[vertex_part[pos_a]]
+    edge_length = cum_lengths[pos_b] - cum_lengths[pos_a]
+    edge_oneway = oneway[edge_way]
+
+    # Add the edges in the digitised and/or the reverse direction
+    forward, backward = edge_oneway >= 0, edge_oneway <= 0
+    sources = np.r_[source[forward], target[backward]]
+    targets = np.r_[target[forward], source[backward]]
+    edge_ways = np.r_[edge_way[forward], edge_way[backward]]
+    lengths = np.r_[edge_length[forward], edge_length[backward]]
+
+    order = np.argsort(sources, kind='stable')
+    offsets = np.r_[0, np.cumsum(np.bincount(sources, minlength=len(node_vertex_ids)))]
+
+    node_coordinates = unique_keys[node_vertex_ids] / 10 ** precision
+    edge_ways = edge_ways[order]
+
+    road_graph = RoadGraph(
+        node_coordinates=node_coordinates, offsets=offsets.astype(np.int64),
+        targets=targets[order].astype(np.int64), lengths=lengths[order],
+        highway_codes=highway_codes.ravel()[edge_ways].astype(np.int16),
+        highway_classes=highway_classes, maxspeeds=maxspeed[edge_ways].astype(np.float32),
+        way_ids=way_ids[edge_ways])
+
+    return road_graph
@@ -0,0 +1,510 @@
+"""
+Sinks that receive `OSM <https://www.openstreetmap.org/>`_ data as it is parsed,
+so that one parse of a data file can feed several outputs.
+
+.. seealso::
+
+    - The parameter ``sinks`` of :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+    - :py:func:`run_pipeline()<pydriosm.pipeline.run_pipeline>`
+"""
+
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import queue
+import threading
+
+import pandas as pd
+import rapidjson
+from pyhelpers.store import save_pickle
+
+from .reader import TagStatistics, parse_osm_pbf_layer, parse_other_tags
+from .utils import get_vsi_path
+
+
+class Sink:
+    """
+    A base class of sinks.
+
+    A sink is opened before the parsing starts, receives each chunk of each layer
+    of the parsed data by :py:meth:`write()<pydriosm.pipeline.Sink.write>`,
+    and is closed (returning its result) when the parsing is finished.
+    """
+
+    def open(self):
+        """
+        Prepare the sink to receive data.
+        """
+
+        pass
+
+    def write(self, layer_name, layer_data):
+        """
+        Receive a chunk of a layer of the parsed data.
+
+        :param layer_name: name of the layer, e.g. ``'points'``
+        :type layer_name: str
+        :param layer_data: a chunk of the layer data
+        :type layer_data: pandas.DataFrame
+        """
+
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Finish receiving data.
+
+        :return: result of the sink
+        """
+
+        return None
+
+
+class PickleSink(Sink):
+    """
+    A sink that collects the parsed data and saves it as a pickle file,
+    e.g. as the cache read by :py:meth:`GeofabrikReader.read_osm_pbf()
+    <pydriosm.reader.GeofabrikReader.read_osm_pbf>`.
+
+    :param path_to_pickle: absolute path to the pickle file
+    :type path_to_pickle: str
+    :param ret_data: whether to return the collected data on closing,
+        defaults to ``False``
+    :type ret_data: bool
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    """
+
+    def __init__(self, path_to_pickle, ret_data=False, verbose=False):
+        """
+        Constructor method.
+        """
+
+        self.PathToPickle = path_to_pickle
+        self.RetData = ret_data
+        self.Verbose = verbose
+        self.Chunks = {}
+
+    def open(self):
+        self.Chunks = {}
+
+    def write(self, layer_name, layer_data):
+        self.Chunks.setdefault(layer_name, []).append(layer_data)
+
+    def close(self):
+        osm_data = {k: pd.concat(v, ignore_index=True, sort=False)
+                    for k, v in self.Chunks.items()}
+        self.Chunks = {}
+
+        save_pickle(osm_data, self.PathToPickle, verbose=self.Verbose)
+
+        return osm_data if self.RetData else self.PathToPickle
+
+
+class PostgresSink(Sink):
+    """
+    A sink that imports the parsed data into a PostgreSQL database, chunk by chunk.
+
+    The raw data of a layer (i.e. GeoJSON strings, when ``parse_raw_feat=False``)
+    is imported into a column named ``'<layer name>_data'``, e.g. ``'points_data'``.
+
+    :param postgres_osm: an instance of the class
+        :py:class:`PostgresOSM<pydriosm.ios.PostgresOSM>`
+    :type postgres_osm: pydriosm.ios.PostgresOSM
+    :param table_name: name of the table (in the schema named as each layer)
+    :type table_name: str
+    :param if_exists: if a table already exists (when its first chunk is written),
+        to ``'replace'`` (default), ``'append'`` or ``'fail'``
+    :type if_exists: str
+    :param kwargs: optional parameters of :py:meth:`PostgresOSM.import_osm_layer()
+        <pydriosm.ios.PostgresOSM.import_osm_layer>`
+    """
+
+    def __init__(self, postgres_osm, table_name, if_exists='replace', **kwargs):
+        """
+        Constructor method.
+        """
+
+        self.PostgresOSM = postgres_osm
+        self.TableName = table_name
+        self.IfExists = if_exists
+        self.ImportKwargs = kwargs
+        self.FeatureCounts = {}
+
+    def open(self):
+        self.FeatureCounts = {}
+
+    def write(self, layer_name, layer_data):
+        if_exists = 'append' if layer_name in self.FeatureCounts else self.IfExists
+
+        if list(layer_data.columns) == [layer_name]:  # Raw data (of GeoJSON strings)
+            layer_data = layer_data.rename(
+                columns={layer_name: '{}_data'.format(layer_name)})
+
+        self.PostgresOSM.import_osm_layer(
+            layer_data, table_name=self.TableName, schema_name=layer_name,
+            if_exists=if_exists, confirmation_required=False, **self.ImportKwargs)
+
+        self.FeatureCounts[layer_name] = \
+            self.FeatureCounts.get(layer_name, 0) + len(layer_data)
+
+    def close(self):
+        return self.FeatureCounts
+
+
+class FileSink(Sink):
+    """
+    A sink that exports the parsed data to files, one file (or one directory of part
+    files) for each layer.
+
+    Geometric objects are written as WKT strings; and coordinates (i.e. lists) and
+    dictionaries of other tags are written as JSON strings.
+
+    :param path_to_dir: absolute path to the directory of the files
+    :type path_to_dir: str
+    :param file_format: ``'csv'`` (default), for a .csv file of each layer,
+        or ``'parquet'``, for a directory of .parquet files (one for each chunk)
+        of each layer, which requires `pyarrow <https://arrow.apache.org/docs/python/>`_
+    :type file_format: str
+    """
+
+    def __init__(self, path_to_dir, file_format='csv'):
+        """
+        Constructor method.
+        """
+
+        assert file_format in ('csv', 'parquet'), \
+            "`file_format` must be either 'csv' or 'parquet'."
+
+        self.PathToDir = path_to_dir
+        self.FileFormat = file_format
+        self.ChunkCounts = {}
+
+    def open(self):
+        os.makedirs(self.PathToDir, exist_ok=True)
+        self.ChunkCounts = {}
+
+    def write(self, layer_name, layer_data):
+        import shapely
+
+        layer_data_ = layer_data.copy()
+        for col in layer_data_.columns:
+            values = layer_data_[col]
+            if values.dtype == object and len(values) > 0:
+                first = values.dropna().iloc[0] if values.notnull().any() else None
+                if isinstance(first, shapely.Geometry):
+                    layer_data_[col] = shapely.to_wkt(values.to_numpy())
+                elif isinstance(first, (list, dict)):
+                    layer_data_[col] = values.map(
+                        lambda x: None if x is None else rapidjson.dumps(x))
+
+        chunk_count = self.ChunkCounts.get(layer_name, 0)
+
+        if self.FileFormat == 'csv':
+            path_to_file = os.path.join(self.PathToDir, layer_name + ".csv")
+            layer_data_.to_csv(path_to_file, mode='w' if chunk_count == 0 else 'a',
+                               header=chunk_count == 0, index=False)
+        else:
+            path_to_layer_dir = os.path.join(self.PathToDir, layer_name)
+            os.makedirs(path_to_layer_dir, exist_ok=True)
+            filename = "part-{:05d}.parquet".format(chunk_count)
+            layer_data_.to_parquet(os.path.join(path_to_layer_dir, filename), index=False)
+
+        self.ChunkCounts[layer_name] = chunk_count + 1
+
+    def close(self):
+        return self.PathToDir
+
+
+class StatsSink(Sink):
+    """
+    A sink that collects statistics of the tags of the parsed data
+    by :py:class:`TagStatistics<pydriosm.reader.TagStatistics>`.
+
+    :param precision: see :py:class:`TagStatistics<pydriosm.reader.TagStatistics>`,
+        defaults to ``12``
+    :type precision: int
+    :param top_k: see :py:class:`TagStatistics<pydriosm.reader.TagStatistics>`,
+        defaults to ``10``
+    :type top_k: int
+    """
+
+    def __init__(self, precision=12, top_k=10):
+        """
+        Constructor method.
+        """
+
+        self.Precision = precision
+        self.TopK = top_k
+        self.Stats = TagStatistics(precision=precision, top_k=top_k)
+
+    def open(self):
+        self.Stats = TagStatistics(precision=self.Precision, top_k=self.TopK)
+
+    def write(self, layer_name, layer_data):
+        if layer_data.shape[1] == 1:  # Raw data, whose features are GeoJSON strings
+            properties = (rapidjson.loads(x)['properties'] for x in layer_data.iloc[:, 0])
+        else:
+            tag_columns = [x for x in layer_data.columns if x not in (
+                'id', 'coordinates', 'geometry', 'geometries', 'minx', 'miny', 'maxx',
+                'maxy', 'quadkey', 'geohash')]
+            properties = layer_data[tag_columns].to_dict('records')
+
+        for tags in properties:
+            tags = {k: v for k, v in tags.items() if v is not None and v == v}
+
+            other_tags = tags.pop('other_tags', None)
+            if other_tags:
+                tags.update(other_tags if isinstance(other_tags, dict)
+                            else parse_other_tags(other_tags))
+
+            self.Stats.update(layer_name, tags)
+
+    def close(self):
+        return self.Stats
+
+
+def parse_pbf_chunk(layer_name, chunk, parse_raw_feat=True, transform_geom=False,
+                    transform_other_tags=False, **kwargs):
+    """
+    Parse a chunk of features of a layer of a PBF data file.
+
+    :param layer_name: name of the layer, e.g. ``'points'``
+    :type layer_name: str
+    :param chunk: features exported by `GDAL/OGR`_, i.e. dictionaries
+        (if ``parse_raw_feat=True``) or GeoJSON strings
+    :type chunk: list
+    :param parse_raw_feat: whether to parse each feature in the raw data,
+        defaults to ``True``
+    :type parse_raw_feat: bool
+    :param transform_geom: whether to transform a single coordinate
+        (or a collection of coordinates) into a geometric object, defaults to ``False``
+    :type transform_geom: bool
+    :param transform_other_tags: whether to transform a ``'other_tags'`` into
+        a dictionary, defaults to ``False``
+    :type transform_other_tags: bool
+    :param kwargs: optional parameters of
+        :py:func:`parse_osm_pbf_layer()<pydriosm.reader.parse_osm_pbf_layer>`
+    :return: name and parsed data of the layer
+    :rtype: tuple
+
+    .. _`GDAL/OGR`: https://gdal.org/python/osgeo.ogr-module.html
+    """
+
+    if parse_raw_feat:
+        layer_data = parse_osm_pbf_layer(
+            pd.DataFrame(chunk), geo_typ=layer_name, transform_geom=transform_geom,
+            transform_other_tags=transform_other_tags, **kwargs)
+    else:
+        layer_data = pd.DataFrame(chunk, columns=[layer_name])
+
+    return layer_name, layer_data
+
+
+def run_pipeline(path_to_osm_pbf, sinks, parse_raw_feat=True, transform_geom=False,
+                 transform_other_tags=False, chunk_size=50000, max_workers=None,
+                 read_queue_size=4, write_queue_size=8, verbose=False, **kwargs):
+    """
+    Parse a PBF data file by a pipeline of concurrent stages, passing the parsed data
+    to sinks.
+
+    The pipeline has three stages connected by bounded queues:
+
+    - a reader thread reads chunks of ``chunk_size`` features of each layer
+      (by `GDAL/OGR <https://gdal.org/python/osgeo.ogr-module.html>`_)
+      into a queue of at most ``read_queue_size`` chunks;
+    - the chunks are parsed, by :py:func:`parse_pbf_chunk()
+      <pydriosm.pipeline.parse_pbf_chunk>`, in a pool of ``max_workers`` processes,
+      at most ``write_queue_size`` of them being parsed or waiting to be written
+      at a time; and
+    - a writer thread passes the parsed chunks, in the order in which they are read,
+      to each of the sinks (see e.g. :py:class:`PostgresSink
+      <pydriosm.pipeline.PostgresSink>`).
+
+    A stage waits whenever the queue it feeds is full, so that the memory use is bounded
+    by the sizes of the queues, whereas all the stages keep busy as long as the next
+    one keeps up. (The parsing is mostly done in Python and holds the GIL, so that
+    the chunks, which are lists of dictionaries or strings, are pickled to
+    separate processes; whereas GDAL and the database drivers release the GIL in most
+    of their work, so that the reader and the writer threads run alongside.)
+
+    :param path_to_osm_pbf: absolute path to a PBF data file, or its URL
+        (e.g. ``'s3://bucket/key'``)
+    :type path_to_osm_pbf: str
+    :param sinks: sinks to which the parsed data is passed
+    :type sinks: list
+    :param parse_raw_feat: whether to parse each feature in the raw data,
+        defaults to ``True``
+    :type parse_raw_feat: bool
+    :param transform_geom: whether to transform a single coordinate
+        (or a collection of coordinates) into a geometric object, defaults to ``False``
+    :type transform_geom: bool
+    :param transform_other_tags: whether to transform a ``'other_tags'`` into
+        a dictionary, defaults to ``False``
+    :type transform_other_tags: bool
+    :param chunk_size: number of features in each chunk, defaults to ``50000``
+    :type chunk_size: int
+    :param max_workers: number of the processes parsing the chunks;
+        if ``None`` (default), up to ``4`` depending on the number of CPUs
+    :type max_workers: int or None
+    :param read_queue_size: maximum number of chunks read but not yet being parsed,
+        defaults to ``4``
+    :type read_queue_size: int
+    :param write_queue_size: maximum number of chunks being parsed
+        or parsed but not yet written, defaults to ``8``
+    :type write_queue_size: int
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :param kwargs: optional parameters of
+        :py:func:`parse_osm_pbf_layer()<pydriosm.reader.parse_osm_pbf_layer>`,
+        e.g. ``spatial_keys='quadkey'``
+    :return: results of the sinks
+    :rtype: list
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.ios import PostgresOSM
+        >>> from pydriosm.pipeline import PostgresSink, StatsSink, run_pipeline
+
+        >>> osmdb_test = PostgresOSM(database_name='osmdb_test')
+        Password (postgres@localhost:5432): ***
+        Connecting postgres:***@localhost:5432/osmdb_test ... Successfully.
+
+        >>> path_to_rutland_pbf = osmdb_test.Downloader.download_osm_data(
+        ...     'Rutland', ".osm.pbf", "tests", confirmation_required=False,
+        ...     ret_download_path=True)
+
+        >>> feature_counts, rutland_stats = run_pipeline(
+        ...     path_to_rutland_pbf, [PostgresSink(osmdb_test, 'Rutland'), StatsSink()])
+
+        >>> print(list(feature_counts.keys()))
+        ['points', 'lines', 'multilinestrings', 'multipolygons', 'other_relations']
+
+        >>> # Delete the downloaded PBF data file
+        >>> os.remove(path_to_rutland_pbf)
+    """
+
+    import ogr
+
+    if max_workers is None:
+        max_workers = min(4, os.cpu_count() or 1)
+
+    read_queue = queue.Queue(maxsize=read_queue_size)
+    write_queue = queue.Queue(maxsize=write_queue_size)
+    stop_event, errors, end_of_data = threading.Event(), [], object()
+
+    def put(queue_, item):
+        # Put an item into a queue (waiting while it is full) unless the pipeline stops
+        while not stop_event.is_set():
+            try:
+                queue_.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(queue_):
+        # Get an item from a queue (waiting while it is empty) unless the pipeline stops
+        while not stop_event.is_set():
+            try:
+                return queue_.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return end_of_data
+
+    def read_chunks():
+        raw_osm_pbf = None
+
+        try:
+            raw_osm_pbf = ogr.Open(get_vsi_path(path_to_osm_pbf))
+
+            for i in range(raw_osm_pbf.GetLayerCount()):
+                layer = raw_osm_pbf.GetLayerByIndex(i)
+                layer_name, chunk = layer.GetName(), []
+
+                for feature in layer:
+                    chunk.append(feature.ExportToJson(as_object=parse_raw_feat))
+                    if len(chunk) == chunk_size:
+                        if not put(read_queue, (layer_name, chunk)):
+                            return
+                        chunk = []
+
+                if chunk and not put(read_queue, (layer_name, chunk)):
+                    return
+
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+
+        finally:
+            if raw_osm_pbf is not None:  # Also when the pipeline stops early
+                raw_osm_pbf.Release()
+            put(read_queue, end_of_data)
+
+    def write_chunks():
+        try:
+            while True:
+                future = get(write_queue)
+                if future is end_of_data:
+                    break
+
+                layer_name, layer_data = future.result()
+                for sink in sinks:
+                    sink.write(layer_name, layer_data)
+
+                feature_counts[layer_name] += len(layer_data)
+
+        except Exception as e:
+            errors.append(e)
+            stop_event.set()
+
+    for sink in sinks:
+        sink.open()
+
+    feature_counts = collections.defaultdict(int)
+
+    try:
+        reader = threading.Thread(target=read_chunks, daemon=True)
+        writer = threading.Thread(target=write_chunks, daemon=True)
+        reader.start()
+        writer.start()
+
+        # The worker processes are spawned (rather than forked from this process,
+        # whose reader and writer threads may hold locks)
+        mp_context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=mp_context) as executor:
+            while True:
+                item = get(read_queue)
+                if item is end_of_data:
+                    break
+                future = executor.submit(
+                    parse_pbf_chunk, *item, parse_raw_feat=parse_raw_feat,
+                    transform_geom=transform_geom,
+                    transform_other_tags=transform_other_tags, **kwargs)
+                # This waits while as many chunks as the queue holds are not written
+                if not put(write_queue, future):
+                    break
+
+            put(write_queue, end_of_data)
+            writer.join()
+
+            stop_event.set()  # In case the reader is still waiting
+            reader.join()
+
+        if errors:
+            raise errors[0]
+
+        if verbose:
+            for layer_name, feature_count in feature_counts.items():
+                print("{}: {} features.".format(layer_name, feature_count))
+
+    finally:  # The sinks are closed even if the pipeline fails
+        stop_event.set()
+        results = [sink.close() for sink in sinks]
+
+    return results
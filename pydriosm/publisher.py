@@ -0,0 +1,452 @@
+"""
+Publishing parsed `OSM <https://www.openstreetmap.org/>`_ data in shared memory,
+so that many processes (e.g. workers of a web server) can read one copy of the data.
+"""
+
+import pickle
+import sys
+import weakref
+
+import numpy as np
+import pandas as pd
+import rapidjson
+
+
+class OSMDataPublisher:
+    """
+    A class representation of a publisher of parsed OSM data in shared memory.
+
+    All layers of the data are packed into one block of shared memory
+    (see `multiprocessing.shared_memory`_) together with a manifest of their layout,
+    so that any process knowing the name of the block can attach to it by
+    :py:class:`OSMDataSubscriber<pydriosm.publisher.OSMDataSubscriber>`.
+    Columns of fixed-size values (e.g. IDs and bounds) are stored as they are in memory,
+    so that they are read without copying; and the other columns are stored
+    as concatenated bytes with offsets, i.e. geometric objects as WKB, strings as UTF-8,
+    and coordinates and dictionaries as JSON.
+
+    The block is released when :py:meth:`unpublish()
+    <pydriosm.publisher.OSMDataPublisher.unpublish>` is called, when the publisher is
+    used as a context manager and the context exits, or, at the latest, when the
+    publisher is garbage-collected or its process exits.
+
+    .. _`multiprocessing.shared_memory`:
+        https://docs.python.org/3/library/multiprocessing.shared_memory.html
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`
+    :type osm_data: dict
+    :param name: name of the block of shared memory; if ``None`` (default),
+        a unique name is generated
+    :type name: str or None
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+
+    **Example**::
+
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.publisher import OSMDataPublisher, OSMDataSubscriber
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> rutland_pbf = geofabrik_reader.read_osm_pbf(
+        ...     'Rutland', data_dir="tests", parse_raw_feat=True, transform_geom=True,
+        ...     download_confirmation_required=False)
+
+        >>> publisher = OSMDataPublisher(rutland_pbf, name='rutland-pbf')
+
+        >>> # In another process
+        >>> subscriber = OSMDataSubscriber('rutland-pbf')
+
+        >>> print(subscriber.LayerNames)
+        ['points', 'lines', 'multilinestrings', 'multipolygons', 'other_relations']
+
+        >>> rutland_points = subscriber.get_layer('points')
+
+        >>> del rutland_points
+        >>> subscriber.close()
+
+        >>> # In the publishing process
+        >>> publisher.unpublish()
+    """
+
+    #: Alignment (in bytes) of the buffers in the shared memory.
+    ALIGNMENT = 64
+
+    def __init__(self, osm_data, name=None, verbose=False):
+        """
+        Constructor method.
+        """
+
+        from multiprocessing import shared_memory
+
+        buffers, manifest, size = [], {'layers': {}}, 0
+
+        def add_buffer(data):
+            # Reserve an aligned position in the shared memory for a buffer
+            nonlocal size
+            position = -(-size // self.ALIGNMENT) * self.ALIGNMENT
+            buffers.append((position, data))
+            size = position + len(data)
+            return position, len(data)
+
+        masked_arrays = (pd.arrays.IntegerArray, pd.arrays.FloatingArray,
+                         pd.arrays.BooleanArray)
+
+        def add_fixed(array):
+            array = np.ascontiguousarray(array)
+            position, _ = add_buffer(array.view(np.uint8).reshape(-1))
+            return {'encoding': 'fixed', 'dtype': array.dtype.str, 'position': position}
+
+        def add_column(values):
+            # Lay out a column (or an index) and return its specification
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufcmM':
+                return add_fixed(values.to_numpy())
+
+            if isinstance(values.array, masked_arrays):  # e.g. of the dtype 'Int64'
+                spec = add_fixed(values.array.to_numpy(
+                    dtype=values.dtype.numpy_dtype, na_value=values.dtype.type(0)))
+                spec.update({'encoding': 'masked', 'pandas_dtype': values.dtype.name,
+                             'nulls_position': add_buffer(
+                                 values.isna().to_numpy(dtype=bool).view(np.uint8))[0]})
+                return spec
+
+            if isinstance(values.dtype, pd.CategoricalDtype):  # By codes and categories
+                categories = values.cat.categories
+                return {'encoding': 'category', 'codes': add_fixed(values.cat.codes),
+                        'categories': add_column(categories.to_series()),
+                        'categories_length': len(categories),
+                        'ordered': values.cat.ordered}
+
+            import shapely
+
+            objects = np.asarray(values, dtype=object)
+            is_null = pd.isnull(values).to_numpy(dtype=bool)
+            first = next((x for x in objects[~is_null]), None)
+
+            if isinstance(first, shapely.Geometry):
+                encoding = 'wkb'
+                encoded = shapely.to_wkb(np.where(is_null, None, objects))
+            elif isinstance(first, (list, tuple, dict)):
+                encoding = 'json'
+                encoded = [None if n else rapidjson.dumps(x).encode('utf-8')
+                           for x, n in zip(objects, is_null)]
+            else:
+                encoding = 'str'
+                encoded = [None if n else str(x).encode('utf-8')
+                           for x, n in zip(objects, is_null)]
+
+            lengths = np.fromiter((0 if x is None else len(x) for x in encoded),
+                                  dtype=np.int64, count=len(encoded))
+            offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+            data_position, _ = add_buffer(b''.join(x for x in encoded if x is not None))
+            offsets_position, _ = add_buffer(offsets.view(np.uint8))
+            nulls_position, _ = add_buffer(is_null.view(np.uint8))
+
+            return {'encoding': encoding, 'position': data_position,
+                    'offsets_position': offsets_position,
+                    'nulls_position': nulls_position}
+
+        for layer_name, layer_data in osm_data.items():
+            print("Publishing \"{}\"".format(layer_name), end=" ... ") if verbose else ""
+
+            layer_spec = {
+                'length': len(layer_data),
+                'columns': [(col, add_column(layer_data[col]))
+                            for col in layer_data.columns],
+                'index': None if isinstance(layer_data.index, pd.RangeIndex)
+                else add_column(layer_data.index.to_series()),
+                'crs': None}
+
+            if hasattr(layer_data, 'geometry') and hasattr(layer_data, 'crs'):
+                layer_spec['crs'] = None if layer_data.crs is None \
+                    else layer_data.crs.to_wkt()
+                layer_spec['geometry'] = layer_data.geometry.name
+
+            manifest['layers'][layer_name] = layer_spec
+
+            print("Done. ") if verbose else ""
+
+        manifest_bytes = pickle.dumps(manifest)
+        header_size = -(-(8 + len(manifest_bytes)) // self.ALIGNMENT) * self.ALIGNMENT
+
+        self.SharedMemory = shared_memory.SharedMemory(
+            name=name, create=True, size=max(header_size + size, 1))
+        self.Name = self.SharedMemory.name
+        self.Size = self.SharedMemory.size
+        self.LayerNames = list(manifest['layers'].keys())
+
+        buf = self.SharedMemory.buf
+        buf[:8] = np.int64(header_size).tobytes()
+        buf[8:8 + len(manifest_bytes)] = manifest_bytes
+        for position, data in buffers:
+            buf[header_size + position:header_size + position + len(data)] = data
+        del buf
+
+        self.Finalizer = weakref.finalize(self, self.release_shared_memory,
+                                          self.SharedMemory)
+
+    @staticmethod
+    def release_shared_memory(shm):
+        """
+        Close and unlink a block of shared memory.
+
+        :param shm: a block of shared memory
+        :type shm: multiprocessing.shared_memory.SharedMemory
+        """
+
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:  # Already unlinked
+            pass
+
+    def unpublish(self):
+        """
+        Release the shared memory of the published data.
+
+        Subscribers that are attached already can still read the data
+        until they are closed; but no more subscribers can attach.
+        """
+
+        self.Finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unpublish()
+
+
+class OSMDataSubscriber:
+    """
+    A class representation of a (read-only) subscriber to OSM data published by
+    :py:class:`OSMDataPublisher<pydriosm.publisher.OSMDataPublisher>`.
+
+    :param name: name of the block of shared memory of the published data
+    :type name: str
+
+    See the example for :py:class:`OSMDataPublisher
+    <pydriosm.publisher.OSMDataPublisher>`.
+    """
+
+    def __init__(self, name):
+        """
+        Constructor method.
+        """
+
+        from multiprocessing import shared_memory
+
+        if sys.version_info >= (3, 13):
+            self.SharedMemory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            from multiprocessing import resource_tracker
+
+            # Not to let the resource tracker unlink the memory when this process exits
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                self.SharedMemory = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+        self.Name = name
+
+        buf = self.SharedMemory.buf
+        self.HeaderSize = int(np.frombuffer(buf, dtype=np.int64, count=1)[0])
+        self.Manifest = pickle.loads(buf[8:self.HeaderSize])
+        del buf
+
+        self.LayerNames = list(self.Manifest['layers'].keys())
+
+        # Geometric objects decoded from WKB (only once), by layer and column
+        self.Geometries = {}
+
+    def get_buffer(self, position, dtype, count):
+        # A read-only array viewing a buffer in the shared memory
+        array = np.frombuffer(self.SharedMemory.buf, dtype=dtype, count=count,
+                              offset=self.HeaderSize + position)
+        array.flags.writeable = False
+
+        return array
+
+    def get_encoded(self, spec, length):
+        # Read-only views of the data, offsets and nulls of a column of encoded values
+        offsets = self.get_buffer(spec['offsets_position'], np.int64, length + 1)
+        is_null = self.get_buffer(spec['nulls_position'], np.bool_, length)
+        data = self.get_buffer(spec['position'], np.uint8, int(offsets[-1]))
+
+        return data, offsets, is_null
+
+    def read_column(self, spec, length):
+        # Read a column (or an index) by its specification
+        if spec['encoding'] == 'fixed':
+            return self.get_buffer(spec['position'], np.dtype(spec['dtype']), length)
+
+        if spec['encoding'] == 'masked':  # Values and nulls are both views
+            values = self.get_buffer(spec['position'], np.dtype(spec['dtype']), length)
+            is_null = self.get_buffer(spec['nulls_position'], np.bool_, length)
+            dtype = pd.api.types.pandas_dtype(spec['pandas_dtype'])
+            return dtype.construct_array_type()(values, is_null)
+
+        if spec['encoding'] == 'category':  # Codes are a view
+            categories = self.read_column(spec['categories'], spec['categories_length'])
+            return pd.Categorical.from_codes(self.read_column(spec['codes'], length),
+                                             categories=categories,
+                                             ordered=spec['ordered'])
+
+        data, offsets, is_null = self.get_encoded(spec, length)
+        data = data.tobytes()
+
+        encoded = [None if n else data[i:j]
+                   for i, j, n in zip(offsets[:-1], offsets[1:], is_null)]
+
+        if spec['encoding'] == 'wkb':
+            import shapely
+
+            return shapely.from_wkb(np.array(encoded, dtype=object))
+
+        decode = rapidjson.loads if spec['encoding'] == 'json' else bytes.decode
+        values = np.empty(length, dtype=object)
+        values[:] = [None if x is None else decode(x) for x in encoded]
+
+        return values
+
+    def get_column(self, layer_name, column, spec, length):
+        # Read a column of a layer, decoding the geometric objects at most once
+        if spec['encoding'] != 'wkb':
+            return self.read_column(spec, length)
+
+        if (layer_name, column) not in self.Geometries:
+            self.Geometries[(layer_name, column)] = self.read_column(spec, length)
+
+        return self.Geometries[(layer_name, column)]
+
+    def get_wkb(self, layer_name, column, i=None):
+        """
+        Get the encoded (WKB) geometric objects of a column of a layer without decoding.
+
+        :param layer_name: name of a layer, e.g. ``'points'``
+        :type layer_name: str
+        :param column: name of a column of geometric objects of the layer
+        :type column: str
+        :param i: position of a feature in the layer; if ``None`` (default), all features
+        :type i: int or None
+        :return: WKB of the ``i``-th feature (or ``None`` if it has no geometry);
+            or, when ``i=None``, read-only views of the shared memory of
+            the concatenated WKB, the offsets (``len + 1``) and the nulls of the features,
+            where the WKB of the ``i``-th feature is ``data[offsets[i]:offsets[i + 1]]``
+        :rtype: bytes or None or tuple
+
+        **Example**::
+
+            >>> import shapely
+            >>> from pydriosm.publisher import OSMDataSubscriber
+
+            >>> # The data published in the example for OSMDataPublisher
+            >>> subscriber = OSMDataSubscriber('rutland-pbf')
+
+            >>> point = shapely.from_wkb(subscriber.get_wkb('points', 'coordinates', 0))
+            >>> print(point)
+            POINT (-0.5134241 52.6555853)
+
+            >>> subscriber.close()
+        """
+
+        layer_spec = self.Manifest['layers'][layer_name]
+
+        spec = dict(layer_spec['columns'])[column]
+        assert spec['encoding'] == 'wkb', \
+            "The column \"{}\" is not of geometric objects.".format(column)
+
+        data, offsets, is_null = self.get_encoded(spec, layer_spec['length'])
+
+        if i is None:
+            return data, offsets, is_null
+
+        return None if is_null[i] else data[offsets[i]:offsets[i + 1]].tobytes()
+
+    def get_array(self, layer_name, column):
+        """
+        Get a column of a layer of the published data as an array.
+
+        Columns of fixed-size values are read-only views of the shared memory
+        (i.e. not copied), as are the values and nulls of nullable (e.g. ``'Int64'``)
+        columns and the codes of categorical columns; geometric objects are
+        decoded once (and kept by the subscriber), see also :py:meth:`get_wkb()
+        <pydriosm.publisher.OSMDataSubscriber.get_wkb>`; and the other columns are
+        decoded into new arrays.
+
+        :param layer_name: name of a layer, e.g. ``'points'``
+        :type layer_name: str
+        :param column: name of a column of the layer
+        :type column: str
+        :return: values of the column
+        :rtype: numpy.ndarray or pandas.api.extensions.ExtensionArray
+        """
+
+        layer_spec = self.Manifest['layers'][layer_name]
+
+        spec = dict(layer_spec['columns'])[column]
+
+        return self.get_column(layer_name, column, spec, layer_spec['length'])
+
+    def get_layer(self, layer_name, columns=None):
+        """
+        Get (columns of) a layer of the published data.
+
+        The columns of fixed-size values are read-only views of the shared memory
+        (i.e. not copied); and only the requested columns are decoded,
+        see also :py:meth:`get_array()<pydriosm.publisher.OSMDataSubscriber.get_array>`.
+
+        :param layer_name: name of a layer, e.g. ``'points'``
+        :type layer_name: str
+        :param columns: names of the columns to be read; if ``None`` (default),
+            all columns
+        :type columns: list or None
+        :return: data of the layer
+        :rtype: pandas.DataFrame or geopandas.GeoDataFrame
+        """
+
+        layer_spec = self.Manifest['layers'][layer_name]
+        length = layer_spec['length']
+
+        column_data = {col: self.get_column(layer_name, col, spec, length)
+                       for col, spec in layer_spec['columns']
+                       if columns is None or col in columns}
+
+        index = None if layer_spec['index'] is None \
+            else self.read_column(layer_spec['index'], length)
+
+        layer_data = pd.DataFrame(column_data, index=index, copy=False)
+
+        if 'geometry' in layer_spec and layer_spec['geometry'] in layer_data.columns:
+            import geopandas as gpd
+
+            layer_data = gpd.GeoDataFrame(layer_data, geometry=layer_spec['geometry'],
+                                          crs=layer_spec['crs'], copy=False)
+
+        return layer_data
+
+    def close(self):
+        """
+        Detach from the shared memory.
+
+        All the arrays and data frames viewing the shared memory
+        (see :py:meth:`get_layer()<pydriosm.publisher.OSMDataSubscriber.get_layer>`)
+        must be deleted before this is called.
+        """
+
+        self.Geometries.clear()
+        self.SharedMemory.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,281 @@
+"""
+Rasterizing layers of `OSM <https://www.openstreetmap.org/>`_ data onto numeric grids,
+e.g. as features of cells for machine learning.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .reader import get_layer_geometries, reproject_coordinates
+
+
+def get_grid_shape(bounds, cell_size):
+    """
+    Get the shape of a grid of square cells covering a bounding box.
+
+    The cells are laid out from the north-west corner of the bounding box, i.e.
+    the cell in row ``i`` and column ``j`` covers x from ``minx + j * cell_size`` to
+    ``minx + (j + 1) * cell_size`` and y from ``maxy - (i + 1) * cell_size`` to
+    ``maxy - i * cell_size``; and the last row and column may extend beyond the box.
+
+    :param bounds: bounding box of the grid, i.e. (minx, miny, maxx, maxy)
+    :type bounds: tuple or list
+    :param cell_size: width (and height) of a cell, in the units of the coordinates
+    :type cell_size: int or float
+    :return: numbers of rows and columns of the grid
+    :rtype: tuple
+
+    **Example**::
+
+        >>> from pydriosm.rasterizer import get_grid_shape
+
+        >>> print(get_grid_shape((480000, 295000, 500500, 320000), cell_size=100))
+        (250, 205)
+    """
+
+    minx, miny, maxx, maxy = bounds
+    assert maxx > minx and maxy > miny, "`bounds` must be (minx, miny, maxx, maxy)."
+
+    n_rows = max(int(np.ceil((maxy - miny) / cell_size)), 1)
+    n_cols = max(int(np.ceil((maxx - minx) / cell_size)), 1)
+
+    return n_rows, n_cols
+
+
+def rasterize_layers(osm_data, rasters, bounds, cell_size, crs=None, chunk_size=1000000,
+                     verbose=False):
+    """
+    Rasterize (i.e. burn) layers of parsed OSM data onto numeric grids.
+
+    Each raster is specified by a tuple ``(layer_name, statistic)``, or
+    ``(layer_name, statistic, column)``, or
+    ``(layer_name, statistic, column, categories)``, where the statistic of a cell
+    is one of:
+
+    - ``'count'``: the number of features intersecting the cell;
+    - ``'coverage'``: the fraction of the cell covered by (polygon) features
+      (summed over the features and capped at ``1``);
+    - ``'length'``: the total length of (line) features, or of the boundaries of
+      (polygon) features, within the cell; or
+    - ``'value'``: the value of a ``column`` of the (last) feature that covers
+      the centre of the cell (polygons), or that intersects the cell (points and lines);
+      where the values are not numbers (e.g. ``'fclass'``), they are coded by their
+      positions in ``categories`` (and ``-1`` for no or other values).
+
+    The features are paired with the cells that their bounding boxes cover in a
+    vectorized way, and the pairs are processed in batches of at most ``chunk_size``
+    by vectorized (and prepared) `shapely`_ operations, so that the memory in use is
+    bounded by ``chunk_size`` (and the grids), however large the layers or features are.
+    All the rasters of a layer are made in a single pass over it.
+
+    .. _`shapely`: https://shapely.readthedocs.io/
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>` or
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``);
+        or an iterable of chunks of such data, each being a dictionary of layers or
+        a tuple of a layer name and a chunk of its data
+    :type osm_data: dict or typing.Iterable
+    :param rasters: specifications of the rasters, keyed by their names
+    :type rasters: dict
+    :param bounds: bounding box of the grids, i.e. (minx, miny, maxx, maxy),
+        in the coordinates of ``crs``; see also :py:func:`get_grid_shape()
+        <pydriosm.rasterizer.get_grid_shape>` for the layout of the cells
+    :type bounds: tuple or list
+    :param cell_size: width (and height) of a cell, in the units of ``crs``
+    :type cell_size: int or float
+    :param crs: CRS of the grids, e.g. ``'EPSG:27700'``, to which the layers are
+        reprojected from their own CRS (or ``'EPSG:4326'`` if they have none);
+        if ``None`` (default), the CRS of the layers
+    :type crs: str or int or dict or pyproj.CRS or None
+    :param chunk_size: maximum number of pairs of features and cells processed at
+        a time, defaults to ``1000000``
+    :type chunk_size: int
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :return: grids of the rasters, keyed by their names; the grids of counts are
+        integers, those of categories are integer codes, and the others are floats
+        (with ``NaN`` where there is no value)
+    :rtype: dict
+
+    **Example**::
+
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.rasterizer import rasterize_layers
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> rutland_shp = geofabrik_reader.read_shp_zip(
+        ...     'Rutland', layer_names=['buildings', 'roads', 'landuse'],
+        ...     data_dir="tests", download_confirmation_required=False)
+
+        >>> rasters = {
+        ...     'building_coverage': ('buildings', 'coverage'),
+        ...     'road_density': ('roads', 'length'),
+        ...     'landuse_class': ('landuse', 'value', 'fclass',
+        ...                       ['farmland', 'forest', 'grass', 'residential']),
+        ... }
+
+        >>> rutland_grids = rasterize_layers(
+        ...     rutland_shp, rasters, bounds=(480000, 295000, 500500, 320000),
+        ...     cell_size=100, crs='EPSG:27700')
+
+        >>> print(rutland_grids['building_coverage'].shape)
+        (250, 205)
+    """
+
+    import pyproj
+    import shapely
+
+    minx, _, _, maxy = bounds
+    n_rows, n_cols = get_grid_shape(bounds, cell_size)
+    cell_area = float(cell_size) ** 2
+
+    statistics = ('count', 'coverage', 'length', 'value')
+
+    specs, grids = {}, {}
+    for raster_name, spec in rasters.items():
+        layer_name, statistic, column, categories = (tuple(spec) + (None, None))[:4]
+        assert statistic in statistics, \
+            "The statistic of \"{}\" must be one of {}.".format(raster_name, statistics)
+        assert statistic != 'value' or column is not None, \
+            "The column of the values of \"{}\" must be specified.".format(raster_name)
+
+        specs[raster_name] = layer_name, statistic, column, categories
+
+        if statistic == 'count':
+            grids[raster_name] = np.zeros((n_rows, n_cols), dtype=np.int64)
+        elif statistic == 'value' and categories is not None:
+            grids[raster_name] = np.full((n_rows, n_cols), -1, dtype=np.int32)
+        elif statistic == 'value':
+            grids[raster_name] = np.full((n_rows, n_cols), np.nan)
+        else:
+            grids[raster_name] = np.zeros((n_rows, n_cols))
+
+    layer_rasters = {}
+    for raster_name, spec in specs.items():
+        layer_rasters.setdefault(spec[0], []).append(raster_name)
+
+    def accumulate(grid, cells, weights):
+        # Add up the weights of (repeated) cells without a full-size temporary array
+        unique_cells, inverse = np.unique(cells, return_inverse=True)
+        grid.ravel()[unique_cells] += np.bincount(inverse, weights=weights)
+
+    def rasterize_chunk(layer_name, layer_data):
+        geoms = get_layer_geometries(layer_data, geo_typ=layer_name)
+
+        if crs is not None:
+            source_crs = getattr(layer_data, 'crs', None) or 'EPSG:4326'
+            if not pyproj.CRS.from_user_input(source_crs).equals(crs):
+                geoms = reproject_coordinates(geoms, crs, source_crs=source_crs)
+                geoms = geoms.to_numpy()
+
+        geoms = np.asarray(geoms, dtype=object)
+        shapely.prepare(geoms)
+        dims = shapely.get_dimensions(geoms)
+
+        # Ranges of the cells covered by the bounding boxes of the features
+        bbox = shapely.bounds(geoms).reshape(-1, 4)
+        located = ~np.isnan(bbox).any(axis=1)
+        bbox[~located] = [minx, maxy, minx, maxy]
+        col_lo = np.floor((bbox[:, 0] - minx) / cell_size)
+        col_hi = np.floor((bbox[:, 2] - minx) / cell_size)
+        row_lo = np.floor((maxy - bbox[:, 3]) / cell_size)
+        row_hi = np.floor((maxy - bbox[:, 1]) / cell_size)
+        located &= (col_hi >= 0) & (col_lo < n_cols) & (row_hi >= 0) & (row_lo < n_rows)
+
+        col_lo, col_hi = np.clip(col_lo, 0, n_cols - 1), np.clip(col_hi, 0, n_cols - 1)
+        row_lo, row_hi = np.clip(row_lo, 0, n_rows - 1), np.clip(row_hi, 0, n_rows - 1)
+        widths = (col_hi - col_lo + 1).astype(np.int64)
+        counts = np.where(located, widths * (row_hi - row_lo + 1).astype(np.int64), 0)
+        ends = np.cumsum(counts)
+
+        raster_values = {}
+        for raster_name in layer_rasters[layer_name]:
+            _, statistic, column, categories = specs[raster_name]
+            if statistic == 'value':
+                values = layer_data[column]
+                raster_values[raster_name] = np.asarray(
+                    pd.Categorical(values, categories=categories).codes, dtype=np.int32) \
+                    if categories is not None else pd.to_numeric(values).to_numpy(float)
+
+        needs = {specs[x][1] for x in layer_rasters[layer_name]}
+        boundaries = np.where(dims == 2, shapely.boundary(geoms), geoms) \
+            if 'length' in needs else None
+
+        # Pairs of features and cells, in batches of (at most) chunk_size
+        for start in range(0, int(ends[-1]) if len(ends) else 0, chunk_size):
+            k = np.arange(start, min(start + chunk_size, int(ends[-1])))
+            pos = np.searchsorted(ends, k, side='right')
+            k_ = k - (ends[pos] - counts[pos])
+            rows = row_lo[pos].astype(np.int64) + k_ // widths[pos]
+            cols = col_lo[pos].astype(np.int64) + k_ % widths[pos]
+            cells = rows * n_cols + cols
+
+            cell_x, cell_y = minx + cols * cell_size, maxy - rows * cell_size
+            boxes = shapely.box(cell_x, cell_y - cell_size, cell_x + cell_size, cell_y)
+            pair_geoms, pair_dims = geoms[pos], dims[pos]
+
+            # Points fall in the cells of their bounding boxes
+            hit = pair_dims == 0
+            hit[~hit] = shapely.intersects(pair_geoms[~hit], boxes[~hit])
+
+            if 'coverage' in needs:
+                is_poly = hit & (pair_dims == 2)
+                full = np.zeros(len(k), dtype=bool)
+                full[is_poly] = shapely.contains_properly(pair_geoms[is_poly],
+                                                          boxes[is_poly])
+                partial = is_poly & ~full
+                areas = np.where(full, cell_area, 0.0)
+                areas[partial] = shapely.area(
+                    shapely.intersection(pair_geoms[partial], boxes[partial]))
+
+            if 'length' in needs:
+                is_line = hit & (pair_dims > 0)
+                lengths = np.zeros(len(k))
+                lengths[is_line] = shapely.length(
+                    shapely.intersection(boundaries[pos[is_line]], boxes[is_line]))
+
+            if 'value' in needs:
+                is_poly = hit & (pair_dims == 2)
+                covers = hit & (pair_dims < 2)
+                covers[is_poly] = shapely.intersects_xy(
+                    pair_geoms[is_poly], cell_x[is_poly] + cell_size / 2,
+                    cell_y[is_poly] - cell_size / 2)
+
+            for raster_name in layer_rasters[layer_name]:
+                grid, statistic = grids[raster_name], specs[raster_name][1]
+
+                if statistic == 'count':
+                    accumulate(grid, cells[hit], None)
+                elif statistic == 'coverage':
+                    accumulate(grid, cells[is_poly], areas[is_poly] / cell_area)
+                elif statistic == 'length':
+                    accumulate(grid, cells[is_line], lengths[is_line])
+                else:
+                    values = raster_values[raster_name][pos]
+                    valid = covers & (values >= 0 if values.dtype.kind == 'i'
+                                      else ~np.isnan(values))
+                    # The later features (in the order of the pairs) overwrite
+                    grid.ravel()[cells[valid]] = values[valid]
+
+    chunks = [osm_data] if isinstance(osm_data, dict) else osm_data
+    for chunk in chunks:
+        for layer_name_, layer_data_ in (
+                chunk.items() if isinstance(chunk, dict) else [chunk]):
+            if layer_name_ not in layer_rasters or len(layer_data_) == 0:
+                continue
+
+            print("Rasterizing \"{}\"".format(layer_name_),
+                  end=" ... ") if verbose else ""
+            rasterize_chunk(layer_name_, layer_data_)
+            print("Done. ") if verbose else ""
+
+    for raster_name, (_, statistic, _, _) in specs.items():
+        if statistic == 'coverage':
+            np.minimum(grids[raster_name], 1.0, out=grids[raster_name])
+
+    return grids
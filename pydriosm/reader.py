@@ -5,8 +5,12 @@ Reading `OSM <https://www.openstreetmap.org/>`_ data extracts.
 import collections
 import gc
 import glob
+import gzip
+import hashlib
+import heapq
 import itertools
 import lzma
+import xml.etree.ElementTree as ElementTree
 import zipfile
 
 import rapidjson
@@ -62,7 +66,7 @@ def get_osm_pbf_layer_names(path_to_osm_pbf):
         import ogr
 
         # Start parsing the '.osm.pbf' file
-        osm_pbf = ogr.Open(path_to_osm_pbf)
+        osm_pbf = ogr.Open(get_vsi_path(path_to_osm_pbf))
 
         # Find out the available layers in the file
         layer_count, layer_names = osm_pbf.GetLayerCount(), []
@@ -80,7 +84,1018 @@ def get_osm_pbf_layer_names(path_to_osm_pbf):
         print("Failed to get layer names of \"{}\". {}.".format(path_to_osm_pbf, e))
 
 
-def parse_osm_pbf_layer(pbf_layer_data, geo_typ, transform_geom, transform_other_tags):
+def parse_other_tags(other_tags):
+    """
+    Transform a ``'other_tags'`` record into a dictionary.
+
+    :param other_tags: data of a single record in the ``'other_tags'`` feature
+    :type other_tags: str or None
+    :return: parsed data of the ``'other_tags'`` record
+    :rtype: dict or None
+
+    **Example**::
+
+        >>> from pydriosm.reader import parse_other_tags
+
+        >>> other_tags_dict = parse_other_tags('"odbl"=>"clean","maxspeed"=>"30 mph"')
+
+        >>> print(other_tags_dict)
+        {'odbl': 'clean', 'maxspeed': '30 mph'}
+    """
+
+    if other_tags:
+        raw_other_tags = (re.sub('^"|"$', '', each_tag)
+                          for each_tag in re.split('(?<="),(?=")', other_tags))
+        other_tags_ = {
+            k: v.replace('<br>', ' ') for k, v in
+            (re.split('"=>"?', each_tag)
+             for each_tag in filter(None, raw_other_tags))}
+
+    else:  # e.g. other_tags_x is None
+        other_tags_ = other_tags
+
+    return other_tags_
+
+
+def get_tag_values(layer_data, key):
+    """
+    Get values of a tag from a layer of parsed OSM data.
+
+    The tag is looked up in the columns of the data first, and then in
+    ``'other_tags'`` (either the raw strings, which are matched by a vectorized
+    regular expression rather than parsed row by row, or dictionaries) or
+    ``'properties'`` (e.g. of the data parsed from a .geojson.xz file).
+
+    :param layer_data: parsed data of a layer of OSM data
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param key: key of the tag, e.g. ``'maxspeed'``
+    :type key: str
+    :return: values of the tag (``None`` where the tag is unavailable)
+    :rtype: pandas.Series
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import get_tag_values
+
+        >>> lines = pd.DataFrame({'id': [1, 2],
+        ...                       'other_tags': ['"maxspeed"=>"30 mph"', None]})
+
+        >>> print(get_tag_values(lines, 'maxspeed'))
+        0    30 mph
+        1      None
+        Name: maxspeed, dtype: object
+    """
+
+    if key in layer_data.columns:
+        tag_values = layer_data[key].astype(object)
+
+    else:
+        tags_col = 'other_tags' if 'other_tags' in layer_data.columns \
+            else ('properties' if 'properties' in layer_data.columns else None)
+
+        if tags_col is None:
+            tag_values = pd.Series(None, index=layer_data.index, dtype=object)
+
+        else:
+            tags = layer_data[tags_col]
+
+            if any(isinstance(x, dict) for x in tags):
+                tag_values = tags.map(
+                    lambda x: x.get(key) if isinstance(x, dict) else None)
+            else:
+                pat = r'"{}"=>"((?:[^"\\]|\\.)*)"'.format(re.escape(key))
+                tag_values = tags.astype(object).where(tags.notnull(), '').astype(
+                    str).str.extract(pat, expand=False)
+
+            tag_values = tag_values.astype(object)
+
+    tag_values = tag_values.where(tag_values.notnull(), None)
+    tag_values.name = key
+
+    return tag_values
+
+
+def get_default_tag_schema():
+    """
+    Get the default schema of typed tags, i.e. tags with numeric values.
+
+    Each key of the schema is mapped to a dtype (``'float'``, ``'int'``, ``'bool'`` or
+    ``'str'``), or to a tuple of a dtype and a unit normaliser, which is either
+    ``'speed'`` (to km/h), ``'length'`` (to metres) or a function that transforms
+    a series of strings into a series of numbers.
+
+    :return: default schema of typed tags
+    :rtype: dict
+
+    **Example**::
+
+        >>> from pydriosm.reader import get_default_tag_schema
+
+        >>> default_tag_schema = get_default_tag_schema()
+
+        >>> print(default_tag_schema['maxspeed'])
+        ('float', 'speed')
+    """
+
+    tag_schema = {
+        'maxspeed': ('float', 'speed'),
+        'lanes': 'int',
+        'width': ('float', 'length'),
+        'height': ('float', 'length'),
+        'building:levels': 'float',
+        'population': 'int',
+    }
+
+    return tag_schema
+
+
+def extract_typed_tags(layer_data, tag_schema=None):
+    """
+    Extract tags from a layer of parsed OSM data into typed columns.
+
+    The values of each tag (see :py:func:`get_tag_values()
+    <pydriosm.reader.get_tag_values>`) are parsed and normalised in one vectorized pass
+    over the layer, e.g. ``'30 mph'`` of ``'maxspeed'`` becomes ``48.28032`` (km/h)
+    and ``'10\'6"'`` of ``'height'`` becomes ``3.2004`` (metres); values that cannot be
+    parsed (e.g. ``'none'`` or ``'signals'``), as well as the missing ones, are nulls.
+
+    :param layer_data: parsed data of a layer of OSM data, e.g. of a .pbf file,
+        a .geojson.xz file or fetched from a database
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param tag_schema: schema of typed tags, mapping each key to a dtype or to a tuple of
+        a dtype and a unit normaliser; if ``None`` (default), use the default schema,
+        see also :py:func:`get_default_tag_schema()
+        <pydriosm.reader.get_default_tag_schema>`
+    :type tag_schema: dict or None
+    :return: the data with a column (named after the key) for each tag of the schema;
+        ``'int'`` and ``'bool'`` tags are of nullable dtypes ``Int64`` and ``boolean``
+    :rtype: pandas.DataFrame or geopandas.GeoDataFrame
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import extract_typed_tags
+
+        >>> lines = pd.DataFrame({
+        ...     'id': [1, 2, 3],
+        ...     'other_tags': ['"maxspeed"=>"30 mph","lanes"=>"2"',
+        ...                    '"maxspeed"=>"50","lanes"=>"2;3"',
+        ...                    '"maxspeed"=>"signals"']})
+
+        >>> lines = extract_typed_tags(lines, {'maxspeed': ('float', 'speed'),
+        ...                                    'lanes': 'int'})
+
+        >>> print(lines[['id', 'maxspeed', 'lanes']])
+           id  maxspeed  lanes
+        0   1  48.28032      2
+        1   2  50.00000      2
+        2   3       NaN   <NA>
+    """
+
+    if tag_schema is None:
+        tag_schema = get_default_tag_schema()
+
+    unit_factors = {
+        'speed': {'': 1.0, 'km/h': 1.0, 'kmh': 1.0, 'kph': 1.0, 'mph': 1.609344,
+                  'knots': 1.852},
+        'length': {'': 1.0, 'm': 1.0, 'km': 1000.0, 'cm': 0.01, 'mm': 0.001,
+                   'mi': 1609.344, 'nmi': 1852.0, 'ft': 0.3048, "'": 0.3048,
+                   'in': 0.0254, '"': 0.0254},
+    }
+
+    layer_data_ = layer_data.copy()
+
+    for key, spec in tag_schema.items():
+        dtype, unit = (spec, None) if isinstance(spec, str) else spec
+
+        tag_values = get_tag_values(layer_data, key)
+        values = tag_values.where(tag_values.notnull(), '').astype(str).str.strip()
+
+        if dtype == 'str':
+            typed_values = tag_values
+
+        elif dtype == 'bool':
+            typed_values = values.str.lower().map(
+                {'yes': True, 'true': True, '1': True,
+                 'no': False, 'false': False, '0': False}).astype('boolean')
+
+        elif callable(unit):
+            typed_values = pd.to_numeric(unit(values), errors='coerce')
+
+        else:
+            # The leading number and its unit, e.g. '30 mph' (or the first of '2;3')
+            parts = values.str.extract(r'^(-?\d+(?:\.\d+)?)\s*([^\d\s;]*)')
+            typed_values = pd.to_numeric(parts[0], errors='coerce')
+
+            if unit is None:
+                typed_values = typed_values.where(parts[1] == '')
+            else:
+                typed_values = typed_values * parts[1].str.lower().map(unit_factors[unit])
+
+            if unit == 'length':  # e.g. 10'6"
+                feet_inches = values.str.extract(
+                    r"^(\d+(?:\.\d+)?)'\s*(\d+(?:\.\d+)?)\"$")
+                typed_values = typed_values.mask(
+                    feet_inches[1].notnull(),
+                    feet_inches[0].astype(float) * 0.3048 +
+                    feet_inches[1].astype(float) * 0.0254)
+
+        if dtype == 'int':
+            typed_values = typed_values.where(typed_values % 1 == 0).astype('Int64')
+        elif dtype == 'float':
+            typed_values = typed_values.astype(np.float64)
+
+        layer_data_[key] = typed_values.to_numpy() if dtype == 'float' else typed_values
+
+    return layer_data_
+
+
+def get_layer_geometries(layer_data, geo_typ=None):
+    """
+    Get geometric objects of a layer of parsed OSM data as an array.
+
+    :param layer_data: parsed data of a layer of PBF data, or a layer of shapefile data
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param geo_typ: name of the PBF layer (e.g. ``'points'``), used to tell the type
+        of the geometries when they are stored as coordinates, defaults to ``None``
+    :type geo_typ: str or None
+    :return: `shapely.geometry`_ objects (or ``None`` where there is no geometry)
+    :rtype: numpy.ndarray
+
+    .. _`shapely.geometry`:
+        https://shapely.readthedocs.io/en/latest/manual.html#geometric-objects
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import get_layer_geometries
+
+        >>> points = pd.DataFrame({'id': [488432, 488658],
+        ...                        'coordinates': [[-0.5134241, 52.6555853],
+        ...                                        [-0.5313354, 52.6737716]]})
+
+        >>> print(get_layer_geometries(points, geo_typ='points'))
+        [<POINT (-0.513 52.656)> <POINT (-0.531 52.674)>]
+    """
+
+    import shapely
+    import shapely.geometry
+
+    if 'geometry' in layer_data.columns:
+        geom_col = 'geometry'
+    elif 'coordinates' in layer_data.columns:
+        geom_col = 'coordinates'
+    elif 'geometries' in layer_data.columns:
+        geom_col = 'geometries'
+    else:
+        raise ValueError("No geometry is found in the layer data.")
+
+    geom_data = np.asarray(layer_data[geom_col].values, dtype=object)
+
+    if len(geom_data) == 0 or all(
+            x is None or isinstance(x, shapely.Geometry) for x in geom_data):
+        return geom_data
+
+    if geom_col == 'geometries':
+        geom_type = 'GeometryCollection'
+    elif geo_typ in get_pbf_layer_feat_types_dict():
+        geom_type = get_pbf_layer_feat_types_dict()[geo_typ]
+    else:
+        geom_type = None
+
+    if geom_type == 'Point':
+        geoms = np.full(len(geom_data), None, dtype=object)
+        mask = np.fromiter((x is not None for x in geom_data), dtype=bool,
+                           count=len(geom_data))
+        if mask.any():
+            geoms[mask] = shapely.points(np.array(list(geom_data[mask]), dtype=float))
+
+    else:
+        def make_geometry(geom):
+            if geom is None or isinstance(geom, shapely.Geometry):
+                return geom
+            if geom_type is None:  # e.g. a GeoJSON-like dictionary
+                return shapely.geometry.shape(geom)
+
+            key = 'geometries' if geom_type == 'GeometryCollection' else 'coordinates'
+            try:
+                return shapely.geometry.shape({'type': geom_type, key: geom})
+            except (ValueError, TypeError, IndexError):
+                return None
+
+        geoms = np.array([make_geometry(x) for x in geom_data], dtype=object)
+
+    return geoms
+
+
+def flatten_coordinates(coordinates):
+    """
+    Flatten the (nested lists of) coordinates of a layer of parsed OSM data.
+
+    Each feature is walked down only to its sequences of points, each of which
+    is then converted to an array as a whole, so that no geometric object is built.
+    GeoJSON geometries (e.g. the members of a relation in the column ``'geometries'``
+    of the layer ``'other_relations'``) are walked through their coordinates.
+
+    :param coordinates: coordinates of the features of a layer, e.g. the column
+        ``'coordinates'`` of a layer of parsed PBF data
+    :type coordinates: pandas.Series or list or numpy.ndarray
+    :return: x and y of all the points, and the (positional) index of
+        the feature to which each point belongs
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+
+    **Example**::
+
+        >>> from pydriosm.reader import flatten_coordinates
+
+        >>> coords = [[-0.5134241, 52.6555853], None, [[-0.51, 52.65], [-0.52, 52.66]]]
+
+        >>> xy, feat_idx = flatten_coordinates(coords)
+        >>> print(xy)
+        [[-0.5134241 52.6555853]
+         [-0.51       52.65     ]
+         [-0.52       52.66     ]]
+        >>> print(feat_idx)
+        [0 2 2]
+    """
+
+    sequences, seq_idx = [], []
+
+    nested_types = (list, tuple, np.ndarray)
+
+    def collect(coords, i):
+        if isinstance(coords, dict):  # A GeoJSON geometry
+            for key, sub_coords in coords.items():
+                if key in ('coordinates', 'geometries'):
+                    collect(sub_coords, i)
+        elif coords is None or len(coords) == 0:
+            return
+        elif not isinstance(coords[0], nested_types + (dict,)):  # A single point
+            sequences.append([coords])
+            seq_idx.append(i)
+        elif isinstance(coords[0], nested_types) and len(coords[0]) > 0 and \
+                not isinstance(coords[0][0], nested_types + (dict,)):
+            sequences.append(coords)  # A sequence of points
+            seq_idx.append(i)
+        else:
+            for sub_coords in coords:
+                collect(sub_coords, i)
+
+    for i, coords in enumerate(coordinates):
+        collect(coords, i)
+
+    if not sequences:
+        return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+
+    arrays = [np.asarray(x, dtype=float).reshape(len(x), -1)[:, :2] for x in sequences]
+    xy = np.concatenate(arrays)
+    feat_idx = np.repeat(np.asarray(seq_idx, dtype=np.int64), [len(x) for x in arrays])
+
+    return xy, feat_idx
+
+
+def quadkey_encode(lon, lat, level):
+    """
+    Encode longitudes and latitudes as `quadkeys
+    <https://docs.microsoft.com/en-us/bingmaps/articles/bing-maps-tile-system>`_.
+
+    :param lon: longitudes
+    :type lon: numpy.ndarray
+    :param lat: latitudes
+    :type lat: numpy.ndarray
+    :param level: level of detail (zoom level), i.e. length of the quadkeys
+    :type level: int
+    :return: quadkeys (``None`` where the coordinates are missing)
+    :rtype: numpy.ndarray
+
+    **Example**::
+
+        >>> import numpy as np
+        >>> from pydriosm.reader import quadkey_encode
+
+        >>> print(quadkey_encode(np.array([-0.5134241]), np.array([52.6555853]), 12))
+        ['031311333210']
+    """
+
+    assert 1 <= level <= 30, "`level` must be an integer between 1 and 30."
+
+    lon, lat = np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    valid = ~(np.isnan(lon) | np.isnan(lat))
+
+    lat_ = np.radians(np.clip(np.where(valid, lat, 0), -85.05112878, 85.05112878))
+    n = 2 ** level
+    tile_x = np.clip(np.floor((np.where(valid, lon, 0) + 180.0) / 360.0 * n), 0, n - 1)
+    tile_y = np.clip(
+        np.floor((1.0 - np.log(np.tan(lat_) + 1.0 / np.cos(lat_)) / np.pi) / 2.0 * n),
+        0, n - 1)
+    tile_x, tile_y = tile_x.astype(np.int64), tile_y.astype(np.int64)
+
+    shifts = np.arange(level - 1, -1, -1, dtype=np.int64)
+    digits = ((tile_x[:, None] >> shifts) & 1) + 2 * ((tile_y[:, None] >> shifts) & 1)
+
+    quadkeys = (digits + ord('0')).astype(np.uint8).view(f'S{level}').ravel()
+    quadkeys = quadkeys.astype(str).astype(object)
+    quadkeys[~valid] = None
+
+    return quadkeys
+
+
+def geohash_encode(lon, lat, level):
+    """
+    Encode longitudes and latitudes as
+    `geohashes <https://en.wikipedia.org/wiki/Geohash>`_.
+
+    :param lon: longitudes
+    :type lon: numpy.ndarray
+    :param lat: latitudes
+    :type lat: numpy.ndarray
+    :param level: precision, i.e. length of the geohashes
+    :type level: int
+    :return: geohashes (``None`` where the coordinates are missing)
+    :rtype: numpy.ndarray
+
+    **Example**::
+
+        >>> import numpy as np
+        >>> from pydriosm.reader import geohash_encode
+
+        >>> print(geohash_encode(np.array([-0.5134241]), np.array([52.6555853]), 6))
+        ['gcres3']
+    """
+
+    assert 1 <= level <= 12, "`level` must be an integer between 1 and 12."
+
+    lon, lat = np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    valid = ~(np.isnan(lon) | np.isnan(lat))
+
+    n_bits = 5 * level
+    lon_bits, lat_bits = (n_bits + 1) // 2, n_bits // 2
+
+    lon_int = np.clip(np.floor((np.where(valid, lon, 0) + 180.0) / 360.0 * 2 ** lon_bits),
+                      0, 2 ** lon_bits - 1).astype(np.int64)
+    lat_int = np.clip(np.floor((np.where(valid, lat, 0) + 90.0) / 180.0 * 2 ** lat_bits),
+                      0, 2 ** lat_bits - 1).astype(np.int64)
+
+    # Interleave the bits, starting with a longitude bit
+    bits = np.empty((len(lon), n_bits), dtype=np.int64)
+    bits[:, 0::2] = (lon_int[:, None] >> np.arange(lon_bits - 1, -1, -1)) & 1
+    bits[:, 1::2] = (lat_int[:, None] >> np.arange(lat_bits - 1, -1, -1)) & 1
+
+    char_idx = bits.reshape(len(lon), level, 5) @ np.array([16, 8, 4, 2, 1])
+
+    base32 = np.frombuffer(b'0123456789bcdefghjkmnpqrstuvwxyz', dtype=np.uint8)
+    geohashes = base32[char_idx].view(f'S{level}').ravel().astype(str).astype(object)
+    geohashes[~valid] = None
+
+    return geohashes
+
+
+def add_spatial_keys(layer_data, key_type='quadkey', level=None, geo_typ=None):
+    """
+    Add bounding box columns and a hierarchical grid key to a layer of parsed OSM data.
+
+    The columns ``'minx'``, ``'miny'``, ``'maxx'`` and ``'maxy'`` hold the bounds of
+    each geometry, and the grid key (``'quadkey'`` or ``'geohash'``) is that of
+    the centre of the bounds. All of them are computed in a vectorized way,
+    so that filtering by a bounding box reduces to a range mask over the columns
+    and spatial partitioning reduces to grouping by (a prefix of) the key.
+
+    :param layer_data: parsed data of a layer of PBF data, or a layer of shapefile data
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param key_type: type of the grid key, ``'quadkey'`` (default) or ``'geohash'``
+    :type key_type: str
+    :param level: level of the grid key; if ``None`` (default),
+        ``14`` for quadkeys or ``7`` for geohashes
+    :type level: int or None
+    :param geo_typ: name of the PBF layer (e.g. ``'points'``), defaults to ``None``;
+        see also :py:func:`get_layer_geometries()<pydriosm.reader.get_layer_geometries>`
+    :type geo_typ: str or None
+    :return: a copy of the layer data with the spatial key columns
+    :rtype: pandas.DataFrame or geopandas.GeoDataFrame
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import add_spatial_keys
+
+        >>> points = pd.DataFrame({'id': [488432, 488658],
+        ...                        'coordinates': [[-0.5134241, 52.6555853],
+        ...                                        [-0.5313354, 52.6737716]]})
+
+        >>> points = add_spatial_keys(points, key_type='geohash', level=6,
+        ...                           geo_typ='points')
+
+        >>> print(points[['id', 'minx', 'miny', 'geohash']])
+               id      minx       miny geohash
+        0  488432 -0.513424  52.655585  gcres3
+        1  488658 -0.531335  52.673772  gcreeu
+    """
+
+    import shapely
+
+    assert key_type in ('quadkey', 'geohash'), \
+        "`key_type` must be either 'quadkey' or 'geohash'."
+
+    if level is None:
+        level = 14 if key_type == 'quadkey' else 7
+
+    coordinates = layer_data['coordinates'].values \
+        if 'coordinates' in layer_data.columns else []
+
+    if len(coordinates) > 0 and all(
+            x is None or isinstance(x, (list, tuple, np.ndarray)) for x in coordinates):
+        # Bounds of the flattened coordinate arrays, without building geometric objects
+        xy, feat_idx = flatten_coordinates(coordinates)
+        bounds = np.full((len(coordinates), 4), np.nan)
+        if len(xy) > 0:
+            starts = np.flatnonzero(np.r_[True, feat_idx[1:] != feat_idx[:-1]])
+            for i, (reduce, col) in enumerate(
+                    [(np.fmin, 0), (np.fmin, 1), (np.fmax, 0), (np.fmax, 1)]):
+                bounds[feat_idx[starts], i] = reduce.reduceat(xy[:, col], starts)
+
+    else:
+        geoms = get_layer_geometries(layer_data, geo_typ=geo_typ)
+        bounds = shapely.bounds(geoms) if len(geoms) > 0 else np.empty((0, 4))
+
+    layer_data = layer_data.copy()  # Leave the given data unchanged
+    for i, col in enumerate(['minx', 'miny', 'maxx', 'maxy']):
+        layer_data[col] = bounds[:, i]
+
+    centre_x = (bounds[:, 0] + bounds[:, 2]) / 2
+    centre_y = (bounds[:, 1] + bounds[:, 3]) / 2
+
+    encode = quadkey_encode if key_type == 'quadkey' else geohash_encode
+    layer_data[key_type] = encode(centre_x, centre_y, level)
+
+    return layer_data
+
+
+def add_measures(layer_data, method='geodesic', geo_typ=None):
+    """
+    Add columns of lengths and areas to a layer of parsed OSM data.
+
+    The column ``'length'`` holds the lengths (in metres) of linear features
+    and the perimeters of polygonal ones, and the column ``'area'`` holds the areas
+    (in square metres) of polygonal features; either is ``NaN`` where it does not apply.
+    Both are computed over the coordinate arrays of the whole layer at once,
+    either on a sphere, by the
+    :py:func:`haversine formula<pydriosm.utils.haversine_distance>` and the spherical
+    excess of each ring, or in the UTM zone of each feature, by (cached)
+    :py:func:`transformers<pydriosm.utils.get_transformer>`.
+
+    :param layer_data: parsed data of a layer of PBF data, or a layer of shapefile data
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param method: ``'geodesic'`` (default), for measures on a sphere, or ``'utm'``,
+        for measures in the UTM zones (of the centroids) of the features
+    :type method: str
+    :param geo_typ: name of the PBF layer (e.g. ``'lines'``), defaults to ``None``;
+        see also :py:func:`get_layer_geometries()<pydriosm.reader.get_layer_geometries>`
+    :type geo_typ: str or None
+    :return: a copy of the layer data with the columns ``'length'`` and ``'area'``
+    :rtype: pandas.DataFrame or geopandas.GeoDataFrame
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import add_measures
+
+        >>> lines = pd.DataFrame({'id': [1, 2],
+        ...                       'coordinates': [[[-0.51, 52.65], [-0.52, 52.66]],
+        ...                                       [[-0.53, 52.67], [-0.53, 52.68]]]})
+
+        >>> lines = add_measures(lines, geo_typ='lines')
+
+        >>> print(lines.round(1))
+           id                       coordinates  length  area
+        0   1  [[-0.51, 52.65], [-0.52, 52.66]]  1300.5   NaN
+        1   2  [[-0.53, 52.67], [-0.53, 52.68]]  1112.0   NaN
+    """
+
+    import shapely
+
+    assert method in ('geodesic', 'utm'), "`method` must be either 'geodesic' or 'utm'."
+
+    geoms = get_layer_geometries(layer_data, geo_typ=geo_typ)
+
+    dims = np.full(len(geoms), -1)
+    has_geom = shapely.is_geometry(geoms)
+    dims[has_geom] = shapely.get_dimensions(geoms[has_geom])
+
+    lengths, areas = np.full(len(geoms), np.nan), np.full(len(geoms), np.nan)
+
+    if method == 'geodesic':
+        # All the single parts of the geometries (including those in collections)
+        parts, part_idx = shapely.get_parts(geoms, return_index=True)
+        is_multi = shapely.get_type_id(parts) >= 4
+        while is_multi.any():
+            sub_parts, sub_idx = shapely.get_parts(parts[is_multi], return_index=True)
+            parts = np.concatenate([parts[~is_multi], sub_parts])
+            part_idx = np.concatenate([part_idx[~is_multi], part_idx[is_multi][sub_idx]])
+            is_multi = shapely.get_type_id(parts) >= 4
+
+        # Lines, and the (exterior and interior) rings of polygons
+        is_polygon = shapely.get_type_id(parts) == 3
+        rings, ring_idx = shapely.get_rings(parts[is_polygon], return_index=True)
+        is_exterior = np.r_[True, ring_idx[1:] != ring_idx[:-1]] if len(rings) else []
+        is_line = shapely.get_dimensions(parts) == 1
+        linework = np.concatenate([parts[is_line], rings])
+        linework_idx = np.concatenate([part_idx[is_line], part_idx[is_polygon][ring_idx]])
+
+        coords, coord_idx = shapely.get_coordinates(linework, return_index=True)
+        lon, lat = coords[:, 0], coords[:, 1]
+        is_segment = coord_idx[1:] == coord_idx[:-1]
+        segment_idx = coord_idx[1:][is_segment]
+
+        segment_lengths = haversine_distance(
+            lon[:-1][is_segment], lat[:-1][is_segment], lon[1:][is_segment],
+            lat[1:][is_segment])
+        linework_lengths = np.bincount(segment_idx, segment_lengths,
+                                       minlength=len(linework))
+        geom_lengths = np.bincount(linework_idx, linework_lengths, minlength=len(geoms))
+
+        # Spherical excess of each ring, i.e. its area on a sphere
+        radius, (lam, phi) = 6371008.8, (np.radians(lon), np.radians(lat))
+        excess = (lam[1:] - lam[:-1]) * (2 + np.sin(phi[:-1]) + np.sin(phi[1:]))
+        linework_areas = np.abs(np.bincount(
+            segment_idx, excess[is_segment], minlength=len(linework))) * radius ** 2 / 2
+        ring_areas = linework_areas[len(linework) - len(rings):]
+        ring_areas[~np.asarray(is_exterior, dtype=bool)] *= -1
+        geom_areas = np.bincount(part_idx[is_polygon][ring_idx], ring_areas,
+                                 minlength=len(geoms))
+
+    else:
+        centroids = shapely.get_coordinates(shapely.centroid(geoms[has_geom]))
+        epsg_codes = np.zeros(len(geoms), dtype=int)
+        epsg_codes[has_geom] = get_utm_epsg_code(centroids[:, 0], centroids[:, 1])
+
+        projected_geoms = geoms.copy()
+        for epsg_code in np.unique(epsg_codes[has_geom]):
+            transformer = get_transformer('EPSG:4326', 'EPSG:{}'.format(epsg_code))
+            in_zone = epsg_codes == epsg_code
+            projected_geoms[in_zone] = shapely.transform(
+                geoms[in_zone],
+                lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])))
+
+        geom_lengths = shapely.length(projected_geoms)
+        geom_areas = shapely.area(projected_geoms)
+
+    lengths[dims >= 1] = geom_lengths[dims >= 1]
+    areas[dims == 2] = geom_areas[dims == 2]
+
+    layer_data = layer_data.copy()  # Leave the given data unchanged
+    layer_data['length'], layer_data['area'] = lengths, areas
+
+    return layer_data
+
+
+def reproject_coordinates(coordinates, target_crs, source_crs='EPSG:4326'):
+    """
+    Reproject the coordinates (or geometric objects) of a layer of parsed OSM data.
+
+    All the coordinates of the layer are transformed at once by a (cached)
+    :py:func:`transformer<pydriosm.utils.get_transformer>`. Nested lists of coordinates
+    (e.g. of the ``'coordinates'`` parsed from a PBF layer) are flattened into one array
+    (see :py:func:`flatten_coordinates()<pydriosm.reader.flatten_coordinates>`) and
+    rebuilt from it (as are the coordinates of GeoJSON geometries, e.g. the members
+    of other relations), without building any geometric object; and geometric objects
+    are transformed by `shapely.transform()`_. Missing coordinates (i.e. ``NaN``)
+    stay missing, and empty ones stay empty.
+
+    .. _`shapely.transform()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.transform.html
+
+    :param coordinates: coordinates, or geometric objects, of the features of a layer
+    :type coordinates: pandas.Series or list or numpy.ndarray
+    :param target_crs: the CRS to reproject to, e.g. ``'EPSG:27700'``
+    :type target_crs: str or int or dict or pyproj.CRS
+    :param source_crs: the CRS of the coordinates, defaults to ``'EPSG:4326'``
+    :type source_crs: str or int or dict or pyproj.CRS
+    :return: the reprojected coordinates (or geometric objects)
+    :rtype: pandas.Series
+
+    **Example**::
+
+        >>> import numpy as np
+        >>> from pydriosm.reader import reproject_coordinates
+
+        >>> coords = [[-0.5134241, 52.6555853], [[-0.51, 52.65], [-0.52, 52.66]]]
+
+        >>> coords_ = reproject_coordinates(coords, target_crs='EPSG:27700')
+
+        >>> print(coords_.map(lambda x: np.round(x, 1).tolist()))
+        0                            [500653.8, 307465.6]
+        1    [[500898.3, 306849.1], [500199.0, 307947.5]]
+        dtype: object
+    """
+
+    import pyproj
+    import shapely
+
+    source_crs, target_crs = (
+        x if isinstance(x, (str, int, pyproj.CRS)) else pyproj.CRS.from_user_input(x)
+        for x in (source_crs, target_crs))
+    transformer = get_transformer(source_crs, target_crs)
+
+    coordinates_ = coordinates if isinstance(coordinates, pd.Series) \
+        else pd.Series(list(coordinates), dtype=object)
+    is_null = coordinates_.isnull().to_numpy()
+
+    if all(isinstance(x, shapely.Geometry) for x in coordinates_[~is_null]):
+        geoms = np.asarray(coordinates_.values, dtype=object)
+        reprojected = pd.Series(shapely.transform(
+            geoms, lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))),
+            index=coordinates_.index, dtype=object)
+
+    else:
+        coords_values = coordinates_.to_numpy(dtype=object, copy=True)
+        coords_values[is_null] = None
+
+        xy, _ = flatten_coordinates(coords_values)
+        if len(xy) > 0:
+            xy = np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))
+            xy[~np.isfinite(xy)] = np.nan
+        xy_list, pos = xy.tolist(), 0
+
+        nested_types = (list, tuple, np.ndarray)
+
+        def rebuild(coords):  # (The same walk as that of flatten_coordinates())
+            nonlocal pos
+            if isinstance(coords, dict):  # A GeoJSON geometry
+                return {key: rebuild(sub_coords)
+                        if key in ('coordinates', 'geometries') else sub_coords
+                        for key, sub_coords in coords.items()}
+            if coords is None or len(coords) == 0:
+                return coords
+            if not isinstance(coords[0], nested_types + (dict,)):  # A single point
+                pos += 1
+                return xy_list[pos - 1]
+            if isinstance(coords[0], nested_types) and len(coords[0]) > 0 and \
+                    not isinstance(coords[0][0], nested_types + (dict,)):
+                pos += len(coords)  # A sequence of points
+                return xy_list[pos - len(coords):pos]
+            return [rebuild(sub_coords) for sub_coords in coords]
+
+        reprojected = pd.Series([rebuild(x) for x in coords_values],
+                                index=coordinates_.index, dtype=object)
+
+    reprojected.name = coordinates_.name
+
+    return reprojected
+
+
+def repair_geometries(osm_data, ret_counts=False, verbose=False):
+    """
+    Validate the geometries of parsed OSM data and repair the invalid ones.
+
+    Both the validation and the repair are vectorized, by `shapely.is_valid()`_ and
+    `shapely.make_valid()`_. A repaired geometry keeps only the parts of the same
+    dimension as the original one (e.g. the polygons of a self-intersecting
+    multipolygon, without its collapsed rings), and is of the same type as the original
+    one unless it is split into several parts; where nothing is left, it becomes
+    ``None``. Geometries stored as coordinates are repaired and kept as coordinates;
+    and layers of raw features (i.e. GeoJSON strings) are left unchanged.
+
+    .. _`shapely.is_valid()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.is_valid.html
+    .. _`shapely.make_valid()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.make_valid.html
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``) or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`
+    :type osm_data: dict
+    :param ret_counts: whether to also return the number of repaired features
+        of each layer, defaults to ``False``
+    :type ret_counts: bool
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :return: the data whose invalid geometries are repaired
+        (and the number of repaired features of each layer, when ``ret_counts=True``)
+    :rtype: dict or tuple
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import repair_geometries
+
+        >>> bowtie = [[[[0, 0], [2, 2], [2, 0], [0, 2], [0, 0]]]]
+        >>> multipolygons = pd.DataFrame({'id': [1], 'coordinates': [bowtie]})
+
+        >>> repaired_data, counts = repair_geometries({'multipolygons': multipolygons},
+        ...                                           ret_counts=True)
+
+        >>> print(counts)
+        {'multipolygons': 1}
+
+        >>> for polygon in repaired_data['multipolygons'].coordinates[0]: print(polygon)
+        [[[0.0, 2.0], [1.0, 1.0], [0.0, 0.0], [0.0, 2.0]]]
+        [[[2.0, 0.0], [1.0, 1.0], [2.0, 2.0], [2.0, 0.0]]]
+    """
+
+    import shapely
+
+    def make_valid(geoms):
+        # Keep the parts (of the repaired geometries) of the original dimensions
+        repaired = shapely.make_valid(geoms)
+
+        parts, idx = shapely.get_parts(repaired, return_index=True)
+        is_multi = shapely.get_type_id(parts) >= 4
+        while is_multi.any():
+            sub_parts, sub_idx = shapely.get_parts(parts[is_multi], return_index=True)
+            parts = np.concatenate([parts[~is_multi], sub_parts])
+            idx = np.concatenate([idx[~is_multi], idx[is_multi][sub_idx]])
+            is_multi = shapely.get_type_id(parts) >= 4
+
+        type_ids, dims = shapely.get_type_id(geoms), shapely.get_dimensions(geoms)
+        is_collection = type_ids == 7
+
+        kept = (shapely.get_dimensions(parts) == dims[idx]) & ~is_collection[idx]
+        order = np.argsort(idx[kept], kind='stable')
+        parts, idx = parts[kept][order], idx[kept][order]
+
+        results = np.full(len(geoms), None, dtype=object)
+        results[is_collection] = repaired[is_collection]
+
+        for dim, multi_func in enumerate(
+                [shapely.multipoints, shapely.multilinestrings, shapely.multipolygons]):
+            dim_parts = dims[idx] == dim
+            if dim_parts.any():
+                rows = np.unique(idx[dim_parts])
+                results[rows] = multi_func(parts[dim_parts], indices=idx[dim_parts])[rows]
+
+        # Geometries of single types that are repaired as a single part
+        part_counts = np.bincount(idx, minlength=len(geoms))
+        is_single = np.isin(type_ids, [0, 1, 3]) & (part_counts == 1)
+        results[is_single] = parts[np.searchsorted(idx, np.flatnonzero(is_single))]
+
+        return results
+
+    osm_data_, repair_counts = {}, {}
+
+    for layer_name, layer_data in osm_data.items():
+        if layer_data.shape[1] == 1:  # Raw features
+            osm_data_[layer_name] = layer_data
+            continue
+
+        geoms = get_layer_geometries(layer_data, geo_typ=layer_name)
+        invalid = ~shapely.is_valid(geoms) & shapely.is_geometry(geoms)
+        repair_counts[layer_name] = int(invalid.sum())
+
+        if invalid.any():
+            layer_data = layer_data.copy()
+            geom_col = [x for x in ('geometry', 'coordinates', 'geometries')
+                        if x in layer_data.columns][0]
+            geom_data = np.asarray(layer_data[geom_col].values, dtype=object).copy()
+
+            repaired = make_valid(geoms[invalid])
+            if all(x is None or isinstance(x, shapely.Geometry) for x in geom_data):
+                geom_data[invalid] = repaired
+            else:  # Coordinates
+                key = 'geometries' if geom_col == 'geometries' else 'coordinates'
+                for i, x in zip(np.flatnonzero(invalid), shapely.to_geojson(repaired)):
+                    geom_data[i] = None if x is None else rapidjson.loads(x)[key]
+
+            layer_data[geom_col] = geom_data
+
+        osm_data_[layer_name] = layer_data
+
+    if verbose:
+        print("Repaired features with invalid geometries: {}.".format(
+            ", ".join("{} ({})".format(k, v) for k, v in repair_counts.items())))
+
+    if ret_counts:
+        return osm_data_, repair_counts
+    else:
+        return osm_data_
+
+
+def select_layer_columns(osm_data, columns):
+    """
+    Select columns of the layers of parsed OSM data.
+
+    The IDs and geometries (i.e. the columns ``'id'``, ``'coordinates'``,
+    ``'geometries'``, ``'geometry'``, ``'coords'`` and ``'shape_type'``), and the columns
+    of spatial keys and measures (see :py:func:`add_spatial_keys()
+    <pydriosm.reader.add_spatial_keys>` and :py:func:`add_measures()
+    <pydriosm.reader.add_measures>`), if any, are always kept; and layers of
+    raw features (i.e. GeoJSON strings) are left unchanged.
+
+    :param osm_data: parsed data of layers
+    :type osm_data: dict
+    :param columns: name of a column, e.g. ``'name'``, or names of multiple columns
+    :type columns: str or list
+    :return: the data of the selected columns
+    :rtype: dict
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import select_layer_columns
+
+        >>> points = pd.DataFrame({'id': [488432, 488658],
+        ...                        'coordinates': [[-0.5134241, 52.6555853],
+        ...                                        [-0.5313354, 52.6737716]],
+        ...                        'name': [None, 'Manton'],
+        ...                        'other_tags': ['"odbl"=>"clean"', None]})
+
+        >>> osm_data = select_layer_columns({'points': points}, columns=['name'])
+
+        >>> print(osm_data['points'].columns.tolist())
+        ['id', 'coordinates', 'name']
+    """
+
+    columns_ = [columns] if isinstance(columns, str) else list(columns)
+    kept_columns = ['id', 'coordinates', 'geometries', 'geometry', 'coords', 'shape_type',
+                    'minx', 'miny', 'maxx', 'maxy', 'quadkey', 'geohash',
+                    'length', 'area']
+
+    osm_data_ = {
+        layer_name: layer_data if layer_data.shape[1] == 1 else layer_data[
+            [x for x in layer_data.columns if x in kept_columns or x in columns_]]
+        for layer_name, layer_data in osm_data.items()}
+
+    return osm_data_
+
+
+def make_path_to_pickle(path_to_pickle, geometry=True, layer_names=None, columns=None,
+                        target_crs=None, spatial_keys=None, spatial_key_level=None,
+                        measures=None):
+    """
+    Make a path to a pickle file of parsed OSM data read with given options.
+
+    Each option that changes the parsed data is added as a suffix to the filename,
+    so that data read with different options are never saved as (or loaded from)
+    the same pickle file. Characters other than letters, digits and underscores
+    (e.g. ``':'`` of ``'addr:street'``, which is not allowed in filenames on Windows)
+    in the names of layers and columns are replaced by underscores, followed by
+    a short hash of the original names to keep them apart.
+
+    :param path_to_pickle: path to a pickle file of the data read with default options
+    :type path_to_pickle: str
+    :param geometry: whether the geometries are read, defaults to ``True``
+    :type geometry: bool
+    :param layer_names: name(s) of the layer(s) read, defaults to ``None``
+    :type layer_names: str or list or None
+    :param columns: name(s) of the field(s) read, defaults to ``None``
+    :type columns: str or list or None
+    :param target_crs: the CRS to which the data is reprojected, defaults to ``None``
+    :type target_crs: str or int or dict or pyproj.CRS or None
+    :param spatial_keys: type of the grid keys added, defaults to ``None``
+    :type spatial_keys: str or None
+    :param spatial_key_level: level of the grid keys, defaults to ``None``
+    :type spatial_key_level: int or None
+    :param measures: method of computing the measures added, defaults to ``None``
+    :type measures: str or None
+    :return: path to the pickle file
+    :rtype: str
+
+    **Example**::
+
+        >>> from pydriosm.reader import make_path_to_pickle
+
+        >>> make_path_to_pickle("tests\\rutland-latest-pbf.pickle", layer_names='points',
+        ...                     spatial_keys='quadkey', measures='geodesic')
+        'tests\\rutland-latest-pbf-points-quadkey14-geodesic.pickle'
+    """
+
+    suffixes = []
+
+    if not geometry:  # Data of tags only
+        suffixes.append('tags')
+    def sanitize_names(names):
+        names = [names] if isinstance(names, str) else list(names)
+        names_ = [re.sub(r'\W+', '_', x) for x in names]
+        if names_ != names:
+            names_.append(hashlib.md5("-".join(names).encode('utf-8')).hexdigest()[:8])
+        return names_
+
+    if layer_names:  # Data of the requested layers only
+        suffixes += sanitize_names(layer_names)
+    if columns:  # Data of the requested columns only
+        suffixes += sanitize_names(columns)
+    if target_crs is not None:  # Reprojected data
+        suffixes.append(re.sub(r'\W+', '', str(target_crs)).lower())
+    if spatial_keys:  # Data with grid keys
+        if spatial_key_level is None:
+            spatial_key_level = 14 if spatial_keys == 'quadkey' else 7
+        suffixes.append('{}{}'.format(spatial_keys, spatial_key_level))
+    if measures:  # Data with lengths and areas
+        suffixes.append(measures)
+
+    if suffixes:
+        path_to_pickle = path_to_pickle.replace(
+            ".pickle", "-{}.pickle".format("-".join(suffixes)))
+
+    return path_to_pickle
+
+
+def parse_osm_pbf_layer(pbf_layer_data, geo_typ, transform_geom, transform_other_tags,
+                        spatial_keys=None, spatial_key_level=None, measures=None,
+                        columns=None, target_crs=None):
     """
     Parse data of a layer of PBF data.
 
@@ -93,6 +1108,25 @@ def parse_osm_pbf_layer(pbf_layer_data, geo_typ, transform_geom, transform_other
     :type transform_geom: bool
     :param transform_other_tags: whether to transform a ``'other_tags'`` into a dictionary
     :type transform_other_tags: bool
+    :param spatial_keys: type of a grid key, ``'quadkey'`` or ``'geohash'``,
+        to be added together with bounding box columns; if ``None`` (default),
+        none is added,
+        see also :py:func:`add_spatial_keys()<pydriosm.reader.add_spatial_keys>`
+    :type spatial_keys: str or None
+    :param spatial_key_level: level of the grid key, defaults to ``None``
+    :type spatial_key_level: int or None
+    :param measures: method of computing lengths and areas, ``'geodesic'`` or ``'utm'``,
+        to be added as columns; if ``None`` (default), none is added,
+        see also :py:func:`add_measures()<pydriosm.reader.add_measures>`
+    :type measures: str or None
+    :param columns: names of the columns (of tags) to be kept, in addition to
+        the IDs and geometries; if ``None`` (default), all columns
+    :type columns: list or None
+    :param target_crs: the CRS to which the coordinates are reprojected (before any
+        geometric object is built), e.g. ``'EPSG:27700'``; if ``None`` (default),
+        the coordinates are kept in WGS84,
+        see also :py:func:`reproject_coordinates()<pydriosm.reader.reproject_coordinates>`
+    :type target_crs: str or int or dict or pyproj.CRS or None
     :return: parsed data of the ``geo_typ`` layer of a given .pbf file
     :rtype: pandas.DataFrame
 
@@ -155,50 +1189,46 @@ def parse_osm_pbf_layer(pbf_layer_data, geo_typ, transform_geom, transform_other
 
         return geom_collection_
 
-    def transform_other_tags_(other_tags):
-        """
-        Transform a ``'other_tags'`` into a dictionary.
-
-        :param other_tags: data of a single record in the ``'other_tags'`` feature
-        :type other_tags: str or None
-        :return: parsed data of the ``'other_tags'`` record
-        :rtype: dict or None
-        """
-
-        if other_tags:
-            raw_other_tags = (re.sub('^"|"$', '', each_tag)
-                              for each_tag in re.split('(?<="),(?=")', other_tags))
-            other_tags_ = {
-                k: v.replace('<br>', ' ') for k, v in
-                (re.split('"=>"?', each_tag)
-                 for each_tag in filter(None, raw_other_tags))}
-
-        else:  # e.g. other_tags_x is None
-            other_tags_ = other_tags
-
-        return other_tags_
+    assert target_crs is None or not (spatial_keys or measures), \
+        "`spatial_keys` and `measures` are computed in WGS84 and " \
+        "cannot be added when `target_crs` is specified."
 
     if not pbf_layer_data.empty:
-        # Start parsing 'geometry' column
-        dat_geometry = pd.DataFrame(
-            x for x in pbf_layer_data.geometry).rename(columns={'type': 'geom_type'})
-
-        if geo_typ != 'other_relations':
-            # `geo_type` can be 'points', 'lines', 'multilinestrings' or 'multipolygons'
-            if transform_geom:
-                dat_geometry.coordinates = transform_single_geometry_(dat_geometry)
-        else:  # geo_typ == 'other_relations'
-            if transform_geom:
-                dat_geometry.geometries = \
-                    dat_geometry.geometries.map(transform_multi_geometries_)
-                dat_geometry.rename(columns={'geometries': 'coordinates'}, inplace=True)
+        if pbf_layer_data.geometry.notnull().any():
+            # Start parsing 'geometry' column
+            dat_geometry = pd.DataFrame(
+                x for x in pbf_layer_data.geometry).rename(columns={'type': 'geom_type'})
+
+            if geo_typ != 'other_relations':
+                # `geo_type` can be 'points', 'lines', 'multilinestrings'
+                # or 'multipolygons'
+                if target_crs is not None:
+                    dat_geometry.coordinates = reproject_coordinates(
+                        dat_geometry.coordinates, target_crs)
+                if transform_geom:
+                    dat_geometry.coordinates = transform_single_geometry_(dat_geometry)
+            else:  # geo_typ == 'other_relations'
+                if target_crs is not None:
+                    dat_geometry.geometries = reproject_coordinates(
+                        dat_geometry.geometries, target_crs)
+                if transform_geom:
+                    dat_geometry.geometries = \
+                        dat_geometry.geometries.map(transform_multi_geometries_)
+                    dat_geometry.rename(columns={'geometries': 'coordinates'},
+                                        inplace=True)
+
+        else:  # The geometries are ignored, see the parameter `geometry` of parse_osm_pbf
+            dat_geometry = pd.DataFrame({'geom_type': None}, index=pbf_layer_data.index)
 
         # Start parsing 'properties' column
         dat_properties = pd.DataFrame(x for x in pbf_layer_data.properties)
 
-        if transform_other_tags:
-            dat_properties.other_tags = dat_properties.other_tags.map(
-                transform_other_tags_)
+        if columns is not None:
+            dat_properties = dat_properties[
+                [x for x in dat_properties.columns if x in columns]]
+
+        if transform_other_tags and 'other_tags' in dat_properties.columns:
+            dat_properties.other_tags = dat_properties.other_tags.map(parse_other_tags)
 
         parsed_layer_data = pbf_layer_data[['id']].join(dat_geometry).join(dat_properties)
         parsed_layer_data.drop(['geom_type'], axis=1, inplace=True)
@@ -213,15 +1243,28 @@ def parse_osm_pbf_layer(pbf_layer_data, geo_typ, transform_geom, transform_other
         parsed_layer_data.sort_values('id', inplace=True)
         parsed_layer_data.index = range(len(parsed_layer_data))
 
+        if spatial_keys:
+            parsed_layer_data = add_spatial_keys(
+                parsed_layer_data, key_type=spatial_keys, level=spatial_key_level,
+                geo_typ=geo_typ)
+
+        if measures:
+            parsed_layer_data = add_measures(parsed_layer_data, method=measures,
+                                             geo_typ=geo_typ)
+
     return parsed_layer_data
 
 
 def parse_osm_pbf(path_to_osm_pbf, number_of_chunks, parse_raw_feat, transform_geom,
-                  transform_other_tags, max_tmpfile_size=None):
+                  transform_other_tags, max_tmpfile_size=None, spatial_keys=None,
+                  spatial_key_level=None, measures=None, layer_names=None, columns=None,
+                  geometry=True, target_crs=None, sinks=None):
     """
     Parse a PBF data file.
 
-    :param path_to_osm_pbf: absolute path to a PBF data file
+    :param path_to_osm_pbf: absolute path to a PBF data file, or its URL
+        (e.g. ``'s3://bucket/key'``, see also :py:func:`get_vsi_path()
+        <pydriosm.utils.get_vsi_path>`)
     :type path_to_osm_pbf: str
     :param number_of_chunks: number of chunks
     :type number_of_chunks: int or None
@@ -234,8 +1277,46 @@ def parse_osm_pbf(path_to_osm_pbf, number_of_chunks, parse_raw_feat, transform_g
     :param max_tmpfile_size: defaults to ``None``,
         see also :py:func:`pydriosm.settings.gdal_configurations`
     :type max_tmpfile_size: int or None
-    :return: parsed OSM PBF data
-    :rtype: dict
+    :param spatial_keys: (when ``parse_raw_feat=True``) type of a grid key,
+        ``'quadkey'`` or ``'geohash'``, to be added together with bounding box columns
+        to each layer; if ``None`` (default), none is added,
+        see also :py:func:`add_spatial_keys()<pydriosm.reader.add_spatial_keys>`
+    :type spatial_keys: str or None
+    :param spatial_key_level: level of the grid key, defaults to ``None``
+    :type spatial_key_level: int or None
+    :param measures: (when ``parse_raw_feat=True``) method of computing lengths and
+        areas, ``'geodesic'`` or ``'utm'``, to be added as columns to each layer;
+        if ``None`` (default), none is added,
+        see also :py:func:`add_measures()<pydriosm.reader.add_measures>`
+    :type measures: str or None
+    :param layer_names: name of a layer, e.g. ``'points'``, or names of multiple layers
+        to be read; if ``None`` (default), all the layers; the other layers are not
+        read at all, and the relations are not resolved by the driver unless
+        ``'multilinestrings'``, ``'multipolygons'`` or ``'other_relations'``
+        is requested
+    :type layer_names: str or list or None
+    :param columns: name of a field, e.g. ``'name'``, or names of multiple fields
+        (of tags) to be read, in addition to the IDs and geometries; if ``None``
+        (default), all the fields; the other fields are ignored by the driver
+    :type columns: str or list or None
+    :param geometry: whether to read the geometries of the features, defaults to ``True``;
+        if ``False``, only the IDs and tags are read, skipping the export of
+        the geometries (and the assembly of the geometries of ways and relations)
+        by the driver, which is much faster and needs much less memory
+    :type geometry: bool
+    :param target_crs: (when ``parse_raw_feat=True``) the CRS to which the coordinates
+        are reprojected, e.g. ``'EPSG:27700'``; if ``None`` (default), WGS84 is kept,
+        see also :py:func:`reproject_coordinates()<pydriosm.reader.reproject_coordinates>`
+    :type target_crs: str or int or dict or pyproj.CRS or None
+    :param sinks: sinks (see :py:mod:`pydriosm.pipeline`) to which each chunk of each
+        layer is passed, concurrently, as soon as it is parsed, instead of
+        being collected; defaults to ``None``; the layers are then read in chunks of
+        (up to) 50000 features (regardless of ``number_of_chunks``), and the sinks are
+        closed even if the parsing fails
+    :type sinks: list or None
+    :return: parsed OSM PBF data; or, when ``sinks`` is given,
+        a list of the results of the sinks
+    :rtype: dict or list
 
     .. _pydriosm-reader-parse_osm_pbf:
 
@@ -343,6 +1424,10 @@ def parse_osm_pbf(path_to_osm_pbf, number_of_chunks, parse_raw_feat, transform_g
         <pydriosm.reader.GeofabrikReader.read_osm_pbf>`.
     """
 
+    assert geometry or not (spatial_keys or measures), \
+        "`spatial_keys` and `measures` are computed from the geometries and " \
+        "cannot be added when `geometry=False`."
+
     parse_raw_feat_ = True if transform_geom or transform_other_tags \
         else copy.copy(parse_raw_feat)
 
@@ -351,72 +1436,815 @@ def parse_osm_pbf(path_to_osm_pbf, number_of_chunks, parse_raw_feat, transform_g
     if max_tmpfile_size:
         gdal_configurations(max_tmpfile_size=max_tmpfile_size)
 
-    raw_osm_pbf = ogr.Open(path_to_osm_pbf)
+    raw_osm_pbf = ogr.Open(get_vsi_path(path_to_osm_pbf))
+
+    if sinks:
+        import concurrent.futures
+
+        for sink in sinks:
+            sink.open()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(sinks))
+    pending_writes = []
+
+    def emit(layer_name_, layer_data_):
+        # Wait for the sinks to finish writing the previous chunk (to keep the order),
+        # and then pass the chunk to all the sinks while the next one is being parsed
+        for future in pending_writes:
+            future.result()
+        pending_writes[:] = [executor.submit(sink.write, layer_name_, layer_data_)
+                             for sink in sinks]
+
+    def parse_feats(feats_, layer_name_):
+        if parse_raw_feat_:
+            lyr_dat_ = pd.DataFrame(f.ExportToJson(as_object=True) for f in feats_)
+            lyr_dat = parse_osm_pbf_layer(
+                lyr_dat_, geo_typ=layer_name_, transform_geom=transform_geom,
+                transform_other_tags=transform_other_tags,
+                spatial_keys=spatial_keys, spatial_key_level=spatial_key_level,
+                measures=measures, columns=columns_, target_crs=target_crs)
+            del lyr_dat_
+            gc.collect()
+        else:
+            lyr_dat = pd.DataFrame(f.ExportToJson() for f in feats_)
+            lyr_dat.columns = [layer_name_]
+
+        return lyr_dat
+
+    if layer_names:
+        layer_names_ = [layer_names] if isinstance(layer_names, str) else layer_names
+        valid_layer_names = list(get_pbf_layer_feat_types_dict().keys())
+        assert all(x in valid_layer_names for x in layer_names_), \
+            "`layer_names` must be among {}.".format(valid_layer_names)
+
+        # Let the driver produce only the requested layers (and, when none of them is
+        # based on relations, skip resolving the relations)
+        raw_osm_pbf.ExecuteSQL("SET interest_layers = {}".format(",".join(layer_names_)))
+    else:
+        layer_names_ = None
+
+    if columns is not None:
+        columns_ = [columns] if isinstance(columns, str) else list(columns)
+    else:
+        columns_ = None
+
+    parsed_layer_names, all_layer_data = [], []
+
+    try:
+        # Parse the data feature by feature
+        layer_count = raw_osm_pbf.GetLayerCount()
+
+        # Loop through all available layers
+        for i in range(layer_count):
+            # Get the data and name of the i-th layer
+            layer_dat = raw_osm_pbf.GetLayerByIndex(i)
+            layer_name = layer_dat.GetName()
+
+            if layer_names_ and layer_name not in layer_names_:
+                continue
+
+            # Fields that are not decoded by the driver at all
+            ignored_fields = [] if geometry else ['OGR_GEOMETRY']
+            if columns_ is not None:
+                layer_defn = layer_dat.GetLayerDefn()
+                ignored_fields += [
+                    x for x in (layer_defn.GetFieldDefn(j).GetName()
+                                for j in range(layer_defn.GetFieldCount()))
+                    if x not in columns_]
+            if ignored_fields:
+                layer_dat.SetIgnoredFields(ignored_fields)
+
+            parsed_layer_names.append(layer_name)
+
+            if sinks:
+                # Read the layer chunk by chunk (of as many features as in the pipeline)
+                # and pass each parsed chunk to the sinks while the next one is read,
+                # so that no more than a chunk of the layer is held at a time
+                layer_feats = iter(layer_dat)
+                for feat in iter(lambda: list(itertools.islice(layer_feats, 50000)), []):
+                    emit(layer_name, parse_feats(feat, layer_name))
+
+                    del feat
+                    gc.collect()
+
+                continue
+
+            elif number_of_chunks:
+                features = [feature for _, feature in enumerate(layer_dat)]
+                # number_of_chunks = file_size_in_mb / chunk_size_limit
+                # chunk_size = len(features) / number_of_chunks
+                feats = split_list(lst=features, num_of_sub=number_of_chunks)
+
+                del features
+                gc.collect()
+
+                all_lyr_dat = []
+                for feat in feats:
+                    all_lyr_dat.append(parse_feats(feat, layer_name))
+
+                    del feat
+                    gc.collect()
+
+                layer_data = pd.concat(all_lyr_dat, ignore_index=True, sort=False)
+
+            else:
+                if parse_raw_feat_:
+                    layer_data_ = pd.DataFrame(feature.ExportToJson(as_object=True)
+                                               for _, feature in enumerate(layer_dat))
+                    layer_data = parse_osm_pbf_layer(
+                        layer_data_, geo_typ=layer_name, transform_geom=transform_geom,
+                        transform_other_tags=transform_other_tags,
+                        spatial_keys=spatial_keys, spatial_key_level=spatial_key_level,
+                        measures=measures, columns=columns_, target_crs=target_crs)
+                    del layer_data_
+                    gc.collect()
+                else:
+                    layer_data = pd.DataFrame(
+                        feature.ExportToJson() for _, feature in enumerate(layer_dat))
+                    layer_data.columns = [layer_name]
+
+            all_layer_data.append(layer_data)
+
+            del layer_data
+            gc.collect()
+
+    finally:
+        if sinks:  # Finish (or, on an error, stop) writing, and close the sinks
+            try:
+                for future in pending_writes:
+                    future.result()
+            finally:
+                executor.shutdown()
+                sink_results = [sink.close() for sink in sinks]
+
+    if sinks:
+        return sink_results
+
+    # Make a dictionary in a dictionary form: {Layer name: Layer data}
+    osm_pbf_data = dict(zip(parsed_layer_names, all_layer_data))
+
+    return osm_pbf_data
+
+
+class TagStatistics:
+    """
+    A class representation of mergeable statistics of tag keys and values
+    across the layers of OSM data.
+
+    For each key of each layer, it keeps an exact count of the features having the key,
+    a `HyperLogLog <https://en.wikipedia.org/wiki/HyperLogLog>`_ sketch
+    estimating the number of distinct values, and a
+    `Space-Saving <https://doi.org/10.1007/978-3-540-30570-5_27>`_ summary
+    of the most frequent values, so that the memory it requires is bounded
+    regardless of the size of the data. The fields of feature IDs
+    (see :py:attr:`ID_FIELDS<pydriosm.reader.TagStatistics.ID_FIELDS>`) are not tags
+    and are not counted.
+
+    :param precision: number of bits used to index the registers of a HyperLogLog sketch,
+        i.e. each sketch holds ``2 ** precision`` registers, defaults to ``12``
+    :type precision: int
+    :param top_k: number of the most frequent values reported for each key,
+        defaults to ``10``
+    :type top_k: int
+
+    **Example**::
+
+        >>> from pydriosm.reader import TagStatistics
+
+        >>> stats = TagStatistics()
+
+        >>> stats.update('points', {'highway': 'bus_stop', 'name': 'Oakham'})
+        >>> stats.update('points', {'highway': 'crossing'})
+
+        >>> print(stats.summary()[['layer', 'key', 'count', 'distinct']])
+            layer      key  count  distinct
+        0  points  highway      2         2
+        1  points     name      1         1
+    """
+
+    #: Fields of feature IDs, which are not counted as tag keys.
+    ID_FIELDS = ('osm_id', 'osm_way_id')
+
+    def __init__(self, precision=12, top_k=10):
+        """
+        Constructor method.
+        """
+
+        assert 4 <= precision <= 18, "`precision` must be an integer between 4 and 18."
+
+        self.Precision = precision
+        self.TopK = top_k
+        # Number of counters kept for each key by the Space-Saving summary
+        self.Capacity = max(4 * top_k, 64)
+
+        self.FeatureCounts = collections.Counter()
+        # {layer_name: {key: [count, registers, counters, heap]}}
+        self.Stats = collections.defaultdict(dict)
+        # Sequence number of the entries of the heaps (to break ties of counts)
+        self.Sequence = 0
+
+    @staticmethod
+    def hash_tag_value(value):
+        """
+        Hash a tag value into a 64-bit integer.
+
+        The hash is stable across processes, which keeps sketches of different
+        regions mergeable.
+
+        :param value: value of a tag
+        :type value: str or int or float
+        :return: hash value
+        :rtype: int
+        """
+
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+
+        return int.from_bytes(digest, 'big')
+
+    def update_counters(self, counters, heap, value, count=1):
+        """
+        Update the Space-Saving counters of a key with a value.
+
+        The counters are accompanied by a min-heap of their counts, in which an entry
+        is added whenever a count changes and outdated entries are skipped
+        (and dropped as the heap is rebuilt), so that the value of the least count
+        is found in logarithmic time.
+
+        :param counters: counters of the values of a key
+        :type counters: dict
+        :param heap: heap of the counts, i.e. a list of (count, sequence number, value)
+        :type heap: list
+        :param value: value of the key
+        :type value: str or int or float
+        :param count: number of occurrences of the value, defaults to ``1``
+        :type count: int
+        """
+
+        if value in counters or len(counters) < self.Capacity:
+            counters[value] = counters.get(value, 0) + count
+        else:
+            while True:
+                min_count, _, min_value = heapq.heappop(heap)
+                if counters.get(min_value) == min_count:
+                    break
+            counters[value] = counters.pop(min_value) + count
+
+        if len(heap) >= 4 * self.Capacity:  # Drop the outdated entries
+            heap[:] = [(c, self.Sequence + i, v)
+                       for i, (v, c) in enumerate(counters.items())]
+            heapq.heapify(heap)
+            self.Sequence += len(heap)
+        else:
+            heapq.heappush(heap, (counters[value], self.Sequence, value))
+            self.Sequence += 1
+
+    def update(self, layer_name, tags):
+        """
+        Add the tags of one feature to the statistics.
+
+        :param layer_name: name of the layer that the feature belongs to
+        :type layer_name: str
+        :param tags: tags (keys and values) of the feature
+        :type tags: dict
+        """
+
+        self.FeatureCounts[layer_name] += 1
+
+        layer_stats = self.Stats[layer_name]
+
+        for key, value in tags.items():
+            if value is None or key in self.ID_FIELDS:
+                continue
+
+            if key not in layer_stats:
+                layer_stats[key] = [
+                    0, np.zeros(2 ** self.Precision, dtype=np.uint8), {}, []]
+
+            key_stats = layer_stats[key]
+            key_stats[0] += 1
+
+            hash_value, suffix_bits = self.hash_tag_value(value), 64 - self.Precision
+            idx = hash_value >> suffix_bits
+            rank = suffix_bits - (hash_value & ((1 << suffix_bits) - 1)).bit_length() + 1
+            if rank > key_stats[1][idx]:
+                key_stats[1][idx] = rank
+
+            self.update_counters(key_stats[2], key_stats[3], value)
+
+    def merge(self, other):
+        """
+        Merge the statistics of another instance (e.g. of another region) into this one.
+
+        :param other: statistics to be merged, computed with the same ``precision``
+        :type other: TagStatistics
+        :return: the merged statistics
+        :rtype: TagStatistics
+        """
+
+        assert self.Precision == other.Precision, \
+            "Only statistics with the same `precision` can be merged."
+
+        self.FeatureCounts.update(other.FeatureCounts)
+
+        for layer_name, other_layer_stats in other.Stats.items():
+            layer_stats = self.Stats[layer_name]
+
+            for key, (count, registers, counters, _) in other_layer_stats.items():
+                if key not in layer_stats:
+                    heap = [(c, self.Sequence + i, v)
+                            for i, (v, c) in enumerate(counters.items())]
+                    heapq.heapify(heap)
+                    self.Sequence += len(heap)
+                    layer_stats[key] = [count, registers.copy(), counters.copy(), heap]
+
+                else:
+                    key_stats = layer_stats[key]
+                    key_stats[0] += count
+                    np.maximum(key_stats[1], registers, out=key_stats[1])
+                    for value, value_count in counters.items():
+                        self.update_counters(key_stats[2], key_stats[3], value,
+                                             value_count)
+
+        return self
+
+    def estimate_distinct(self, registers):
+        """
+        Estimate the number of distinct values from the registers of a HyperLogLog sketch.
+
+        :param registers: registers of a HyperLogLog sketch
+        :type registers: numpy.ndarray
+        :return: estimated number of distinct values
+        :rtype: int
+        """
+
+        m = registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m ** 2 / np.sum(np.exp2(-registers.astype(np.float64)))
+
+        zeros = np.count_nonzero(registers == 0)
+        if estimate <= 2.5 * m and zeros > 0:  # Small range correction
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+    def summary(self):
+        """
+        Summarise the statistics.
+
+        :return: key frequencies, estimated value cardinalities and
+            the most frequent values (with their approximate counts) of each layer
+        :rtype: pandas.DataFrame
+        """
+
+        records = []
+        for layer_name, layer_stats in self.Stats.items():
+            for key, (count, registers, counters, _) in layer_stats.items():
+                top_values = sorted(counters.items(), key=lambda x: x[1], reverse=True)
+                records.append((layer_name, key, count,
+                                count / self.FeatureCounts[layer_name],
+                                min(self.estimate_distinct(registers), count),
+                                top_values[:self.TopK]))
+
+        stats_summary = pd.DataFrame(
+            records, columns=['layer', 'key', 'count', 'frequency', 'distinct',
+                              'top_values'])
+
+        stats_summary.sort_values(
+            ['layer', 'count', 'key'], ascending=[True, False, True], inplace=True)
+        stats_summary.index = range(len(stats_summary))
+
+        return stats_summary
+
+
+def tag_stats(path_to_osm_file, layer_names=None, precision=12, top_k=10,
+              max_tmpfile_size=None):
+    """
+    Compute statistics of tag keys and values of an OSM data file
+    by streaming through its features once.
+
+    Both the regular columns (e.g. ``'highway'``, ``'name'``) and the keys packed in
+    ``'other_tags'`` are counted; the result can be merged with that of other regions
+    by :py:meth:`TagStatistics.merge()<pydriosm.reader.TagStatistics.merge>`.
+
+    :param path_to_osm_file: absolute path to a PBF data file (or any other file,
+        e.g. a shapefile, that can be opened by OGR)
+    :type path_to_osm_file: str
+    :param layer_names: name of a layer, e.g. ``'points'``, or names of multiple layers;
+        if ``None`` (default), all available layers
+    :type layer_names: str or list or None
+    :param precision: see the parameter ``precision`` of
+        :py:class:`TagStatistics<pydriosm.reader.TagStatistics>`, defaults to ``12``
+    :type precision: int
+    :param top_k: see the parameter ``top_k`` of
+        :py:class:`TagStatistics<pydriosm.reader.TagStatistics>`, defaults to ``10``
+    :type top_k: int
+    :param max_tmpfile_size: defaults to ``None``,
+        see also :py:func:`pydriosm.settings.gdal_configurations`
+    :type max_tmpfile_size: int or None
+    :return: statistics of the tags
+    :rtype: TagStatistics
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import GeofabrikDownloader, tag_stats
+
+        >>> geofabrik_downloader = GeofabrikDownloader()
+
+        >>> sr_name = 'Rutland'
+        >>> file_fmt = ".pbf"
+        >>> dwnld_dir = "tests"
+
+        >>> path_to_rutland_pbf = geofabrik_downloader.download_osm_data(
+        ...     sr_name, file_fmt, dwnld_dir, confirmation_required=False,
+        ...     ret_download_path=True)
+
+        >>> rutland_tag_stats = tag_stats(path_to_rutland_pbf, layer_names='points')
+
+        >>> rutland_tag_stats_summary = rutland_tag_stats.summary()
+        >>> print(rutland_tag_stats_summary.columns.tolist())
+        ['layer', 'key', 'count', 'frequency', 'distinct', 'top_values']
+
+        >>> # Delete the downloaded PBF data file
+        >>> os.remove(path_to_rutland_pbf)
+    """
+
+    import ogr
+
+    if max_tmpfile_size:
+        gdal_configurations(max_tmpfile_size=max_tmpfile_size)
+
+    layer_names_ = [layer_names] if isinstance(layer_names, str) else layer_names
+
+    stats = TagStatistics(precision=precision, top_k=top_k)
 
-    layer_names, all_layer_data = [], []
-    # Parse the data feature by feature
-    layer_count = raw_osm_pbf.GetLayerCount()
+    raw_osm_file = ogr.Open(get_vsi_path(path_to_osm_file))
 
-    # Loop through all available layers
-    for i in range(layer_count):
-        # Get the data and name of the i-th layer
-        layer_dat = raw_osm_pbf.GetLayerByIndex(i)
+    for i in range(raw_osm_file.GetLayerCount()):
+        layer_dat = raw_osm_file.GetLayerByIndex(i)
         layer_name = layer_dat.GetName()
 
-        layer_names.append(layer_name)
+        if layer_names_ and layer_name not in layer_names_:
+            continue
+
+        layer_dat.SetIgnoredFields(['OGR_GEOMETRY'])  # Only the tags are needed
+
+        for feature in layer_dat:
+            tags = feature.items()
+
+            other_tags = parse_other_tags(tags.pop('other_tags', None))
+            if other_tags:
+                tags.update(other_tags)
+
+            stats.update(layer_name, tags)
+
+    del raw_osm_file
+    gc.collect()
+
+    return stats
+
+
+class OSMQuery:
+    """
+    A class representation of a lazy query of a layer of OSM data.
+
+    Conditions, columns, a bounding box and a limit are collected by chaining the methods
+    :py:meth:`layer()<pydriosm.reader.OSMQuery.layer>`,
+    :py:meth:`where()<pydriosm.reader.OSMQuery.where>`,
+    :py:meth:`select()<pydriosm.reader.OSMQuery.select>`,
+    :py:meth:`bbox()<pydriosm.reader.OSMQuery.bbox>` and
+    :py:meth:`limit()<pydriosm.reader.OSMQuery.limit>` (each of which returns a new
+    query), and nothing is read until the query is run by
+    :py:meth:`read()<pydriosm.reader.OSMQuery.read>`, in one pass over a PBF data file
+    with an `OGR SQL <https://gdal.org/user/ogr_sql_dialect.html>`_ statement and
+    a spatial filter, or by :py:meth:`fetch()<pydriosm.reader.OSMQuery.fetch>`,
+    with a query of a table in a PostgreSQL database
+    (see :py:class:`PostgresOSM<pydriosm.ios.PostgresOSM>`).
+    Only the selected columns of the matching features are materialized.
+
+    :param path_to_osm_file: absolute path to a PBF data file (or its URL, see also
+        :py:func:`get_vsi_path()<pydriosm.utils.get_vsi_path>`); it is not required
+        for querying a database, defaults to ``None``
+    :type path_to_osm_file: str or None
+    :param max_tmpfile_size: defaults to ``None``,
+        see also :py:func:`pydriosm.settings.gdal_configurations`
+    :type max_tmpfile_size: int or None
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import GeofabrikDownloader, OSMQuery
+
+        >>> geofabrik_downloader = GeofabrikDownloader()
+
+        >>> path_to_rutland_pbf = geofabrik_downloader.download_osm_data(
+        ...     'Rutland', ".pbf", "tests", confirmation_required=False,
+        ...     ret_download_path=True)
+
+        >>> query = OSMQuery(path_to_rutland_pbf).layer('lines').where(
+        ...     "highway = 'primary'").select(['id', 'name']).limit(5)
+
+        >>> print(query.get_sql_query())
+        SELECT "name" FROM "lines" WHERE (highway = 'primary') LIMIT 5
+
+        >>> rutland_primary_roads = query.read()
+        >>> print(rutland_primary_roads.columns.tolist())
+        ['id', 'name']
+
+        >>> # Delete the downloaded PBF data file
+        >>> os.remove(path_to_rutland_pbf)
+    """
 
-        if number_of_chunks:
-            features = [feature for _, feature in enumerate(layer_dat)]
-            # number_of_chunks = file_size_in_mb / chunk_size_limit
-            # chunk_size = len(features) / number_of_chunks
-            feats = split_list(lst=features, num_of_sub=number_of_chunks)
+    def __init__(self, path_to_osm_file=None, max_tmpfile_size=None):
+        """
+        Constructor method.
+        """
+
+        self.PathToOSMFile = path_to_osm_file
+        self.MaxTmpFileSize = max_tmpfile_size
+
+        self.LayerName = None
+        self.Conditions = []
+        self.Columns = None
+        self.BBox = None
+        self.Limit = None
+
+    def copy_with(self, **attributes):
+        # A new query with the given attributes changed
+        query = copy.copy(self)
+        query.Conditions = self.Conditions.copy()
+        for name, value in attributes.items():
+            setattr(query, name, value)
+
+        return query
+
+    def layer(self, layer_name):
+        """
+        Specify the layer to be queried.
+
+        :param layer_name: name of a layer, e.g. ``'lines'``
+            (or the name of the schema of the layer in a database)
+        :type layer_name: str
+        :return: the query of the layer
+        :rtype: OSMQuery
+        """
+
+        return self.copy_with(LayerName=layer_name)
+
+    def where(self, condition):
+        """
+        Add a condition (combined with any others by ``AND``).
+
+        :param condition: an SQL expression of the fields, e.g. ``"highway = 'primary'"``
+        :type condition: str
+        :return: the query with the condition
+        :rtype: OSMQuery
+        """
+
+        query = self.copy_with()
+        query.Conditions.append(condition)
+
+        return query
+
+    def select(self, columns):
+        """
+        Specify the columns to be read.
+
+        The IDs are always read; and the geometries are returned only if
+        ``'coordinates'`` (or ``'geometry'``) is selected (though they are read
+        for the spatial filter of a bounding box, if any).
+
+        :param columns: name of a column, e.g. ``'name'``, or names of multiple columns;
+            if ``None``, all the columns (and the geometries)
+        :type columns: str or list or None
+        :return: the query of the columns
+        :rtype: OSMQuery
+        """
+
+        columns_ = [columns] if isinstance(columns, str) \
+            else (None if columns is None else list(columns))
+
+        return self.copy_with(Columns=columns_)
+
+    def bbox(self, minx, miny, maxx, maxy):
+        """
+        Specify a bounding box that the features must intersect.
+
+        :param minx: minimum longitude (or x)
+        :type minx: float
+        :param miny: minimum latitude (or y)
+        :type miny: float
+        :param maxx: maximum longitude (or x)
+        :type maxx: float
+        :param maxy: maximum latitude (or y)
+        :type maxy: float
+        :return: the query within the bounding box
+        :rtype: OSMQuery
+        """
+
+        assert minx <= maxx and miny <= maxy, "The bounding box is invalid."
+
+        return self.copy_with(BBox=(minx, miny, maxx, maxy))
+
+    def limit(self, n):
+        """
+        Limit the number of features to be read.
+
+        :param n: maximum number of features
+        :type n: int
+        :return: the query with the limit
+        :rtype: OSMQuery
+        """
+
+        assert isinstance(n, int) and n >= 0, "`n` must be a non-negative integer."
+
+        return self.copy_with(Limit=n)
+
+    def get_sql_query(self, table_name=None):
+        """
+        Compile the query into an SQL statement.
+
+        :param table_name: (quoted) name of a table in a PostgreSQL database,
+            e.g. ``'"lines"."rutland"'``; if ``None`` (default), the statement is
+            in the OGR SQL dialect (with the bounding box left to the spatial filter)
+        :type table_name: str or None
+        :return: the SQL statement
+        :rtype: str
+        """
+
+        assert self.LayerName, "The layer is not specified; see `.layer()`."
+
+        geom_columns = ('coordinates', 'geometry', 'geometries')
+
+        if table_name is None:  # OGR SQL (the IDs are the FIDs of the features)
+            if self.Columns is None:
+                fields = '*'
+            else:
+                fields = ', '.join(
+                    '"{}"'.format(x) for x in self.Columns
+                    if x not in ('id',) + geom_columns) or 'FID'
+            from_clause = '"{}"'.format(self.LayerName)
+            conditions = self.Conditions.copy()
+
+        else:
+            if self.Columns is None:
+                fields = '*'
+            else:
+                fields = ', '.join('"{}"'.format(x) for x in dict.fromkeys(
+                    ['id'] + [x for x in self.Columns if x != 'geometry'] +
+                    (['coordinates'] if 'geometry' in self.Columns else [])))
+            from_clause = table_name
+            conditions = self.Conditions.copy()
+            if self.BBox is not None:  # See also add_spatial_keys()
+                minx, miny, maxx, maxy = self.BBox
+                conditions.append(
+                    '"maxx" >= {} AND "minx" <= {} AND '
+                    '"maxy" >= {} AND "miny" <= {}'.format(minx, maxx, miny, maxy))
+
+        sql_query = 'SELECT {} FROM {}'.format(fields, from_clause)
+        if conditions:
+            sql_query += ' WHERE ' + ' AND '.join('({})'.format(x) for x in conditions)
+        if self.Limit is not None:
+            sql_query += ' LIMIT {}'.format(self.Limit)
+
+        return sql_query
+
+    def read(self, transform_geom=False, transform_other_tags=False):
+        """
+        Run the query over the PBF data file.
+
+        The query is compiled into one OGR SQL statement, which is executed (together with
+        the spatial filter of the bounding box, if any) in one pass over the layer;
+        only the layer is read by the driver (see the parameter ``layer_names`` of
+        :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`), and the fields
+        (and the geometries) that are not selected are ignored.
+
+        :param transform_geom: whether to transform the coordinates into
+            geometric objects, defaults to ``False``
+        :type transform_geom: bool
+        :param transform_other_tags: whether to transform a ``'other_tags'``
+            into a dictionary, defaults to ``False``
+        :type transform_other_tags: bool
+        :return: the selected columns of the matching features
+        :rtype: pandas.DataFrame
+        """
+
+        import ogr
+        import shapely
+
+        assert self.PathToOSMFile, "`path_to_osm_file` is required to read the data."
+        assert self.LayerName in get_pbf_layer_feat_types_dict(), \
+            "The layer must be one of {}.".format(
+                set(get_pbf_layer_feat_types_dict().keys()))
+
+        if self.MaxTmpFileSize:
+            gdal_configurations(max_tmpfile_size=self.MaxTmpFileSize)
+
+        select_geom = self.Columns is None or any(
+            x in self.Columns for x in ('coordinates', 'geometry', 'geometries'))
+        # The geometries are needed by the spatial filter even if they are not selected
+        read_geom = select_geom or self.BBox is not None
+
+        raw_osm_file = ogr.Open(get_vsi_path(self.PathToOSMFile))
+        raw_osm_file.ExecuteSQL("SET interest_layers = {}".format(self.LayerName))
+        if not read_geom:
+            raw_osm_file.GetLayerByName(self.LayerName).SetIgnoredFields(['OGR_GEOMETRY'])
+
+        spatial_filter = None
+        if self.BBox is not None:
+            spatial_filter = ogr.CreateGeometryFromWkt(shapely.box(*self.BBox).wkt)
+
+        result_layer = raw_osm_file.ExecuteSQL(self.get_sql_query(), spatial_filter)
+
+        feat_ids, geoms, records = [], [], []
+        try:
+            for feat in result_layer:
+                feat_ids.append(feat.GetFID())
+                records.append(feat.items())
+                if select_geom:
+                    geom = feat.GetGeometryRef()
+                    if geom is None:
+                        geoms.append(None)
+                    elif transform_geom:
+                        geoms.append(bytes(geom.ExportToWkb()))
+                    else:
+                        geom_json = rapidjson.loads(geom.ExportToJson())
+                        geoms.append(
+                            geom_json.get('coordinates', geom_json.get('geometries')))
+        finally:
+            raw_osm_file.ReleaseResultSet(result_layer)
+
+        query_data = pd.DataFrame({'id': feat_ids})
+        if select_geom:
+            query_data['coordinates'] = pd.Series(
+                shapely.from_wkb(np.array(geoms, dtype=object)) if transform_geom
+                else geoms, dtype=object)
+
+        fields = pd.DataFrame.from_records(records, index=query_data.index)
+        if self.Columns is not None:
+            fields = fields[[x for x in self.Columns if x in fields.columns]]
+        query_data = query_data.join(fields)
+
+        if transform_other_tags and 'other_tags' in query_data.columns:
+            query_data.other_tags = query_data.other_tags.map(parse_other_tags)
+
+        return query_data
+
+    def fetch(self, postgres_osm, subregion_name, table_named_as_subregion=False,
+              schema_named_as_layer=False, **kwargs):
+        """
+        Run the query over a table (of the layer) in a PostgreSQL database.
 
-            del features
-            gc.collect()
+        The bounding box applies to the columns ``'minx'``, ``'miny'``, ``'maxx'`` and
+        ``'maxy'`` of the table (see the parameter ``spatial_keys`` of
+        :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`), which must exist
+        if the bounding box is specified.
 
-            all_lyr_dat = []
-            for feat in feats:
-                if parse_raw_feat_:
-                    lyr_dat_ = pd.DataFrame(f.ExportToJson(as_object=True) for f in feat)
-                    lyr_dat = parse_osm_pbf_layer(
-                        lyr_dat_, geo_typ=layer_name, transform_geom=transform_geom,
-                        transform_other_tags=transform_other_tags)
-                    del lyr_dat_
-                    gc.collect()
-                else:
-                    lyr_dat = pd.DataFrame(f.ExportToJson() for f in feat)
-                    lyr_dat.columns = [layer_name]
+        :param postgres_osm: an instance of :py:class:`PostgresOSM
+            <pydriosm.ios.PostgresOSM>`
+        :type postgres_osm: pydriosm.ios.PostgresOSM
+        :param subregion_name: name of a geographic region (or the corresponding table)
+        :type subregion_name: str
+        :param table_named_as_subregion: whether to use subregion name to be a table name,
+            defaults to ``False``
+        :type table_named_as_subregion: bool
+        :param schema_named_as_layer: whether a schema is named as a layer name,
+            defaults to ``False``
+        :type schema_named_as_layer: bool
+        :param kwargs: optional parameters of `pandas.read_sql()`_
+        :return: the selected columns of the matching features
+        :rtype: pandas.DataFrame
 
-                all_lyr_dat.append(lyr_dat)
+        .. _`pandas.read_sql()`:
+            https://pandas.pydata.org/docs/reference/api/pandas.read_sql.html
+        """
 
-                del feat, lyr_dat
-                gc.collect()
+        from .ios import validate_schema_names
 
-            layer_data = pd.concat(all_lyr_dat, ignore_index=True, sort=False)
+        table_name = postgres_osm.get_table_name_for_subregion(
+            subregion_name, table_named_as_subregion)
+        schema_name = validate_schema_names(self.LayerName, schema_named_as_layer)[0]
 
-        else:
-            if parse_raw_feat_:
-                layer_data_ = pd.DataFrame(feature.ExportToJson(as_object=True)
-                                           for _, feature in enumerate(layer_dat))
-                layer_data = parse_osm_pbf_layer(
-                    layer_data_, geo_typ=layer_name, transform_geom=transform_geom,
-                    transform_other_tags=transform_other_tags)
-                del layer_data_
-                gc.collect()
-            else:
-                layer_data = pd.DataFrame(
-                    feature.ExportToJson() for _, feature in enumerate(layer_dat))
-                layer_data.columns = [layer_name]
+        if self.BBox is not None:
+            import sqlalchemy
 
-        all_layer_data.append(layer_data)
+            inspector = sqlalchemy.inspect(postgres_osm.PostgreSQL.engine)
+            table_columns = [
+                x['name'] for x in inspector.get_columns(table_name, schema=schema_name)]
+            missing_columns = [x for x in ('minx', 'miny', 'maxx', 'maxy')
+                               if x not in table_columns]
+            if missing_columns:
+                raise ValueError(
+                    "The table \"{}\".\"{}\" cannot be queried by a bounding box "
+                    "without the column(s) {}; import the data with `spatial_keys` "
+                    "specified.".format(schema_name, table_name, missing_columns))
 
-        del layer_data
-        gc.collect()
+        sql_query = self.get_sql_query(
+            table_name='"{}"."{}"'.format(schema_name, table_name))
 
-    # Make a dictionary in a dictionary form: {Layer name: Layer data}
-    osm_pbf_data = dict(zip(layer_names, all_layer_data))
+        query_data = pd.read_sql(sql_query, con=postgres_osm.PostgreSQL.engine, **kwargs)
 
-    return osm_pbf_data
+        return query_data
 
 
 def unzip_shp_zip(path_to_shp_zip, path_to_extract_dir=None, layer_names=None,
@@ -590,22 +2418,35 @@ def unzip_shp_zip(path_to_shp_zip, path_to_extract_dir=None, layer_names=None,
         return extract_dir
 
 
-def read_shp_file(path_to_shp, method='geopandas', **kwargs):
+def read_shp_file(path_to_shp, method='geopandas', geometry=True, columns=None, **kwargs):
     """
     Parse a shapefile.
 
-    :param path_to_shp: absolute path to a .shp data file
+    :param path_to_shp: absolute path to a .shp data file, or its URL, e.g.
+        ``'s3://bucket/key'`` (which is read by `fsspec`_ when ``method='pyshp'``;
+        see the extra ``'remote'`` of the package),
+        or its path in a virtual file system of GDAL (see :py:func:`get_vsi_path()
+        <pydriosm.utils.get_vsi_path>`, only when ``method='geopandas'``)
     :type: str
     :param method: the method used to read the .shp file;
         if ``'geopandas'`` (default), use the `geopandas.read_file()`_ method,
         for otherwise use `shapefile.Reader()`_
     :type method: str
+    :param geometry: whether to read the geometries (or shapes) of the features,
+        defaults to ``True``; if ``False``, only the attributes are read
+    :type geometry: bool
+    :param columns: name of a field, e.g. ``'fclass'``, or names of multiple fields
+        to be read; if ``None`` (default), all the fields; when ``method='geopandas'``,
+        only the requested fields are read with ``engine='pyogrio'``, whereas
+        the other fields are dropped after being read otherwise
+    :type columns: str or list or None
     :param kwargs: optional parameters of `geopandas.read_file()`_
     :return: data frame of the .shp data
     :rtype: pandas.DataFrame or geopandas.GeoDataFrame
 
     .. _`geopandas.read_file()`: https://geopandas.org/reference/geopandas.read_file.html
     .. _`shapefile.Reader()`: https://github.com/GeospatialPython/pyshp#reading-shapefiles
+    .. _`fsspec`: https://filesystem-spec.readthedocs.io/
 
     **Examples**::
 
@@ -664,27 +2505,59 @@ def read_shp_file(path_to_shp, method='geopandas', **kwargs):
         >>> os.remove(path_to_rutland_shp_zip)
     """
 
+    columns_ = [columns] if isinstance(columns, str) else columns
+
     if method in ('geopandas', 'gpd'):  # default
         import geopandas as gpd
 
-        shp_data = gpd.read_file(path_to_shp, **kwargs)
+        if not geometry:
+            kwargs.update({'ignore_geometry': True})
+        if columns_ is not None and kwargs.get('engine') == 'pyogrio':
+            kwargs.update({'columns': columns_})  # Only the requested fields are read
+
+        shp_data = gpd.read_file(get_vsi_path(path_to_shp), **kwargs)
+
+        if columns_ is not None:  # e.g. by the engine 'fiona', which reads all the fields
+            geom_col = getattr(shp_data, '_geometry_column_name', None)
+            shp_data = shp_data[
+                [x for x in shp_data.columns if x in columns_ or x == geom_col]]
 
     else:
         import shapefile
 
         # Read .shp file using shapefile.Reader()
-        shp_reader = shapefile.Reader(path_to_shp)
+        if is_remote_path(path_to_shp):  # Only the blocks that are read are fetched
+            try:
+                import fsspec
+            except ImportError:
+                raise ImportError(
+                    "Reading a remote shapefile requires `fsspec` (and `s3fs` for S3), "
+                    "which can be installed by `pip install pydriosm[remote]`.")
+
+            fs, path_to_shp_ = fsspec.core.url_to_fs(path_to_shp)
+            shp_reader = shapefile.Reader(**{
+                ext: fs.open(os.path.splitext(path_to_shp_)[0] + '.' + ext, mode='rb',
+                             cache_type='blockcache')
+                for ext in ('shp', 'shx', 'dbf')})
+        else:
+            shp_reader = shapefile.Reader(path_to_shp)
 
         # Transform the data to a DataFrame
         filed_names = [field[0] for field in shp_reader.fields[1:]]
-        shp_data = pd.DataFrame(shp_reader.records(), columns=filed_names)
+        if columns_ is None:
+            records = shp_reader.records()
+        else:  # Only the requested fields (in the order of the file) are decoded
+            filed_names = [x for x in filed_names if x in columns_]
+            records = shp_reader.records(fields=filed_names)
+        shp_data = pd.DataFrame(records, columns=filed_names)
 
         # Clean data
         # shp_data['name'] = shp_data.name.str.encode('utf-8').str.decode('utf-8')
-        shape_info = pd.DataFrame(
-            ((s.points, s.shapeType) for s in shp_reader.iterShapes()),
-            index=shp_data.index, columns=['coords', 'shape_type'])
-        shp_data = shp_data.join(shape_info)
+        if geometry:
+            shape_info = pd.DataFrame(
+                ((s.points, s.shapeType) for s in shp_reader.iterShapes()),
+                index=shp_data.index, columns=['coords', 'shape_type'])
+            shp_data = shp_data.join(shape_info)
 
         shp_reader.close()
 
@@ -716,7 +2589,9 @@ def get_default_shp_crs():
 
 def parse_layer_shp(path_to_layer_shp, feature_names=None, crs=None,
                     save_fclass_shp=False, driver='ESRI Shapefile',
-                    ret_path_to_fclass_shp=False, **kwargs):
+                    ret_path_to_fclass_shp=False, spatial_keys=None,
+                    spatial_key_level=None, measures=None, geometry=True, columns=None,
+                    target_crs=None, **kwargs):
     """
     Parse a layer of OSM shapefile data.
 
@@ -736,10 +2611,34 @@ def parse_layer_shp(path_to_layer_shp, feature_names=None, crs=None,
     :param ret_path_to_fclass_shp: (when ``save_fclass_shp`` is ``True``)
         whether to return the path to the saved data of ``fclass``, defaults to ``False``
     :type ret_path_to_fclass_shp: bool
+    :param spatial_keys: type of a grid key, ``'quadkey'`` or ``'geohash'``,
+        to be added together with bounding box columns; if ``None`` (default),
+        none is added,
+        see also :py:func:`add_spatial_keys()<pydriosm.reader.add_spatial_keys>`
+    :type spatial_keys: str or None
+    :param spatial_key_level: level of the grid key, defaults to ``None``
+    :type spatial_key_level: int or None
+    :param measures: method of computing lengths and areas, ``'geodesic'`` or ``'utm'``,
+        to be added as columns; if ``None`` (default), none is added,
+        see also :py:func:`add_measures()<pydriosm.reader.add_measures>`
+    :type measures: str or None
+    :param geometry: whether to read the geometries of the features,
+        defaults to ``True``; if ``False``, only the attributes are read
+        (which cannot be saved as shapefile by ``save_fclass_shp=True``)
+    :type geometry: bool
+    :param columns: name of a field, e.g. ``'name'``, or names of multiple fields
+        to be read; if ``None`` (default), all the fields; when ``feature_names``
+        is specified, the field ``'fclass'`` (or ``'type'``) must be included
+    :type columns: str or list or None
+    :param target_crs: the CRS to which the geometries (or the coordinates read by
+        ``pyshp``) are reprojected from ``crs``, e.g. ``'EPSG:27700'``;
+        if ``None`` (default), no reprojection is made, see also
+        :py:func:`reproject_coordinates()<pydriosm.reader.reproject_coordinates>`
+    :type target_crs: str or int or dict or pyproj.CRS or None
     :param kwargs: optional parameters of
         :py:func:`read_shp_file()<pydriosm.reader.read_shp_file>`
     :return: parsed shapefile data
-    :rtype: geopandas.GeoDataFrame
+    :rtype: geopandas.GeoDataFrame or pandas.DataFrame
 
     .. _`geopandas.GeoDataFrame.to_file()`:
         https://geopandas.org/reference.html#geopandas.GeoDataFrame.to_file
@@ -800,6 +2699,18 @@ def parse_layer_shp(path_to_layer_shp, feature_names=None, crs=None,
         >>> os.remove(path_to_rutland_shp_zip)
     """
 
+    assert geometry or not (spatial_keys or measures), \
+        "`spatial_keys` and `measures` are computed from the geometries and " \
+        "cannot be added when `geometry=False`."
+
+    assert geometry or not save_fclass_shp, \
+        "The data cannot be saved as shapefile when `geometry=False`."
+
+    columns_ = [columns] if isinstance(columns, str) else columns
+    assert not (feature_names and columns_ is not None) or \
+        any(x in columns_ for x in ('fclass', 'type')), \
+        "`columns` must include 'fclass' (or 'type') when `feature_names` is specified."
+
     path_to_lyr_shp = [path_to_layer_shp] if isinstance(path_to_layer_shp, str) \
         else copy.copy(path_to_layer_shp)
 
@@ -813,13 +2724,32 @@ def parse_layer_shp(path_to_layer_shp, feature_names=None, crs=None,
         if len(path_to_lyr_shp) == 1:
             path_to_lyr_shp_ = path_to_lyr_shp[0]
             # gpd.GeoDataFrame(read_shp_file(path_to_shp))
-            shp_data = read_shp_file(path_to_lyr_shp_, **kwargs)
+            shp_data = read_shp_file(
+                path_to_lyr_shp_, geometry=geometry, columns=columns_, **kwargs)
         else:
-            shp_data = [read_shp_file(path_to_lyr_shp_, **kwargs)
+            shp_data = [read_shp_file(path_to_lyr_shp_, geometry=geometry,
+                                      columns=columns_, **kwargs)
                         for path_to_lyr_shp_ in path_to_lyr_shp]
             shp_data = pd.concat(shp_data, axis=0, ignore_index=True)
 
-        shp_data.crs = crs
+        if geometry:
+            shp_data.crs = crs
+
+        if spatial_keys:
+            shp_data = add_spatial_keys(shp_data, key_type=spatial_keys,
+                                        level=spatial_key_level)
+
+        if measures:
+            shp_data = add_measures(shp_data, method=measures)
+
+        if target_crs is not None and geometry:
+            geom_col = 'coords' if 'coords' in shp_data.columns else 'geometry'
+            shp_data[geom_col] = reproject_coordinates(
+                shp_data[geom_col], target_crs=target_crs, source_crs=crs)
+            if geom_col == 'geometry':
+                shp_data = shp_data.set_crs(target_crs, allow_override=True)
+            else:
+                shp_data.crs = target_crs
 
         if feature_names:
             feature_names_ = [feature_names] if isinstance(feature_names, str) \
@@ -1154,88 +3084,1052 @@ def parse_csv_xz(path_to_csv_xz, col_names=None):
     :py:meth:`BBBikeReader.read_csv_xz()<pydriosm.reader.BBBikeReader.read_csv_xz>`.
     """
 
-    csv_xz_raw = lzma.open(path_to_csv_xz, mode='rt', encoding='utf-8').readlines()
-    csv_xz_dat = [x.rstrip('\t\n').split('\t') for x in csv_xz_raw]
+    csv_xz_raw = lzma.open(path_to_csv_xz, mode='rt', encoding='utf-8').readlines()
+    csv_xz_dat = [x.rstrip('\t\n').split('\t') for x in csv_xz_raw]
+
+    if col_names is None:
+        col_names = ['type', 'id', 'feature']
+
+    csv_xz = pd.DataFrame.from_records(csv_xz_dat, columns=col_names)
+
+    return csv_xz
+
+
+def parse_geojson_xz(path_to_geojson_xz, fmt_geom=False):
+    """
+    Parse a compressed Osmium GeoJSON (.geojson.xz) data file.
+
+    :param path_to_geojson_xz: absolute path to a .geojson.xz data file
+    :type path_to_geojson_xz: str
+    :param fmt_geom: whether to reformat coordinates into a geometric object,
+        defaults to ``False``
+    :type fmt_geom: bool
+    :return: tabular data of the Osmium GeoJSON file
+    :rtype: pandas.DataFrame
+
+    See the example for the method :py:meth:`BBBikeReader.read_geojson_xz()
+    <pydriosm.reader.BBBikeReader.read_geojson_xz>`.
+    """
+
+    geojson_xz_raw = rapidjson.load(
+        lzma.open(path_to_geojson_xz, mode='rt', encoding='utf-8'))
+
+    geojson_xz_dat = pd.DataFrame.from_dict(geojson_xz_raw)
+
+    feature_types = geojson_xz_dat.features.map(
+        lambda x: x['type']).to_frame(name='feature_name')
+
+    geom_types = geojson_xz_dat.features.map(
+        lambda x: x['geometry']['type']).to_frame(name='geom_types')
+
+    if fmt_geom:
+        geom_types_funcs = get_osm_geom_object_dict()
+
+        def reformat_geom(geo_typ, coords):
+            sub_geom_type_func = geom_types_funcs[geo_typ]
+            if geo_typ == 'MultiPolygon':
+                geom_coords = sub_geom_type_func(
+                    geom_types_funcs['Polygon'](y) for x in coords for y in x)
+            else:
+                geom_coords = sub_geom_type_func(coords)
+            return geom_coords
+
+        coordinates = geojson_xz_dat.features.map(
+            lambda x: reformat_geom(
+                x['geometry']['type'],
+                x['geometry']['coordinates'])).to_frame(name='coordinates')
+
+    else:
+        coordinates = geojson_xz_dat.features.map(
+            lambda x: x['geometry']['coordinates']).to_frame(name='coordinates')
+
+    properties = geojson_xz_dat.features.map(
+        lambda x: x['properties']).to_frame(name='properties')
+
+    # decode_properties=False
+    #
+    # :param decode_properties: whether to transform a 'properties' dictionary into
+    #   tabular form, defaults to ``False``
+    # :type decode_properties: bool
+    #
+    # if decode_properties:
+    #     if confirmed("Confirmed to decode \"properties\"\n"
+    #                  "(Note this can be very computationally expensive and costing "
+    #                  "fairly large amount of memory)?"):
+    #         properties = \
+    #           pd.concat(properties['properties'].map(pd.json_normalize).to_list())
+
+    geojson_xz_data = \
+        pd.concat([feature_types, geom_types, coordinates, properties], axis=1)
+
+    del feature_types, geom_types, coordinates, properties
+    gc.collect()
+
+    return geojson_xz_data
+
+
+def spatial_join(left_layer, right_layer, predicate='intersects', how='inner',
+                 left_geo_typ=None, right_geo_typ=None, lsuffix='_left',
+                 rsuffix='_right'):
+    """
+    Join two layers of parsed OSM data by the spatial relationship of their geometries.
+
+    An `STRtree <https://shapely.readthedocs.io/en/stable/strtree.html>`_ is built
+    once over the geometries of ``right_layer`` and queried in bulk with
+    all the geometries of ``left_layer``.
+
+    :param left_layer: parsed data of a layer of PBF data (e.g. ``'points'``),
+        or a layer of shapefile data (e.g. ``'pois'``)
+    :type left_layer: pandas.DataFrame or geopandas.GeoDataFrame
+    :param right_layer: parsed data of another layer (e.g. ``'multipolygons'``)
+    :type right_layer: pandas.DataFrame or geopandas.GeoDataFrame
+    :param predicate: binary predicate that a geometry of ``left_layer`` and
+        a geometry of ``right_layer`` must satisfy, e.g. ``'within'``, ``'contains'``,
+        ``'intersects'`` (default); see also `shapely.STRtree.query()`_
+    :type predicate: str
+    :param how: ``'inner'`` (default) or ``'left'`` for the joined data; or ``'pairs'``
+        for the (positional) indices of the matched features only;
+        when ``how='left'``, the integer and boolean columns of ``right_layer`` are
+        of the nullable types (e.g. ``'Int64'`` and ``'boolean'``), so that
+        the unmatched features of ``left_layer`` can be filled with missing values
+    :type how: str
+    :param left_geo_typ: name of the PBF layer of ``left_layer`` (e.g. ``'points'``),
+        defaults to ``None``;
+        see also :py:func:`get_layer_geometries()<pydriosm.reader.get_layer_geometries>`
+    :type left_geo_typ: str or None
+    :param right_geo_typ: name of the PBF layer of ``right_layer``, defaults to ``None``
+    :type right_geo_typ: str or None
+    :param lsuffix: suffix to be added to overlapping column names of ``left_layer``,
+        defaults to ``'_left'``
+    :type lsuffix: str
+    :param rsuffix: suffix to be added to overlapping column names of ``right_layer``,
+        defaults to ``'_right'``
+    :type rsuffix: str
+    :return: joined data (where, if ``left_layer`` is a GeoDataFrame, its geometry
+        column keeps its name and remains the active geometry, as in
+        `geopandas.sjoin()`_); or, when ``how='pairs'``, an array of two rows holding
+        the positional indices of the matched features of ``left_layer`` and
+        ``right_layer``, respectively
+    :rtype: pandas.DataFrame or geopandas.GeoDataFrame or numpy.ndarray
+
+    .. _`shapely.STRtree.query()`:
+        https://shapely.readthedocs.io/en/stable/strtree.html#shapely.STRtree.query
+    .. _`geopandas.sjoin()`:
+        https://geopandas.org/en/stable/docs/reference/api/geopandas.sjoin.html
+
+    **Example**::
+
+        >>> from pydriosm.reader import GeofabrikReader, spatial_join
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> sr_name = 'Rutland'
+
+        >>> rutland_shp = geofabrik_reader.read_shp_zip(
+        ...     sr_name, layer_names=['pois', 'landuse'], data_dir="tests",
+        ...     download_confirmation_required=False)
+
+        >>> # Points of interest within each landuse polygon
+        >>> pois_landuse = spatial_join(rutland_shp['pois'], rutland_shp['landuse'],
+        ...                             predicate='within')
+
+        >>> print(pois_landuse.columns.tolist())
+        ['osm_id_left',
+         'code_left',
+         'fclass_left',
+         'name_left',
+         'geometry',
+         'osm_id_right',
+         'code_right',
+         'fclass_right',
+         'name_right',
+         'geometry_right']
+    """
+
+    import shapely
+
+    assert how in ('inner', 'left', 'pairs'), \
+        "`how` must be one of 'inner', 'left' and 'pairs'."
+
+    left_geoms = get_layer_geometries(left_layer, geo_typ=left_geo_typ)
+    right_geoms = get_layer_geometries(right_layer, geo_typ=right_geo_typ)
+
+    tree = shapely.STRtree(right_geoms)
+    left_idx, right_idx = tree.query(left_geoms, predicate=predicate)
+
+    if how == 'pairs':
+        return np.vstack([left_idx, right_idx])
+
+    if how == 'left':
+        unmatched = np.setdiff1d(np.arange(len(left_layer)), left_idx)
+        left_idx = np.concatenate([left_idx, unmatched])
+        right_idx = np.concatenate([right_idx, np.full(len(unmatched), -1)])
+
+        order = np.argsort(left_idx, kind='stable')
+        left_idx, right_idx = left_idx[order], right_idx[order]
+
+    # The active geometry column of a GeoDataFrame (if any) keeps its name
+    left_geom_col = getattr(left_layer, '_geometry_column_name', None)
+
+    overlapping_cols = set(left_layer.columns) & set(right_layer.columns)
+
+    left_part = pd.DataFrame(left_layer.iloc[left_idx]).reset_index(drop=True).rename(
+        columns={x: x + lsuffix for x in overlapping_cols if x != left_geom_col})
+
+    right_part = pd.DataFrame(right_layer).reset_index(drop=True)
+    if how == 'left':  # Nullable types of integers and booleans
+        right_part = right_part.astype({
+            col: 'boolean' if pd.api.types.is_bool_dtype(dtype)
+            else dtype.name.replace('uint', 'UInt').replace('int', 'Int')
+            for col, dtype in right_part.dtypes.items()
+            if isinstance(dtype, np.dtype) and dtype.kind in 'biu'})
+    # Unmatched rows (with the index -1) of the right layer are filled with NA
+    right_part = right_part.reindex(right_idx).reset_index(drop=True).rename(
+        columns={x: x + rsuffix for x in overlapping_cols})
+
+    joined_data = pd.concat([left_part, right_part], axis=1)
+
+    if left_geom_col is not None:
+        import geopandas as gpd
+
+        joined_data = gpd.GeoDataFrame(
+            joined_data, geometry=left_geom_col, crs=left_layer.crs)
+
+    return joined_data
+
+
+def hash_osm_layer(layer_data, id_column='id'):
+    """
+    Hash each feature (i.e. row) of a layer of parsed OSM data into an unsigned 64-bit
+    integer, with the features sorted by their IDs.
+
+    All the columns (including the tags and geometry) are hashed by the vectorized
+    `pandas.util.hash_pandas_object()`_; and values that are not hashable
+    (e.g. lists of coordinates and geometric objects) are hashed as their strings.
+
+    :param layer_data: parsed data of a layer of OSM data
+        (or the raw data, whose features are GeoJSON strings)
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param id_column: name of the column of feature IDs, defaults to ``'id'``
+    :type id_column: str
+    :return: sorted feature IDs, the hashes of the features and the positional indices
+        of the features in ``layer_data``
+    :rtype: tuple
+
+    .. _`pandas.util.hash_pandas_object()`:
+        https://pandas.pydata.org/docs/reference/api/pandas.util.hash_pandas_object.html
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.reader import hash_osm_layer
+
+        >>> points = pd.DataFrame({'id': [2, 1],
+        ...                        'coordinates': [[-0.51, 52.66], [-0.73, 52.67]],
+        ...                        'other_tags': ['"odbl"=>"clean"', None]})
+
+        >>> feat_ids, feat_hashes, _ = hash_osm_layer(points)
+
+        >>> print(feat_ids)
+        [1 2]
+    """
+
+    import shapely
+
+    if id_column in layer_data.columns:
+        feat_ids = layer_data[id_column]
+    elif layer_data.shape[1] == 1:  # Raw data of a layer
+        feat_ids = layer_data.iloc[:, 0].astype(str).str.extract(
+            r'"id":\s*(-?\d+)', expand=False)
+    else:
+        raise ValueError(f"The column '{id_column}' is not found in the layer data.")
+
+    feat_ids = pd.to_numeric(feat_ids).to_numpy(dtype=np.int64)
+
+    hashable_data = pd.DataFrame(index=range(len(layer_data)))
+    for col in layer_data.columns:
+        values = layer_data[col].values
+        if str(values.dtype) == 'geometry' or (
+                len(values) > 0 and isinstance(values[0], shapely.Geometry)):
+            values = shapely.to_wkb(np.asarray(values, dtype=object), hex=True)
+        elif values.dtype == object:
+            values = np.array([str(x) for x in values], dtype=object)
+        hashable_data[col] = values
+
+    feat_hashes = pd.util.hash_pandas_object(hashable_data, index=False).to_numpy()
+
+    order = np.argsort(feat_ids, kind='stable')
+
+    return feat_ids[order], feat_hashes[order], order
+
+
+def diff_osm_pbf(old_osm_data, new_osm_data, layer_names=None, id_column='id'):
+    """
+    Find the differences (i.e. created, modified and deleted features)
+    between two versions of OSM data of a geographic region.
+
+    Rather than merging the two versions, each feature is hashed
+    (see :py:func:`hash_osm_layer()<pydriosm.reader.hash_osm_layer>`) and the
+    arrays of IDs and hashes sorted by the IDs are compared in a vectorized way.
+
+    :param old_osm_data: the older version of the data, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>`, or path to a PBF data file
+    :type old_osm_data: dict or str
+    :param new_osm_data: the newer version of the data (in the same form as
+        ``old_osm_data``), or path to a PBF data file
+    :type new_osm_data: dict or str
+    :param layer_names: names of the layers to be compared;
+        if ``None`` (default), the layers in both versions
+    :type layer_names: list or None
+    :param id_column: name of the column of feature IDs, defaults to ``'id'``
+    :type id_column: str
+    :return: change sets of the layers, each of which is a dictionary of
+        ``'created'`` and ``'modified'`` (the features in the newer version) and
+        ``'deleted'`` (an array of the IDs of the deleted features)
+    :rtype: dict
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import diff_osm_pbf
+
+        >>> old_pbf = os.path.join("tests", "rutland-201231.osm.pbf")
+        >>> new_pbf = os.path.join("tests", "rutland-latest.osm.pbf")
+
+        >>> rutland_changes = diff_osm_pbf(old_pbf, new_pbf)
+
+        >>> print(list(rutland_changes['points'].keys()))
+        ['created', 'modified', 'deleted']
+
+    .. seealso::
+
+        - :py:meth:`PostgresOSM.apply_osm_pbf_diff()
+          <pydriosm.ios.PostgresOSM.apply_osm_pbf_diff>`
+    """
+
+    if isinstance(old_osm_data, str):
+        old_osm_data = parse_osm_pbf(old_osm_data, None, parse_raw_feat=True,
+                                     transform_geom=False, transform_other_tags=False)
+    if isinstance(new_osm_data, str):
+        new_osm_data = parse_osm_pbf(new_osm_data, None, parse_raw_feat=True,
+                                     transform_geom=False, transform_other_tags=False)
+
+    if layer_names is None:
+        layer_names_ = [x for x in new_osm_data.keys() if x in old_osm_data.keys()]
+    else:
+        layer_names_ = layer_names
+
+    osm_pbf_diff = {}
+
+    for layer_name in layer_names_:
+        old_layer, new_layer = old_osm_data[layer_name], new_osm_data[layer_name]
+
+        old_ids, old_hashes, _ = hash_osm_layer(old_layer, id_column)
+        new_ids, new_hashes, new_order = hash_osm_layer(new_layer, id_column)
+
+        _, old_idx, new_idx = np.intersect1d(old_ids, new_ids, assume_unique=True,
+                                             return_indices=True)
+        modified = new_idx[old_hashes[old_idx] != new_hashes[new_idx]]
+
+        created = np.ones(len(new_ids), dtype=bool)
+        created[new_idx] = False
+
+        deleted = np.ones(len(old_ids), dtype=bool)
+        deleted[old_idx] = False
+
+        osm_pbf_diff[layer_name] = {
+            'created': new_layer.iloc[new_order[created]],
+            'modified': new_layer.iloc[new_order[np.sort(modified)]],
+            'deleted': old_ids[deleted],
+        }
+
+    return osm_pbf_diff
+
+
+def parse_osc(path_to_osc):
+    """
+    Parse an OSM change file (.osc or .osc.gz), e.g. a replication diff.
+
+    The file is parsed incrementally (and each element is cleared once it has been
+    parsed) so that the memory use is bounded by the size of the change.
+
+    :param path_to_osc: absolute path to an .osc (or .osc.gz) file
+    :type path_to_osc: str
+    :return: changes of the nodes, ways and relations, each with the columns
+        ``'action'`` (``'create'``, ``'modify'`` or ``'delete'``), ``'id'`` and
+        ``'tags'`` (plus ``'lon'`` and ``'lat'`` for nodes, and ``'refs'`` for ways);
+        only the last change of each element is kept
+    :rtype: dict
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import parse_osc
+
+        >>> path_to_osc = os.path.join("tests", "rutland-updates-000.osc.gz")
+
+        >>> rutland_changes = parse_osc(path_to_osc)
+
+        >>> print(list(rutland_changes.keys()))
+        ['node', 'way', 'relation']
+    """
+
+    open_ = gzip.open if path_to_osc.endswith(".gz") else open
+
+    changes = {'node': [], 'way': [], 'relation': []}
+
+    with open_(path_to_osc, mode='rb') as f:
+        action, tags, refs = None, {}, []
+
+        for event, elem in ElementTree.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag in ('create', 'modify', 'delete'):
+                    action = elem.tag
+                continue
+
+            if elem.tag == 'tag':
+                tags[elem.get('k')] = elem.get('v')
+            elif elem.tag == 'nd':
+                refs.append(int(elem.get('ref')))
+
+            elif elem.tag in changes:
+                change = {'action': action, 'id': int(elem.get('id')), 'tags': tags}
+                if elem.tag == 'node':
+                    lon, lat = elem.get('lon'), elem.get('lat')
+                    change.update({'lon': float(lon) if lon else np.nan,
+                                   'lat': float(lat) if lat else np.nan})
+                elif elem.tag == 'way':
+                    change.update({'refs': refs})
+                changes[elem.tag].append(change)
+
+                tags, refs = {}, []
+                elem.clear()
+
+    columns = {'node': ['action', 'id', 'lon', 'lat', 'tags'],
+               'way': ['action', 'id', 'refs', 'tags'],
+               'relation': ['action', 'id', 'tags']}
+
+    for elem_type, elem_changes in changes.items():
+        elem_changes = pd.DataFrame(elem_changes, columns=columns[elem_type])
+        changes[elem_type] = elem_changes.drop_duplicates('id', keep='last').sort_values(
+            'id', ignore_index=True)
+
+    return changes
+
+
+def apply_changes(cache, path_to_osc, ret_unresolved=False, verbose=False):
+    """
+    Apply an OSM change file (.osc or .osc.gz) to parsed PBF data (or a pickle file
+    of it), so that the data is refreshed without being parsed again.
+
+    The features of each affected layer are located by binary search on its (sorted)
+    IDs; their cells are updated in place, and a layer is rebuilt only when features
+    are deleted from or created in it (with the created ones inserted in order of ID,
+    without sorting the layer); the coordinates of the nodes of the changed ways are
+    looked up only for those nodes; and the layers untouched by the change are kept as
+    they are. So, apart from the (unavoidable) rebuild of a layer of deleted or created
+    features, the cost scales with the size of the change rather than the size of
+    the region. The data is updated in place.
+
+    - Nodes are created, updated or deleted in the layer ``'points'``.
+    - Ways and relations are deleted from the layers ``'lines'``, ``'multilinestrings'``,
+      ``'multipolygons'`` and ``'other_relations'`` (as are those whose tags are all
+      deleted); their tags are updated; and the geometries of (non-closed) ways in
+      ``'lines'`` are rebuilt when the coordinates of all their nodes are in the change
+      file or in the layer ``'points'``.
+
+    :param cache: parsed PBF data (e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` with ``parse_raw_feat=True``),
+        or path to a pickle file of it (which is then updated, if anything is changed)
+    :type cache: dict or str
+    :param path_to_osc: absolute path to an .osc (or .osc.gz) file
+    :type path_to_osc: str
+    :param ret_unresolved: whether to return also the IDs of the ways and relations
+        whose geometries could not be rebuilt, defaults to ``False``
+    :type ret_unresolved: bool
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :return: the updated data (and, when ``ret_unresolved=True``, the IDs of the ways
+        and relations whose geometries could not be rebuilt)
+    :rtype: dict or tuple
+
+    .. note::
+
+        A change file does not include the ways whose nodes are moved but which are
+        otherwise unchanged; the geometries of such ways are not refreshed.
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import GeofabrikReader, apply_changes
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> sr_name = 'Rutland'
+
+        >>> _, path_to_pickle = geofabrik_reader.read_osm_pbf(
+        ...     sr_name, data_dir="tests", parse_raw_feat=True, pickle_it=True,
+        ...     ret_pickle_path=True, download_confirmation_required=False)
+
+        >>> path_to_osc = os.path.join("tests", "rutland-updates-000.osc.gz")
+
+        >>> rutland_pbf = apply_changes(path_to_pickle, path_to_osc, verbose=True)
+        Applying changes of "tests\\rutland-updates-000.osc.gz" ...
+            points ... Done.
+            lines ... Done.
+            ...
+    """
+
+    import shapely
+    import shapely.geometry
+
+    osm_pbf_data = load_pickle(cache) if isinstance(cache, str) else cache
+
+    if verbose:
+        print("Applying changes of \"{}\" ... ".format(os.path.relpath(path_to_osc)))
+
+    changes = parse_osc(path_to_osc)
+
+    # Tags ignored by the OSM driver of GDAL (see osmconf.ini)
+    ignored_tags = ['created_by', 'converted_by', 'source', 'time', 'ele', 'note',
+                    'todo', 'fixme', 'FIXME']
+    non_tag_columns = ['id', 'coordinates', 'geometry', 'other_tags', 'osm_id',
+                       'osm_way_id', 'z_order', 'minx', 'miny', 'maxx', 'maxy',
+                       'quadkey', 'geohash', 'length', 'area']
+
+    def make_rows(layer_data, elem_ids, tags_list, coordinates):
+        tag_fields = [x for x in layer_data.columns if x not in non_tag_columns]
+
+        rows = pd.DataFrame({'id': elem_ids})
+        for field in tag_fields:
+            rows[field] = [tags.get(field) for tags in tags_list]
+
+        if 'other_tags' in layer_data.columns:  # (It may have been projected away)
+            as_dict = any(
+                isinstance(x, dict) for x in layer_data['other_tags'].values[:100])
+            other_tags = [{k: v for k, v in tags.items() if k not in tag_fields}
+                          for tags in tags_list]
+            if not as_dict:
+                other_tags = [','.join('"{}"=>"{}"'.format(
+                    k.replace('"', '\\"'), v.replace('"', '\\"')) for k, v in x.items())
+                    for x in other_tags]
+            rows['other_tags'] = [x if x else None for x in other_tags]
+
+        if coordinates is not None:
+            rows['coordinates'] = coordinates
+
+        return rows
+
+    def locate(layer_data, id_col, elem_ids):
+        # Positions of the rows of the (found) IDs, without sorting the layer
+        layer_ids = layer_data[id_col]
+        elem_ids = np.asarray(elem_ids, dtype=np.int64)
+
+        if len(layer_data) == 0 or len(elem_ids) == 0:
+            return np.empty(0, dtype=np.int64), np.zeros(len(elem_ids), dtype=bool)
+
+        if id_col == 'id' and layer_ids.is_monotonic_increasing:  # (Sorted by parsing)
+            sorted_ids = layer_ids.to_numpy()
+            pos = np.minimum(np.searchsorted(sorted_ids, elem_ids), len(sorted_ids) - 1)
+            found = sorted_ids[pos] == elem_ids
+            return pos[found], found
+
+        # e.g. 'osm_way_id' of multipolygons, which is not in order
+        layer_ids = pd.to_numeric(layer_ids, errors='coerce')
+        matched = np.flatnonzero(layer_ids.isin(elem_ids).to_numpy())
+        positions = dict(zip(layer_ids.to_numpy()[matched].astype(np.int64), matched))
+        found = np.array([x in positions for x in elem_ids], dtype=bool)
+        pos = np.array([positions[x] for x in elem_ids[found]], dtype=np.int64)
+        return pos, found
+
+    def update_layer(layer_name, id_col, deleted_ids, updated_rows):
+        layer_data = osm_pbf_data[layer_name]
+
+        # Update the cells of the existing features in place
+        pos, found = locate(layer_data, id_col, updated_rows['id'].to_numpy())
+        for col in updated_rows.columns.drop('id'):
+            if col not in layer_data.columns:
+                continue
+            values = updated_rows[col].to_numpy(dtype=object)[found]
+            pos_ = pos
+            if col == 'coordinates':  # Keep the geometries that cannot be rebuilt
+                rebuilt = np.array([x is not None for x in values], dtype=bool)
+                pos_, values = pos[rebuilt], values[rebuilt]
+            col_idx = layer_data.columns.get_loc(col)
+            for p, v in zip(pos_, values):
+                try:
+                    layer_data.iat[p, col_idx] = v
+                except (TypeError, ValueError):  # e.g. None in a column of numbers
+                    layer_data[col] = layer_data[col].astype(object)
+                    layer_data.iat[p, col_idx] = v
+
+        # Delete and create features (and only then is the layer rebuilt)
+        deleted_pos = locate(layer_data, id_col, deleted_ids)[0]
+        created_rows = updated_rows[~found]
+
+        if len(deleted_pos) > 0:
+            kept = np.ones(len(layer_data), dtype=bool)
+            kept[deleted_pos] = False
+            layer_data = layer_data[kept]
+
+        if len(created_rows) > 0:
+            if id_col == 'id' and layer_data['id'].is_monotonic_increasing:
+                # Insert the created features (in order of ID) where they belong
+                ins = np.searchsorted(layer_data['id'].to_numpy(), created_rows.id)
+                bounds = np.r_[np.unique(np.r_[0, ins]), len(layer_data)]
+                pieces = []
+                for i, j in zip(bounds[:-1], bounds[1:]):
+                    pieces += [created_rows[ins == i], layer_data.iloc[i:j]]
+            else:
+                pieces = [layer_data, created_rows]
+            layer_data = pd.concat([x for x in pieces if len(x) > 0], ignore_index=True)
+
+        elif len(deleted_pos) > 0:
+            layer_data.index = range(len(layer_data))
+
+        osm_pbf_data[layer_name] = layer_data
+
+    def is_transformed(layer_data):
+        return len(layer_data) > 0 and 'coordinates' in layer_data.columns and \
+            isinstance(layer_data['coordinates'].iloc[0], shapely.Geometry)
+
+    def is_significant(tags):
+        return any(k not in ignored_tags for k in tags)
+
+    unresolved, updated = {}, False
+
+    # Nodes
+    nodes = changes['node']
+    if 'points' in osm_pbf_data and len(nodes) > 0:
+        print("\tpoints", end=" ... ") if verbose else ""
+
+        points = osm_pbf_data['points']
+        upserted = nodes[(nodes.action != 'delete') & nodes.tags.map(is_significant)]
+
+        coordinates = [[lon, lat] for lon, lat in zip(upserted.lon, upserted.lat)]
+        if is_transformed(points):
+            coordinates = [shapely.geometry.Point(x) for x in coordinates]
+        rows = make_rows(points, upserted.id.to_numpy(), upserted.tags.tolist(),
+                         coordinates if 'coordinates' in points.columns else None)
+
+        deleted_ids = nodes.id[~nodes.id.isin(upserted.id)].to_numpy()
+        update_layer('points', 'id', deleted_ids, rows)
+        updated = True
+
+        print("Done. ") if verbose else ""
+
+    # Coordinates of the nodes of the changed ways, from the change file or
+    # (only for the nodes not in it) from the layer 'points'
+    node_coords = nodes[nodes.action != 'delete'].set_index('id')[['lon', 'lat']]
+    ways = changes['way']
+    if 'points' in osm_pbf_data and len(ways) > 0:
+        points = osm_pbf_data['points']
+        refs = np.unique(np.fromiter(itertools.chain.from_iterable(
+            ways.refs[ways.action != 'delete']), dtype=np.int64))
+        refs = refs[~np.isin(refs, node_coords.index.to_numpy())]
+        pos, found = locate(points, 'id', refs)
+        if len(pos) > 0 and 'coordinates' in points.columns:
+            points_coords = pd.DataFrame(
+                shapely.get_coordinates(
+                    get_layer_geometries(points.iloc[pos], geo_typ='points')),
+                index=refs[found], columns=['lon', 'lat'])
+            node_coords = pd.concat([node_coords, points_coords])
+
+    # Ways and relations
+    for elem_type, layer_names in [('way', ['lines', 'multipolygons']),
+                                   ('relation', ['multilinestrings', 'multipolygons',
+                                                 'other_relations'])]:
+        elems = changes[elem_type]
+        if len(elems) == 0:
+            continue
+
+        # Those whose tags are all deleted are no longer features of any layer
+        is_upserted = (elems.action != 'delete') & elems.tags.map(is_significant)
+        deleted_ids = elems.id[~is_upserted].to_numpy()
+        upserted = elems[is_upserted]
+        unresolved_ids = set(upserted.id)
+
+        for layer_name in layer_names:
+            if layer_name not in osm_pbf_data or (
+                    elem_type == 'way' and layer_name == 'multipolygons' and
+                    'osm_way_id' not in osm_pbf_data[layer_name].columns):
+                continue
+
+            print("\t{}".format(layer_name), end=" ... ") if verbose else ""
+
+            layer_data = osm_pbf_data[layer_name]
+            if layer_name == 'multipolygons':
+                id_col = 'osm_way_id' if elem_type == 'way' else 'osm_id'
+            else:
+                id_col = 'id'
+
+            coordinates = None
+            if layer_name == 'lines' and 'coordinates' in layer_data.columns:
+                coordinates = []
+                for refs in upserted.refs:
+                    if (len(refs) > 1 and refs[0] == refs[-1]) or \
+                            not all(x in node_coords.index for x in refs):
+                        coordinates.append(None)  # Closed (area) ways are not rebuilt
+                    else:
+                        coordinates.append(node_coords.loc[refs].to_numpy().tolist())
+                if is_transformed(layer_data):
+                    coordinates = [shapely.geometry.LineString(x) if x else None
+                                   for x in coordinates]
+                unresolved_ids -= set(upserted.id[[x is not None for x in coordinates]])
+
+            rows = make_rows(layer_data, upserted.id.to_numpy(), upserted.tags.tolist(),
+                             coordinates)
+            found = locate(layer_data, id_col, rows.id.to_numpy())[1]
+            if layer_name == 'lines' and coordinates is not None:
+                # Ways whose geometries cannot be built are updated but not created
+                rows = rows[rows.coordinates.notnull().to_numpy() | found]
+            else:  # Relations and ways of areas are updated only
+                rows = rows[found]
+
+            update_layer(layer_name, id_col, deleted_ids, rows)
+            updated = True
+
+            print("Done. ") if verbose else ""
+
+        unresolved[elem_type] = np.sort(np.array(list(unresolved_ids), dtype=np.int64))
+
+    if isinstance(cache, str) and updated:
+        save_pickle(osm_pbf_data, cache, verbose=verbose)
+
+    if ret_unresolved:
+        osm_pbf_data = osm_pbf_data, unresolved
+
+    return osm_pbf_data
+
+
+def decompress_bz2_streams(path_to_bz2, max_workers=None, chunk_size=16):
+    """
+    Decompress a .bz2 file in a streaming way, with the streams of a multi-stream file
+    (e.g. one made by ``lbzip2`` or ``pbzip2``) decompressed in parallel.
+
+    The headers of the streams are byte-aligned, so the file can be split at them
+    into chunks that are decompressed independently by a pool of threads
+    (which run in parallel since ``bz2`` releases the GIL); and the decompressed chunks
+    are yielded in order, with a bounded number of them held at a time.
+    Only a multi-stream file larger than ``chunk_size`` is decompressed in parallel;
+    a single-stream file, or a smaller one, is decompressed sequentially
+    (stream by stream).
+
+    :param path_to_bz2: absolute path to a .bz2 file
+    :type path_to_bz2: str
+    :param max_workers: number of threads for decompression;
+        if ``None`` (default), the number of processors
+    :type max_workers: int or None
+    :param chunk_size: (approximate) size (in MB) of compressed data
+        decompressed by a thread at a time, defaults to ``16``
+    :type chunk_size: int or float
+    :return: decompressed data, chunk by chunk
+    :rtype: typing.Generator[bytes]
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import decompress_bz2_streams
+
+        >>> path_to_osm_bz2 = os.path.join("tests", "rutland-latest.osm.bz2")
+
+        >>> decompressed_data = decompress_bz2_streams(path_to_osm_bz2)
+
+        >>> print(next(decompressed_data)[:38])
+        b"<?xml version='1.0' encoding='UTF-8'?>"
+    """
+
+    import bz2
+    import concurrent.futures
+    import mmap
+
+    max_workers_ = max_workers if max_workers else os.cpu_count()
+    chunk_size_ = int(chunk_size * 1024 ** 2)
 
-    if col_names is None:
-        col_names = ['type', 'id', 'feature']
+    with open(path_to_bz2, mode='rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
 
-    csv_xz = pd.DataFrame.from_records(csv_xz_dat, columns=col_names)
+        # Offsets of the stream headers, i.e. 'BZh' + block size + block magic number
+        stream_offsets = [m.start() for m in re.finditer(rb'BZh[1-9]1AY&SY', mm)]
 
-    return csv_xz
+        chunk_offsets = [0]
+        for offset in stream_offsets[1:]:
+            if offset - chunk_offsets[-1] >= chunk_size_:
+                chunk_offsets.append(offset)
+        chunk_offsets.append(len(mm))
 
+        if len(chunk_offsets) <= 2:  # A single-stream (or small) file
+            decompressor, block_size = bz2.BZ2Decompressor(), max(chunk_size_ // 16, 1)
+            for i in range(0, len(mm), block_size):
+                block, data = mm[i:i + block_size], []
+                while block:
+                    if decompressor.eof:  # The next stream starts in (or at) this block
+                        decompressor = bz2.BZ2Decompressor()
+                    data.append(decompressor.decompress(block))
+                    block = decompressor.unused_data if decompressor.eof else b''
+                yield b''.join(data)
 
-def parse_geojson_xz(path_to_geojson_xz, fmt_geom=False):
-    """
-    Parse a compressed Osmium GeoJSON (.geojson.xz) data file.
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers_) as executor:
+                futures = collections.deque()
+                for start, end in zip(chunk_offsets[:-1], chunk_offsets[1:]):
+                    futures.append(executor.submit(bz2.decompress, mm[start:end]))
+                    # Hold a bounded number of decompressed chunks
+                    if len(futures) >= 2 * max_workers_:
+                        yield futures.popleft().result()
 
-    :param path_to_geojson_xz: absolute path to a .geojson.xz data file
-    :type path_to_geojson_xz: str
-    :param fmt_geom: whether to reformat coordinates into a geometric object,
-        defaults to ``False``
-    :type fmt_geom: bool
-    :return: tabular data of the Osmium GeoJSON file
-    :rtype: pandas.DataFrame
+                while futures:
+                    yield futures.popleft().result()
 
-    See the example for the method :py:meth:`BBBikeReader.read_geojson_xz()
-    <pydriosm.reader.BBBikeReader.read_geojson_xz>`.
-    """
 
-    geojson_xz_raw = rapidjson.load(
-        lzma.open(path_to_geojson_xz, mode='rt', encoding='utf-8'))
+def parse_osm_xml(path_to_osm_xml, max_workers=None):
+    """
+    Parse an OSM XML data file (.osm, .osm.bz2 or .osm.gz) into the layers of
+    the PBF data (i.e. in the same form as the output of
+    :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+    with ``parse_raw_feat=True``).
+
+    The data is parsed incrementally by `xml.etree.ElementTree.XMLPullParser`_,
+    with the elements cleared once they have been processed; and .bz2 data is
+    decompressed in parallel by
+    :py:func:`decompress_bz2_streams()<pydriosm.reader.decompress_bz2_streams>`.
+    The features are categorised into layers, with attribute fields, in the way of
+    the OSM driver of GDAL (see :py:func:`get_pbf_layer_fields_dict()
+    <pydriosm.utils.get_pbf_layer_fields_dict>`); and the geometries of (multi)polygon
+    relations are built by `shapely.build_area()`_.
+
+    :param path_to_osm_xml: absolute path to an OSM XML data file
+    :type path_to_osm_xml: str
+    :param max_workers: number of threads for decompressing .bz2 data;
+        if ``None`` (default), the number of processors
+    :type max_workers: int or None
+    :return: parsed OSM XML data
+    :rtype: dict
 
-    geojson_xz_dat = pd.DataFrame.from_dict(geojson_xz_raw)
+    .. _`xml.etree.ElementTree.XMLPullParser`:
+        https://docs.python.org/3/library/xml.etree.elementtree.html#pull-api-for-non-blocking-parsing
+    .. _`shapely.build_area()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.build_area.html
 
-    feature_types = geojson_xz_dat.features.map(
-        lambda x: x['type']).to_frame(name='feature_name')
+    .. note::
 
-    geom_types = geojson_xz_dat.features.map(
-        lambda x: x['geometry']['type']).to_frame(name='geom_types')
+        The coordinates of all nodes (and the node references of all ways) are kept in
+        compact arrays, as the OSM driver of GDAL keeps them in a temporary file,
+        for building the geometries of ways and relations; the elements are expected to
+        be ordered as nodes, ways and then relations.
 
-    if fmt_geom:
-        geom_types_funcs = get_osm_geom_object_dict()
+    **Example**::
 
-        def reformat_geom(geo_typ, coords):
-            sub_geom_type_func = geom_types_funcs[geo_typ]
-            if geo_typ == 'MultiPolygon':
-                geom_coords = sub_geom_type_func(
-                    geom_types_funcs['Polygon'](y) for x in coords for y in x)
-            else:
-                geom_coords = sub_geom_type_func(coords)
-            return geom_coords
+        >>> import os
+        >>> from pydriosm.reader import parse_osm_xml
 
-        coordinates = geojson_xz_dat.features.map(
-            lambda x: reformat_geom(
-                x['geometry']['type'],
-                x['geometry']['coordinates'])).to_frame(name='coordinates')
+        >>> path_to_osm_bz2 = os.path.join("tests", "rutland-latest.osm.bz2")
 
-    else:
-        coordinates = geojson_xz_dat.features.map(
-            lambda x: x['geometry']['coordinates']).to_frame(name='coordinates')
+        >>> rutland_osm = parse_osm_xml(path_to_osm_bz2)
 
-    properties = geojson_xz_dat.features.map(
-        lambda x: x['properties']).to_frame(name='properties')
+        >>> print(list(rutland_osm.keys()))
+        ['points', 'lines', 'multilinestrings', 'multipolygons', 'other_relations']
+    """
 
-    # decode_properties=False
-    #
-    # :param decode_properties: whether to transform a 'properties' dictionary into
-    #   tabular form, defaults to ``False``
-    # :type decode_properties: bool
-    #
-    # if decode_properties:
-    #     if confirmed("Confirmed to decode \"properties\"\n"
-    #                  "(Note this can be very computationally expensive and costing "
-    #                  "fairly large amount of memory)?"):
-    #         properties = \
-    #           pd.concat(properties['properties'].map(pd.json_normalize).to_list())
+    import array
+    import shapely
 
-    geojson_xz_data = \
-        pd.concat([feature_types, geom_types, coordinates, properties], axis=1)
+    if path_to_osm_xml.endswith(".bz2"):
+        data_chunks = decompress_bz2_streams(path_to_osm_xml, max_workers=max_workers)
+    else:
+        def read_data_chunks(open_):
+            with open_(path_to_osm_xml, mode='rb') as f:
+                yield from iter(lambda: f.read(2 ** 20), b'')
+
+        data_chunks = read_data_chunks(gzip.open if path_to_osm_xml.endswith(".gz")
+                                       else open)
+
+    layer_fields = get_pbf_layer_fields_dict()
+
+    # Tags ignored by the OSM driver of GDAL (see osmconf.ini)
+    ignored_tags = ['created_by', 'converted_by', 'source', 'time', 'ele', 'note',
+                    'todo', 'fixme', 'FIXME']
+    # Keys of tags with which closed ways are taken as polygons
+    polygon_keys = ['aeroway', 'amenity', 'boundary', 'building', 'craft', 'geological',
+                    'historic', 'landuse', 'leisure', 'military', 'natural', 'office',
+                    'place', 'shop', 'sport', 'tourism']
+    z_orders = {'minor': 3, 'road': 3, 'unclassified': 3, 'residential': 3,
+                'tertiary_link': 4, 'tertiary': 4, 'secondary_link': 6, 'secondary': 6,
+                'primary_link': 7, 'primary': 7, 'trunk_link': 8, 'trunk': 8,
+                'motorway_link': 9, 'motorway': 9}
+
+    features = {layer_name: [] for layer_name in layer_fields.keys()}
+
+    def add_feature(layer_name, feat_id, coordinates, tags, **fields):
+        fields_ = layer_fields[layer_name]
+        feature = {'id': feat_id, 'coordinates': coordinates, 'osm_id': str(feat_id)}
+        feature.update(
+            {k: tags.get(k) for k in fields_ if k not in ('osm_id', 'z_order')})
+        feature.update(fields)
+
+        other_tags = ','.join('"{}"=>"{}"'.format(
+            k.replace('"', '\\"'), v.replace('"', '\\"'))
+            for k, v in tags.items() if k not in fields_)
+        feature['other_tags'] = other_tags if other_tags else None
+
+        features[layer_name].append(feature)
+
+    def get_z_order(tags):
+        z_order = z_orders.get(tags.get('highway'), 0)
+        z_order += 10 if tags.get('bridge') in ('yes', 'true', '1') else 0
+        z_order -= 10 if tags.get('tunnel') in ('yes', 'true', '1') else 0
+        z_order += 5 if 'railway' in tags else 0
+        layer = tags.get('layer')
+        z_order += 10 * int(layer) if layer and layer.lstrip('-').isdigit() else 0
+        return z_order
+
+    node_ids, node_lons, node_lats = array.array('q'), array.array('d'), array.array('d')
+    way_ids, way_offsets, way_refs = array.array('q'), array.array('q', [0]), \
+        array.array('q')
+    nodes_, relations = [], []
+
+    def index_nodes():
+        # Sort the nodes by IDs for binary search (when all nodes have been read)
+        node_data = [np.frombuffer(x, dtype=x.typecode)
+                     for x in (node_ids, node_lons, node_lats)]
+        order = np.argsort(node_data[0], kind='stable')
+        nodes_.extend(x[order] for x in node_data)
+        del node_data
+        del node_ids[:], node_lons[:], node_lats[:]
+
+    def get_node_coordinates(refs):
+        if len(nodes_[0]) == 0:
+            return np.empty((0, 2))
+        pos = np.minimum(np.searchsorted(nodes_[0], refs), len(nodes_[0]) - 1)
+        pos = pos[nodes_[0][pos] == refs]  # Nodes that are unavailable are skipped
+        return np.column_stack([nodes_[1][pos], nodes_[2][pos]])
+
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    root = None
+
+    for data in itertools.chain(data_chunks, [None]):
+        if data is None:
+            parser.close()
+        else:
+            parser.feed(data)
+
+        for event, elem in parser.read_events():
+            if event == 'start':
+                root = elem if root is None else root
+                continue
+
+            if elem.tag not in ('node', 'way', 'relation'):
+                continue
+
+            elem_id = int(elem.get('id'))
+            tags = {t.get('k'): t.get('v') for t in elem.iterfind('tag')
+                    if t.get('k') not in ignored_tags}
+
+            if elem.tag == 'node':
+                lon, lat = float(elem.get('lon')), float(elem.get('lat'))
+                node_ids.append(elem_id)
+                node_lons.append(lon)
+                node_lats.append(lat)
+                if tags:
+                    add_feature('points', elem_id, [lon, lat], tags)
+
+            elif elem.tag == 'way':
+                if not nodes_:
+                    index_nodes()
+
+                refs = np.array([int(nd.get('ref')) for nd in elem.iterfind('nd')],
+                                dtype=np.int64)
+                way_ids.append(elem_id)
+                way_refs.extend(refs)
+                way_offsets.append(len(way_refs))
+
+                if tags:
+                    coords = get_node_coordinates(refs).tolist()
+                    closed = len(refs) >= 4 and refs[0] == refs[-1]
+                    if closed and (tags.get('area') == 'yes' or (
+                            tags.get('area') != 'no' and
+                            any(k in tags for k in polygon_keys))):
+                        add_feature('multipolygons', elem_id, [[coords]], tags,
+                                    osm_id=None, osm_way_id=str(elem_id))
+                    elif len(coords) >= 2:
+                        add_feature('lines', elem_id, coords, tags,
+                                    z_order=get_z_order(tags))
 
-    del feature_types, geom_types, coordinates, properties
-    gc.collect()
+            else:
+                members = [(m.get('type'), int(m.get('ref')), m.get('role'))
+                           for m in elem.iterfind('member')]
+                relations.append((elem_id, tags, members))
+
+            root.clear()
+
+    if not nodes_:
+        index_nodes()
+
+    # Build the geometries of relations
+    way_ids_ = np.frombuffer(way_ids, dtype=np.int64)
+    way_order = np.argsort(way_ids_, kind='stable')
+    way_offsets_, way_refs_ = np.frombuffer(way_offsets, dtype=np.int64), \
+        np.frombuffer(way_refs, dtype=np.int64)
+
+    def get_way_coordinates(way_id):
+        i = np.searchsorted(way_ids_, way_id, sorter=way_order)
+        if i == len(way_ids_) or way_ids_[way_order[i]] != way_id:
+            return None
+        i = way_order[i]
+        coords = get_node_coordinates(way_refs_[way_offsets_[i]:way_offsets_[i + 1]])
+        return coords if len(coords) >= 2 else None
+
+    for rel_id, tags, members in relations:
+        rel_type = tags.get('type')
+
+        if rel_type in ('multipolygon', 'boundary'):
+            lines = [get_way_coordinates(ref) for typ, ref, _ in members if typ == 'way']
+            area = shapely.build_area(shapely.multilinestrings(
+                [x for x in lines if x is not None])) if any(
+                x is not None for x in lines) else None
+            if area is None or area.is_empty:
+                continue
+            coords = [[shapely.get_coordinates(poly.exterior).tolist()] +
+                      [shapely.get_coordinates(r).tolist() for r in poly.interiors]
+                      for poly in getattr(area, 'geoms', [area])]
+            add_feature('multipolygons', rel_id, coords, tags, osm_way_id=None)
+
+        elif rel_type in ('multilinestring', 'route'):
+            lines = [get_way_coordinates(ref) for typ, ref, _ in members if typ == 'way']
+            lines = [x.tolist() for x in lines if x is not None]
+            if lines:
+                add_feature('multilinestrings', rel_id, lines, tags)
 
-    return geojson_xz_data
+        else:
+            geometries = []
+            for typ, ref, _ in members:
+                if typ == 'node':
+                    coords = get_node_coordinates(np.array([ref]))
+                    if len(coords) > 0:
+                        geometries.append({'type': 'Point',
+                                           'coordinates': coords[0].tolist()})
+                elif typ == 'way':
+                    coords = get_way_coordinates(ref)
+                    if coords is not None:
+                        geometries.append({'type': 'LineString',
+                                           'coordinates': coords.tolist()})
+            if geometries:
+                add_feature('other_relations', rel_id, geometries, tags)
+
+    osm_xml_data = {}
+    for layer_name, layer_features in features.items():
+        geom_col = 'geometries' if layer_name == 'other_relations' else 'coordinates'
+        layer_data = pd.DataFrame(
+            layer_features,
+            columns=['id', 'coordinates'] + layer_fields[layer_name] + ['other_tags'])
+        layer_data.rename(columns={'coordinates': geom_col}, inplace=True)
+        layer_data.sort_values('id', inplace=True, ignore_index=True)
+        osm_xml_data[layer_name] = layer_data
+
+    return osm_xml_data
 
 
 class GeofabrikReader:
@@ -1275,9 +4169,10 @@ class GeofabrikReader:
             on Geofabrik's free download server
         :type subregion_name: str
         :param data_dir: directory where the data file of the ``subregion_name`` is
-            located/saved; if ``None`` (default), the default local directory
+            located/saved, or its URL (e.g. ``'s3://bucket/prefix'``);
+            if ``None`` (default), the default local directory
         :type data_dir: str or None
-        :return: path to PBF (.osm.pbf) file
+        :return: path to PBF (.osm.pbf) file (or its URL)
         :rtype: str or None
 
         **Example**::
@@ -1324,11 +4219,18 @@ class GeofabrikReader:
         if data_dir is None:  # Go to default file path
             path_to_osm_pbf = path_to_osm_pbf_
 
+        elif is_remote_path(data_dir):  # e.g. in an object storage
+            path_to_osm_pbf = data_dir.rstrip('/') + '/' + osm_pbf_filename_
+
         else:
             osm_pbf_dir = validate_input_data_dir(data_dir)
             path_to_osm_pbf = os.path.join(osm_pbf_dir, osm_pbf_filename_)
 
-        if not os.path.isfile(path_to_osm_pbf):
+        if is_remote_path(path_to_osm_pbf):
+            if get_remote_file_size(path_to_osm_pbf) is None:
+                path_to_osm_pbf = None
+
+        elif not os.path.isfile(path_to_osm_pbf):
             path_to_osm_pbf = None
 
         return path_to_osm_pbf
@@ -1337,7 +4239,10 @@ class GeofabrikReader:
                      parse_raw_feat=False, transform_geom=False,
                      transform_other_tags=False, update=False,
                      download_confirmation_required=True, pickle_it=False,
-                     ret_pickle_path=False, rm_osm_pbf=False, verbose=False):
+                     ret_pickle_path=False, rm_osm_pbf=False, verbose=False,
+                     spatial_keys=None, spatial_key_level=None, measures=None,
+                     repair_geom=False, geometry=True, layer_names=None, columns=None,
+                     tag_schema=None, target_crs=None, **kwargs):
         """
         Read a PBF (.osm.pbf) data file of a geographic region.
 
@@ -1345,7 +4250,11 @@ class GeofabrikReader:
             on Geofabrik's free download server
         :type subregion_name: str
         :param data_dir: directory where the .osm.pbf data file is located/saved;
-            if ``None``, the default local directory
+            if ``None``, the default local directory; if it is a URL, e.g.
+            ``'s3://bucket/prefix'``, the data file is read where it is (by ranges,
+            see also :py:func:`gdal_vsi_configurations()
+            <pydriosm.settings.gdal_vsi_configurations>`), with the pickle file
+            in the default local directory
         :type data_dir: str or None
         :param chunk_size_limit: threshold (in MB) that triggers the use of chunk parser,
             defaults to ``50``; if the size of the .osm.pbf file (in MB) is greater than
@@ -1379,6 +4288,50 @@ class GeofabrikReader:
         :param verbose: whether to print relevant information in console as
             the function runs, defaults to ``False``
         :type verbose: bool or int
+        :param spatial_keys: (when ``parse_raw_feat=True``) type of a grid key,
+            ``'quadkey'`` or ``'geohash'``, to be added together with bounding box
+            columns to each layer; if ``None`` (default), none is added,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type spatial_keys: str or None
+        :param spatial_key_level: level of the grid key, defaults to ``None``
+        :type spatial_key_level: int or None
+        :param measures: (when ``parse_raw_feat=True``) method of computing lengths
+            and areas, ``'geodesic'`` or ``'utm'``, to be added as columns to each layer;
+            if ``None`` (default), none is added,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type measures: str or None
+        :param repair_geom: whether to validate the geometries of the parsed data
+            and repair the invalid ones (see :py:func:`repair_geometries()
+            <pydriosm.reader.repair_geometries>`), defaults to ``False``;
+            the repair is made after the data is loaded or pickled, so that
+            the pickle file always holds the data as parsed
+        :type repair_geom: bool
+        :param geometry: whether to read the geometries of the features,
+            defaults to ``True``; if ``False``, only the IDs and tags are read,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type geometry: bool
+        :param layer_names: name of a layer, e.g. ``'points'``, or names of multiple
+            layers to be read; if ``None`` (default), all the layers,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type layer_names: str or list or None
+        :param columns: name of a field, e.g. ``'name'``, or names of multiple fields
+            (of tags) to be read, in addition to the IDs and geometries;
+            if ``None`` (default), all the fields,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type columns: str or list or None
+        :param tag_schema: schema of tags to be extracted into typed columns
+            (see :py:func:`extract_typed_tags()<pydriosm.reader.extract_typed_tags>`),
+            e.g. ``get_default_tag_schema()``; if ``None`` (default), none is extracted;
+            the tags are extracted after the data is loaded or pickled, so that
+            the pickle file always holds the data as parsed
+        :type tag_schema: dict or None
+        :param target_crs: (when ``parse_raw_feat=True``) the CRS to which
+            the coordinates are reprojected, e.g. ``'EPSG:27700'``; if ``None`` (default),
+            WGS84 is kept,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type target_crs: str or int or dict or pyproj.CRS or None
+        :param kwargs: optional parameters of
+            :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
         :return: dictionary of the .osm.pbf data; when ``pickle_it=True``,
             return a tuple of the dictionary and an absolute path to the pickle file
         :rtype: dict or tuple or None
@@ -1462,28 +4415,49 @@ class GeofabrikReader:
 
         osm_file_format = ".osm.pbf"
 
+        assert geometry or not (spatial_keys or measures), \
+            "`spatial_keys` and `measures` are computed from the geometries and " \
+            "cannot be added when `geometry=False`."
+
         assert isinstance(chunk_size_limit, int) or chunk_size_limit is None
 
         osm_pbf_filename, path_to_osm_pbf = self.Downloader.get_default_path_to_osm_file(
             subregion_name, osm_file_format=osm_file_format, mkdir=False)
 
         if osm_pbf_filename and path_to_osm_pbf:
-            if not data_dir:  # Go to default file path
+            if not data_dir or is_remote_path(data_dir):  # Go to default file path
                 path_to_osm_pbf = path_to_osm_pbf
             else:
                 osm_pbf_dir = validate_input_data_dir(data_dir)
                 path_to_osm_pbf = os.path.join(osm_pbf_dir, osm_pbf_filename)
 
-            path_to_pickle = path_to_osm_pbf.replace(
-                osm_file_format, "-pbf.pickle" if parse_raw_feat else "-raw.pickle")
+            path_to_pickle = make_path_to_pickle(
+                path_to_osm_pbf.replace(
+                    osm_file_format, "-pbf.pickle" if parse_raw_feat else "-raw.pickle"),
+                geometry=geometry, layer_names=layer_names, columns=columns,
+                **(dict(target_crs=target_crs, spatial_keys=spatial_keys,
+                        spatial_key_level=spatial_key_level, measures=measures)
+                   if parse_raw_feat else {}))
             if os.path.isfile(path_to_pickle) and not update:
                 osm_pbf_data = load_pickle(path_to_pickle)
+                if columns:
+                    osm_pbf_data = select_layer_columns(osm_pbf_data, columns)
+
+                if repair_geom and geometry:
+                    osm_pbf_data = repair_geometries(osm_pbf_data, verbose=verbose)
+                if tag_schema:
+                    osm_pbf_data = {
+                        k: v if v.shape[1] == 1 else extract_typed_tags(v, tag_schema)
+                        for k, v in osm_pbf_data.items()}
 
                 if ret_pickle_path:
                     osm_pbf_data = osm_pbf_data, path_to_pickle
 
             else:
-                if not os.path.isfile(path_to_osm_pbf) or update:
+                if is_remote_path(data_dir):  # Read the remote file where it is
+                    path_to_osm_pbf = data_dir.rstrip('/') + '/' + osm_pbf_filename
+
+                elif not os.path.isfile(path_to_osm_pbf) or update:
                     # If the target file is not available, try downloading it first.
                     self.Downloader.download_osm_data(
                         subregion_name, osm_file_format=osm_file_format,
@@ -1501,16 +4475,26 @@ class GeofabrikReader:
                     osm_pbf_data = parse_osm_pbf(
                         path_to_osm_pbf, number_of_chunks=number_of_chunks,
                         parse_raw_feat=parse_raw_feat, transform_geom=transform_geom,
-                        transform_other_tags=transform_other_tags)
+                        transform_other_tags=transform_other_tags,
+                        spatial_keys=spatial_keys, spatial_key_level=spatial_key_level,
+                        measures=measures, layer_names=layer_names, columns=columns,
+                        geometry=geometry, target_crs=target_crs, **kwargs)
                     print("Done. ") if verbose and parse_raw_feat else ""
 
-                    if pickle_it:
+                    if pickle_it:  # (The data is pickled as parsed)
                         save_pickle(osm_pbf_data, path_to_pickle, verbose=verbose)
 
-                        if ret_pickle_path:
-                            osm_pbf_data = osm_pbf_data, path_to_pickle
+                    if repair_geom and geometry:
+                        osm_pbf_data = repair_geometries(osm_pbf_data, verbose=verbose)
+                    if tag_schema:
+                        osm_pbf_data = {
+                            k: v if v.shape[1] == 1 else extract_typed_tags(v, tag_schema)
+                            for k, v in osm_pbf_data.items()}
+
+                    if pickle_it and ret_pickle_path:
+                        osm_pbf_data = osm_pbf_data, path_to_pickle
 
-                    if rm_osm_pbf:
+                    if rm_osm_pbf and not is_remote_path(path_to_osm_pbf):
                         remove_subregion_osm_file(path_to_osm_pbf, verbose=verbose)
 
                 except Exception as e:
@@ -1522,6 +4506,117 @@ class GeofabrikReader:
         else:
             print("Errors occur. Data might not be available for the \"subregion_name\".")
 
+    def read_osm_bz2(self, subregion_name, data_dir=None, max_workers=None, update=False,
+                     download_confirmation_required=True, pickle_it=False,
+                     ret_pickle_path=False, rm_osm_bz2=False, verbose=False):
+        """
+        Read a .osm.bz2 (OSM XML) data file of a geographic region.
+
+        :param subregion_name: name of a geographic region (case-insensitive) available
+            on Geofabrik's free download server
+        :type subregion_name: str
+        :param data_dir: directory where the .osm.bz2 data file is located/saved;
+            if ``None``, the default local directory
+        :type data_dir: str or None
+        :param max_workers: number of threads for decompressing the data;
+            if ``None`` (default), the number of processors
+        :type max_workers: int or None
+        :param update: whether to check to update pickle backup (if available),
+            defaults to ``False``
+        :type update: bool
+        :param download_confirmation_required: whether to ask for confirmation before
+            starting to download a file, defaults to ``True``
+        :type download_confirmation_required: bool
+        :param pickle_it: whether to save the parsed data as a .pickle file,
+            defaults to ``False``
+        :type pickle_it: bool
+        :param ret_pickle_path: whether to return an absolute path to
+            the saved pickle file (when ``pickle_it=True``)
+        :type ret_pickle_path: bool
+        :param rm_osm_bz2: whether to delete the downloaded .osm.bz2 file,
+            defaults to ``False``
+        :type rm_osm_bz2: bool
+        :param verbose: whether to print relevant information in console
+            as the function runs, defaults to ``False``
+        :type verbose: bool or int
+        :return: dictionary of the parsed data (in the same form as the output of
+            :py:meth:`GeofabrikReader.read_osm_pbf()
+            <pydriosm.reader.GeofabrikReader.read_osm_pbf>` with ``parse_raw_feat=True``);
+            when ``ret_pickle_path=True``, return a tuple of the dictionary and
+            an absolute path to the pickle file
+        :rtype: dict or tuple or None
+
+        .. seealso::
+
+            - :py:func:`parse_osm_xml()<pydriosm.reader.parse_osm_xml>`
+
+        **Example**::
+
+            >>> from pydriosm.reader import GeofabrikReader
+
+            >>> geofabrik_reader = GeofabrikReader()
+
+            >>> sr_name = 'Rutland'
+
+            >>> rutland_osm = geofabrik_reader.read_osm_bz2(
+            ...     sr_name, data_dir="tests", download_confirmation_required=False,
+            ...     verbose=True)
+            Parsing "\\tests\\rutland-latest.osm.bz2" ... Done.
+
+            >>> print(list(rutland_osm.keys()))
+            ['points', 'lines', 'multilinestrings', 'multipolygons', 'other_relations']
+        """
+
+        osm_file_format = ".osm.bz2"
+
+        osm_bz2_filename, path_to_osm_bz2 = self.Downloader.get_default_path_to_osm_file(
+            subregion_name, osm_file_format=osm_file_format, mkdir=False)
+
+        if osm_bz2_filename and path_to_osm_bz2:
+            if data_dir:
+                osm_bz2_dir = validate_input_data_dir(data_dir)
+                path_to_osm_bz2 = os.path.join(osm_bz2_dir, osm_bz2_filename)
+
+            path_to_pickle = path_to_osm_bz2.replace(osm_file_format, "-bz2.pickle")
+            if os.path.isfile(path_to_pickle) and not update:
+                osm_bz2_data = load_pickle(path_to_pickle)
+
+                if ret_pickle_path:
+                    osm_bz2_data = osm_bz2_data, path_to_pickle
+
+            else:
+                if not os.path.isfile(path_to_osm_bz2) or update:
+                    self.Downloader.download_osm_data(
+                        subregion_name, osm_file_format=osm_file_format,
+                        download_dir=data_dir, update=update,
+                        confirmation_required=download_confirmation_required,
+                        verbose=False)
+
+                if verbose:
+                    print("Parsing \"\\{}\"".format(os.path.relpath(path_to_osm_bz2)),
+                          end=" ... ")
+                try:
+                    osm_bz2_data = parse_osm_xml(path_to_osm_bz2, max_workers=max_workers)
+                    print("Done. ") if verbose else ""
+
+                    if pickle_it:
+                        save_pickle(osm_bz2_data, path_to_pickle, verbose=verbose)
+
+                        if ret_pickle_path:
+                            osm_bz2_data = osm_bz2_data, path_to_pickle
+
+                    if rm_osm_bz2:
+                        remove_subregion_osm_file(path_to_osm_bz2, verbose=verbose)
+
+                except Exception as e:
+                    print("Failed. {}".format(e))
+                    osm_bz2_data = None
+
+            return osm_bz2_data
+
+        else:
+            print("Errors occur. Data might not be available for the \"subregion_name\".")
+
     def get_path_to_osm_shp(self, subregion_name, layer_name=None, feature_name=None,
                             data_dir=None, file_ext=".shp"):
         """
@@ -1819,7 +4914,9 @@ class GeofabrikReader:
     def read_shp_zip(self, subregion_name, layer_names=None, feature_names=None,
                      data_dir=None, update=False, download_confirmation_required=True,
                      pickle_it=False, ret_pickle_path=False, rm_extracts=False,
-                     rm_shp_zip=False, verbose=False):
+                     rm_shp_zip=False, verbose=False, spatial_keys=None,
+                     spatial_key_level=None, measures=None, repair_geom=False,
+                     geometry=True, columns=None, target_crs=None, **kwargs):
         """
         Read a .shp.zip data file of a geographic region.
 
@@ -1834,7 +4931,12 @@ class GeofabrikReader:
             if ``None`` (default), all available features
         :type feature_names: str or list or None
         :param data_dir: directory where the .shp.zip data file is located/saved;
-            if ``None``, the default directory
+            if ``None``, the default directory; if it is a URL, e.g.
+            ``'s3://bucket/prefix'``, the layers are read from the archive where it is,
+            by ranges and without being extracted (which requires the default
+            ``method='geopandas'`` of :py:func:`read_shp_file()
+            <pydriosm.reader.read_shp_file>`), with the pickle file
+            in the default directory
         :type data_dir: str or None
         :param update: whether to check to update pickle backup (if available),
             defaults to ``False``
@@ -1857,6 +4959,37 @@ class GeofabrikReader:
         :param verbose: whether to print relevant information in console
             as the function runs, defaults to ``False``
         :type verbose: bool or int
+        :param spatial_keys: type of a grid key, ``'quadkey'`` or ``'geohash'``,
+            to be added together with bounding box columns to each layer;
+            if ``None`` (default), none is added,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type spatial_keys: str or None
+        :param spatial_key_level: level of the grid key, defaults to ``None``
+        :type spatial_key_level: int or None
+        :param measures: method of computing lengths and areas, ``'geodesic'`` or
+            ``'utm'``, to be added as columns to each layer; if ``None`` (default),
+            none is added,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type measures: str or None
+        :param repair_geom: whether to validate the geometries of the shapefile data
+            and repair the invalid ones (see :py:func:`repair_geometries()
+            <pydriosm.reader.repair_geometries>`), defaults to ``False``;
+            the repair is made after the data is loaded or pickled, so that
+            the pickle file always holds the data as parsed
+        :type repair_geom: bool
+        :param geometry: whether to read the geometries of the features,
+            defaults to ``True``; if ``False``, only the attributes are read
+        :type geometry: bool
+        :param columns: name of a field, e.g. ``'name'``, or names of multiple fields
+            to be read; if ``None`` (default), all the fields,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type columns: str or list or None
+        :param target_crs: the CRS to which the geometries are reprojected,
+            e.g. ``'EPSG:27700'``; if ``None`` (default), no reprojection is made,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type target_crs: str or int or dict or pyproj.CRS or None
+        :param kwargs: optional parameters of
+            :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
         :return: dictionary of the shapefile data,
             with keys and values being layer names and
             tabular data (in the format of `geopandas.GeoDataFrame`_), respectively
@@ -1975,6 +5108,10 @@ class GeofabrikReader:
 
         osm_file_format = ".shp.zip"
 
+        assert geometry or not (spatial_keys or measures), \
+            "`spatial_keys` and `measures` are computed from the geometries and " \
+            "cannot be added when `geometry=False`."
+
         shp_zip_filename, path_to_shp_zip = self.Downloader.get_default_path_to_osm_file(
             subregion_name=subregion_name, osm_file_format=osm_file_format, mkdir=False)
 
@@ -1992,7 +5129,9 @@ class GeofabrikReader:
 
         if shp_zip_filename and path_to_shp_zip:
             path_to_extract_dir = os.path.splitext(path_to_shp_zip)[0].replace(".", "-")
-            if data_dir:
+            if is_remote_path(data_dir):  # e.g. in an object storage
+                path_to_shp_zip = data_dir.rstrip('/') + '/' + shp_zip_filename
+            elif data_dir:
                 shp_zip_dir = validate_input_data_dir(data_dir)
                 path_to_shp_zip = cd(shp_zip_dir, shp_zip_filename)
                 path_to_extract_dir = cd(shp_zip_dir,
@@ -2008,16 +5147,42 @@ class GeofabrikReader:
                                         sub_fname + "-shp.pickle")
             else:
                 path_to_shp_pickle = path_to_extract_dir + ".pickle"
+            path_to_shp_pickle = make_path_to_pickle(
+                path_to_shp_pickle, geometry=geometry, columns=columns,
+                target_crs=target_crs if geometry else None, spatial_keys=spatial_keys,
+                spatial_key_level=spatial_key_level, measures=measures)
 
             if os.path.isfile(path_to_shp_pickle) and not update:
                 shp_data = load_pickle(path_to_shp_pickle)
+                if columns:
+                    shp_data = select_layer_columns(shp_data, columns)
+
+                if repair_geom and geometry:
+                    shp_data = repair_geometries(shp_data, verbose=verbose)
 
                 if ret_pickle_path:
                     shp_data = shp_data, path_to_shp_pickle
 
             else:
+                if is_remote_path(path_to_shp_zip):
+                    import gdal
+
+                    # Read the layers in the remote archive, without extracting them
+                    shp_filenames = [
+                        x for x in gdal.ReadDir(get_vsi_path(path_to_shp_zip, member=''))
+                        or [] if x.endswith(".shp")]
+
+                    if not layer_names_:
+                        layer_names_ = list(set(find_shp_layer_name(x)
+                                                for x in shp_filenames))
+
+                    paths_to_layers_shp = [
+                        [get_vsi_path(path_to_shp_zip, member=x) for x in shp_filenames
+                         if x.startswith("gis_osm_{}_".format(layer_name))]
+                        for layer_name in layer_names_]
+
                 # Download the requested OSM file urlretrieve(download_url, file_path)
-                if not os.path.exists(path_to_extract_dir):
+                elif not os.path.exists(path_to_extract_dir):
                     if not os.path.exists(path_to_shp_zip):
                         self.Downloader.download_osm_data(
                             subregion_name, osm_file_format=osm_file_format,
@@ -2063,24 +5228,34 @@ class GeofabrikReader:
                     if not layer_names_:
                         layer_names_ = layer_names_temp
 
-                paths_to_layers_shp = [
-                    glob.glob(
-                        cd(path_to_extract_dir, r"gis_osm_{}_*.shp".format(layer_name)))
-                    for layer_name in layer_names_]
+                if not is_remote_path(path_to_shp_zip):
+                    paths_to_layers_shp = [
+                        glob.glob(cd(path_to_extract_dir,
+                                     r"gis_osm_{}_*.shp".format(layer_name)))
+                        for layer_name in layer_names_]
                 paths_to_layers_shp = [x for x in paths_to_layers_shp if x]
 
-                shp_data_ = [parse_layer_shp(p, feature_names=feature_names_)
-                             for p in paths_to_layers_shp]
+                shp_data_ = [
+                    parse_layer_shp(p, feature_names=feature_names_,
+                                    spatial_keys=spatial_keys,
+                                    spatial_key_level=spatial_key_level,
+                                    measures=measures, geometry=geometry, columns=columns,
+                                    target_crs=target_crs, **kwargs)
+                    for p in paths_to_layers_shp]
 
                 shp_data = dict(zip(layer_names_, shp_data_))
 
-                if pickle_it:
+                if pickle_it:  # (The data is pickled as parsed, before any repair)
                     save_pickle(shp_data, path_to_shp_pickle, verbose=verbose)
 
-                    if ret_pickle_path:
-                        shp_data = shp_data, path_to_shp_pickle
+                if repair_geom and geometry:
+                    shp_data = repair_geometries(shp_data, verbose=verbose)
 
-                if os.path.exists(path_to_extract_dir) and rm_extracts:
+                if pickle_it and ret_pickle_path:
+                    shp_data = shp_data, path_to_shp_pickle
+
+                if os.path.exists(path_to_extract_dir) and rm_extracts and \
+                        not is_remote_path(path_to_shp_zip):
                     if verbose:
                         print("Deleting the extracts \"\\{}\" ".format(
                             os.path.relpath(path_to_extract_dir)), end=" ... ")
@@ -2187,7 +5362,10 @@ class BBBikeReader:
                      parse_raw_feat=False, transform_geom=False,
                      transform_other_tags=False, update=False,
                      download_confirmation_required=True, pickle_it=False,
-                     ret_pickle_path=False, rm_osm_pbf=False, verbose=False):
+                     ret_pickle_path=False, rm_osm_pbf=False, verbose=False,
+                     spatial_keys=None, spatial_key_level=None, measures=None,
+                     repair_geom=False, geometry=True, layer_names=None, columns=None,
+                     tag_schema=None, target_crs=None, **kwargs):
         """
         Read a PBF data file of a geographic region.
 
@@ -2195,7 +5373,10 @@ class BBBikeReader:
             on BBBike's free download server
         :type subregion_name: str
         :param data_dir: directory where the PBF data file is saved;
-            if ``None`` (default), the default directory
+            if ``None`` (default), the default directory; if it is a URL, e.g.
+            ``'s3://bucket/prefix'``, the data file is read where it is,
+            see also :py:meth:`GeofabrikReader.read_osm_pbf()
+            <pydriosm.reader.GeofabrikReader.read_osm_pbf>`
         :type data_dir: str or None
         :param chunk_size_limit: threshold (in MB) that triggers the use of chunk parser,
             defaults to ``50``; if the size of the .osm.pbf file (in MB) is greater than
@@ -2229,6 +5410,50 @@ class BBBikeReader:
         :param verbose: whether to print relevant information in console
             as the function runs, defaults to ``False``
         :type verbose: bool or int
+        :param spatial_keys: (when ``parse_raw_feat=True``) type of a grid key,
+            ``'quadkey'`` or ``'geohash'``, to be added together with bounding box
+            columns to each layer; if ``None`` (default), none is added,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type spatial_keys: str or None
+        :param spatial_key_level: level of the grid key, defaults to ``None``
+        :type spatial_key_level: int or None
+        :param measures: (when ``parse_raw_feat=True``) method of computing lengths
+            and areas, ``'geodesic'`` or ``'utm'``, to be added as columns to each layer;
+            if ``None`` (default), none is added,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type measures: str or None
+        :param repair_geom: whether to validate the geometries of the parsed data
+            and repair the invalid ones (see :py:func:`repair_geometries()
+            <pydriosm.reader.repair_geometries>`), defaults to ``False``;
+            the repair is made after the data is loaded or pickled, so that
+            the pickle file always holds the data as parsed
+        :type repair_geom: bool
+        :param geometry: whether to read the geometries of the features,
+            defaults to ``True``; if ``False``, only the IDs and tags are read,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type geometry: bool
+        :param layer_names: name of a layer, e.g. ``'points'``, or names of multiple
+            layers to be read; if ``None`` (default), all the layers,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type layer_names: str or list or None
+        :param columns: name of a field, e.g. ``'name'``, or names of multiple fields
+            (of tags) to be read, in addition to the IDs and geometries;
+            if ``None`` (default), all the fields,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type columns: str or list or None
+        :param tag_schema: schema of tags to be extracted into typed columns
+            (see :py:func:`extract_typed_tags()<pydriosm.reader.extract_typed_tags>`),
+            e.g. ``get_default_tag_schema()``; if ``None`` (default), none is extracted;
+            the tags are extracted after the data is loaded or pickled, so that
+            the pickle file always holds the data as parsed
+        :type tag_schema: dict or None
+        :param target_crs: (when ``parse_raw_feat=True``) the CRS to which
+            the coordinates are reprojected, e.g. ``'EPSG:27700'``; if ``None`` (default),
+            WGS84 is kept,
+            see also :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
+        :type target_crs: str or int or dict or pyproj.CRS or None
+        :param kwargs: optional parameters of
+            :py:func:`parse_osm_pbf()<pydriosm.reader.parse_osm_pbf>`
         :return: dictionary of the .osm.pbf data; when ``pickle_it=True``,
             return a tuple of the dictionary and an absolute path to the pickle file
         :rtype: dict or tuple or None
@@ -2269,23 +5494,47 @@ class BBBikeReader:
             >>> os.remove(cd(data_dir, "Leeds.osm.pbf"))
         """
 
+        assert geometry or not (spatial_keys or measures), \
+            "`spatial_keys` and `measures` are computed from the geometries and " \
+            "cannot be added when `geometry=False`."
+
         assert isinstance(chunk_size_limit, int) or chunk_size_limit is None
 
         osm_file_format = ".osm.pbf"
 
-        path_to_osm_pbf = self.get_path_to_osm_file(subregion_name, osm_file_format,
-                                                    data_dir)
-
-        path_to_pickle = path_to_osm_pbf.replace(
-            ".osm.pbf", "-pbf.pickle" if parse_raw_feat else "-raw.pickle")
+        # (The pickle file of remote data is in the default directory)
+        path_to_osm_pbf = self.get_path_to_osm_file(
+            subregion_name, osm_file_format,
+            None if is_remote_path(data_dir) else data_dir)
+
+        path_to_pickle = make_path_to_pickle(
+            path_to_osm_pbf.replace(
+                ".osm.pbf", "-pbf.pickle" if parse_raw_feat else "-raw.pickle"),
+            geometry=geometry, layer_names=layer_names, columns=columns,
+            **(dict(target_crs=target_crs, spatial_keys=spatial_keys,
+                    spatial_key_level=spatial_key_level, measures=measures)
+               if parse_raw_feat else {}))
         if os.path.isfile(path_to_pickle) and not update:
             osm_pbf_data = load_pickle(path_to_pickle)
+            if columns:
+                osm_pbf_data = select_layer_columns(osm_pbf_data, columns)
+
+            if repair_geom and geometry:
+                osm_pbf_data = repair_geometries(osm_pbf_data, verbose=verbose)
+            if tag_schema:
+                osm_pbf_data = {
+                    k: v if v.shape[1] == 1 else extract_typed_tags(v, tag_schema)
+                    for k, v in osm_pbf_data.items()}
 
             if ret_pickle_path:
                 osm_pbf_data = osm_pbf_data, path_to_pickle
 
         else:
-            if not os.path.isfile(path_to_osm_pbf):
+            if is_remote_path(data_dir):  # Read the remote file where it is
+                path_to_osm_pbf = \
+                    data_dir.rstrip('/') + '/' + os.path.basename(path_to_osm_pbf)
+
+            elif not os.path.isfile(path_to_osm_pbf):
                 path_to_osm_pbf = self.Downloader.download_osm_data(
                     subregion_name, osm_file_format=osm_file_format,
                     download_dir=data_dir,
@@ -2304,17 +5553,29 @@ class BBBikeReader:
                                              number_of_chunks=number_of_chunks,
                                              parse_raw_feat=parse_raw_feat,
                                              transform_geom=transform_geom,
-                                             transform_other_tags=transform_other_tags)
+                                             transform_other_tags=transform_other_tags,
+                                             spatial_keys=spatial_keys,
+                                             spatial_key_level=spatial_key_level,
+                                             measures=measures, layer_names=layer_names,
+                                             columns=columns, geometry=geometry,
+                                             target_crs=target_crs, **kwargs)
 
                 print("Done. ") if verbose and parse_raw_feat else ""
 
-                if pickle_it:
+                if pickle_it:  # (The data is pickled as parsed)
                     save_pickle(osm_pbf_data, path_to_pickle, verbose=verbose)
 
-                    if ret_pickle_path:
-                        osm_pbf_data = osm_pbf_data, path_to_pickle
+                if repair_geom and geometry:
+                    osm_pbf_data = repair_geometries(osm_pbf_data, verbose=verbose)
+                if tag_schema:
+                    osm_pbf_data = {
+                        k: v if v.shape[1] == 1 else extract_typed_tags(v, tag_schema)
+                        for k, v in osm_pbf_data.items()}
 
-                if rm_osm_pbf:
+                if pickle_it and ret_pickle_path:
+                    osm_pbf_data = osm_pbf_data, path_to_pickle
+
+                if rm_osm_pbf and not is_remote_path(path_to_osm_pbf):
                     remove_subregion_osm_file(path_to_osm_pbf, verbose=verbose)
 
             except Exception as e:
@@ -2323,10 +5584,113 @@ class BBBikeReader:
 
         return osm_pbf_data
 
+    def read_osm_gz(self, subregion_name, data_dir=None, update=False,
+                    download_confirmation_required=True, pickle_it=False,
+                    ret_pickle_path=False, rm_osm_gz=False, verbose=False):
+        """
+        Read a .osm.gz (OSM XML) data file of a geographic region.
+
+        :param subregion_name: name of a geographic region (case-insensitive) available
+            on BBBike's free download server
+        :type subregion_name: str
+        :param data_dir: directory where the .osm.gz data file is saved;
+            if ``None`` (default), the default directory
+        :type data_dir: str or None
+        :param update: whether to check to update pickle backup (if available),
+            defaults to ``False``
+        :type update: bool
+        :param download_confirmation_required: whether to ask for confirmation
+            before starting to download a file, defaults to ``True``
+        :type download_confirmation_required: bool
+        :param pickle_it: whether to save the parsed data as a .pickle file,
+            defaults to ``False``
+        :type pickle_it: bool
+        :param ret_pickle_path: whether to return an absolute path to
+            the saved pickle file (when ``pickle_it=True``)
+        :type ret_pickle_path: bool
+        :param rm_osm_gz: whether to delete the downloaded .osm.gz file,
+            defaults to ``False``
+        :type rm_osm_gz: bool
+        :param verbose: whether to print relevant information in console
+            as the function runs, defaults to ``False``
+        :type verbose: bool or int
+        :return: dictionary of the parsed data (in the same form as the output of
+            :py:meth:`BBBikeReader.read_osm_pbf()
+            <pydriosm.reader.BBBikeReader.read_osm_pbf>` with ``parse_raw_feat=True``);
+            when ``ret_pickle_path=True``, return a tuple of the dictionary and
+            an absolute path to the pickle file
+        :rtype: dict or tuple or None
+
+        .. seealso::
+
+            - :py:func:`parse_osm_xml()<pydriosm.reader.parse_osm_xml>`
+
+        **Example**::
+
+            >>> from pydriosm.reader import BBBikeReader
+
+            >>> bbbike_reader = BBBikeReader()
+
+            >>> sr_name = 'Leeds'
+
+            >>> leeds_osm = bbbike_reader.read_osm_gz(sr_name, data_dir="tests",
+            ...                                       verbose=True)
+            Parsing "\\tests\\Leeds.osm.gz" ... Done.
+
+            >>> print(list(leeds_osm.keys()))
+            ['points', 'lines', 'multilinestrings', 'multipolygons', 'other_relations']
+        """
+
+        osm_file_format = ".osm.gz"
+
+        path_to_osm_gz = self.get_path_to_osm_file(subregion_name, osm_file_format,
+                                                   data_dir)
+
+        path_to_pickle = path_to_osm_gz.replace(osm_file_format, "-gz.pickle")
+        if os.path.isfile(path_to_pickle) and not update:
+            osm_gz_data = load_pickle(path_to_pickle)
+
+            if ret_pickle_path:
+                osm_gz_data = osm_gz_data, path_to_pickle
+
+        else:
+            if not os.path.isfile(path_to_osm_gz):
+                path_to_osm_gz = self.Downloader.download_osm_data(
+                    subregion_name, osm_file_format=osm_file_format,
+                    download_dir=data_dir,
+                    confirmation_required=download_confirmation_required, verbose=verbose,
+                    ret_download_path=True)
+
+            if verbose:
+                print("Parsing \"\\{}\"".format(os.path.relpath(path_to_osm_gz)),
+                      end=" ... ")
+
+            try:
+                osm_gz_data = parse_osm_xml(path_to_osm_gz)
+
+                print("Done. ") if verbose else ""
+
+                if pickle_it:
+                    save_pickle(osm_gz_data, path_to_pickle, verbose=verbose)
+
+                    if ret_pickle_path:
+                        osm_gz_data = osm_gz_data, path_to_pickle
+
+                if rm_osm_gz:
+                    remove_subregion_osm_file(path_to_osm_gz, verbose=verbose)
+
+            except Exception as e:
+                print("Failed. {}".format(e))
+                osm_gz_data = None
+
+        return osm_gz_data
+
     def read_shp_zip(self, subregion_name, layer_names=None, feature_names=None,
                      data_dir=None, update=False, download_confirmation_required=True,
                      pickle_it=False, ret_pickle_path=False, rm_extracts=False,
-                     rm_shp_zip=False, verbose=False):
+                     rm_shp_zip=False, verbose=False, spatial_keys=None,
+                     spatial_key_level=None, measures=None, repair_geom=False,
+                     geometry=True, columns=None, target_crs=None, **kwargs):
         """
         Read a shapefile of a geographic region.
 
@@ -2363,6 +5727,37 @@ class BBBikeReader:
         :param verbose: whether to print relevant information in console
             as the function runs, defaults to ``False``
         :type verbose: bool or int
+        :param spatial_keys: type of a grid key, ``'quadkey'`` or ``'geohash'``,
+            to be added together with bounding box columns to each layer;
+            if ``None`` (default), none is added,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type spatial_keys: str or None
+        :param spatial_key_level: level of the grid key, defaults to ``None``
+        :type spatial_key_level: int or None
+        :param measures: method of computing lengths and areas, ``'geodesic'`` or
+            ``'utm'``, to be added as columns to each layer; if ``None`` (default),
+            none is added,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type measures: str or None
+        :param repair_geom: whether to validate the geometries of the shapefile data
+            and repair the invalid ones (see :py:func:`repair_geometries()
+            <pydriosm.reader.repair_geometries>`), defaults to ``False``;
+            the repair is made after the data is loaded or pickled, so that
+            the pickle file always holds the data as parsed
+        :type repair_geom: bool
+        :param geometry: whether to read the geometries of the features,
+            defaults to ``True``; if ``False``, only the attributes are read
+        :type geometry: bool
+        :param columns: name of a field, e.g. ``'name'``, or names of multiple fields
+            to be read; if ``None`` (default), all the fields,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type columns: str or list or None
+        :param target_crs: the CRS to which the geometries are reprojected,
+            e.g. ``'EPSG:27700'``; if ``None`` (default), no reprojection is made,
+            see also :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
+        :type target_crs: str or int or dict or pyproj.CRS or None
+        :param kwargs: optional parameters of
+            :py:func:`parse_layer_shp()<pydriosm.reader.parse_layer_shp>`
         :return: dictionary of the shapefile data, with keys and values being layer names
             and tabular data (in the format of `geopandas.GeoDataFrame`_), respectively;
             when ``pickle_it=True``, return a tuple of the dictionary and an absolute path
@@ -2474,6 +5869,10 @@ class BBBikeReader:
 
         osm_file_format = ".shp.zip"
 
+        assert geometry or not (spatial_keys or measures), \
+            "`spatial_keys` and `measures` are computed from the geometries and " \
+            "cannot be added when `geometry=False`."
+
         path_to_shp_zip = self.get_path_to_osm_file(subregion_name, osm_file_format,
                                                     data_dir)
 
@@ -2502,9 +5901,18 @@ class BBBikeReader:
                                     sub_fname + "-shp.pickle")
         else:
             path_to_shp_pickle = path_to_extract_dir_ + ".pickle"
+        path_to_shp_pickle = make_path_to_pickle(
+            path_to_shp_pickle, geometry=geometry, columns=columns,
+            target_crs=target_crs if geometry else None, spatial_keys=spatial_keys,
+            spatial_key_level=spatial_key_level, measures=measures)
 
         if os.path.isfile(path_to_shp_pickle) and not update:
             shp_data = load_pickle(path_to_shp_pickle)
+            if columns:
+                shp_data = select_layer_columns(shp_data, columns)
+
+            if repair_geom and geometry:
+                shp_data = repair_geometries(shp_data, verbose=verbose)
 
             if ret_pickle_path:
                 shp_data = shp_data, path_to_shp_pickle
@@ -2566,18 +5974,26 @@ class BBBikeReader:
                         itertools.chain.from_iterable(paths_to_layers_shp)))
                     print("Parsing \"\\{}\"".format(files_dir), end=" ... ")
 
-                shp_data_ = [parse_layer_shp(p, feature_names=feature_names_)
-                             for p in paths_to_layers_shp]
+                shp_data_ = [
+                    parse_layer_shp(p, feature_names=feature_names_,
+                                    spatial_keys=spatial_keys,
+                                    spatial_key_level=spatial_key_level,
+                                    measures=measures, geometry=geometry, columns=columns,
+                                    target_crs=target_crs, **kwargs)
+                    for p in paths_to_layers_shp]
 
                 shp_data = dict(zip(layer_names_, shp_data_))
 
                 print("Done. ") if verbose else ""
 
-                if pickle_it:
+                if pickle_it:  # (The data is pickled as parsed, before any repair)
                     save_pickle(shp_data, path_to_shp_pickle, verbose=verbose)
 
-                    if ret_pickle_path:
-                        shp_data = shp_data, path_to_shp_pickle
+                if repair_geom and geometry:
+                    shp_data = repair_geometries(shp_data, verbose=verbose)
+
+                if pickle_it and ret_pickle_path:
+                    shp_data = shp_data, path_to_shp_pickle
 
                 if rm_extracts and os.path.exists(path_to_extract_dir_):
                     if verbose:
@@ -2679,7 +6095,8 @@ class BBBikeReader:
         return csv_xz_data
 
     def read_geojson_xz(self, subregion_name, data_dir=None, fmt_geom=False,
-                        download_confirmation_required=True, verbose=False):
+                        download_confirmation_required=True, verbose=False,
+                        tag_schema=None):
         """
         Read a .geojson.xz data file of a geographic region.
 
@@ -2698,6 +6115,11 @@ class BBBikeReader:
         :param verbose: whether to print relevant information in console
             as the function runs, defaults to ``False``
         :type verbose: bool or int
+        :param tag_schema: schema of tags (of ``'properties'``) to be extracted into
+            typed columns (see :py:func:`extract_typed_tags()
+            <pydriosm.reader.extract_typed_tags>`), e.g. ``get_default_tag_schema()``;
+            if ``None`` (default), none is extracted
+        :type tag_schema: dict or None
         :return: tabular data of the .csv.xz file
         :rtype: pandas.DataFrame or None
 
@@ -2773,6 +6195,9 @@ class BBBikeReader:
         try:
             geojson_xz_data = parse_geojson_xz(path_to_geojson_xz, fmt_geom=fmt_geom)
 
+            if tag_schema:
+                geojson_xz_data = extract_typed_tags(geojson_xz_data, tag_schema)
+
             print("Done. ") if verbose else ""
 
         except Exception as e:
@@ -37,3 +37,82 @@ def gdal_configurations(reset=False, max_tmpfile_size=5000):
         gdal.SetConfigOption('USE_CUSTOM_INDEXING', 'YES')
         gdal.SetConfigOption('COMPRESS_NODES', 'NO')
         gdal.SetConfigOption('MAX_TMPFILE_SIZE', '100')
+
+
+def gdal_vsi_configurations(endpoint_url=None, access_key_id=None,
+                            secret_access_key=None, region=None, virtual_hosting=False,
+                            chunk_size=1024 ** 2, cache_size=256 * 1024 ** 2,
+                            reset=False):
+    """
+    Set `GDAL <https://gdal.org/index.html>`_ configurations for reading remote data
+    files, e.g. in an S3-compatible object storage (such as MinIO),
+    by their virtual paths.
+    See also [`GC-2 <https://gdal.org/user/virtual_file_systems.html#vsis3>`_].
+
+    Reads of a remote file are made by HTTP range requests of blocks of ``chunk_size``,
+    and consecutive ranges are merged (i.e. read ahead); the fetched blocks are cached
+    (up to ``cache_size``), so that only the touched blocks are fetched, and only once.
+
+    :param endpoint_url: URL of an S3-compatible storage, e.g. ``'http://localhost:9000'``
+        of a local MinIO server; if ``None`` (default), AWS S3
+    :type endpoint_url: str or None
+    :param access_key_id: access key ID; if ``None`` (default), that of the environment
+    :type access_key_id: str or None
+    :param secret_access_key: secret access key; if ``None`` (default),
+        that of the environment
+    :type secret_access_key: str or None
+    :param region: region of the storage; if ``None`` (default), that of the environment
+    :type region: str or None
+    :param virtual_hosting: whether to address buckets as virtual hosts
+        (rather than by paths, e.g. for MinIO), defaults to ``False``
+    :type virtual_hosting: bool
+    :param chunk_size: size (in bytes) of each block to be fetched,
+        defaults to ``1024 ** 2`` (i.e. 1 MB)
+    :type chunk_size: int
+    :param cache_size: size (in bytes) of the cache of the fetched blocks,
+        defaults to ``256 * 1024 ** 2`` (i.e. 256 MB)
+    :type cache_size: int
+    :param reset: reset to default settings, defaults to ``False``
+    :type reset: bool
+
+    **Example**::
+
+        >>> from pydriosm.settings import gdal_vsi_configurations
+
+        >>> gdal_vsi_configurations(endpoint_url='http://localhost:9000',
+        ...                         access_key_id='minioadmin',
+        ...                         secret_access_key='minioadmin')
+    """
+
+    import urllib.parse
+
+    import gdal
+
+    if not reset:
+        if endpoint_url:
+            endpoint = urllib.parse.urlparse(endpoint_url)
+            gdal.SetConfigOption('AWS_S3_ENDPOINT', endpoint.netloc or endpoint.path)
+            gdal.SetConfigOption('AWS_HTTPS',
+                                 'NO' if endpoint.scheme == 'http' else 'YES')
+        if access_key_id:
+            gdal.SetConfigOption('AWS_ACCESS_KEY_ID', access_key_id)
+        if secret_access_key:
+            gdal.SetConfigOption('AWS_SECRET_ACCESS_KEY', secret_access_key)
+        if region:
+            gdal.SetConfigOption('AWS_REGION', region)
+        gdal.SetConfigOption('AWS_VIRTUAL_HOSTING',
+                             'TRUE' if virtual_hosting else 'FALSE')
+        # Not to list the directory (e.g. a bucket) when a file is opened
+        gdal.SetConfigOption('GDAL_DISABLE_READDIR_ON_OPEN', 'EMPTY_DIR')
+        # Size of each range request and of the cache of fetched blocks
+        gdal.SetConfigOption('CPL_VSIL_CURL_CHUNK_SIZE', str(chunk_size))
+        gdal.SetConfigOption('CPL_VSIL_CURL_CACHE_SIZE', str(cache_size))
+        gdal.SetConfigOption('GDAL_HTTP_MERGE_CONSECUTIVE_RANGES', 'YES')
+        gdal.SetConfigOption('VSI_CACHE', 'TRUE')
+    else:
+        for key in ('AWS_S3_ENDPOINT', 'AWS_HTTPS', 'AWS_ACCESS_KEY_ID',
+                    'AWS_SECRET_ACCESS_KEY', 'AWS_REGION', 'AWS_VIRTUAL_HOSTING',
+                    'GDAL_DISABLE_READDIR_ON_OPEN', 'CPL_VSIL_CURL_CHUNK_SIZE',
+                    'CPL_VSIL_CURL_CACHE_SIZE', 'GDAL_HTTP_MERGE_CONSECUTIVE_RANGES',
+                    'VSI_CACHE'):
+            gdal.SetConfigOption(key, None)
@@ -0,0 +1,1251 @@
+"""
+Partitioning `OSM <https://www.openstreetmap.org/>`_ data extracts into tiles,
+simplifying their geometries for zoom levels, and generating vector tiles.
+"""
+
+import collections
+import concurrent.futures
+import gzip
+import itertools
+import os
+import pickle
+import re
+import sqlite3
+import struct
+import tempfile
+
+import numpy as np
+import pandas as pd
+import rapidjson
+from pyhelpers.store import load_pickle, save_pickle
+
+from .reader import diff_osm_pbf, get_layer_geometries, quadkey_encode, \
+    reproject_coordinates
+
+
+def quadkey_to_bbox(quadkey):
+    """
+    Get the bounding box of a (Web Mercator) tile given by its quadkey.
+
+    :param quadkey: quadkey of a tile, e.g. ``'0313113'``; ``''`` for the whole world
+    :type quadkey: str
+    :return: longitude and latitude bounds of the tile, i.e. (minx, miny, maxx, maxy)
+    :rtype: tuple
+
+    **Example**::
+
+        >>> from pydriosm.tiler import quadkey_to_bbox
+
+        >>> bbox = quadkey_to_bbox('0313113')
+
+        >>> print(tuple(round(x, 4) for x in bbox))
+        (-2.8125, 52.4828, 0.0, 54.1624)
+    """
+
+    tile_x, tile_y, level = 0, 0, len(quadkey)
+    for digit in quadkey:
+        tile_x, tile_y = 2 * tile_x + (int(digit) & 1), 2 * tile_y + (int(digit) >> 1)
+
+    n = 2 ** level
+
+    def tile_lat(y):
+        return np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y / n))))
+
+    bbox = (tile_x / n * 360.0 - 180.0, float(tile_lat(tile_y + 1)),
+            (tile_x + 1) / n * 360.0 - 180.0, float(tile_lat(tile_y)))
+
+    return bbox
+
+
+def partition_osm_data(osm_data, path_to_tile_dir, max_features=10000, max_level=18,
+                       verbose=False):
+    """
+    Partition parsed OSM data (or chunks of it) into adaptive quadtree tiles on disk.
+
+    Each feature is assigned to the tile containing the centre of its bounding box
+    (so that no feature is duplicated across tiles); and a tile is split into its four
+    children while it holds more than ``max_features`` features (of all layers)
+    and its level is below ``max_level``. The tile sizes are decided by counting
+    the features by prefixes of their quadkeys level by level, in a vectorized way.
+
+    The data is read in two passes: the quadkeys of all the features are counted in the
+    first one, and the features of each chunk are appended to the files of their tiles
+    in the second one, so that no more than a chunk (and a tile) of the data is held in
+    memory at a time. Chunks that can be iterated only once (e.g. a generator) are
+    spilled to temporary files in the directory between the two passes.
+
+    The data of each tile (a dictionary of the layers) is saved as a pickle file
+    named by its quadkey (``'root.pickle'`` for the single tile of the whole world);
+    and an index of the tiles is saved as ``'tile_index.pickle'`` in the directory.
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``) or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`,
+        or an iterable of chunks of such data (each of which is a dictionary of layers)
+    :type osm_data: dict or typing.Iterable[dict]
+    :param path_to_tile_dir: absolute path to a directory where the tiles are saved
+    :type path_to_tile_dir: str
+    :param max_features: maximum number of features in a tile
+        (unless the tile is at ``max_level``), defaults to ``10000``
+    :type max_features: int
+    :param max_level: maximum level (zoom) of the tiles, defaults to ``18``
+    :type max_level: int
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :return: index of the tiles, with the quadkey, level, bounds, file name and
+        numbers of features of each layer of each tile
+    :rtype: pandas.DataFrame
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.tiler import partition_osm_data, read_tile
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> sr_name = 'Rutland'
+
+        >>> rutland_pbf = geofabrik_reader.read_osm_pbf(
+        ...     sr_name, data_dir="tests", parse_raw_feat=True,
+        ...     download_confirmation_required=False)
+
+        >>> path_to_tile_dir = os.path.join("tests", "rutland-tiles")
+
+        >>> tile_index = partition_osm_data(rutland_pbf, path_to_tile_dir,
+        ...                                 max_features=5000)
+
+        >>> rutland_tile = read_tile(path_to_tile_dir, tile_index.quadkey[0])
+
+        >>> print(list(rutland_tile.keys()))
+        ['points', 'lines', 'multilinestrings', 'multipolygons', 'other_relations']
+
+        >>> # Chunks of the data
+        >>> rutland_chunks = ({k: v.iloc[i:i + 2000] for k, v in rutland_pbf.items()}
+        ...                   for i in range(0, 10000, 2000))
+
+        >>> tile_index_ = partition_osm_data(rutland_chunks, path_to_tile_dir,
+        ...                                  max_features=5000)
+
+        >>> print(tile_index_.quadkey.equals(tile_index.quadkey))
+        True
+    """
+
+    import shapely
+
+    assert 1 <= max_level <= 30, "`max_level` must be an integer between 1 and 30."
+
+    if isinstance(osm_data, dict):
+        osm_data = [osm_data]
+
+    os.makedirs(path_to_tile_dir, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix=".partition-", dir=path_to_tile_dir)
+
+    def get_quadkeys(layer_data, layer_name):
+        # Quadkeys (at the maximum level) of the centres of the features
+        geoms = get_layer_geometries(layer_data, geo_typ=layer_name)
+        bounds = shapely.bounds(geoms) if len(geoms) > 0 else np.empty((0, 4))
+        keys = quadkey_encode((bounds[:, 0] + bounds[:, 2]) / 2,
+                              (bounds[:, 1] + bounds[:, 3]) / 2, max_level)
+        return np.asarray(keys, dtype=object)
+
+    try:
+        # The first pass: count the features by their quadkeys
+        layer_names, templates, spilled = [], {}, []
+        key_counts = pd.Series(dtype='int64', index=pd.Index([], dtype=object))
+        for chunk in osm_data:
+            chunk_keys = {}
+            for layer_name, layer_data in chunk.items():
+                if layer_name not in templates:
+                    layer_names.append(layer_name)
+                    templates[layer_name] = layer_data.iloc[:0]
+
+                keys = get_quadkeys(layer_data, layer_name)
+                chunk_keys[layer_name] = keys
+                key_counts = key_counts.add(
+                    pd.Series(keys[pd.notnull(keys)]).value_counts(), fill_value=0)
+
+            if not isinstance(osm_data, (list, tuple)):  # The chunks can be read once
+                path_to_spill = os.path.join(
+                    temp_dir, "chunk{}.pickle".format(len(spilled)))
+                with open(path_to_spill, mode='wb') as f:
+                    pickle.dump((chunk, chunk_keys), f, protocol=pickle.HIGHEST_PROTOCOL)
+                spilled.append(path_to_spill)
+
+        # Split the tiles level by level
+        tile_keys, pending = [], key_counts.astype('int64')
+        for level in range(max_level + 1):
+            counts = pending.groupby(pending.index.str.slice(0, level)).sum()
+            is_leaf = (counts <= max_features) | (level == max_level)
+            tile_keys += counts.index[is_leaf].tolist()
+            pending = pending[
+                pending.index.str.slice(0, level).isin(counts.index[~is_leaf])]
+            if pending.empty:
+                break
+
+        tile_keys = np.sort(np.array(tile_keys, dtype=str))
+
+        tile_index = pd.DataFrame({'quadkey': tile_keys,
+                                   'level': [len(x) for x in tile_keys]})
+        tile_index[['minx', 'miny', 'maxx', 'maxy']] = [
+            quadkey_to_bbox(x) for x in tile_keys]
+        tile_index['filename'] = [(x if x else 'root') + ".pickle" for x in tile_keys]
+        for layer_name in layer_names:
+            tile_index[layer_name] = 0
+
+        if verbose:
+            print("Saving {} tiles to \"{}\" ... ".format(
+                len(tile_keys), os.path.relpath(path_to_tile_dir)), end="")
+
+        def read_chunks():
+            if spilled:
+                for path_to_spill in spilled:
+                    with open(path_to_spill, mode='rb') as f_:
+                        yield pickle.load(f_)
+                    os.remove(path_to_spill)
+            else:
+                for chunk_ in osm_data:
+                    yield chunk_, {k: get_quadkeys(v, k) for k, v in chunk_.items()}
+
+        # The second pass: append the features of each chunk to the files of their tiles
+        skipped = collections.Counter()
+        for chunk, chunk_keys in read_chunks():
+            chunk_parts = collections.defaultdict(dict)
+            for layer_name, keys in chunk_keys.items():
+                located = pd.notnull(keys)
+                skipped[layer_name] += (~located).sum()
+                if not located.any():
+                    continue
+
+                # The tile of a key is the (unique) tile key that is a prefix of the key
+                tile_pos = np.searchsorted(
+                    tile_keys, keys[located].astype(str), side='right') - 1
+                tile_index[layer_name] += np.bincount(tile_pos, minlength=len(tile_keys))
+
+                order = np.argsort(tile_pos, kind='stable')
+                splits = np.searchsorted(tile_pos[order], np.arange(len(tile_keys) + 1))
+                positions = np.flatnonzero(located)[order]
+                for i in np.flatnonzero(np.diff(splits)):
+                    chunk_parts[i][layer_name] = chunk[layer_name].iloc[
+                        positions[splits[i]:splits[i + 1]]]
+
+            for i, tile_part in chunk_parts.items():
+                path_to_part = os.path.join(temp_dir, tile_index.filename[i])
+                with open(path_to_part, mode='ab') as f:
+                    pickle.dump(tile_part, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if verbose:
+            for layer_name, n in skipped.items():
+                if n:
+                    print("{} features without geometries in the layer \"{}\" are "
+                          "skipped.".format(n, layer_name), end=" ")
+
+        # Gather the parts of each tile into its file
+        for filename in tile_index.filename:
+            tile_parts = collections.defaultdict(list)
+            path_to_part = os.path.join(temp_dir, filename)
+            if os.path.isfile(path_to_part):
+                with open(path_to_part, mode='rb') as f:
+                    while f.peek(1):
+                        for layer_name, part in pickle.load(f).items():
+                            tile_parts[layer_name].append(part)
+                os.remove(path_to_part)
+
+            tile_data = {
+                layer_name: pd.concat(tile_parts[layer_name]).reset_index(drop=True)
+                if tile_parts[layer_name] else templates[layer_name]
+                for layer_name in layer_names}
+
+            save_pickle(tile_data, os.path.join(path_to_tile_dir, filename),
+                        verbose=False)
+
+        save_pickle(tile_index, os.path.join(path_to_tile_dir, "tile_index.pickle"),
+                    verbose=False)
+
+        print("Done. ") if verbose else ""
+
+    finally:
+        for filename in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, filename))
+        os.rmdir(temp_dir)
+
+    return tile_index
+
+
+def load_tile_index(path_to_tile_dir, bbox=None):
+    """
+    Load the index of tiles made by
+    :py:func:`partition_osm_data()<pydriosm.tiler.partition_osm_data>`.
+
+    :param path_to_tile_dir: absolute path to the directory of the tiles
+    :type path_to_tile_dir: str
+    :param bbox: bounding box (minx, miny, maxx, maxy) by which the tiles are filtered;
+        if ``None`` (default), all tiles
+    :type bbox: tuple or list or None
+    :return: index of the tiles (intersecting ``bbox``)
+    :rtype: pandas.DataFrame
+    """
+
+    tile_index = load_pickle(os.path.join(path_to_tile_dir, "tile_index.pickle"))
+
+    if bbox is not None:
+        minx, miny, maxx, maxy = bbox
+        tile_index = tile_index[
+            (tile_index.minx <= maxx) & (tile_index.maxx >= minx) &
+            (tile_index.miny <= maxy) & (tile_index.maxy >= miny)]
+
+    return tile_index
+
+
+def read_tile(path_to_tile_dir, quadkey, layer_names=None):
+    """
+    Read the data of a tile made by
+    :py:func:`partition_osm_data()<pydriosm.tiler.partition_osm_data>`.
+
+    :param path_to_tile_dir: absolute path to the directory of the tiles
+    :type path_to_tile_dir: str
+    :param quadkey: quadkey of the tile
+    :type quadkey: str
+    :param layer_names: names of the layers to be returned;
+        if ``None`` (default), all layers
+    :type layer_names: list or None
+    :return: data of the tile
+    :rtype: dict
+    """
+
+    filename = (quadkey if quadkey else 'root') + ".pickle"
+    tile_data = load_pickle(os.path.join(path_to_tile_dir, filename))
+
+    if layer_names:
+        tile_data = {k: v for k, v in tile_data.items() if k in layer_names}
+
+    return tile_data
+
+
+def get_zoom_tolerance(zoom, pixel_tolerance=0.5, tile_size=256):
+    """
+    Get a tolerance of simplifying geometries (in degrees) for a zoom level of a map.
+
+    :param zoom: zoom level of a (Web Mercator) map
+    :type zoom: int
+    :param pixel_tolerance: tolerance in pixels, defaults to ``0.5``
+    :type pixel_tolerance: float
+    :param tile_size: size (in pixels) of a tile, defaults to ``256``
+    :type tile_size: int
+    :return: width (in degrees of longitude) of ``pixel_tolerance`` pixels at the zoom
+    :rtype: float
+
+    **Example**::
+
+        >>> from pydriosm.tiler import get_zoom_tolerance
+
+        >>> print(round(get_zoom_tolerance(12), 8))
+        0.00017166
+    """
+
+    tolerance = pixel_tolerance * 360.0 / (tile_size * 2 ** zoom)
+
+    return tolerance
+
+
+def build_geometry_pyramid(osm_data, zoom_levels=(6, 9, 12), tolerances=None,
+                           preserve_topology=True, verbose=False):
+    """
+    Precompute simplified geometries of parsed OSM data for several zoom levels.
+
+    For each zoom level, the geometries of each layer (except points) are simplified
+    all at once by `shapely.simplify()`_ and stored in a column ``'geometry_z<zoom>'``
+    alongside the original data, so that the data (e.g. pickled, or partitioned by
+    :py:func:`partition_osm_data()<pydriosm.tiler.partition_osm_data>`) can be
+    served at any of the levels by
+    :py:func:`get_pyramid_geometries()<pydriosm.tiler.get_pyramid_geometries>`
+    without any further computation.
+
+    .. _`shapely.simplify()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.simplify.html
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``) or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`
+    :type osm_data: dict
+    :param zoom_levels: zoom levels of the simplified geometries,
+        defaults to ``(6, 9, 12)``
+    :type zoom_levels: tuple or list
+    :param tolerances: tolerances (in degrees) of simplifying the geometries
+        for the zoom levels; if ``None`` (default), half a pixel at each level,
+        see also :py:func:`get_zoom_tolerance()<pydriosm.tiler.get_zoom_tolerance>`
+    :type tolerances: tuple or list or None
+    :param preserve_topology: whether to keep the simplified geometries valid
+        (e.g. with no self-intersecting rings or collapsed polygons),
+        defaults to ``True``
+    :type preserve_topology: bool
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :return: the data with the simplified geometries
+    :rtype: dict
+
+    **Example**::
+
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.tiler import build_geometry_pyramid, get_pyramid_geometries
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> rutland_pbf = geofabrik_reader.read_osm_pbf(
+        ...     'Rutland', data_dir="tests", parse_raw_feat=True,
+        ...     download_confirmation_required=False)
+
+        >>> rutland_pyramid = build_geometry_pyramid(rutland_pbf)
+
+        >>> rutland_multipolygons = rutland_pyramid['multipolygons']
+
+        >>> print([x for x in rutland_multipolygons.columns if x.startswith('geometry_')])
+        ['geometry_z6', 'geometry_z9', 'geometry_z12']
+
+        >>> geoms_z10 = get_pyramid_geometries(rutland_multipolygons, zoom=10)
+
+        >>> print(geoms_z10 is not None)
+        True
+    """
+
+    import shapely
+
+    if tolerances is None:
+        tolerances = [get_zoom_tolerance(z) for z in zoom_levels]
+    else:
+        assert len(tolerances) == len(zoom_levels), \
+            "`tolerances` must be as many as `zoom_levels`."
+
+    osm_data_ = {}
+
+    for layer_name, layer_data in osm_data.items():
+        if layer_data.shape[1] == 1:  # Raw features
+            osm_data_[layer_name] = layer_data
+            continue
+
+        geoms = get_layer_geometries(layer_data, geo_typ=layer_name)
+        has_geom = shapely.is_geometry(geoms)
+
+        layer_data = layer_data.copy()
+
+        if has_geom.any() and shapely.get_dimensions(geoms[has_geom]).max() > 0:
+            print("Simplifying the geometries of \"{}\"".format(layer_name),
+                  end=" ... ") if verbose else ""
+
+            for zoom, tolerance in zip(zoom_levels, tolerances):
+                layer_data['geometry_z{}'.format(zoom)] = shapely.simplify(
+                    geoms, tolerance, preserve_topology=preserve_topology)
+
+            print("Done. ") if verbose else ""
+
+        else:  # Points are the same at all the levels
+            for zoom in zoom_levels:
+                layer_data['geometry_z{}'.format(zoom)] = geoms
+
+        osm_data_[layer_name] = layer_data
+
+    return osm_data_
+
+
+def get_pyramid_geometries(layer_data, zoom, geo_typ=None):
+    """
+    Get the geometries of a layer for a zoom level from a pyramid made by
+    :py:func:`build_geometry_pyramid()<pydriosm.tiler.build_geometry_pyramid>`.
+
+    The geometries of the lowest level at or above ``zoom`` are returned;
+    where ``zoom`` is above all the levels, the original geometries are returned.
+
+    :param layer_data: data of a layer with simplified geometries
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param zoom: zoom level of a map
+    :type zoom: int
+    :param geo_typ: name of the PBF layer (e.g. ``'lines'``), defaults to ``None``;
+        see also :py:func:`get_layer_geometries()<pydriosm.reader.get_layer_geometries>`
+    :type geo_typ: str or None
+    :return: `shapely.geometry`_ objects (or ``None`` where there is no geometry)
+    :rtype: numpy.ndarray
+
+    .. _`shapely.geometry`:
+        https://shapely.readthedocs.io/en/latest/manual.html#geometric-objects
+    """
+
+    pyramid_columns = [x for x in layer_data.columns if re.match(r'^geometry_z\d+$', x)]
+    zoom_levels = sorted(z for z in (int(x[len('geometry_z'):]) for x in pyramid_columns)
+                         if z >= zoom)
+
+    if zoom_levels:
+        geoms = np.asarray(layer_data['geometry_z{}'.format(zoom_levels[0])].values,
+                           dtype=object)
+    else:
+        geoms = get_layer_geometries(layer_data.drop(columns=pyramid_columns),
+                                     geo_typ=geo_typ)
+
+    return geoms
+
+
+# == Vector tiles ==================================================================
+
+
+def get_world_geometries(layer_data, zoom=None, geo_typ=None):
+    """
+    Get geometric objects of a layer of parsed OSM data in (normalized)
+    `Web Mercator <https://en.wikipedia.org/wiki/Web_Mercator_projection>`_ coordinates.
+
+    The world is mapped onto the unit square, with ``(0, 0)`` at its north-west corner
+    (so that the coordinates of a tile ``(x, y)`` at a zoom ``z`` are between
+    ``x / 2 ** z`` and ``(x + 1) / 2 ** z``, and ``y / 2 ** z`` and ``(y + 1) / 2 ** z``);
+    and all the coordinates of the layer are projected at once by `shapely.transform()`_.
+
+    .. _`shapely.transform()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.transform.html
+
+    :param layer_data: parsed data of a layer, e.g. of the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>`; the geometries are reprojected
+        from its ``crs`` (if any) to longitudes and latitudes beforehand
+    :type layer_data: pandas.DataFrame or geopandas.GeoDataFrame
+    :param zoom: zoom level of a map, by which simplified geometries are taken from
+        a pyramid (see :py:func:`get_pyramid_geometries()
+        <pydriosm.tiler.get_pyramid_geometries>`); if ``None`` (default),
+        the original geometries
+    :type zoom: int or None
+    :param geo_typ: name of the PBF layer (e.g. ``'lines'``), defaults to ``None``;
+        see also :py:func:`get_layer_geometries()<pydriosm.reader.get_layer_geometries>`
+    :type geo_typ: str or None
+    :return: `shapely.geometry`_ objects (or ``None`` where there is no geometry)
+    :rtype: numpy.ndarray
+
+    .. _`shapely.geometry`:
+        https://shapely.readthedocs.io/en/latest/manual.html#geometric-objects
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.tiler import get_world_geometries
+
+        >>> points = pd.DataFrame({'id': [488432],
+        ...                        'coordinates': [[-0.5134241, 52.6555853]]})
+
+        >>> print(get_world_geometries(points, geo_typ='points'))
+        [<POINT (0.499 0.327)>]
+    """
+
+    import pyproj
+    import shapely
+
+    if zoom is None:
+        geoms = get_layer_geometries(layer_data, geo_typ=geo_typ)
+    else:
+        geoms = get_pyramid_geometries(layer_data, zoom=zoom, geo_typ=geo_typ)
+
+    crs = getattr(layer_data, 'crs', None)
+    if crs is not None and pyproj.CRS.from_user_input(crs).to_epsg() != 4326:
+        geoms = reproject_coordinates(geoms, 'EPSG:4326', source_crs=crs).to_numpy()
+
+    def lonlat_to_world(xy):
+        lat = np.radians(np.clip(xy[:, 1], -85.05112878, 85.05112878))
+        return np.column_stack(
+            [(xy[:, 0] + 180.0) / 360.0,
+             (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0])
+
+    world_geoms = shapely.transform(np.asarray(geoms, dtype=object), lonlat_to_world)
+
+    return world_geoms
+
+
+def get_feature_tiles(world_geoms, zoom, buffer=0.0):
+    """
+    Find the tiles (at a zoom level) that the bounding boxes of features intersect.
+
+    The ranges of the tiles are computed from the bounds of all the features at once;
+    and every feature is paired with each of the tiles in its range in a vectorized way.
+
+    :param world_geoms: geometric objects in normalized Web Mercator coordinates,
+        see :py:func:`get_world_geometries()<pydriosm.tiler.get_world_geometries>`
+    :type world_geoms: numpy.ndarray
+    :param zoom: zoom level of the tiles
+    :type zoom: int
+    :param buffer: width of a margin around each tile, as a fraction of the tile size,
+        defaults to ``0.0``
+    :type buffer: float
+    :return: positions of the features, and the columns (x) and rows (y) of the tiles,
+        one for each pair of a feature and a tile
+    :rtype: tuple
+
+    **Example**::
+
+        >>> import pandas as pd
+        >>> from pydriosm.tiler import get_world_geometries, get_feature_tiles
+
+        >>> points = pd.DataFrame({'id': [488432],
+        ...                        'coordinates': [[-0.5134241, 52.6555853]]})
+
+        >>> world_geoms = get_world_geometries(points, geo_typ='points')
+
+        >>> feat_pos, tile_x, tile_y = get_feature_tiles(world_geoms, zoom=14)
+
+        >>> print(feat_pos, tile_x, tile_y)
+        [0] [8168] [5363]
+    """
+
+    import shapely
+
+    bounds = shapely.bounds(world_geoms).reshape(-1, 4)
+    located = ~np.isnan(bounds).any(axis=1)
+
+    n = 2 ** zoom
+    lower = np.clip(np.floor((bounds[located, :2] - buffer / n) * n), 0, n - 1)
+    upper = np.clip(np.floor((bounds[located, 2:] + buffer / n) * n), 0, n - 1)
+    lower, upper = lower.astype(np.int64), upper.astype(np.int64)
+
+    widths = upper[:, 0] - lower[:, 0] + 1
+    counts = widths * (upper[:, 1] - lower[:, 1] + 1)
+
+    # The k-th tile of a feature is at (k % width, k // width) in its range
+    feat_pos = np.repeat(np.flatnonzero(located), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    widths_ = np.repeat(widths, counts)
+    tile_x = np.repeat(lower[:, 0], counts) + k % widths_
+    tile_y = np.repeat(lower[:, 1], counts) + k // widths_
+
+    return feat_pos, tile_x, tile_y
+
+
+def encode_mvt_tile(tile_layers, extent=4096):
+    """
+    Encode layers of features as a `Mapbox Vector Tile
+    <https://github.com/mapbox/vector-tile-spec/tree/master/2.1>`_ (version 2).
+
+    The geometries must be in the coordinates of the tile, i.e. integers
+    from ``0`` to ``extent`` (or beyond it in a buffer), with y increasing downwards.
+    Repeated vertices, and lines and rings that collapse when quantized, are dropped;
+    and the rings of polygons are oriented as the specification requires.
+
+    :param tile_layers: features of each layer, i.e. a tuple of geometric objects,
+        feature IDs (``numpy.nan`` where there is none) and dictionaries of properties
+        (where values that are not strings, numbers or booleans are omitted)
+    :type tile_layers: dict
+    :param extent: size of the tile in its coordinates, defaults to ``4096``
+    :type extent: int
+    :return: the encoded tile (not compressed); ``b''`` if there is no feature
+    :rtype: bytes
+
+    **Example**::
+
+        >>> import shapely
+        >>> from pydriosm.tiler import encode_mvt_tile
+
+        >>> tile_layers = {'points': ([shapely.Point(25, 17)], [1], [{'name': 'a'}])}
+
+        >>> tile_data = encode_mvt_tile(tile_layers)
+
+        >>> print(len(tile_data))
+        41
+    """
+
+    import shapely
+
+    def varint(value):
+        data = bytearray()
+        while value > 0x7f:
+            data.append((value & 0x7f) | 0x80)
+            value >>= 7
+        data.append(value)
+        return bytes(data)
+
+    def field(number, data):  # A length-delimited field
+        return varint(number << 3 | 2) + varint(len(data)) + data
+
+    def encode_value(value):
+        if isinstance(value, (bool, np.bool_)):
+            return varint(7 << 3) + varint(int(value))
+        elif isinstance(value, (int, np.integer)):
+            value = int(value)
+            if value >= 0:
+                return varint(5 << 3) + varint(value)
+            return varint(6 << 3) + varint((value << 1) ^ (value >> 63))
+        elif isinstance(value, (float, np.floating)):
+            return varint(3 << 3 | 1) + struct.pack('<d', value) \
+                if np.isfinite(value) else None
+        elif isinstance(value, str):
+            return field(1, value.encode('utf-8'))
+        return None
+
+    def encode_geometry(geom):
+        # The type and command integers of a geometry
+        parts = shapely.get_parts(geom)
+        if len(parts) == 0:
+            return None, []
+        dims = shapely.get_dimensions(parts)
+        parts = parts[dims == dims.max()]  # e.g. of a collection made by clipping
+
+        commands, cursor = [], np.zeros(2, dtype=np.int64)
+
+        def draw(command_id, coords):
+            nonlocal cursor
+            deltas = np.diff(np.vstack([cursor, coords]), axis=0).ravel()
+            commands.append(command_id | len(coords) << 3)
+            commands.extend(((deltas << 1) ^ (deltas >> 63)).tolist())
+            cursor = coords[-1]
+
+        def get_vertices(part, ring=False):
+            coords = shapely.get_coordinates(part).astype(np.int64)
+            if ring:
+                coords = coords[:-1]
+            keep = np.any(np.diff(coords, axis=0, prepend=np.nan) != 0, axis=1)
+            coords = coords[keep]
+            if ring and len(coords) > 1 and (coords[0] == coords[-1]).all():
+                coords = coords[:-1]
+            return coords
+
+        if dims.max() == 0:
+            draw(1, shapely.get_coordinates(parts).astype(np.int64))
+
+        elif dims.max() == 1:
+            for part in parts:
+                coords = get_vertices(part)
+                if len(coords) >= 2:
+                    draw(1, coords[:1])
+                    draw(2, coords[1:])
+
+        else:
+            for polygon in parts:
+                rings = [shapely.get_exterior_ring(polygon)] + list(
+                    shapely.get_interior_ring(
+                        polygon, range(shapely.get_num_interior_rings(polygon))))
+                for i, ring in enumerate(rings):
+                    coords = get_vertices(ring, ring=True)
+                    # Twice the area by the surveyor's formula (in tile coordinates)
+                    area = (np.dot(coords[:, 0], np.roll(coords[:, 1], -1)) -
+                            np.dot(np.roll(coords[:, 0], -1), coords[:, 1])) \
+                        if len(coords) >= 3 else 0
+                    if area == 0:
+                        if i == 0:  # The polygon collapses
+                            break
+                        continue
+                    if (area > 0) != (i == 0):  # Exterior rings are clockwise
+                        coords = coords[::-1]
+                    draw(1, coords[:1])
+                    draw(2, coords[1:])
+                    commands.append(7 | 1 << 3)
+
+        return int(dims.max()) + 1, commands
+
+    tile_data = b''
+
+    for layer_name, (geoms, feat_ids, properties) in tile_layers.items():
+        keys, values, features = {}, {}, []
+
+        for geom, feat_id, props in zip(geoms, feat_ids, properties):
+            geom_type, commands = encode_geometry(geom)
+            if not commands:
+                continue
+
+            tags = []
+            for key, value in props.items():
+                value_ = encode_value(value)
+                if value_ is not None:
+                    tags += [keys.setdefault(key, len(keys)),
+                             values.setdefault(value_, len(values))]
+
+            feature = b''
+            if feat_id is not None and not np.isnan(feat_id):
+                feature += varint(1 << 3) + varint(int(feat_id))
+            if tags:
+                feature += field(2, b''.join(varint(x) for x in tags))
+            feature += varint(3 << 3) + varint(geom_type)
+            feature += field(4, b''.join(varint(x) for x in commands))
+
+            features.append(field(2, feature))
+
+        if features:
+            layer = varint(15 << 3) + varint(2) + field(1, layer_name.encode('utf-8'))
+            layer += b''.join(features)
+            layer += b''.join(field(3, x.encode('utf-8')) for x in keys)
+            layer += b''.join(field(4, x) for x in values)
+            layer += varint(5 << 3) + varint(extent)
+
+            tile_data += field(3, layer)
+
+    return tile_data
+
+
+def make_vector_tile(tile, fragments, extent=4096, buffer=64, compress=False):
+    """
+    Make a vector tile of fragments of layers that are binned into it.
+
+    The geometries of each layer are clipped to the tile (with a buffer) by
+    `shapely.clip_by_rect()`_ and quantized to the coordinates of the tile all at once,
+    and then encoded by :py:func:`encode_mvt_tile()<pydriosm.tiler.encode_mvt_tile>`.
+    (This is the work done by each process of
+    :py:func:`generate_vector_tiles()<pydriosm.tiler.generate_vector_tiles>`.)
+
+    .. _`shapely.clip_by_rect()`:
+        https://shapely.readthedocs.io/en/stable/reference/shapely.clip_by_rect.html
+
+    :param tile: zoom level, column (x) and row (y) of the tile
+    :type tile: tuple
+    :param fragments: fragments of layers, each being a tuple of the layer name,
+        WKB of geometries in normalized Web Mercator coordinates (see
+        :py:func:`get_world_geometries()<pydriosm.tiler.get_world_geometries>`),
+        feature IDs and dictionaries of properties
+    :type fragments: list
+    :param extent: size of the tile in its coordinates, defaults to ``4096``
+    :type extent: int
+    :param buffer: width (in the coordinates of the tile) of a margin around the tile
+        within which the geometries are kept, defaults to ``64``
+    :type buffer: int
+    :param compress: whether to compress the tile by gzip, defaults to ``False``
+    :type compress: bool
+    :return: the encoded tile, or ``None`` if the tile is empty
+    :rtype: bytes or None
+    """
+
+    import shapely
+
+    zoom, tile_x, tile_y = tile
+    n, margin = 2 ** zoom, buffer / extent
+
+    layer_fragments = collections.defaultdict(list)
+    for layer_name, wkb, feat_ids, properties in fragments:
+        layer_fragments[layer_name].append((wkb, feat_ids, properties))
+
+    def world_to_tile(xy):
+        return np.round((xy * n - [tile_x, tile_y]) * extent)
+
+    tile_layers = {}
+    for layer_name, layer_parts in layer_fragments.items():
+        geoms = shapely.clip_by_rect(
+            shapely.from_wkb(np.concatenate([x[0] for x in layer_parts])),
+            (tile_x - margin) / n, (tile_y - margin) / n,
+            (tile_x + 1 + margin) / n, (tile_y + 1 + margin) / n)
+        geoms = shapely.transform(geoms, world_to_tile)
+
+        kept = np.flatnonzero(~shapely.is_empty(geoms))
+        if len(kept) > 0:
+            feat_ids = np.concatenate([x[1] for x in layer_parts])
+            properties = list(itertools.chain.from_iterable(x[2] for x in layer_parts))
+            tile_layers[layer_name] = (
+                geoms[kept], feat_ids[kept], [properties[i] for i in kept])
+
+    tile_data = encode_mvt_tile(tile_layers, extent=extent) if tile_layers else b''
+
+    if not tile_data:
+        return None
+
+    return gzip.compress(tile_data) if compress else tile_data
+
+
+def generate_vector_tiles(osm_data, path_to_tiles, min_zoom=0, max_zoom=14,
+                          layer_names=None, properties=None, extent=4096, buffer=64,
+                          dirty_tiles=None, max_workers=None, verbose=False):
+    """
+    Generate a pyramid of `Mapbox Vector Tiles
+    <https://github.com/mapbox/vector-tile-spec>`_ directly from parsed OSM data.
+
+    For each zoom level, the features of each layer are binned by the tiles that
+    their bounding boxes intersect in a vectorized way
+    (see :py:func:`get_feature_tiles()<pydriosm.tiler.get_feature_tiles>`);
+    and the tiles are clipped, quantized and encoded
+    (see :py:func:`make_vector_tile()<pydriosm.tiler.make_vector_tile>`) by a pool of
+    processes, with a bounded number of them in progress at a time. Tiles that have
+    no feature are skipped.
+
+    Where ``osm_data`` is an iterable of chunks, the binned fragments of the chunks
+    are spilled to a temporary `SQLite <https://www.sqlite.org/>`_ database,
+    so that only a chunk (and the tiles in progress) is held in memory at a time.
+    Simplified geometries precomputed by
+    :py:func:`build_geometry_pyramid()<pydriosm.tiler.build_geometry_pyramid>`
+    are used for the zoom levels where they are available.
+
+    :param osm_data: parsed data of layers, e.g. the output of
+        :py:meth:`GeofabrikReader.read_osm_pbf()
+        <pydriosm.reader.GeofabrikReader.read_osm_pbf>` (with ``parse_raw_feat=True``) or
+        :py:meth:`GeofabrikReader.read_shp_zip()
+        <pydriosm.reader.GeofabrikReader.read_shp_zip>`; or an iterable of chunks
+        of such data, each being a dictionary of layers or a tuple of a layer name
+        and a chunk of its data
+    :type osm_data: dict or typing.Iterable
+    :param path_to_tiles: absolute path to an `MBTiles
+        <https://github.com/mapbox/mbtiles-spec>`_ file (ending with ``".mbtiles"``),
+        in which the tiles are compressed by gzip, or to a directory, in which
+        the tiles are saved (uncompressed) as ``"<z>/<x>/<y>.pbf"``
+    :type path_to_tiles: str
+    :param min_zoom: minimum zoom level of the tiles, defaults to ``0``
+    :type min_zoom: int
+    :param max_zoom: maximum zoom level of the tiles, defaults to ``14``
+    :type max_zoom: int
+    :param layer_names: names of the layers to be included in the tiles;
+        if ``None`` (default), all layers (except those of raw features)
+    :type layer_names: list or None
+    :param properties: names of the columns to be included as properties of
+        the features (or a dictionary of such names for each layer);
+        if ``None`` (default), all columns but the geometries and IDs
+    :type properties: list or dict or None
+    :param extent: size of a tile in its coordinates, defaults to ``4096``
+    :type extent: int
+    :param buffer: width (in the coordinates of a tile) of a margin around each tile
+        within which the geometries are kept, defaults to ``64``
+    :type buffer: int
+    :param dirty_tiles: tiles, i.e. (zoom, x, y), to be regenerated, e.g. by
+        :py:func:`get_dirty_tiles()<pydriosm.tiler.get_dirty_tiles>`, while the other
+        tiles at ``path_to_tiles`` are kept; if ``None`` (default),
+        all tiles are (re)generated
+    :type dirty_tiles: pandas.DataFrame or list or None
+    :param max_workers: maximum number of processes; if ``None`` (default),
+        the number of processors; if ``1``, the tiles are made in this process
+    :type max_workers: int or None
+    :param verbose: whether to print relevant information in console as the function
+        runs, defaults to ``False``
+    :type verbose: bool or int
+    :return: index of the generated tiles, with the zoom level, column (x),
+        row (y) and size (in bytes) of each tile
+    :rtype: pandas.DataFrame
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import GeofabrikReader
+        >>> from pydriosm.tiler import generate_vector_tiles
+
+        >>> geofabrik_reader = GeofabrikReader()
+
+        >>> rutland_pbf = geofabrik_reader.read_osm_pbf(
+        ...     'Rutland', data_dir="tests", parse_raw_feat=True,
+        ...     download_confirmation_required=False)
+
+        >>> path_to_mbtiles = os.path.join("tests", "rutland.mbtiles")
+
+        >>> tile_index = generate_vector_tiles(rutland_pbf, path_to_mbtiles, max_zoom=12)
+
+        >>> print(tile_index.zoom.unique().tolist())
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    """
+
+    import shapely
+
+    assert 0 <= min_zoom <= max_zoom <= 24, \
+        "`min_zoom` and `max_zoom` must be integers, " \
+        "where 0 <= min_zoom <= max_zoom <= 24."
+
+    zoom_levels = range(min_zoom, max_zoom + 1)
+
+    if dirty_tiles is not None:
+        dirty_tiles = pd.DataFrame(np.asarray(dirty_tiles, dtype=np.int64).reshape(-1, 3),
+                                   columns=['zoom', 'x', 'y'])
+        dirty_keys = {z: (dat.x * 2 ** z + dat.y).to_numpy()
+                      for z, dat in dirty_tiles.groupby('zoom')}
+
+    geom_columns = ['coordinates', 'geometry', 'geometries']
+    layer_fields, world_bounds = {}, []
+
+    def bin_layer_data(layer_name, layer_data):
+        # Yield the fragments of the tiles into which the features of a layer fall
+        if layer_data.shape[1] == 1 or len(layer_data) == 0:  # Raw features
+            return
+
+        id_column = next((x for x in ['id', 'osm_id'] if x in layer_data.columns), None)
+        feat_ids = np.full(len(layer_data), np.nan) if id_column is None \
+            else pd.to_numeric(layer_data[id_column], errors='coerce').to_numpy(float)
+        feat_ids[feat_ids < 0] = np.nan
+
+        prop_columns = properties.get(layer_name) if isinstance(properties, dict) \
+            else properties
+        if prop_columns is None:
+            prop_columns = [
+                x for x in layer_data.columns if x not in geom_columns + [id_column]
+                and not re.match(r'^geometry_z\d+$', x)]
+        props = pd.DataFrame(layer_data[prop_columns]).to_dict('records') \
+            if len(prop_columns) > 0 else [{}] * len(layer_data)
+
+        fields = layer_fields.setdefault(layer_name, {})
+        for col in prop_columns:
+            dtype = layer_data[col].dtype
+            fields[col] = 'Boolean' if pd.api.types.is_bool_dtype(dtype) else \
+                'Number' if pd.api.types.is_numeric_dtype(dtype) else 'String'
+
+        has_pyramid = any(re.match(r'^geometry_z\d+$', x) for x in layer_data.columns)
+        world_geoms = None
+
+        for zoom in zoom_levels:
+            if world_geoms is None or has_pyramid:
+                world_geoms = get_world_geometries(
+                    layer_data, zoom=zoom if has_pyramid else None, geo_typ=layer_name)
+                wkb = shapely.to_wkb(world_geoms)
+                world_bounds.append(shapely.total_bounds(world_geoms))
+
+            feat_pos, tile_x, tile_y = get_feature_tiles(
+                world_geoms, zoom, buffer=buffer / extent)
+            tile_keys = tile_x * 2 ** zoom + tile_y
+
+            if dirty_tiles is not None:
+                is_dirty = np.isin(tile_keys, dirty_keys.get(zoom, []))
+                feat_pos, tile_keys = feat_pos[is_dirty], tile_keys[is_dirty]
+
+            order = np.lexsort((feat_pos, tile_keys))
+            feat_pos, tile_keys = feat_pos[order], tile_keys[order]
+            splits = np.flatnonzero(np.diff(tile_keys)) + 1
+
+            for tile_key, pos in zip(tile_keys[np.r_[0, splits]] if len(order) else [],
+                                     np.split(feat_pos, splits)):
+                tile = zoom, int(tile_key // 2 ** zoom), int(tile_key % 2 ** zoom)
+                yield tile, (layer_name, wkb[pos], feat_ids[pos], [props[i] for i in pos])
+
+    def iter_layer_chunks():
+        for chunk in ([osm_data] if isinstance(osm_data, dict) else osm_data):
+            for layer_name, layer_data in (
+                    chunk.items() if isinstance(chunk, dict) else [chunk]):
+                if layer_names is None or layer_name in layer_names:
+                    print("Binning the features of \"{}\"".format(layer_name),
+                          end=" ... ") if verbose else ""
+                    yield layer_name, layer_data
+                    print("Done. ") if verbose else ""
+
+    path_to_spill = None
+
+    if isinstance(osm_data, dict):
+        tile_fragments = collections.defaultdict(list)
+        for layer_name_, layer_data_ in iter_layer_chunks():
+            for tile_, fragment in bin_layer_data(layer_name_, layer_data_):
+                tile_fragments[tile_].append(fragment)
+
+        tiles = ((x, tile_fragments.pop(x)) for x in sorted(tile_fragments))
+
+    else:
+        spill_fd, path_to_spill = tempfile.mkstemp(suffix=".sqlite")
+        os.close(spill_fd)
+        spill = sqlite3.connect(path_to_spill)
+        spill.execute("CREATE TABLE fragments (zoom INTEGER, x INTEGER, y INTEGER, "
+                      "fragment BLOB)")
+        for layer_name_, layer_data_ in iter_layer_chunks():
+            spill.executemany(
+                "INSERT INTO fragments VALUES (?, ?, ?, ?)",
+                ((*tile_, pickle.dumps(fragment, pickle.HIGHEST_PROTOCOL))
+                 for tile_, fragment in bin_layer_data(layer_name_, layer_data_)))
+        spill.execute("CREATE INDEX fragments_index ON fragments (zoom, x, y)")
+        spill.commit()
+
+        rows = spill.execute("SELECT * FROM fragments ORDER BY zoom, x, y")
+        tiles = ((tile_, [pickle.loads(x[3]) for x in tile_rows])
+                 for tile_, tile_rows in itertools.groupby(rows, key=lambda x: x[:3]))
+
+    is_mbtiles = path_to_tiles.endswith(".mbtiles")
+
+    if is_mbtiles:
+        os.makedirs(os.path.dirname(os.path.abspath(path_to_tiles)), exist_ok=True)
+        mbtiles = sqlite3.connect(path_to_tiles)
+        mbtiles.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)")
+        mbtiles.execute("CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, "
+                        "tile_column INTEGER, tile_row INTEGER, tile_data BLOB)")
+        mbtiles.execute("CREATE UNIQUE INDEX IF NOT EXISTS tile_index "
+                        "ON tiles (zoom_level, tile_column, tile_row)")
+        if dirty_tiles is None:
+            mbtiles.execute("DELETE FROM tiles")
+        else:  # Dirty tiles that become empty are removed
+            mbtiles.executemany(
+                "DELETE FROM tiles "
+                "WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                ((int(z), int(x), int(2 ** z - 1 - y))
+                 for z, x, y in dirty_tiles.itertuples(index=False)))
+
+    else:
+        if dirty_tiles is None:
+            stale_tiles = [(z, None, None) for z in zoom_levels]
+        else:
+            stale_tiles = dirty_tiles.itertuples(index=False)
+        for z, x, y in stale_tiles:  # Remove the tiles that are to be regenerated
+            if x is None:
+                zoom_dir = os.path.join(path_to_tiles, str(z))
+                for dir_path, _, filenames in os.walk(zoom_dir):
+                    for filename in filenames:
+                        if filename.endswith(".pbf"):
+                            os.remove(os.path.join(dir_path, filename))
+            else:
+                path_to_tile = os.path.join(path_to_tiles, str(z), str(x), f"{y}.pbf")
+                if os.path.isfile(path_to_tile):
+                    os.remove(path_to_tile)
+
+    tile_index = []
+
+    def write_tile(tile, tile_data):
+        if tile_data is None:  # An empty tile
+            return
+
+        z, x, y = tile
+        if is_mbtiles:
+            mbtiles.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                            (z, x, 2 ** z - 1 - y, tile_data))  # Rows are in TMS order
+        else:
+            os.makedirs(os.path.join(path_to_tiles, str(z), str(x)), exist_ok=True)
+            with open(os.path.join(path_to_tiles, str(z), str(x), f"{y}.pbf"), 'wb') as f:
+                f.write(tile_data)
+
+        tile_index.append((z, x, y, len(tile_data)))
+
+    print("Making the tiles", end=" ... ") if verbose else ""
+
+    try:
+        if max_workers == 1:
+            for tile_, fragments in tiles:
+                write_tile(tile_, make_vector_tile(tile_, fragments, extent, buffer,
+                                                   is_mbtiles))
+
+        else:
+            max_workers_ = max_workers or os.cpu_count() or 1
+
+            with concurrent.futures.ProcessPoolExecutor(max_workers_) as executor:
+                pending = {}
+                for tile_, fragments in tiles:
+                    # Hold a bounded number of tiles in progress
+                    if len(pending) >= 4 * max_workers_:
+                        done, _ = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            write_tile(pending.pop(future), future.result())
+
+                    future = executor.submit(
+                        make_vector_tile, tile_, fragments, extent, buffer, is_mbtiles)
+                    pending[future] = tile_
+
+                for future in concurrent.futures.as_completed(pending):
+                    write_tile(pending[future], future.result())
+
+        print("Done. ") if verbose else ""
+
+        # Metadata of the tiles
+        if world_bounds:
+            minx, miny = np.nanmin(world_bounds, axis=0)[:2]
+            maxx, maxy = np.nanmax(world_bounds, axis=0)[2:]
+        else:
+            minx, miny, maxx, maxy = 0.0, 0.0, 1.0, 1.0
+
+        def world_to_lat(y):
+            return float(np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y)))))
+
+        metadata = {
+            'name': os.path.splitext(os.path.basename(path_to_tiles.rstrip(os.sep)))[0],
+            'format': 'pbf',
+            'minzoom': str(min_zoom),
+            'maxzoom': str(max_zoom),
+            'bounds': ",".join(str(round(x, 7)) for x in [
+                minx * 360.0 - 180.0, world_to_lat(maxy),
+                maxx * 360.0 - 180.0, world_to_lat(miny)]),
+            'json': rapidjson.dumps({'vector_layers': [
+                {'id': k, 'fields': v, 'minzoom': min_zoom, 'maxzoom': max_zoom}
+                for k, v in layer_fields.items()]}),
+        }
+
+        if is_mbtiles:
+            mbtiles.execute("DELETE FROM metadata")
+            mbtiles.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+            mbtiles.commit()
+        else:
+            os.makedirs(path_to_tiles, exist_ok=True)
+            with open(os.path.join(path_to_tiles, "metadata.json"), 'w') as f:
+                f.write(rapidjson.dumps(metadata, indent=4))
+
+    finally:
+        if is_mbtiles:
+            mbtiles.close()
+        if path_to_spill is not None:
+            spill.close()
+            os.remove(path_to_spill)
+
+    tile_index = pd.DataFrame(tile_index, columns=['zoom', 'x', 'y', 'size'])
+    tile_index = tile_index.sort_values(['zoom', 'x', 'y'], ignore_index=True)
+
+    return tile_index
+
+
+def get_dirty_tiles(old_osm_data, new_osm_data, min_zoom=0, max_zoom=14, extent=4096,
+                    buffer=64, layer_names=None, id_column='id'):
+    """
+    Find the vector tiles that are affected by the changes between two versions
+    of parsed OSM data, so that only they need to be regenerated by
+    :py:func:`generate_vector_tiles()<pydriosm.tiler.generate_vector_tiles>`.
+
+    The changed features are found by :py:func:`diff_osm_pbf()
+    <pydriosm.reader.diff_osm_pbf>`; and a tile is dirty if the bounding box of
+    a created or modified feature (in the newer version), or of a modified or deleted
+    feature (in the older version), intersects it.
+
+    :param old_osm_data: the older version of the parsed data
+    :type old_osm_data: dict
+    :param new_osm_data: the newer version of the parsed data
+    :type new_osm_data: dict
+    :param min_zoom: minimum zoom level of the tiles, defaults to ``0``
+    :type min_zoom: int
+    :param max_zoom: maximum zoom level of the tiles, defaults to ``14``
+    :type max_zoom: int
+    :param extent: size of a tile in its coordinates, defaults to ``4096``
+    :type extent: int
+    :param buffer: width (in the coordinates of a tile) of the margin around each tile,
+        defaults to ``64``
+    :type buffer: int
+    :param layer_names: names of the layers to be compared;
+        if ``None`` (default), the layers in both versions
+    :type layer_names: list or None
+    :param id_column: name of the column of feature IDs, defaults to ``'id'``
+    :type id_column: str
+    :return: the dirty tiles, with the zoom level, column (x) and row (y) of each tile
+    :rtype: pandas.DataFrame
+
+    **Example**::
+
+        >>> import os
+        >>> from pydriosm.reader import parse_osm_pbf
+        >>> from pydriosm.tiler import get_dirty_tiles, generate_vector_tiles
+
+        >>> old_pbf, new_pbf = [
+        ...     parse_osm_pbf(os.path.join("tests", x), None, parse_raw_feat=True,
+        ...                   transform_geom=False, transform_other_tags=False)
+        ...     for x in ["rutland-201231.osm.pbf", "rutland-latest.osm.pbf"]]
+
+        >>> path_to_mbtiles = os.path.join("tests", "rutland.mbtiles")
+
+        >>> dirty_tiles = get_dirty_tiles(old_pbf, new_pbf, max_zoom=12)
+
+        >>> tile_index = generate_vector_tiles(new_pbf, path_to_mbtiles, max_zoom=12,
+        ...                                    dirty_tiles=dirty_tiles)
+    """
+
+    assert isinstance(old_osm_data, dict) and isinstance(new_osm_data, dict), \
+        "`old_osm_data` and `new_osm_data` must be parsed data of layers."
+
+    layer_names_ = [
+        x for x in (new_osm_data.keys() if layer_names is None else layer_names)
+        if x in old_osm_data.keys() and new_osm_data[x].shape[1] > 1]  # Not raw features
+
+    osm_pbf_diff = diff_osm_pbf(old_osm_data, new_osm_data, layer_names=layer_names_,
+                                id_column=id_column)
+
+    dirty_tiles = []
+
+    for layer_name, changes in osm_pbf_diff.items():
+        old_layer = old_osm_data[layer_name]
+        changed_ids = np.concatenate([
+            pd.to_numeric(changes['modified'][id_column]).to_numpy(dtype=np.int64),
+            changes['deleted']])
+        old_changed = old_layer[pd.to_numeric(old_layer[id_column]).isin(changed_ids)]
+
+        for layer_data in [changes['created'], changes['modified'], old_changed]:
+            if len(layer_data) == 0:
+                continue
+            world_geoms = get_world_geometries(layer_data, geo_typ=layer_name)
+            for zoom in range(min_zoom, max_zoom + 1):
+                _, tile_x, tile_y = get_feature_tiles(
+                    world_geoms, zoom, buffer=buffer / extent)
+                dirty_tiles.append(np.column_stack(
+                    [np.full(len(tile_x), zoom), tile_x, tile_y]))
+
+    dirty_tiles = pd.DataFrame(
+        np.unique(np.concatenate(dirty_tiles), axis=0) if dirty_tiles else [],
+        columns=['zoom', 'x', 'y'], dtype=np.int64)
+
+    return dirty_tiles
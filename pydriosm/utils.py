@@ -2,6 +2,7 @@
 Helper functions.
 """
 
+import functools
 import math
 import os
 import re
@@ -142,6 +143,36 @@ def get_pbf_layer_feat_types_dict():
     return pbf_layer_feat_types
 
 
+def get_pbf_layer_fields_dict():
+    """
+    A dictionary for PBF layers and the corresponding attribute fields
+    (besides ``'other_tags'``) by default of the OSM driver of GDAL.
+
+    :return: a dictionary with keys and values being PBF layers and lists of field names
+    :rtype: dict
+
+    .. seealso::
+
+        - `osmconf.ini <https://github.com/OSGeo/gdal/blob/master/gdal/data/osmconf.ini>`_
+    """
+
+    pbf_layer_fields = {
+        'points': ['osm_id', 'name', 'barrier', 'highway', 'ref', 'address', 'is_in',
+                   'place', 'man_made'],
+        'lines': ['osm_id', 'name', 'highway', 'waterway', 'aerialway', 'barrier',
+                  'man_made', 'z_order'],
+        'multilinestrings': ['osm_id', 'name', 'type'],
+        'multipolygons': ['osm_id', 'osm_way_id', 'name', 'type', 'aeroway', 'amenity',
+                          'admin_level', 'barrier', 'boundary', 'building', 'craft',
+                          'geological', 'historic', 'land_area', 'landuse', 'leisure',
+                          'man_made', 'military', 'natural', 'office', 'place', 'shop',
+                          'sport', 'tourism'],
+        'other_relations': ['osm_id', 'name', 'type'],
+    }
+
+    return pbf_layer_fields
+
+
 def get_osm_geom_object_dict():
     """
     A dictionary for OSM geometry types.
@@ -192,6 +223,255 @@ def get_valid_shp_layer_names():
     return shp_layer_names
 
 
+# -- Geodesic computation --------------------------------------------------------------
+
+def haversine_distance(lon1, lat1, lon2, lat2, radius=6371008.8):
+    """
+    Compute great-circle distances between pairs of points
+    by the `haversine formula <https://en.wikipedia.org/wiki/Haversine_formula>`_.
+
+    :param lon1: longitudes of the first points
+    :type lon1: numpy.ndarray or float
+    :param lat1: latitudes of the first points
+    :type lat1: numpy.ndarray or float
+    :param lon2: longitudes of the second points
+    :type lon2: numpy.ndarray or float
+    :param lat2: latitudes of the second points
+    :type lat2: numpy.ndarray or float
+    :param radius: (mean) radius of the earth in metres, defaults to ``6371008.8``
+    :type radius: float
+    :return: distances (in metres) between the pairs of points
+    :rtype: numpy.ndarray or float
+
+    **Example**::
+
+        >>> from pydriosm.utils import haversine_distance
+
+        >>> dist = haversine_distance(-0.5134241, 52.6555853, -0.5313354, 52.6737716)
+
+        >>> print(round(dist, 2))
+        2355.51
+    """
+
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + \
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+
+    distance = 2 * radius * np.arcsin(np.sqrt(a))
+
+    return distance
+
+
+def geodetic_to_cartesian(lon, lat, radius=6371008.8):
+    """
+    Convert longitudes and latitudes to Cartesian coordinates on a sphere
+    (centred at the centre of the earth).
+
+    The Euclidean (chord) distances between the converted points increase monotonically
+    with the great-circle distances, so that the points can be indexed by a KD-tree.
+
+    :param lon: longitudes
+    :type lon: numpy.ndarray or float
+    :param lat: latitudes
+    :type lat: numpy.ndarray or float
+    :param radius: (mean) radius of the earth in metres, defaults to ``6371008.8``
+    :type radius: float
+    :return: x, y and z coordinates (in metres) of the points, of shape (n, 3)
+    :rtype: numpy.ndarray
+
+    **Example**::
+
+        >>> from pydriosm.utils import geodetic_to_cartesian
+
+        >>> xyz = geodetic_to_cartesian(-0.5134241, 52.6555853)
+
+        >>> print(xyz.round(1))
+        [[3864529.7  -34630.7 5064974.2]]
+    """
+
+    lon, lat = np.radians(np.atleast_1d(lon)), np.radians(np.atleast_1d(lat))
+
+    xyz = radius * np.column_stack(
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+    return xyz
+
+
+def get_utm_epsg_code(lon, lat):
+    """
+    Get EPSG codes of the (WGS 84)
+    `UTM <https://en.wikipedia.org/wiki/Universal_Transverse_Mercator_coordinate_system>`_
+    zones in which given points are located.
+
+    :param lon: longitudes
+    :type lon: numpy.ndarray or float
+    :param lat: latitudes
+    :type lat: numpy.ndarray or float
+    :return: EPSG codes of the UTM zones, e.g. ``32630`` for the zone 30N
+    :rtype: numpy.ndarray
+
+    **Example**::
+
+        >>> from pydriosm.utils import get_utm_epsg_code
+
+        >>> lon, lat = [-0.5134241, 2.3522219], [52.6555853, 48.856614]
+
+        >>> epsg_codes = get_utm_epsg_code(lon, lat)
+
+        >>> print(epsg_codes)
+        [32630 32631]
+    """
+
+    lon, lat = np.atleast_1d(lon).astype(float), np.atleast_1d(lat).astype(float)
+
+    zones = np.clip(np.floor((np.nan_to_num(lon) + 180) / 6).astype(int) + 1, 1, 60)
+    epsg_codes = np.where(lat < 0, 32700, 32600) + zones
+
+    return epsg_codes
+
+
+@functools.lru_cache(maxsize=None)
+def get_transformer(crs_from, crs_to):
+    """
+    Get a transformer of coordinates from one coordinate reference system to another.
+
+    Creating a `pyproj.Transformer`_ costs far more than transforming arrays of
+    coordinates with it, so the transformers are cached and reused.
+
+    .. _`pyproj.Transformer`:
+        https://pyproj4.github.io/pyproj/stable/api/transformer.html
+
+    :param crs_from: coordinate reference system of the input coordinates,
+        e.g. ``'EPSG:4326'``
+    :type crs_from: str or int
+    :param crs_to: coordinate reference system of the output coordinates,
+        e.g. ``'EPSG:32630'``
+    :type crs_to: str or int
+    :return: a transformer taking and returning coordinates in the (x, y) order,
+        i.e. (longitude, latitude) for geographic coordinates
+    :rtype: pyproj.Transformer
+
+    **Example**::
+
+        >>> from pydriosm.utils import get_transformer
+
+        >>> transformer = get_transformer('EPSG:4326', 'EPSG:32630')
+
+        >>> x, y = transformer.transform(-0.5134241, 52.6555853)
+
+        >>> print(round(x, 1), round(y, 1))
+        668186.0 5836860.5
+    """
+
+    import pyproj
+
+    transformer = pyproj.Transformer.from_crs(crs_from, crs_to, always_xy=True)
+
+    return transformer
+
+
+# -- Remote data files -----------------------------------------------------------------
+
+def is_remote_path(path):
+    """
+    Check whether a path is the URL of a remote data file,
+    e.g. in an (S3-compatible) object storage.
+
+    :param path: path to a data file (or a directory)
+    :type path: str or None
+    :return: whether the ``path`` is a URL, such as ``'s3://bucket/key'``
+        (but not ``'file://...'``)
+    :rtype: bool
+
+    **Example**::
+
+        >>> from pydriosm.utils import is_remote_path
+
+        >>> is_remote_path("s3://osm/rutland-latest.osm.pbf")
+        True
+
+        >>> is_remote_path("tests/rutland-latest.osm.pbf")
+        False
+    """
+
+    is_remote = isinstance(path, str) and not path.startswith('file://') and \
+        re.match(r'^[A-Za-z][A-Za-z0-9+.-]*://', path) is not None
+
+    return is_remote
+
+
+def get_vsi_path(path, member=None):
+    """
+    Get the path of a (remote) data file in the virtual file systems of
+    `GDAL <https://gdal.org/user/virtual_file_systems.html>`_.
+
+    Reading a remote file by its virtual path starts immediately, and only the byte
+    ranges that are read are fetched (and cached in blocks), see also
+    :py:func:`gdal_vsi_configurations()<pydriosm.settings.gdal_vsi_configurations>`.
+
+    :param path: path to a data file, either local or a URL, e.g. ``'s3://bucket/key'``,
+        ``'gs://...'``, ``'az://...'`` or ``'https://...'``
+    :type path: str
+    :param member: name of a file in the .zip archive ``path``; if ``''``, the root of
+        the archive; if ``None`` (default), the ``path`` is not an archive
+    :type member: str or None
+    :return: the path (to be opened by GDAL/OGR)
+    :rtype: str
+
+    **Examples**::
+
+        >>> from pydriosm.utils import get_vsi_path
+
+        >>> get_vsi_path("s3://osm/rutland-latest.osm.pbf")
+        '/vsis3/osm/rutland-latest.osm.pbf'
+
+        >>> get_vsi_path("s3://osm/rutland-latest-free.shp.zip",
+        ...              member="gis_osm_railways_free_1.shp")
+        '/vsizip//vsis3/osm/rutland-latest-free.shp.zip/gis_osm_railways_free_1.shp'
+    """
+
+    vsi_prefixes = {
+        's3': '/vsis3/', 'gs': '/vsigs/', 'gcs': '/vsigs/', 'az': '/vsiaz/',
+        'abfs': '/vsiadls/', 'oss': '/vsioss/', 'swift': '/vsiswift/',
+        'http': '/vsicurl/', 'https': '/vsicurl/'}
+
+    if is_remote_path(path):
+        scheme, key = path.split('://', 1)
+        scheme = scheme.lower()
+        assert scheme in vsi_prefixes, \
+            "The scheme of `path` must be one of {}.".format(set(vsi_prefixes.keys()))
+
+        vsi_path = vsi_prefixes[scheme] + (path if scheme.startswith('http') else key)
+
+    else:
+        vsi_path = path[len('file://'):] if path.startswith('file://') else path
+
+    if member is not None:
+        vsi_path = '/vsizip/' + vsi_path + ('/' + member if member else '')
+
+    return vsi_path
+
+
+def get_remote_file_size(path):
+    """
+    Get the size of a (remote) data file, without reading it.
+
+    :param path: path to a data file, either local or a URL, e.g. ``'s3://bucket/key'``
+    :type path: str
+    :return: size of the file (in bytes), or ``None`` if the file is not found
+    :rtype: int or None
+    """
+
+    import gdal
+
+    stat = gdal.VSIStatL(get_vsi_path(path))
+
+    file_size = None if stat is None else stat.size
+
+    return file_size
+
+
 # -- Miscellaneous ---------------------------------------------------------------------
 
 def validate_shp_layer_names(layer_names):
@@ -342,16 +622,23 @@ def get_number_of_chunks(path_to_file, chunk_size_limit=50):
     Compute number of chunks for parsing OSM (mainly PBF) data file
     in a chunk-wise manner.
 
-    :param path_to_file: absolute path to a file
+    :param path_to_file: absolute path to a file, or its URL, e.g. ``'s3://bucket/key'``
     :type path_to_file: str
     :param chunk_size_limit: threshold (in MB) above which
         the data file is split into chunks, defaults to ``50``;
     :type chunk_size_limit: int
-    :return: number of chunks
+    :return: number of chunks, or ``None`` if the file is not to be split
+        (or its size is unknown, e.g. when a remote file cannot be found)
     :rtype: int or None
     """
 
-    file_size_in_mb = round(os.path.getsize(path_to_file) / (1024 ** 2), 1)
+    file_size = get_remote_file_size(path_to_file) if is_remote_path(path_to_file) \
+        else os.path.getsize(path_to_file)
+
+    if file_size is None:
+        return None
+
+    file_size_in_mb = round(file_size / (1024 ** 2), 1)
 
     if chunk_size_limit and file_size_in_mb > chunk_size_limit:
         number_of_chunks = math.ceil(file_size_in_mb / chunk_size_limit)
@@ -58,7 +58,7 @@ setuptools.setup(
         'Fiona',
         'fuzzywuzzy',
         'GDAL~=3.1.4',
-        'geopandas',
+        'geopandas>=0.12',
         'html5lib',
         'humanfriendly',
         'lxml',
@@ -69,12 +69,17 @@ setuptools.setup(
         'pyproj',
         'pyshp',
         'requests',
-        'Shapely',
+        'scipy',
+        'Shapely>=2.0',
         'SQLAlchemy',
         'SQLAlchemy-Utils',
         'tqdm',
     ],
 
+    extras_require={
+        'remote': ['fsspec', 's3fs'],
+    },
+
     package_data={"": ["requirements.txt", "LICENSE"]},
     include_package_data=True,
 
@@ -0,0 +1,131 @@
+"""
+Fixtures shared by the tests.
+"""
+
+import sys
+import types
+
+import pytest
+import rapidjson
+
+
+class FakeFeature:
+    """A feature of a (fake) layer of GDAL/OGR."""
+
+    def __init__(self, layer, feature):
+        self.Layer = layer
+        self.Feature = feature
+
+    def ExportToJson(self, as_object=False):
+        ignored_fields = self.Layer.IgnoredFields
+
+        feature = dict(self.Feature, properties={
+            k: v for k, v in self.Feature['properties'].items()
+            if k not in ignored_fields})
+        if 'OGR_GEOMETRY' in ignored_fields:
+            feature['geometry'] = None
+
+        return feature if as_object else rapidjson.dumps(feature)
+
+
+class FakeFieldDefn:
+
+    def __init__(self, name):
+        self.Name = name
+
+    def GetName(self):
+        return self.Name
+
+
+class FakeLayer:
+    """A (fake) layer of GDAL/OGR, whose features are given as GeoJSON dictionaries."""
+
+    def __init__(self, name, features):
+        self.Name = name
+        self.Features = features
+        self.FieldNames = list(dict.fromkeys(
+            k for feature in features for k in feature['properties']))
+        self.IgnoredFields = []
+
+    def GetName(self):
+        return self.Name
+
+    def GetLayerDefn(self):
+        return self
+
+    def GetFieldCount(self):
+        return len(self.FieldNames)
+
+    def GetFieldDefn(self, i):
+        return FakeFieldDefn(self.FieldNames[i])
+
+    def SetIgnoredFields(self, field_names):
+        self.IgnoredFields = list(field_names)
+
+    def __iter__(self):
+        return (FakeFeature(self, feature) for feature in self.Features)
+
+
+class FakeDataSource:
+
+    def __init__(self, layers):
+        self.Layers = [FakeLayer(k, v) for k, v in layers.items()]
+        self.Released = False
+
+    def GetLayerCount(self):
+        return len(self.Layers)
+
+    def GetLayerByIndex(self, i):
+        return self.Layers[i]
+
+    def ExecuteSQL(self, statement):
+        pass
+
+    def Release(self):
+        self.Released = True
+
+
+def make_features(geo_typ, n, start=1):
+    """Make features of a layer, as exported from a PBF data file by GDAL/OGR."""
+
+    geom_types = {'points': 'Point', 'lines': 'LineString'}
+
+    features = []
+    for i in range(start, start + n):
+        x, y = -0.5 - i % 1000 * 1e-4, 52.6 + i % 1000 * 1e-4
+        coordinates = [x, y] if geo_typ == 'points' else [[x, y], [x + 0.01, y + 0.01]]
+        features.append({
+            'type': 'Feature', 'id': i,
+            'geometry': {'type': geom_types[geo_typ], 'coordinates': coordinates},
+            'properties': {'osm_id': str(i), 'name': 'n{}'.format(i),
+                           'other_tags': '"odbl"=>"clean"' if i % 2 else None}})
+
+    return features
+
+
+@pytest.fixture
+def make_pbf_features():
+    """A maker of features of a (fake) layer of PBF data."""
+
+    return make_features
+
+
+@pytest.fixture
+def fake_ogr(monkeypatch):
+    """
+    A (fake) module ``ogr``, which opens any PBF data file as the layers
+    in its dictionary ``Layers``, and keeps the data sources in ``DataSources``.
+    """
+
+    ogr = types.ModuleType('ogr')
+    ogr.Layers, ogr.DataSources = {}, []
+
+    def open_data_source(path_to_file, *args):
+        data_source = FakeDataSource(ogr.Layers)
+        ogr.DataSources.append(data_source)
+        return data_source
+
+    ogr.Open = open_data_source
+    monkeypatch.setitem(sys.modules, 'ogr', ogr)
+
+    return ogr
@@ -0,0 +1,124 @@
+"""
+Tests of the module :py:mod:`pydriosm.indexer`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pydriosm.indexer import NameSearchIndex, ReverseGeocoder, build_name_search_index, \
+    build_reverse_geocoder
+
+
+def make_points():
+    return pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'name': ['Oakham Castle', 'Oakham', 'Oakley', 'Uppingham'],
+        'other_tags': [None, None, None, '"addr:street"=>"High Street"']})
+
+
+class TestNameSearchIndex:
+
+    def test_fuzzy_search_matches_longer_names(self):
+        name_index = build_name_search_index({'points': make_points()})
+
+        entries = name_index.fuzzy_search('okham')
+        assert [x[0] for x in entries] == ['Oakham', 'Oakham Castle']
+        assert name_index.fuzzy_search('okham', limit=1)[0][:3] == ('Oakham', 'points', 2)
+
+    def test_prefix_search(self):
+        name_index = build_name_search_index({'points': make_points()})
+
+        assert [x[0] for x in name_index.prefix_search('oak')] == \
+            ['Oakham', 'Oakham Castle', 'Oakley']
+        assert name_index.prefix_search('high') == [('High Street', 'points', 4)]
+
+    def test_empty_layers(self, tmp_path):
+        name_index = build_name_search_index(
+            {'points': make_points().iloc[:0], 'lines': None})
+
+        assert len(name_index) == 0
+        assert name_index.prefix_search('oak') == []
+        assert name_index.fuzzy_search('okham') == []
+
+        name_index.save(str(tmp_path / "name-index.npz"))
+        name_index = NameSearchIndex.load(str(tmp_path / "name-index.npz"))
+        assert name_index.fuzzy_search('okham') == []
+
+
+def make_addressed_layers():
+    points = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'coordinates': [[-0.7279, 52.6705], [-0.7269, 52.6705], [-0.5134, 52.6556],
+                        [-0.7289, 52.6705]],
+        'name': [None, 'Oakham Castle', 'Manton', 'Rutland Showground'],
+        'other_tags': ['"addr:housenumber"=>"1","addr:street"=>"High Street"',
+                       '"addr:street"=>"Market Place","addr:postcode"=>"LE15 6DT"',
+                       None, '"historic"=>"castle"']})
+    multipolygons = pd.DataFrame({
+        'id': [10],
+        'coordinates': [[[[[-0.514, 52.655], [-0.512, 52.655], [-0.512, 52.657],
+                           [-0.514, 52.657], [-0.514, 52.655]]]]],
+        'name': [None], 'other_tags': ['"addr:housenumber"=>"5","building"=>"yes"']})
+    return {'points': points, 'multipolygons': multipolygons}
+
+
+class TestReverseGeocoder:
+
+    def test_nearest(self):
+        geocoder = build_reverse_geocoder(make_addressed_layers())
+        assert len(geocoder) == 3  # Features with no address are not taken
+
+        nearest = geocoder.query([-0.7278, -0.5132], [52.6705, 52.6561])
+        assert nearest['query'].tolist() == [0, 1]
+        assert list(zip(nearest.layer, nearest.id)) == [
+            ('points', 1), ('multipolygons', 10)]  # The centroid of the building
+        assert nearest.street[0] == 'High Street' and nearest.housenumber[1] == '5'
+        assert 5 < nearest.distance[0] < 10
+
+    def test_k_nearest(self):
+        geocoder = build_reverse_geocoder(make_addressed_layers())
+
+        nearest = geocoder.query(-0.7278, 52.6705, k=2)
+        assert nearest['query'].tolist() == [0, 0]
+        assert nearest.id.tolist() == [1, 2]
+        assert nearest.distance.is_monotonic_increasing
+
+        # There are fewer features than k
+        assert len(geocoder.query(-0.7278, 52.6705, k=5)) == 3
+
+    def test_max_distance(self):
+        geocoder = build_reverse_geocoder(make_addressed_layers())
+
+        nearest = geocoder.query([-0.7278, -0.6], [52.6705, 52.6], k=3, max_distance=100)
+        assert nearest['query'].tolist() == [0, 0]  # The other location has none
+        assert (nearest.distance <= 100).all()
+
+        assert geocoder.query(-0.6, 52.6, max_distance=100).empty
+
+    def test_include_named(self):
+        layers = make_addressed_layers()
+
+        geocoder = build_reverse_geocoder(layers, layer_names=['points'],
+                                          include_named=True)
+        assert sorted(geocoder.AddressData.id) == [1, 2, 3, 4]
+        assert geocoder.query(-0.5134, 52.6556).name[0] == 'Manton'
+
+    def test_save_and_load(self, tmp_path):
+        geocoder = build_reverse_geocoder(make_addressed_layers())
+
+        path_to_pickle = str(tmp_path / "rutland-geocoder.pickle")
+        geocoder.save(path_to_pickle)
+        geocoder_ = ReverseGeocoder.load(path_to_pickle)
+
+        lon, lat = np.array([-0.7278, -0.5132, -0.6]), np.array([52.6705, 52.6561, 52.6])
+        pd.testing.assert_frame_equal(geocoder_.query(lon, lat, k=2),
+                                      geocoder.query(lon, lat, k=2))
+        np.testing.assert_array_equal(geocoder_.Coordinates, geocoder.Coordinates)
+
+    def test_no_addresses(self):
+        points = make_addressed_layers()['points'].assign(other_tags=None)
+
+        for osm_data in [{'points': points}, {'points': points.iloc[:0], 'lines': None}]:
+            with pytest.raises(ValueError, match="No addressed feature"):
+                build_reverse_geocoder(osm_data)
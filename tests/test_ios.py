@@ -0,0 +1,67 @@
+"""
+Tests of the module :py:mod:`pydriosm.ios`.
+"""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pydriosm.ios import PostgresOSM, prepare_layer_data
+
+
+def make_postgres_osm():
+    postgres_osm = PostgresOSM.__new__(PostgresOSM)
+    postgres_osm.PostgreSQL = mock.MagicMock(address='postgres:***@localhost:5432/test')
+    postgres_osm.PostgreSQL.table_exists.return_value = True
+    postgres_osm.get_table_name_for_subregion = lambda x, y: x
+    return postgres_osm
+
+
+def make_changes():
+    modified = pd.DataFrame({'id': [2], 'coordinates': [[0.0, 1.0]], 'name': ['B']})
+    changes = {'created': modified.iloc[:0], 'modified': modified,
+               'deleted': np.array([3])}
+    return changes
+
+
+class TestApplyOSMPBFDiff:
+
+    def test_changes_are_applied_in_one_transaction(self):
+        postgres_osm = make_postgres_osm()
+        conn = postgres_osm.PostgreSQL.engine.begin.return_value.__enter__.return_value
+
+        with mock.patch.object(pd.DataFrame, 'to_sql') as to_sql:
+            postgres_osm.apply_osm_pbf_diff(
+                {'points': make_changes(), 'lines': make_changes()}, 'Rutland',
+                confirmation_required=False)
+
+        postgres_osm.PostgreSQL.engine.begin.assert_called_once()
+        delete_calls = [x for x in conn.execute.call_args_list if len(x.args) == 2]
+        assert [x.args[1] for x in delete_calls] == [{'ids': [3, 2]}] * 2
+        assert all(x.args[1] is conn for x in to_sql.call_args_list)
+
+    def test_failure_is_raised_and_rolled_back(self):
+        postgres_osm = make_postgres_osm()
+        transaction = postgres_osm.PostgreSQL.engine.begin.return_value
+        transaction.__enter__.return_value.execute.side_effect = RuntimeError('lost')
+
+        with pytest.raises(RuntimeError):
+            postgres_osm.apply_osm_pbf_diff({'points': make_changes()}, 'Rutland',
+                                            confirmation_required=False)
+
+        # The transaction is exited with the error, i.e. rolled back
+        assert transaction.__exit__.call_args.args[0] is RuntimeError
+
+
+def test_prepare_layer_data():
+    from shapely.geometry import Point
+
+    points = pd.DataFrame({'id': [1, 2], 'coordinates': [Point(0, 1), Point(1, 2)]},
+                          index=[5, 6])
+    points_, col_type = prepare_layer_data(points)
+
+    assert points_.coordinates.tolist() == ['POINT (0 1)', 'POINT (1 2)']
+    assert col_type is None
+    assert isinstance(points.coordinates[5], Point)  # The input is left unchanged
@@ -0,0 +1,131 @@
+"""
+Tests of the module :py:mod:`pydriosm.network`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pydriosm.network import RoadGraph, build_road_graph, parse_maxspeed, parse_oneway
+
+
+def test_parse_maxspeed():
+    maxspeed = pd.Series(['30 mph', '20mph', '50', '12.5', '10 knots', '50;30',
+                          '30 mph;20 mph', 'none', 'signals', '0', None])
+    speed = parse_maxspeed(maxspeed)
+
+    np.testing.assert_allclose(
+        speed[:7], [48.28032, 32.18688, 50, 12.5, 18.52, 50, 48.28032])
+    assert np.isnan(speed[7:]).all()
+
+    # Speed limits of shapefiles are integers in km/h (and 0 where unknown)
+    np.testing.assert_array_equal(parse_maxspeed(pd.Series([30, 0])), [30, np.nan])
+
+
+class TestParseOneway:
+
+    def test_tags(self):
+        oneway = pd.Series(['yes', 'true', '1', '-1', 'reverse', 'no', None, 'YES'])
+        assert parse_oneway(oneway).tolist() == [1, 1, 1, -1, -1, 0, 0, 1]
+
+    def test_implied(self):
+        oneway = pd.Series([None, 'no', None, '-1', None])
+        highway = pd.Series(
+            ['motorway', 'motorway', 'primary', 'motorway_link', 'primary'])
+        junction = pd.Series([None, None, 'roundabout', None, None])
+
+        assert parse_oneway(oneway, highway=highway, junction=junction).tolist() == \
+            [1, 0, 1, -1, 0]
+
+    def test_shapefile(self):
+        # 'F': along the digitised direction only; 'T': against it only; 'B': both
+        oneway = pd.Series(['F', 'T', 'B', 'B'])
+        fclass = pd.Series(['primary', 'primary', 'primary', 'motorway'])
+
+        assert parse_oneway(oneway, highway=fclass).tolist() == [1, -1, 0, 0]
+
+
+@pytest.fixture
+def lines():
+    """
+    Ways crossing at their vertices: 1 (A-B-C), 2 (B-D, one-way) and 3 (C-E, one-way
+    against its direction), and a line that is not a road.
+    """
+
+    a, b, c, d, e = [0.0, 52.0], [0.0, 52.001], [0.0, 52.002], [0.001, 52.001], \
+        [0.001, 52.002]
+
+    lines_ = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'coordinates': [[a, b, c], [b, d], [c, e], [a, d]],
+        'other_tags': ['"highway"=>"primary","maxspeed"=>"30 mph"',
+                       '"highway"=>"residential","oneway"=>"yes"',
+                       '"highway"=>"residential","oneway"=>"-1","maxspeed"=>"20"',
+                       None]})
+
+    return lines_
+
+
+class TestBuildRoadGraph:
+
+    def test_lines(self, lines):
+        road_graph = build_road_graph(lines, geo_typ='lines')
+
+        assert road_graph.number_of_nodes == 5
+        assert road_graph.number_of_edges == 6  # A-B and B-C twice, B-D and E-C once
+
+        nodes = {tuple(xy): i for i, xy in enumerate(road_graph.NodeCoordinates.tolist())}
+        a, b, c, d, e = (nodes[x] for x in [(0.0, 52.0), (0.0, 52.001), (0.0, 52.002),
+                                            (0.001, 52.001), (0.001, 52.002)])
+
+        assert sorted(road_graph.neighbours(b)) == sorted([a, c, d])
+        assert list(road_graph.neighbours(d)) == []  # One-way from B to D
+        assert list(road_graph.neighbours(e)) == [c]  # One-way against the digitisation
+        assert sorted(road_graph.neighbours(c)) == [b]
+
+        edges = pd.DataFrame({
+            'source': np.repeat(np.arange(5), np.diff(road_graph.Offsets)),
+            'target': road_graph.Targets, 'length': road_graph.Lengths,
+            'way_id': road_graph.WayIDs, 'maxspeed': road_graph.MaxSpeeds,
+            'highway': road_graph.HighwayClasses[road_graph.HighwayCodes]})
+        edge = edges[(edges.source == a) & (edges.target == b)].iloc[0]
+        assert edge.way_id == 1 and edge.highway == 'primary'
+        assert abs(edge.length - 111.2) < 0.5 and abs(edge.maxspeed - 48.28) < 0.01
+        assert np.isnan(edges.maxspeed[edges.way_id == 2]).all()
+        assert (edges.maxspeed[edges.way_id == 3] == 20).all()
+
+    def test_shapefile(self):
+        gpd = pytest.importorskip('geopandas')
+        shapely = pytest.importorskip('shapely')
+
+        roads = gpd.GeoDataFrame({
+            'osm_id': ['1', '2', '3'], 'fclass': ['primary', 'primary', 'motorway'],
+            'oneway': ['F', 'T', 'B'], 'maxspeed': [50, 0, 70],
+            'geometry': [shapely.LineString([(0, 0), (3, 4)]),
+                         shapely.LineString([(3, 4), (6, 8)]),
+                         shapely.LineString([(6, 8), (6, 9)])]})
+
+        road_graph = build_road_graph(roads, geodesic=False)
+
+        assert road_graph.number_of_nodes == 4 and road_graph.number_of_edges == 4
+        edges = set(zip(
+            map(tuple, road_graph.NodeCoordinates[
+                np.repeat(np.arange(4), np.diff(road_graph.Offsets))].tolist()),
+            map(tuple, road_graph.NodeCoordinates[road_graph.Targets].tolist())))
+        assert edges == {((0, 0), (3, 4)), ((6, 8), (3, 4)),
+                         ((6, 8), (6, 9)), ((6, 9), (6, 8))}
+        assert sorted(road_graph.Lengths.tolist()) == [1, 1, 5, 5]
+        assert road_graph.WayIDs.dtype == np.int64
+
+    def test_save_and_load(self, lines, tmp_path):
+        road_graph = build_road_graph(lines, geo_typ='lines')
+
+        path_to_npz = str(tmp_path / "road-graph.npz")
+        road_graph.save(path_to_npz)
+        road_graph_ = RoadGraph.load(path_to_npz)
+
+        for attr in ['NodeCoordinates', 'Offsets', 'Targets', 'Lengths', 'HighwayCodes',
+                     'HighwayClasses', 'MaxSpeeds', 'WayIDs']:
+            np.testing.assert_array_equal(getattr(road_graph_, attr),
+                                          getattr(road_graph, attr))
+        assert road_graph_.HighwayClasses.tolist() == ['primary', 'residential']
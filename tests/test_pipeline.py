@@ -0,0 +1,195 @@
+"""
+Tests of the module :py:mod:`pydriosm.pipeline`.
+"""
+
+import os
+from unittest import mock
+
+import pandas as pd
+import pytest
+import rapidjson
+import shapely
+from pyhelpers.store import load_pickle
+
+from pydriosm.pipeline import FileSink, PickleSink, PostgresSink, Sink, StatsSink, \
+    parse_pbf_chunk, run_pipeline
+
+
+class FailingSink(Sink):
+
+    def __init__(self):
+        self.Closed = False
+
+    def write(self, layer_name, layer_data):
+        raise ValueError("Failed to write.")
+
+    def close(self):
+        self.Closed = True
+
+
+def make_chunk(start, n):
+    return pd.DataFrame({
+        'id': range(start, start + n),
+        'coordinates': [[-0.5 - i * 1e-3, 52.6] for i in range(n)],
+        'name': ['n{}'.format(start + i) for i in range(n)],
+        'other_tags': ['"odbl"=>"clean"'] + [None] * (n - 1)})
+
+
+class TestSinks:
+
+    @pytest.mark.parametrize('ret_data', [False, True])
+    def test_pickle_sink(self, tmp_path, ret_data):
+        path_to_pickle = str(tmp_path / "rutland-latest-pbf.pickle")
+        sink = PickleSink(path_to_pickle, ret_data=ret_data)
+
+        sink.open()
+        sink.write('points', make_chunk(1, 2))
+        sink.write('lines', make_chunk(10, 1))
+        sink.write('points', make_chunk(3, 2))
+        result = sink.close()
+
+        osm_data = load_pickle(path_to_pickle)
+        assert list(osm_data.keys()) == ['points', 'lines']
+        assert osm_data['points'].id.tolist() == [1, 2, 3, 4]
+        if ret_data:
+            pd.testing.assert_frame_equal(result['points'], osm_data['points'])
+        else:
+            assert result == path_to_pickle
+
+    def test_postgres_sink(self):
+        postgres_osm = mock.MagicMock()
+        sink = PostgresSink(postgres_osm, 'Rutland', if_exists='replace', chunk_size=10)
+
+        sink.open()
+        sink.write('points', make_chunk(1, 2))
+        sink.write('points', make_chunk(3, 2))
+        sink.write('lines', pd.DataFrame({'lines': ['{"id": 10}']}))  # Raw data
+
+        calls = postgres_osm.import_osm_layer.call_args_list
+        assert [(x.kwargs['schema_name'], x.kwargs['if_exists']) for x in calls] == [
+            ('points', 'replace'), ('points', 'append'), ('lines', 'replace')]
+        assert all(x.kwargs['table_name'] == 'Rutland' and x.kwargs['chunk_size'] == 10
+                   for x in calls)
+        assert calls[2].args[0].columns.tolist() == ['lines_data']
+
+        assert sink.close() == {'points': 4, 'lines': 1}
+
+    def test_file_sink(self, tmp_path):
+        sink = FileSink(str(tmp_path / "rutland"))
+
+        sink.open()
+        for chunk in [make_chunk(1, 2), make_chunk(3, 2)]:
+            chunk['geometry'] = shapely.points(chunk.coordinates.tolist())
+            sink.write('points', chunk)
+        path_to_dir = sink.close()
+
+        assert os.listdir(path_to_dir) == ['points.csv']
+        points = pd.read_csv(os.path.join(path_to_dir, "points.csv"))
+        assert points.id.tolist() == [1, 2, 3, 4]  # With a header only at the top
+        assert rapidjson.loads(points.coordinates[0]) == [-0.5, 52.6]
+        assert points.geometry[0] == 'POINT (-0.5 52.6)'
+
+    def test_file_sink_parquet(self, tmp_path):
+        pytest.importorskip('pyarrow')
+
+        sink = FileSink(str(tmp_path / "rutland"), file_format='parquet')
+
+        sink.open()
+        sink.write('points', make_chunk(1, 2))
+        sink.write('points', make_chunk(3, 2))
+        path_to_dir = sink.close()
+
+        assert sorted(os.listdir(os.path.join(path_to_dir, "points"))) == [
+            "part-00000.parquet", "part-00001.parquet"]
+        points = pd.read_parquet(os.path.join(path_to_dir, "points"))
+        assert sorted(points.id) == [1, 2, 3, 4]
+
+    def test_stats_sink(self):
+        sink = StatsSink()
+
+        sink.open()
+        sink.write('points', make_chunk(1, 3))
+        raw_feature = {'id': 10, 'properties': {'osm_id': '10', 'name': 'Oakham',
+                                                'other_tags': '"odbl"=>"clean"'}}
+        sink.write('points', pd.DataFrame({'points': [rapidjson.dumps(raw_feature)]}))
+        summary = sink.close().summary().set_index('key')
+
+        assert summary.loc['name', 'count'] == 4 and summary.loc['odbl', 'count'] == 2
+        assert 'osm_id' not in summary.index
+
+    def test_file_format(self):
+        with pytest.raises(AssertionError):
+            FileSink("rutland", file_format='shp')
+
+
+class TestParsePBFChunk:
+
+    def test_parse_raw_feat(self, make_pbf_features):
+        features = make_pbf_features('points', 3)
+
+        layer_name, layer_data = parse_pbf_chunk('points', features)
+        assert layer_name == 'points'
+        assert layer_data.columns.tolist() == [
+            'id', 'coordinates', 'osm_id', 'name', 'other_tags']
+
+        layer_name, layer_data = parse_pbf_chunk(
+            'points', [rapidjson.dumps(x) for x in features], parse_raw_feat=False)
+        assert layer_data.columns.tolist() == ['points'] and len(layer_data) == 3
+
+
+class TestRunPipeline:
+
+    def test_sinks(self, fake_ogr, make_pbf_features, tmp_path):
+        fake_ogr.Layers.update(points=make_pbf_features('points', 5),
+                               lines=make_pbf_features('lines', 2, start=100))
+
+        path_to_pickle = str(tmp_path / "rutland-latest-pbf.pickle")
+        postgres_osm = mock.MagicMock()
+        sinks = [PickleSink(path_to_pickle, ret_data=True), StatsSink(),
+                 PostgresSink(postgres_osm, 'Rutland'), FileSink(str(tmp_path / "csv"))]
+
+        osm_data, stats, feature_counts, path_to_dir = run_pipeline(
+            "rutland-latest.osm.pbf", sinks, chunk_size=2, max_workers=1,
+            spatial_keys='quadkey')
+
+        # The chunks are written in the order in which they are read
+        assert osm_data['points'].id.tolist() == [1, 2, 3, 4, 5]
+        assert osm_data['lines'].id.tolist() == [100, 101]
+        assert 'quadkey' in osm_data['points'].columns
+
+        summary = stats.summary().set_index(['layer', 'key'])
+        assert summary.loc[('points', 'name'), 'count'] == 5
+
+        assert feature_counts == {'points': 5, 'lines': 2}
+        assert len(postgres_osm.import_osm_layer.call_args_list) == 4
+
+        points = pd.read_csv(os.path.join(path_to_dir, "points.csv"))
+        assert points.id.tolist() == [1, 2, 3, 4, 5]
+
+        assert fake_ogr.DataSources[0].Released
+
+    def test_raw_data(self, fake_ogr, make_pbf_features):
+        fake_ogr.Layers.update(points=make_pbf_features('points', 3))
+
+        postgres_osm = mock.MagicMock()
+        run_pipeline("rutland-latest.osm.pbf", [PostgresSink(postgres_osm, 'Rutland')],
+                     parse_raw_feat=False, chunk_size=2, max_workers=1)
+
+        layer_data = [x.args[0] for x in postgres_osm.import_osm_layer.call_args_list]
+        assert all(x.columns.tolist() == ['points_data'] for x in layer_data)
+        assert [rapidjson.loads(x)['id'] for x in pd.concat(layer_data).points_data] \
+            == [1, 2, 3]
+
+    def test_failing_sink(self, fake_ogr, make_pbf_features, tmp_path):
+        fake_ogr.Layers.update(points=make_pbf_features('points', 5))
+
+        sinks = [StatsSink(), FailingSink()]
+        with mock.patch.object(StatsSink, 'close', autospec=True) as close:
+            with pytest.raises(ValueError, match="Failed to write."):
+                run_pipeline("rutland-latest.osm.pbf", sinks, chunk_size=2,
+                             max_workers=1)
+
+        # All the sinks are closed, and the data file is released
+        close.assert_called_once_with(sinks[0])
+        assert sinks[1].Closed
+        assert fake_ogr.DataSources[0].Released
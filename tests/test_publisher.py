@@ -0,0 +1,67 @@
+"""
+Tests of the module :py:mod:`pydriosm.publisher`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+from pydriosm.publisher import OSMDataPublisher, OSMDataSubscriber
+
+
+@pytest.fixture
+def points():
+    """Data of a layer of points with nullable, categorical and geometric columns."""
+
+    return pd.DataFrame({
+        'id': np.arange(4),
+        'layer': pd.array([1, None, 3, -2], dtype='Int64'),
+        'oneway': pd.array([True, None, False, True], dtype='boolean'),
+        'fclass': pd.Categorical(['bench', 'bus_stop', 'bench', None]),
+        'name': ['Oakham', None, 'Uppingham', 'Ketton'],
+        'coordinates': [shapely.Point(-0.73, 52.67), None, shapely.Point(-0.72, 52.59),
+                        shapely.LineString([(-0.5, 52.6), (-0.4, 52.7)])]})
+
+
+class TestOSMDataSubscriber:
+
+    def test_dtypes(self, points):
+        with OSMDataPublisher({'points': points}) as publisher:
+            subscriber = OSMDataSubscriber(publisher.Name)
+            points_ = subscriber.get_layer('points')
+
+            pd.testing.assert_series_equal(points_.dtypes, points.dtypes)
+            pd.testing.assert_frame_equal(points_.drop(columns='coordinates'),
+                                          points.drop(columns='coordinates'))
+            assert shapely.equals(points_.coordinates.iloc[[0, 2, 3]],
+                                  points.coordinates.iloc[[0, 2, 3]]).all()
+            assert points_.coordinates[1] is None
+
+            del points_
+            subscriber.close()
+
+    def test_wkb(self, points):
+        with OSMDataPublisher({'points': points}) as publisher:
+            subscriber = OSMDataSubscriber(publisher.Name)
+
+            data, offsets, is_null = subscriber.get_wkb('points', 'coordinates')
+            assert not data.flags.writeable
+            assert is_null.tolist() == [False, True, False, False]
+            assert data[offsets[2]:offsets[3]].tobytes() == \
+                shapely.to_wkb(points.coordinates[2])
+
+            assert subscriber.get_wkb('points', 'coordinates', 1) is None
+            wkb = subscriber.get_wkb('points', 'coordinates', 3)
+            assert shapely.from_wkb(wkb).equals(points.coordinates[3])
+            assert subscriber.Geometries == {}  # Nothing is decoded
+
+            geoms = subscriber.get_array('points', 'coordinates')
+            assert list(subscriber.Geometries) == [('points', 'coordinates')]
+            assert subscriber.get_array('points', 'coordinates') is geoms
+
+            with pytest.raises(AssertionError):
+                subscriber.get_wkb('points', 'name')
+
+            del data, offsets, is_null
+            subscriber.close()
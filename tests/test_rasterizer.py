@@ -0,0 +1,73 @@
+"""
+Tests of the module :py:mod:`pydriosm.rasterizer`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+from pydriosm.rasterizer import get_grid_shape, rasterize_layers
+
+gpd = pytest.importorskip('geopandas')
+
+
+@pytest.fixture
+def osm_data():
+    """Layers of (projected) shapefile data, covering a grid of 2 x 3 cells of 100 m."""
+
+    buildings = gpd.GeoDataFrame({'osm_id': ['1'], 'fclass': ['house']},
+                                 geometry=[shapely.box(50, 50, 150, 150)],
+                                 crs='EPSG:27700')
+    landuse = gpd.GeoDataFrame({'osm_id': ['2'], 'fclass': ['farmland']},
+                               geometry=[shapely.box(0, 0, 400, 400)], crs='EPSG:27700')
+    roads = gpd.GeoDataFrame({'osm_id': ['3'], 'maxspeed': [30]},
+                             geometry=[shapely.LineString([(0, 50), (400, 50)])],
+                             crs='EPSG:27700')
+    pois = gpd.GeoDataFrame({'osm_id': ['4', '5'], 'rating': [1.0, 2.0]},
+                            geometry=[shapely.Point(10, 10), shapely.Point(20, 20)],
+                            crs='EPSG:27700')
+
+    return {'buildings': buildings, 'landuse': landuse, 'roads': roads, 'pois': pois}
+
+
+class TestRasterizeLayers:
+
+    def test_get_grid_shape(self):
+        grid_shape = get_grid_shape((480000, 295000, 500500, 320000), cell_size=100)
+        assert grid_shape == (250, 205)
+
+    @pytest.mark.parametrize('chunk_size', [1000000, 3])
+    def test_statistics(self, osm_data, chunk_size):
+        rasters = {
+            'building_coverage': ('buildings', 'coverage'),
+            'building_count': ('buildings', 'count'),
+            'road_length': ('roads', 'length'),
+            'road_speed': ('roads', 'value', 'maxspeed'),
+            'landuse_class': ('landuse', 'value', 'fclass', ['forest', 'farmland']),
+            'poi_count': ('pois', 'count'),
+            'poi_rating': ('pois', 'value', 'rating')}
+
+        grids = rasterize_layers(osm_data, rasters, (0, 0, 300, 200), 100,
+                                 chunk_size=chunk_size)
+
+        # The first row of the grids is at the top (i.e. y from 100 to 200)
+        assert grids['building_coverage'].tolist() == [[0.25, 0.25, 0], [0.25, 0.25, 0]]
+        assert grids['building_count'].tolist() == [[1, 1, 0], [1, 1, 0]]
+        assert grids['building_count'].dtype.kind == 'i'
+        assert grids['landuse_class'].dtype.kind == 'i'
+        assert grids['road_length'].tolist() == [[0, 0, 0], [100, 100, 100]]
+        np.testing.assert_array_equal(
+            grids['road_speed'], [[np.nan] * 3, [30, 30, 30]])
+        assert grids['landuse_class'].tolist() == [[1, 1, 1], [1, 1, 1]]
+        assert grids['poi_count'].tolist() == [[0, 0, 0], [2, 0, 0]]
+        np.testing.assert_array_equal(
+            grids['poi_rating'], [[np.nan] * 3, [2.0, np.nan, np.nan]])
+
+    def test_chunks_in_wgs84(self):
+        points = pd.DataFrame({'id': [1], 'coordinates': [[-0.5134241, 52.6555853]]})
+
+        grids = rasterize_layers(iter([('points', points)]), {'n': ('points', 'count')},
+                                 (500000, 307000, 501000, 308000), 100, crs='EPSG:27700')
+
+        assert np.argwhere(grids['n']).tolist() == [[5, 6]]
@@ -0,0 +1,652 @@
+"""
+Tests of the module :py:mod:`pydriosm.reader`.
+"""
+
+import bz2
+import gzip
+import os
+import sys
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+import rapidjson
+from pyhelpers.store import load_pickle, save_pickle
+
+import pydriosm.reader
+from pydriosm.pipeline import Sink
+from pydriosm.reader import GeofabrikReader, OSMQuery, TagStatistics, add_measures, \
+    add_spatial_keys, apply_changes, decompress_bz2_streams, flatten_coordinates, \
+    make_path_to_pickle, parse_osm_pbf, read_shp_file, reproject_coordinates, \
+    spatial_join
+
+
+class FakeDownloader:
+
+    def __init__(self, path_to_osm_pbf):
+        self.PathToOSMPBF = path_to_osm_pbf
+
+    def get_default_path_to_osm_file(self, subregion_name, osm_file_format, mkdir=False):
+        return os.path.basename(self.PathToOSMPBF), self.PathToOSMPBF
+
+
+@pytest.fixture
+def geofabrik_reader(tmp_path, monkeypatch):
+    """A reader of a local (fake) PBF file, whose parsing is recorded."""
+
+    path_to_osm_pbf = str(tmp_path / "rutland-latest.osm.pbf")
+    with open(path_to_osm_pbf, 'wb') as f:
+        f.write(b'')
+
+    calls = []
+
+    def fake_parse_osm_pbf(path_to_osm_pbf, number_of_chunks, parse_raw_feat,
+                           transform_geom, transform_other_tags, spatial_keys=None,
+                           measures=None, **kwargs):
+        calls.append(dict(spatial_keys=spatial_keys, measures=measures))
+        points = pd.DataFrame({'id': [488432], 'coordinates': [[-0.5134241, 52.6555853]],
+                               'other_tags': ['"odbl"=>"clean"']})
+        if spatial_keys:
+            points = add_spatial_keys(points, key_type=spatial_keys, geo_typ='points')
+        return {'points': points}
+
+    monkeypatch.setattr(pydriosm.reader, 'parse_osm_pbf', fake_parse_osm_pbf)
+
+    reader = GeofabrikReader.__new__(GeofabrikReader)
+    reader.Downloader = FakeDownloader(path_to_osm_pbf)
+    reader.Calls = calls
+
+    return reader
+
+
+class TestPickleCache:
+
+    def test_make_path_to_pickle(self):
+        path_to_pickle = os.path.join("tests", "rutland-latest-pbf.pickle")
+
+        assert make_path_to_pickle(path_to_pickle) == path_to_pickle
+        path_to_pickle_ = make_path_to_pickle(
+            path_to_pickle, geometry=False, layer_names=['points', 'lines'],
+            columns='name', target_crs='EPSG:27700', spatial_keys='geohash',
+            measures='utm')
+        assert os.path.basename(path_to_pickle_) == \
+            "rutland-latest-pbf-tags-points-lines-name-epsg27700-geohash7-utm.pickle"
+
+        # Names of columns (e.g. with ':') are made safe, yet still kept apart
+        path_1, path_2 = (make_path_to_pickle(path_to_pickle, columns=['addr:street', x])
+                          for x in ['name', 'name_'])
+        assert path_1 != path_2 and not {':', '*', '?'} & set(os.path.basename(path_1))
+        assert os.path.basename(path_1).startswith("rutland-latest-pbf-addr_street-name-")
+
+        path_to_pickle_ = make_path_to_pickle(path_to_pickle, spatial_keys='quadkey')
+        assert path_to_pickle_ != make_path_to_pickle(
+            path_to_pickle, spatial_keys='quadkey', spatial_key_level=10)
+
+    def test_spatial_keys_are_cached_apart(self, geofabrik_reader):
+        data_1, path_1 = geofabrik_reader.read_osm_pbf(
+            'rutland', parse_raw_feat=True, pickle_it=True, ret_pickle_path=True)
+        data_2, path_2 = geofabrik_reader.read_osm_pbf(
+            'rutland', parse_raw_feat=True, pickle_it=True, ret_pickle_path=True,
+            spatial_keys='quadkey')
+
+        assert path_1 != path_2
+        assert 'quadkey' not in data_1['points'].columns
+        assert data_2['points'].quadkey[0] == '03131133321022'
+        assert len(geofabrik_reader.Calls) == 2
+
+        # Both are loaded from their own pickle files
+        data_2_ = geofabrik_reader.read_osm_pbf('rutland', parse_raw_feat=True,
+                                                spatial_keys='quadkey')
+        data_1_ = geofabrik_reader.read_osm_pbf('rutland', parse_raw_feat=True)
+        assert len(geofabrik_reader.Calls) == 2
+        assert 'quadkey' in data_2_['points'].columns
+        assert 'quadkey' not in data_1_['points'].columns
+
+    def test_repaired_data_is_not_pickled(self, geofabrik_reader, monkeypatch):
+        def fake_repair_geometries(osm_data, verbose=False):
+            return {k: v.assign(repaired=True) for k, v in osm_data.items()}
+
+        monkeypatch.setattr(pydriosm.reader, 'repair_geometries', fake_repair_geometries)
+
+        data, path_to_pickle = geofabrik_reader.read_osm_pbf(
+            'rutland', parse_raw_feat=True, pickle_it=True, ret_pickle_path=True,
+            repair_geom=True)
+        assert 'repaired' in data['points'].columns
+        assert 'repaired' not in load_pickle(path_to_pickle)['points'].columns
+
+        data = geofabrik_reader.read_osm_pbf('rutland', parse_raw_feat=True)
+        assert 'repaired' not in data['points'].columns
+        data = geofabrik_reader.read_osm_pbf('rutland', parse_raw_feat=True,
+                                             repair_geom=True)
+        assert 'repaired' in data['points'].columns
+        assert len(geofabrik_reader.Calls) == 1
+
+    def test_tag_schema_is_not_pickled(self, geofabrik_reader):
+        data, path_to_pickle = geofabrik_reader.read_osm_pbf(
+            'rutland', parse_raw_feat=True, pickle_it=True, ret_pickle_path=True,
+            tag_schema={'odbl': 'str'})
+        assert data['points'].odbl[0] == 'clean'
+        assert 'odbl' not in load_pickle(path_to_pickle)['points'].columns
+
+        data = geofabrik_reader.read_osm_pbf('rutland', parse_raw_feat=True)
+        assert 'odbl' not in data['points'].columns
+        assert len(geofabrik_reader.Calls) == 1
+
+
+class RecordingSink(Sink):
+
+    def __init__(self, fail_at=None):
+        self.FailAt = fail_at
+        self.Chunks, self.Closed = [], False
+
+    def write(self, layer_name, layer_data):
+        if len(self.Chunks) == self.FailAt:
+            raise ValueError("Failed to write.")
+        self.Chunks.append((layer_name, len(layer_data), layer_data.iloc[0, 0]))
+
+    def close(self):
+        self.Closed = True
+        return self.Chunks
+
+
+class TestParseOSMPBF:
+
+    def test_sinks(self, fake_ogr, make_pbf_features):
+        fake_ogr.Layers.update(points=make_pbf_features('points', 100001),
+                               lines=make_pbf_features('lines', 3, start=200001))
+
+        sinks = [RecordingSink(), RecordingSink()]
+        results = parse_osm_pbf("rutland-latest.osm.pbf", None, parse_raw_feat=False,
+                                transform_geom=False, transform_other_tags=False,
+                                sinks=sinks)
+
+        # The chunks (of up to 50000 features) reach every sink, in order
+        chunks = [(layer_name, n, rapidjson.loads(feat)['id'])
+                  for layer_name, n, feat in results[0]]
+        assert chunks == [('points', 50000, 1), ('points', 50000, 50001),
+                          ('points', 1, 100001), ('lines', 3, 200001)]
+        assert results[1] == results[0] and all(sink.Closed for sink in sinks)
+
+    def test_failing_sink(self, fake_ogr, make_pbf_features):
+        fake_ogr.Layers.update(points=make_pbf_features('points', 100001))
+
+        sinks = [RecordingSink(), RecordingSink(fail_at=1), RecordingSink()]
+        with pytest.raises(ValueError, match="Failed to write."):
+            parse_osm_pbf("rutland-latest.osm.pbf", None, parse_raw_feat=False,
+                          transform_geom=False, transform_other_tags=False, sinks=sinks)
+
+        # The other sinks are closed as well, and no chunk is passed after the failure
+        assert all(sink.Closed for sink in sinks)
+        assert [len(sink.Chunks) for sink in sinks] == [2, 1, 2]
+        assert [x[:2] for x in sinks[0].Chunks] == [('points', 50000)] * 2
+
+
+@pytest.fixture
+def path_to_shp(tmp_path):
+    """Path to a shapefile of railways (made by pyshp)."""
+
+    shapefile = pytest.importorskip('shapefile')
+
+    path_to_shp_ = str(tmp_path / "gis_osm_railways_free_1.shp")
+    with shapefile.Writer(path_to_shp_, shapeType=shapefile.POLYLINE) as w:
+        w.field('osm_id', 'C')
+        w.field('code', 'N')
+        w.field('name', 'C')
+        w.line([[[-0.6, 52.6], [-0.5, 52.7]]])
+        w.record('2162114', 6101, 'Oakham')
+        w.line([[[-0.7, 52.5], [-0.6, 52.6]]])
+        w.record('3681043', 6101, 'Ketton')
+
+    return path_to_shp_
+
+
+class TestReadColumns:
+
+    def test_osm_pbf(self, fake_ogr, make_pbf_features):
+        fake_ogr.Layers.update(points=make_pbf_features('points', 3))
+
+        points = parse_osm_pbf("rutland-latest.osm.pbf", None, parse_raw_feat=True,
+                               transform_geom=False, transform_other_tags=False,
+                               columns=['name'])['points']
+
+        # The other fields are not decoded by the driver
+        assert fake_ogr.DataSources[0].Layers[0].IgnoredFields == ['osm_id', 'other_tags']
+        assert points.columns.tolist() == ['id', 'coordinates', 'name']
+        assert points.name.tolist() == ['n1', 'n2', 'n3']
+
+        points = parse_osm_pbf("rutland-latest.osm.pbf", None, parse_raw_feat=True,
+                               transform_geom=False, transform_other_tags=False,
+                               columns='other_tags', geometry=False)['points']
+        assert fake_ogr.DataSources[1].Layers[0].IgnoredFields == [
+            'OGR_GEOMETRY', 'osm_id', 'name']
+        assert points.columns.tolist() == ['id', 'other_tags']
+
+    @pytest.mark.parametrize('engine', ['pyogrio', 'fiona'])
+    def test_shp_geopandas(self, path_to_shp, monkeypatch, engine):
+        gpd = pytest.importorskip('geopandas')
+        pytest.importorskip('pyogrio')
+
+        read_file = gpd.read_file
+
+        def read_file_by_fiona(filename, **kwargs):
+            # The engine 'fiona' (e.g. of Fiona 1.8) cannot select the fields to read
+            assert 'columns' not in kwargs
+            return read_file(filename, engine='pyogrio', **kwargs)
+
+        if engine == 'fiona':
+            monkeypatch.setattr(gpd, 'read_file', read_file_by_fiona)
+            kwargs = {}
+        else:
+            kwargs = {'engine': 'pyogrio'}
+
+        railways = read_shp_file(path_to_shp, columns=['name', 'osm_id'], **kwargs)
+        assert isinstance(railways, gpd.GeoDataFrame)
+        assert railways.columns.tolist() == ['osm_id', 'name', 'geometry']
+        assert railways.name.tolist() == ['Oakham', 'Ketton']
+
+        railways = read_shp_file(path_to_shp, columns='code', geometry=False, **kwargs)
+        assert railways.columns.tolist() == ['code']
+
+    def test_shp_pyshp(self, path_to_shp):
+        railways = read_shp_file(path_to_shp, method='pyshp', columns=['name', 'osm_id'])
+        assert railways.columns.tolist() == ['osm_id', 'name', 'coords', 'shape_type']
+        assert railways.osm_id.tolist() == ['2162114', '3681043']
+
+        railways = read_shp_file(path_to_shp, method='pyshp', columns='code',
+                                 geometry=False)
+        assert railways.columns.tolist() == ['code']
+
+
+class TestSpatialKeys:
+
+    def test_flatten_coordinates(self):
+        coords = [[0.0, 1.0], None, [], [[[0, 0], [2, 0], [2, 2], [0, 0]]],
+                  [[[[5, 5], [6, 5], [6, 6], [5, 5]]], [[[-1, -1], [-1, 0], [0, 0]]]]]
+        xy, feat_idx = flatten_coordinates(coords)
+
+        assert xy.shape == (12, 2)
+        assert feat_idx.tolist() == [0] + [3] * 4 + [4] * 7
+
+    def test_bounds_of_nested_coordinates(self):
+        multipolygons = pd.DataFrame({
+            'id': [1, 2, 3],
+            'coordinates': [[[[[5, 5], [6, 5], [6, 6], [5, 5]]],
+                             [[[-1, -1], [-1, 0], [0, 0], [-1, -1]]]],
+                            None,
+                            [[[[0, 0], [np.nan, np.nan], [1, 2], [0, 0]]]]]})
+        multipolygons = add_spatial_keys(multipolygons, key_type='geohash', level=5,
+                                         geo_typ='multipolygons')
+
+        bounds = multipolygons[['minx', 'miny', 'maxx', 'maxy']].to_numpy()
+        assert bounds[0].tolist() == [-1, -1, 6, 6]
+        assert np.isnan(bounds[1]).all() and pd.isna(multipolygons.geohash[1])
+        assert bounds[2].tolist() == [0, 0, 1, 2]
+
+    def test_data_unchanged(self):
+        lines = pd.DataFrame({'id': [1], 'coordinates': [[[0.0, 52.0], [0.1, 52.1]]]})
+        lines_ = add_measures(add_spatial_keys(lines, geo_typ='lines'), geo_typ='lines')
+
+        assert lines.columns.tolist() == ['id', 'coordinates']
+        assert {'quadkey', 'minx', 'length', 'area'} <= set(lines_.columns)
+
+    def test_keys_require_geometry(self, geofabrik_reader):
+        for kwargs in [dict(measures='utm'), dict(spatial_keys='quadkey')]:
+            with pytest.raises(AssertionError, match='geometry=False'):
+                geofabrik_reader.read_osm_pbf(
+                    'rutland', parse_raw_feat=True, geometry=False, **kwargs)
+
+        assert len(geofabrik_reader.Calls) == 0
+
+
+class TestSpatialJoin:
+
+    @pytest.fixture
+    def layers(self):
+        points = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c'],
+                               'coordinates': [[0.5, 0.5], [1.5, 1.5], [5, 5]]})
+        multipolygons = pd.DataFrame({
+            'id': [10, 11], 'name': ['x', 'y'], 'boundary': [True, False],
+            'coordinates': [[[[[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]]],
+                            [[[[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]]]]]})
+        return points, multipolygons
+
+    def test_inner(self, layers):
+        joined = spatial_join(*layers, predicate='within', left_geo_typ='points',
+                              right_geo_typ='multipolygons')
+
+        assert joined.columns.tolist() == [
+            'id_left', 'name_left', 'coordinates_left',
+            'id_right', 'name_right', 'boundary', 'coordinates_right']
+        assert sorted(zip(joined.id_left, joined.id_right)) == [(1, 10), (2, 10), (2, 11)]
+        assert joined.id_right.dtype == np.int64
+
+    def test_left(self, layers):
+        joined = spatial_join(*layers, predicate='within', how='left',
+                              left_geo_typ='points', right_geo_typ='multipolygons')
+
+        assert joined.id_left.tolist() == [1, 2, 2, 3]
+        # Integers and booleans are not turned into floats by the unmatched feature
+        assert joined.id_right.dtype == 'Int64' and joined.boundary.dtype == 'boolean'
+        assert joined.id_right.tolist()[:3] == [10, 10, 11] and \
+            pd.isna(joined.id_right[3]) and pd.isna(joined.boundary[3])
+
+    def test_predicates(self, layers):
+        points, multipolygons = layers
+        kwargs = dict(left_geo_typ='multipolygons', right_geo_typ='points', how='pairs')
+
+        contains = spatial_join(multipolygons, points, predicate='contains', **kwargs)
+        assert sorted(zip(*contains.tolist())) == [(0, 0), (0, 1), (1, 1)]
+
+        kwargs.update(right_geo_typ='multipolygons')
+        overlaps = spatial_join(multipolygons, multipolygons, predicate='overlaps',
+                                **kwargs)
+        assert sorted(zip(*overlaps.tolist())) == [(0, 1), (1, 0)]
+
+    def test_geodataframes(self, layers):
+        import geopandas as gpd
+        import shapely
+
+        points, multipolygons = layers
+        points = gpd.GeoDataFrame(
+            points.drop(columns='coordinates'),
+            geometry=shapely.points(points.coordinates.tolist()), crs='EPSG:4326')
+        polygons = gpd.GeoDataFrame(
+            multipolygons.drop(columns='coordinates'),
+            geometry=[shapely.box(0, 0, 2, 2), shapely.box(1, 1, 3, 3)], crs='EPSG:4326')
+
+        joined = spatial_join(points, polygons, predicate='within', how='left')
+
+        assert isinstance(joined, gpd.GeoDataFrame)
+        assert joined.geometry.name == 'geometry' and joined.crs == points.crs
+        assert 'geometry_left' not in joined.columns
+        assert 'geometry_right' in joined.columns
+        assert joined.geometry.x.tolist() == [0.5, 1.5, 1.5, 5]
+
+
+class TestTagStatistics:
+
+    def test_id_fields_are_not_tags(self):
+        stats = TagStatistics()
+        stats.update('points', {'osm_id': '1', 'osm_way_id': None, 'name': 'Oakham'})
+        stats.update('lines', {'osm_way_id': '2', 'highway': 'primary'})
+
+        assert stats.summary().key.tolist() == ['highway', 'name']
+
+    def test_top_values(self):
+        stats = TagStatistics(top_k=3)
+        values = ['a'] * 500 + ['b'] * 300 + ['c'] * 200 + [str(i) for i in range(5000)]
+        for value in values:
+            stats.update('points', {'k': value})
+
+        summary = stats.summary()
+        assert summary['count'][0] == len(values)
+        assert [v for v, _ in summary.top_values[0]] == ['a', 'b', 'c']
+        # Space-Saving over-estimates, but never under-estimates, the counts
+        assert dict(summary.top_values[0])['a'] >= 500
+
+        counters, heap = stats.Stats['points']['k'][2:]
+        assert len(counters) == stats.Capacity
+        assert len(heap) < 4 * stats.Capacity + 1
+
+    def test_merge(self):
+        stats_1, stats_2 = TagStatistics(), TagStatistics()
+        for i in range(100):
+            stats_1.update('points', {'k': 'x' if i % 2 else str(i)})
+            stats_2.update('points', {'k': 'x'})
+
+        stats_1.merge(stats_2)
+        summary = stats_1.summary()
+
+        assert summary['count'][0] == 200
+        assert summary.top_values[0][0] == ('x', 150)
+        assert abs(summary.distinct[0] - 51) <= 3
+
+
+class TestReprojectCoordinates:
+
+    def test_nested_coordinates(self):
+        coords = pd.Series([[-0.5134241, 52.6555853], [[-0.51, 52.65], [-0.52, 52.66]]])
+        coords_ = reproject_coordinates(coords, target_crs='EPSG:27700')
+
+        assert np.round(coords_[0], 1).tolist() == [500653.8, 307465.6]
+        assert np.round(coords_[1], 1).tolist() == [[500898.3, 306849.1],
+                                                    [500199.0, 307947.5]]
+
+    def test_missing_and_empty_coordinates(self):
+        coords = pd.Series([[np.nan, np.nan], [], None, np.nan,
+                            [[[[-0.51, 52.65], [np.nan, np.nan], [-0.52, 52.66]]]],
+                            [[-1e-05, 50.0]]])
+        coords_ = reproject_coordinates(coords, target_crs='EPSG:27700')
+
+        assert np.isnan(coords_[0]).all()
+        assert coords_[1] == [] and coords_[2] is None and coords_[3] is None
+        assert np.isnan(coords_[4][0][0][1]).all()
+        assert np.round(coords_[4][0][0][2], 1).tolist() == [500199.0, 307947.5]
+        assert np.round(coords_[5][0], 1).tolist() == [543428.6, 13008.6]
+        assert np.isnan(coords[3])  # The input is left unchanged
+
+    def test_other_relations(self):
+        geometries = pd.Series([
+            [{'type': 'Point', 'coordinates': [-0.5134241, 52.6555853]},
+             {'type': 'LineString', 'coordinates': [[-0.51, 52.65], [-0.52, 52.66]]}],
+            None])
+        geometries_ = reproject_coordinates(geometries, target_crs='EPSG:27700')
+
+        point, line = geometries_[0]
+        assert point['type'] == 'Point' and line['type'] == 'LineString'
+        assert np.round(point['coordinates'], 1).tolist() == [500653.8, 307465.6]
+        assert np.round(line['coordinates'], 1).tolist() == [[500898.3, 306849.1],
+                                                             [500199.0, 307947.5]]
+        assert geometries_[1] is None
+        assert geometries[0][0]['coordinates'] == [-0.5134241, 52.6555853]
+
+        xy, feat_idx = flatten_coordinates(geometries)
+        assert xy.shape == (3, 2) and feat_idx.tolist() == [0, 0, 0]
+
+
+OSC = b'''<?xml version="1.0" encoding="UTF-8"?>
+<osmChange version="0.6">
+<create>
+  <node id="15" lon="1.5" lat="2.5"><tag k="amenity" v="pub"/></node>
+  <node id="100" lon="9.0" lat="9.0"><tag k="name" v="Last"/></node>
+  <node id="7" lon="0.5" lat="0.5"/>
+</create>
+<modify>
+  <node id="20" lon="2.0" lat="3.0"><tag k="name" v="New name"/></node>
+  <way id="200"><nd ref="10"/><nd ref="7"/><tag k="highway" v="primary"/></way>
+  <way id="300"><nd ref="10"/><nd ref="20"/><tag k="source" v="survey"/></way>
+  <way id="500"><nd ref="10"/><nd ref="20"/><tag k="highway" v="service"/></way>
+</modify>
+<delete>
+  <node id="30"/>
+</delete>
+</osmChange>'''
+
+
+@pytest.fixture
+def path_to_osc(tmp_path):
+    path_to_osc = str(tmp_path / "changes.osc.gz")
+    with gzip.open(path_to_osc, 'wb') as f:
+        f.write(OSC)
+    return path_to_osc
+
+
+class TestApplyChanges:
+
+    def test_points_and_lines(self, path_to_osc):
+        points = pd.DataFrame({'id': [10, 20, 30],
+                               'coordinates': [[1.0, 2.0], [2.0, 3.0], [3.0, 4.0]],
+                               'name': ['A', 'B', 'C'],
+                               'other_tags': [None, '"odbl"=>"clean"', None]})
+        lines = pd.DataFrame({'id': [200, 300],
+                              'coordinates': [[[0, 0], [1, 1]], [[0, 0], [2, 2]]],
+                              'highway': ['residential', 'track'],
+                              'other_tags': [None, None]})
+
+        data, unresolved = apply_changes({'points': points, 'lines': lines}, path_to_osc,
+                                         ret_unresolved=True)
+
+        points_ = data['points']
+        assert points_.id.tolist() == [10, 15, 20, 100]
+        assert points_.name.tolist()[2:] == ['New name', 'Last']
+        assert points_.other_tags[1] == '"amenity"=>"pub"'
+        assert points_.other_tags[[0, 2]].isnull().all()
+        assert points_.index.tolist() == [0, 1, 2, 3]
+
+        # The way 300, whose tags are all deleted (but 'source'), is deleted
+        lines_ = data['lines']
+        assert lines_.id.tolist() == [200, 500]
+        assert lines_.highway.tolist() == ['primary', 'service']
+        assert lines_.coordinates.tolist() == [[[1.0, 2.0], [0.5, 0.5]],
+                                               [[1.0, 2.0], [2.0, 3.0]]]
+        assert len(unresolved['way']) == 0
+
+    def test_layers_without_other_tags(self, path_to_osc):
+        points = pd.DataFrame({'id': [10, 20, 30],
+                               'coordinates': [[1.0, 2.0], [2.0, 3.0], [3.0, 4.0]],
+                               'name': ['A', 'B', 'C']})
+
+        data = apply_changes({'points': points}, path_to_osc)
+
+        assert data['points'].columns.tolist() == ['id', 'coordinates', 'name']
+        assert data['points'].id.tolist() == [10, 15, 20, 100]
+
+    def test_pickle_file(self, path_to_osc, tmp_path):
+        path_to_pickle = str(tmp_path / "rutland-latest-pbf.pickle")
+        points = pd.DataFrame({'id': [10, 20], 'coordinates': [[1.0, 2.0], [2.0, 3.0]],
+                               'name': ['A', 'B']})
+        save_pickle({'points': points}, path_to_pickle)
+
+        apply_changes(path_to_pickle, path_to_osc)
+
+        assert load_pickle(path_to_pickle)['points'].id.tolist() == [10, 15, 20, 100]
+
+
+class TestDecompressBZ2Streams:
+
+    @staticmethod
+    def write_streams(path_to_bz2, n_streams):
+        data = [bytes(str(i), 'utf-8') * 100000 for i in range(n_streams)]
+        streams = [bz2.compress(x) for x in data]
+        with open(path_to_bz2, 'wb') as f:
+            f.write(b''.join(streams))
+        return b''.join(data), streams
+
+    def test_stream_ending_at_a_block(self, tmp_path):
+        path_to_bz2 = str(tmp_path / "streams.bz2")
+        data, streams = self.write_streams(path_to_bz2, 2)
+
+        # Sequential (smaller than chunk_size), with each block read being a stream
+        chunk_size = len(streams[0]) * 16 / 1024 ** 2
+        decompressed = decompress_bz2_streams(path_to_bz2, chunk_size=chunk_size)
+        assert b''.join(decompressed) == data
+
+    def test_small_and_large_chunks(self, tmp_path):
+        path_to_bz2 = str(tmp_path / "streams.bz2")
+        data, streams = self.write_streams(path_to_bz2, 5)
+
+        for chunk_size in [16, 1e-4, len(streams[0]) * 1.5 / 1024 ** 2]:
+            decompressed = decompress_bz2_streams(path_to_bz2, max_workers=2,
+                                                  chunk_size=chunk_size)
+            assert b''.join(decompressed) == data
+
+
+@pytest.fixture
+def s3_bucket(monkeypatch):
+    """A bucket of a (mock) S3 server, by `moto <https://docs.getmoto.org/>`_."""
+
+    boto3 = pytest.importorskip('boto3')
+    moto_server = pytest.importorskip('moto.server')
+    pytest.importorskip('s3fs')
+
+    server = moto_server.ThreadedMotoServer(ip_address='127.0.0.1', port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+
+    monkeypatch.setenv('AWS_ENDPOINT_URL', "http://{}:{}".format(host, port))
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+    s3 = boto3.client('s3')
+    s3.create_bucket(Bucket='osm')
+
+    yield s3
+
+    server.stop()
+
+
+class TestRemoteFiles:
+
+    def test_read_shp_file(self, s3_bucket, tmp_path):
+        shapefile = pytest.importorskip('shapefile')
+
+        path_to_shp = str(tmp_path / "gis_osm_railways_free_1.shp")
+        with shapefile.Writer(path_to_shp, shapeType=shapefile.POLYLINE) as w:
+            w.field('osm_id', 'C')
+            w.field('name', 'C')
+            w.line([[[-0.6, 52.6], [-0.5, 52.7]]])
+            w.record('2162114', 'Oakham')
+            w.line([[[-0.7, 52.5], [-0.6, 52.6]]])
+            w.record('3681043', 'Ketton')
+
+        for ext in ('shp', 'shx', 'dbf'):
+            s3_bucket.upload_file(path_to_shp.replace('.shp', '.' + ext), 'osm',
+                                  "rutland/gis_osm_railways_free_1." + ext)
+
+        railways = read_shp_file("s3://osm/rutland/gis_osm_railways_free_1.shp",
+                                 method='pyshp', columns=['name'])
+
+        assert railways.name.tolist() == ['Oakham', 'Ketton']
+        assert 'osm_id' not in railways.columns
+        assert list(railways.coords[0]) == [(-0.6, 52.6), (-0.5, 52.7)]
+
+    def test_missing_fsspec(self, monkeypatch):
+        pytest.importorskip('shapefile')
+        monkeypatch.setitem(sys.modules, 'fsspec', None)
+
+        with pytest.raises(ImportError, match=r'pydriosm\[remote\]'):
+            read_shp_file("s3://osm/rutland/gis_osm_railways_free_1.shp", method='pyshp')
+
+
+class TestOSMQuery:
+
+    @staticmethod
+    def make_postgres_osm(lines):
+        sqlalchemy = pytest.importorskip('sqlalchemy')
+
+        engine = sqlalchemy.create_engine("sqlite://")
+        # The schema of the layer is an attached database
+        sqlalchemy.event.listen(engine, 'connect', lambda conn, _: conn.execute(
+            "ATTACH DATABASE ':memory:' AS lines"))
+
+        postgres_osm = mock.Mock()
+        postgres_osm.PostgreSQL.engine = engine
+        postgres_osm.get_table_name_for_subregion = lambda x, y: x.lower()
+
+        with engine.begin() as conn:
+            lines.to_sql('rutland', conn, schema='lines', index=False)
+
+        return postgres_osm
+
+    def test_fetch_by_bbox(self):
+        lines = pd.DataFrame({'id': [1, 2], 'name': ['A1', 'A47'],
+                              'minx': [-0.6, 0.5], 'miny': [52.6, 52.6],
+                              'maxx': [-0.5, 0.6], 'maxy': [52.7, 52.7]})
+        postgres_osm = self.make_postgres_osm(lines)
+
+        query = OSMQuery().layer('lines').select('name').bbox(-1, 52, 0, 53)
+        query_data = query.fetch(postgres_osm, 'Rutland')
+
+        assert query_data.to_dict('list') == {'id': [1], 'name': ['A1']}
+
+    def test_fetch_by_bbox_without_bounds(self):
+        lines = pd.DataFrame({'id': [1, 2], 'name': ['A1', 'A47']})
+        postgres_osm = self.make_postgres_osm(lines)
+
+        with pytest.raises(ValueError, match="'minx', 'miny', 'maxx', 'maxy'"):
+            OSMQuery().layer('lines').bbox(-1, 52, 0, 53).fetch(postgres_osm, 'Rutland')
+
+        query_data = OSMQuery().layer('lines').fetch(postgres_osm, 'Rutland')
+        assert len(query_data) == 2
@@ -0,0 +1,355 @@
+"""
+Tests of the module :py:mod:`pydriosm.tiler`.
+"""
+
+import gzip
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+
+from pydriosm.tiler import build_geometry_pyramid, encode_mvt_tile, \
+    generate_vector_tiles, get_dirty_tiles, get_pyramid_geometries, load_tile_index, \
+    partition_osm_data, read_tile
+
+
+def read_message(data):
+    """Read the fields of a protobuf message, as a list of (field number, value)."""
+
+    def read_varint(i):
+        value = shift = 0
+        while True:
+            byte, i = data[i], i + 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if byte < 0x80:
+                return value, i
+
+    fields, i = [], 0
+    while i < len(data):
+        key, i = read_varint(i)
+        if key & 7 == 0:
+            value, i = read_varint(i)
+        elif key & 7 == 2:
+            length, i = read_varint(i)
+            value, i = data[i:i + length], i + length
+        else:  # Fixed 64-bit (1) or 32-bit (5)
+            n = 8 if key & 7 == 1 else 4
+            value, i = data[i:i + n], i + n
+        fields.append((key >> 3, value))
+
+    return fields
+
+
+def read_packed(data):
+    """Read packed (unsigned) varints."""
+
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value, shift = value | (byte & 0x7f) << shift, shift + 7
+        if byte < 0x80:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def read_tile_layers(tile_data):
+    """Read the version, extent, keys and features of each layer of a vector tile."""
+
+    tile_layers = {}
+    for _, layer in read_message(tile_data):
+        fields = read_message(layer)
+        name = next(v for k, v in fields if k == 1).decode()
+        tile_layers[name] = {
+            'version': next(v for k, v in fields if k == 15),
+            'extent': next(v for k, v in fields if k == 5),
+            'keys': [v.decode() for k, v in fields if k == 3],
+            'features': [dict(read_message(v)) for k, v in fields if k == 2]}
+
+    return tile_layers
+
+
+@pytest.fixture
+def osm_data():
+    """Parsed data of points and lines (a few of which have no coordinates)."""
+
+    rng = np.random.default_rng(0)
+    xy = np.c_[rng.uniform(-0.8, -0.4, 500), rng.uniform(52.5, 52.8, 500)]
+    points = pd.DataFrame({'id': np.arange(500), 'coordinates': xy.tolist()})
+    points.loc[[7, 42], 'coordinates'] = None
+
+    lines = pd.DataFrame({
+        'id': np.arange(1000, 1100),
+        'coordinates': [[[x, y], [x + 0.01, y + 0.01]] for x, y in xy[:100]]})
+
+    return {'points': points, 'lines': lines}
+
+
+class TestPartitionOSMData:
+
+    def test_tiles(self, osm_data, tmp_path):
+        tile_index = partition_osm_data(osm_data, str(tmp_path), max_features=100)
+
+        assert (tile_index[['points', 'lines']].sum(axis=1) <= 100).all()
+        assert tile_index.points.sum() == 498 and tile_index.lines.sum() == 100
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            tile_index.filename.tolist() + ["tile_index.pickle"])
+
+        tile_data = read_tile(str(tmp_path), tile_index.quadkey[0])
+        assert list(tile_data.keys()) == ['points', 'lines']
+        assert len(tile_data['points']) == tile_index.points[0]
+
+        bbox = tuple(tile_index.loc[0, ['minx', 'miny', 'maxx', 'maxy']])
+        tile_index_ = load_tile_index(str(tmp_path), bbox)
+        assert tile_index.quadkey[0] in tile_index_.quadkey.values
+
+    @pytest.mark.parametrize('as_generator', [False, True])
+    def test_chunks(self, osm_data, tmp_path, as_generator):
+        tile_index = partition_osm_data(
+            osm_data, str(tmp_path / "whole"), max_features=100)
+
+        chunks = ({k: v.iloc[i:i + 150] for k, v in osm_data.items()}
+                  for i in range(0, 500, 150))
+        if not as_generator:
+            chunks = list(chunks)
+        tile_index_ = partition_osm_data(
+            chunks, str(tmp_path / "chunks"), max_features=100)
+
+        pd.testing.assert_frame_equal(tile_index_, tile_index)
+        assert sorted(os.listdir(tmp_path / "chunks")) == sorted(
+            os.listdir(tmp_path / "whole"))
+
+        for quadkey in tile_index.quadkey:
+            tile_data = read_tile(str(tmp_path / "whole"), quadkey)
+            tile_data_ = read_tile(str(tmp_path / "chunks"), quadkey)
+            for layer_name in ['points', 'lines']:
+                assert tile_data_[layer_name].id.tolist() == \
+                    tile_data[layer_name].id.tolist()
+
+
+class TestGeometryPyramid:
+
+    @pytest.fixture
+    def pyramid(self):
+        x = np.linspace(-0.8, -0.4, 201)
+        wiggly_line = np.c_[x, 52.6 + 0.001 * np.sin(x * 500)].tolist()
+        lines = pd.DataFrame({'id': [1, 2, 3],
+                              'coordinates': [wiggly_line, None, wiggly_line[:2]]})
+        points = pd.DataFrame({'id': [4, 5], 'coordinates': [[-0.5, 52.6], None]})
+        raw_points = pd.DataFrame({'points': ['{"type": "Feature", "id": 4}']})
+
+        osm_data = {'lines': lines, 'points': points, 'raw_points': raw_points}
+        return build_geometry_pyramid(osm_data, zoom_levels=(4, 8),
+                                      tolerances=(0.01, 0.0001))
+
+    def test_zoom_levels(self, pyramid):
+        lines = pyramid['lines']
+        assert [x for x in lines.columns if x.startswith('geometry_')] == \
+            ['geometry_z4', 'geometry_z8']
+
+        n_coords = {
+            z: shapely.get_num_coordinates(get_pyramid_geometries(lines, z, 'lines'))[0]
+            for z in [0, 4, 5, 8, 9]}
+        # The lowest level at or above the zoom, and the original geometry above all
+        assert n_coords[0] == n_coords[4] < n_coords[5] == n_coords[8] < n_coords[9]
+        assert n_coords[9] == 201
+
+        original = get_pyramid_geometries(lines, 9, geo_typ='lines')
+        assert shapely.equals(original[0], shapely.LineString(lines.coordinates[0]))
+
+    def test_points(self, pyramid):
+        points = pyramid['points']
+
+        for zoom in [0, 8, 9]:
+            geoms = get_pyramid_geometries(points, zoom, geo_typ='points')
+            assert shapely.equals(geoms[0], shapely.Point(-0.5, 52.6))
+            assert geoms[1] is None
+
+    def test_no_geometries(self, pyramid):
+        lines = pyramid['lines']
+        assert lines.geometry_z4[1] is None and lines.geometry_z8[1] is None
+        # A short line is kept rather than collapsed
+        assert shapely.get_num_coordinates(lines.geometry_z4[2]) == 2
+
+        lines_ = build_geometry_pyramid(
+            {'lines': lines[['id', 'coordinates']].iloc[[1]]}, zoom_levels=(4,))['lines']
+        assert lines_.geometry_z4.isna().all()
+        assert get_pyramid_geometries(lines_, 2)[0] is None
+        assert get_pyramid_geometries(lines_, 5, geo_typ='lines')[0] is None
+
+    def test_raw_data(self, pyramid):
+        assert pyramid['raw_points'].columns.tolist() == ['points']
+
+        with pytest.raises(AssertionError):
+            build_geometry_pyramid({}, zoom_levels=(4, 8), tolerances=(0.01,))
+
+
+class TestEncodeMVTTile:
+
+    def test_points(self):
+        tile_layers = {
+            'points': ([shapely.Point(25, 17)], [1], [{'name': 'a', 'n': 3, 'x': None}])}
+        tile_data = encode_mvt_tile(tile_layers)
+        points = read_tile_layers(tile_data)['points']
+
+        assert (points['version'], points['extent']) == (2, 4096)
+        assert points['keys'] == ['name', 'n']
+        feature = points['features'][0]
+        assert feature[1] == 1  # ID
+        assert feature[3] == 1  # Point
+        assert read_packed(feature[4]) == [9, 50, 34]  # MoveTo (25, 17), zigzag-encoded
+
+    def test_lines(self):
+        tile_data = encode_mvt_tile({'lines': (
+            [shapely.LineString([(0, 0), (0, 0), (10, 0)]), shapely.LineString()],
+            [np.nan, 2], [{}, {}])})
+        features = read_tile_layers(tile_data)['lines']['features']
+
+        assert len(features) == 1  # The empty line is dropped
+        assert 1 not in features[0]  # No ID
+        # MoveTo (0, 0) and LineTo (+10, 0), without the repeated vertex
+        assert read_packed(features[0][4]) == [9, 0, 0, 10, 20, 0]
+
+    def test_polygons(self):
+        # Both rings are given against the orientations required by the specification
+        polygon = shapely.Polygon([(0, 0), (0, 10), (10, 10), (10, 0)],
+                                  holes=[[(2, 2), (4, 2), (4, 4), (2, 4)]])
+        tile_data = encode_mvt_tile({'polygons': ([polygon], [1], [{}])})
+        feature = read_tile_layers(tile_data)['polygons']['features'][0]
+        assert feature[3] == 3  # Polygon
+
+        commands, rings, i, cursor = read_packed(feature[4]), [], 0, np.zeros(2)
+        while i < len(commands):
+            command_id, count = commands[i] & 7, commands[i] >> 3
+            if command_id == 7:  # ClosePath
+                assert count == 1
+                i += 1
+                continue
+            params = np.array(commands[i + 1:i + 1 + 2 * count])
+            deltas = ((params >> 1) ^ -(params & 1)).reshape(-1, 2)
+            coords = cursor + np.cumsum(deltas, axis=0)
+            if command_id == 1:  # MoveTo
+                rings.append([coords[-1]])
+            else:  # LineTo
+                assert command_id == 2
+                rings[-1].extend(coords)
+            cursor, i = coords[-1], i + 1 + 2 * count
+
+        # Each ring is MoveTo, LineTo (of 3 vertices) and ClosePath
+        assert [commands[k] for k in [0, 3, 10, 11, 14, 21]] == [9, 26, 15, 9, 26, 15]
+        assert len(rings) == 2 and all(len(ring) == 4 for ring in rings)
+
+        def area(ring):  # Twice the signed area, in tile coordinates (y downwards)
+            x, y = np.array(ring).T
+            return np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)
+
+        assert area(rings[0]) == 200 and area(rings[1]) == -8  # Exterior is clockwise
+        assert sorted(map(tuple, rings[0])) == [(0, 0), (0, 10), (10, 0), (10, 10)]
+
+    def test_no_features(self):
+        assert encode_mvt_tile({}) == b''
+        assert encode_mvt_tile({'points': ([], [], [])}) == b''
+
+
+class TestGenerateVectorTiles:
+
+    @pytest.fixture
+    def layers(self):
+        points = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b'], 'n': [3, -4],
+                               'coordinates': [[-0.51, 52.66], [-0.53, 52.67]]})
+        lines = pd.DataFrame({
+            'id': [10], 'name': ['road'],
+            'coordinates': [[[-0.6, 52.6], [-0.4, 52.7], [-0.3, 52.65]]]})
+        return {'points': points, 'lines': lines}
+
+    def test_mbtiles(self, layers, tmp_path):
+        path_to_tiles = str(tmp_path / "rutland.mbtiles")
+        tile_index = generate_vector_tiles(
+            layers, path_to_tiles, max_zoom=8, max_workers=2)
+
+        assert tile_index.zoom.tolist() == sorted(tile_index.zoom) and \
+            set(tile_index.zoom) == set(range(9))
+
+        with sqlite3.connect(path_to_tiles) as conn:
+            metadata = dict(conn.execute("SELECT name, value FROM metadata"))
+            tiles = conn.execute("SELECT zoom_level, tile_column, tile_row, tile_data "
+                                 "FROM tiles").fetchall()
+
+        assert (metadata['minzoom'], metadata['maxzoom']) == ('0', '8')
+        assert len(tiles) == len(tile_index)
+
+        zoom, x, y_tms, tile_data = max(tiles)
+        tile_layers = read_tile_layers(gzip.decompress(tile_data))
+        assert sorted(tile_layers) == ['lines', 'points']
+        assert sorted(f[1] for f in tile_layers['points']['features']) == [1, 2]
+
+    def test_chunks(self, layers, tmp_path):
+        tile_index = generate_vector_tiles(
+            layers, str(tmp_path / "rutland.mbtiles"), max_zoom=8, max_workers=1)
+
+        chunks = iter([{'points': layers['points'].iloc[:1]},
+                       ('points', layers['points'].iloc[1:]), ('lines', layers['lines'])])
+        path_to_tiles = str(tmp_path / "rutland-tiles")
+        tile_index_ = generate_vector_tiles(
+            chunks, path_to_tiles, max_zoom=8, max_workers=1)
+
+        pd.testing.assert_frame_equal(tile_index_.drop(columns='size'),
+                                      tile_index.drop(columns='size'))
+        for zoom, x, y in tile_index_[['zoom', 'x', 'y']].itertuples(index=False):
+            path_to_tile = os.path.join(
+                path_to_tiles, str(zoom), str(x), "{}.pbf".format(y))
+            assert os.path.isfile(path_to_tile)
+
+    @pytest.mark.parametrize('pyramid', [False, True])
+    def test_no_properties(self, layers, tmp_path, pyramid):
+        layers = {k: v[['id', 'coordinates']] for k, v in layers.items()}
+        if pyramid:
+            layers = build_geometry_pyramid(layers, zoom_levels=(4, 6))
+        path_to_tiles = str(tmp_path / "rutland.mbtiles")
+        tile_index = generate_vector_tiles(
+            layers, path_to_tiles, max_zoom=8, max_workers=1)
+
+        with sqlite3.connect(path_to_tiles) as conn:
+            tile_data = conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = 8").fetchall()
+
+        assert len(tile_data) == (tile_index.zoom == 8).sum()
+        tile_layers = [read_tile_layers(gzip.decompress(x)) for x, in tile_data]
+        assert all(not x['keys'] for t in tile_layers for x in t.values())
+        assert sorted(f[1] for t in tile_layers if 'points' in t
+                      for f in t['points']['features']) == [1, 2]
+
+
+class TestGetDirtyTiles:
+
+    @staticmethod
+    def get_tile(lon, lat, zoom):
+        n = 2 ** zoom
+        lat_ = np.radians(lat)
+        return (int((lon + 180) / 360 * n),
+                int((1 - np.log(np.tan(lat_) + 1 / np.cos(lat_)) / np.pi) / 2 * n))
+
+    def test_changes(self):
+        old_data = {'points': pd.DataFrame({
+            'id': [1, 2, 3], 'name': ['a', 'b', 'c'],
+            'coordinates': [[-0.51, 52.66], [-0.53, 52.67], [10.0, -20.0]]})}
+
+        assert get_dirty_tiles(old_data, old_data, max_zoom=10).empty
+
+        new_data = {'points': old_data['points'].copy()}
+        new_data['points'].loc[0, 'name'] = 'A'  # Modified
+        new_data['points'] = new_data['points'][new_data['points'].id != 3]  # Deleted
+
+        dirty_tiles = get_dirty_tiles(old_data, new_data, min_zoom=2, max_zoom=10)
+
+        assert list(dirty_tiles.columns) == ['zoom', 'x', 'y']
+        assert set(dirty_tiles.zoom) == set(range(2, 11))
+        for zoom in range(2, 11):
+            tiles = set(map(tuple, dirty_tiles.loc[dirty_tiles.zoom == zoom, ['x', 'y']]
+                            .to_numpy().tolist()))
+            assert self.get_tile(-0.51, 52.66, zoom) in tiles
+            assert self.get_tile(10.0, -20.0, zoom) in tiles
+            assert len(tiles) <= 8  # Only the tiles (with buffers) of the two points
@@ -0,0 +1,35 @@
+"""
+Tests of the module :py:mod:`pydriosm.utils`.
+"""
+
+import pydriosm.utils
+from pydriosm.utils import get_number_of_chunks, get_vsi_path, is_remote_path
+
+
+class TestRemotePaths:
+
+    def test_is_remote_path(self):
+        assert is_remote_path("s3://osm/rutland-latest.osm.pbf")
+        assert not is_remote_path("file:///tmp/rutland-latest.osm.pbf")
+        assert not is_remote_path("tests/rutland-latest.osm.pbf")
+
+    def test_get_vsi_path(self):
+        assert get_vsi_path("gs://osm/rutland-latest.osm.pbf") == \
+            "/vsigs/osm/rutland-latest.osm.pbf"
+        url = "https://example.com/rutland-latest-free.shp.zip"
+        assert get_vsi_path(url, member='') == "/vsizip//vsicurl/" + url
+
+
+class TestGetNumberOfChunks:
+
+    def test_local_file(self, tmp_path):
+        path_to_file = tmp_path / "rutland-latest.osm.pbf"
+        path_to_file.write_bytes(b'\0' * (3 * 1024 ** 2))
+
+        assert get_number_of_chunks(str(path_to_file), chunk_size_limit=1) == 3
+        assert get_number_of_chunks(str(path_to_file), chunk_size_limit=5) is None
+
+    def test_remote_file_of_unknown_size(self, monkeypatch):
+        monkeypatch.setattr(pydriosm.utils, 'get_remote_file_size', lambda path: None)
+
+        assert get_number_of_chunks("s3://osm/rutland-latest.osm.pbf", 1) is None